@@ -0,0 +1,125 @@
+"""Benchmark of the bideltoid breadth and chest depth measurements of the slices of a 3D body against their resolution."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import argparse
+import time
+from collections.abc import Callable
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon
+
+import configuration.utils.constants as cst
+import configuration.utils.functions as fun
+from configuration.utils.typing_custom import Sex
+
+#: Default lengths (cm) of the longest segments of the slices, which are densified to reach them.
+DEFAULT_SEGMENT_LENGTHS: tuple[float, ...] = (0.0, 1.0, 0.25, 0.05)
+
+
+def sliding_window_breadth(multi_polygon: MultiPolygon) -> float:
+    """
+    Compute the bideltoid breadth with the pure Python sliding window used before the vectorized implementation.
+
+    Parameters
+    ----------
+    multi_polygon : MultiPolygon
+        The MultiPolygon to measure.
+
+    Returns
+    -------
+    float
+        The largest horizontal distance between two points with almost the same y-coordinate.
+    """
+    center_of_mass = multi_polygon.centroid
+    all_coords = np.array(
+        [(coord[0] - center_of_mass.x, coord[1] - center_of_mass.y) for poly in multi_polygon.geoms for coord in poly.boundary.coords]
+    )
+    sorted_coords = all_coords[np.argsort(all_coords[:, 1])]
+    max_distance = 0.0
+    i = 0
+    while i < len(sorted_coords):
+        j = i + 1
+        while j < len(sorted_coords) and abs(sorted_coords[j, 1] - sorted_coords[i, 1]) <= cst.BREADTH_DEPTH_TOLERANCE:
+            max_distance = max(max_distance, abs(sorted_coords[j, 0] - sorted_coords[i, 0]))
+            j += 1
+        i += 1
+    return max_distance
+
+
+def time_measure(measure: Callable[[list[MultiPolygon]], object], slices: list[MultiPolygon]) -> float:
+    """
+    Measure the time needed to measure all the slices of a 3D body.
+
+    Parameters
+    ----------
+    measure : Callable[[list[MultiPolygon]], object]
+        The measurement, run on the list of slices.
+    slices : list[MultiPolygon]
+        The slices of the 3D body.
+
+    Returns
+    -------
+    float
+        The running time (s).
+    """
+    start = time.perf_counter()
+    measure(slices)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Measure the bideltoid breadth of all the slices of a 3D body for the requested resolutions and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "segment_lengths",
+        nargs="*",
+        type=float,
+        default=list(DEFAULT_SEGMENT_LENGTHS),
+        help="Longest segment lengths (cm) of the densified slices, 0 to keep the original slices.",
+    )
+    parser.add_argument("--sex", choices=["male", "female"], default="male", help="Sex of the 3D body template.")
+    args = parser.parse_args()
+
+    sex: Sex = args.sex
+    slices = list(fun.load_body_template(sex).values())
+
+    print(f"{'points':>8} {'sliding window (s)':>20} {'vectorized (s)':>16} {'batch (s)':>11}")
+    for segment_length in args.segment_lengths:
+        if segment_length > 0.0:
+            densified = [MultiPolygon(list(shapely.get_parts(shapely.segmentize(mp, segment_length)))) for mp in slices]
+        else:
+            densified = slices
+        number_points = len(shapely.get_coordinates(densified))
+        sliding_window_time = time_measure(lambda mps: [sliding_window_breadth(mp) for mp in mps], densified)
+        vectorized_time = time_measure(lambda mps: [fun.compute_bideltoid_breadth_from_multipolygon(mp) for mp in mps], densified)
+        batch_time = time_measure(fun.compute_bideltoid_breadths_from_multipolygons, densified)
+        print(f"{number_points:>8} {sliding_window_time:>20.3f} {vectorized_time:>16.3f} {batch_time:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Benchmark of one decisional time step of the mechanical layer against the crowd size."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import argparse
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+
+import configuration.utils.constants as cst
+from configuration.mechanics.crowd_mechanics import CrowdMechanicsSimulation
+
+#: Default crowd sizes used for the benchmark.
+DEFAULT_CROWD_SIZES: tuple[int, ...] = (250, 500, 1000, 2000, 4000)
+#: Default number of decisional time steps timed for each crowd size.
+DEFAULT_NB_STEPS: int = 20
+#: Distance (m) between the centers of two neighbouring agents on the initial grid.
+GRID_SPACING: float = 0.8
+#: Distance (m) between the centers of two neighbouring agents when all agents must be mechanically active.
+ACTIVE_GRID_SPACING: float = 0.6
+#: Decisional time step (s).
+TIME_STEP: float = 0.1
+#: Mechanical time step (s).
+MECHANICAL_TIME_STEP: float = 1e-4
+#: Radii (m) and positions (m) relative to the center of mass of the five disks of each agent.
+AGENT_DISKS: tuple[tuple[float, float, float], ...] = (
+    (0.100, -0.017, 0.165),
+    (0.137, 0.010, 0.073),
+    (0.144, 0.015, 0.000),
+    (0.137, 0.010, -0.073),
+    (0.100, -0.017, -0.165),
+)
+
+
+def write_scenario(
+    directory: Path, number_agents: int, grid_spacing: float = GRID_SPACING, mechanical_time_step: float = MECHANICAL_TIME_STEP
+) -> Path:
+    """
+    Write the input files of a crowd of agents at rest on a square grid, inside a square room.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory in which the files are written.
+    number_agents : int
+        The number of agents.
+    grid_spacing : float
+        The distance (m) between the centers of two neighbouring agents.
+    mechanical_time_step : float
+        The time step (s) of the mechanical layer.
+
+    Returns
+    -------
+    Path
+        The path to the Parameters file.
+    """
+    (directory / "static").mkdir(parents=True)
+    (directory / "dynamic").mkdir()
+    nb_columns = int(np.ceil(np.sqrt(number_agents)))
+    room_size = (nb_columns + 1) * grid_spacing
+
+    (directory / "Parameters.xml").write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Parameters>\n'
+        f'    <Directories Static="{directory / "static"}/" Dynamic="{directory / "dynamic"}/"/>\n'
+        f'    <Times TimeStep="{TIME_STEP}" TimeStepMechanical="{mechanical_time_step}"/>\n</Parameters>\n'
+    )
+    (directory / "static" / "Materials.xml").write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Materials>\n    <Intrinsic>\n'
+        f'        <Material Id="concrete" YoungModulus="{cst.YOUNG_MODULUS_CONCRETE}" ShearModulus="{cst.SHEAR_MODULUS_CONCRETE}"/>\n'
+        f'        <Material Id="human_naked" YoungModulus="{cst.YOUNG_MODULUS_HUMAN_NAKED}" '
+        f'ShearModulus="{cst.SHEAR_MODULUS_HUMAN_NAKED}"/>\n'
+        "    </Intrinsic>\n    <Binary>\n"
+        '        <Contact Id1="concrete" Id2="human_naked" GammaNormal="1.3e3" GammaTangential="1.3e3" KineticFriction="0.5"/>\n'
+        '        <Contact Id1="human_naked" Id2="human_naked" GammaNormal="1.3e3" GammaTangential="1.3e3" KineticFriction="0.5"/>\n'
+        "    </Binary>\n</Materials>\n"
+    )
+    corners = [(0.0, 0.0), (room_size, 0.0), (room_size, room_size), (0.0, room_size), (0.0, 0.0)]
+    (directory / "static" / "Geometry.xml").write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Geometry>\n'
+        f'    <Dimensions Lx="{room_size}" Ly="{room_size}"/>\n    <Wall Id="0" MaterialId="concrete">\n'
+        + "".join(f'        <Corner Coordinates="{x},{y}"/>\n' for x, y in corners)
+        + "    </Wall>\n</Geometry>\n"
+    )
+    shapes = "".join(
+        f'        <Shape Type="disk" Radius="{radius}" MaterialId="human_naked" Position="{x},{y}"/>\n' for radius, x, y in AGENT_DISKS
+    )
+    (directory / "static" / "Agents.xml").write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Agents>\n'
+        + "".join(
+            f'    <Agent Type="pedestrian" Id="{a}" Mass="80.0" MomentOfInertia="2.0" FloorDamping="2.0" AngularDamping="2.0">\n'
+            f"{shapes}    </Agent>\n"
+            for a in range(number_agents)
+        )
+        + "</Agents>\n"
+    )
+    (directory / "dynamic" / "AgentDynamics.xml").write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Agents>\n'
+        + "".join(
+            f'    <Agent Id="{a}">\n'
+            f'        <Kinematics Position="{(a % nb_columns + 1) * grid_spacing},{(a // nb_columns + 1) * grid_spacing}" '
+            'Velocity="0.0,0.0" Theta="0.0" Omega="0.0"/>\n'
+            '        <Dynamics Fp="0.0,0.0" Mp="0.0"/>\n    </Agent>\n'
+            for a in range(number_agents)
+        )
+        + "</Agents>\n"
+    )
+    return directory / "Parameters.xml"
+
+
+def time_xml_steps(parameters_file: Path, nb_steps: int, library_path: Path | None = None, number_threads: int = 1) -> float:
+    """
+    Measure the mean time of a decisional time step when the state is exchanged through the AgentDynamics XML file.
+
+    At each step, the driving forces are written to the file, the mechanical layer is called, and the new kinematics are
+    parsed back, as in the ``run_simulation.py`` drivers.
+
+    Parameters
+    ----------
+    parameters_file : Path
+        The path to the Parameters file of the scenario.
+    nb_steps : int
+        The number of timed steps.
+    library_path : Path | None
+        The path to the CrowdMechanics shared library. If None, the library built in ``src/mechanical_layer/build`` is used.
+    number_threads : int
+        The number of threads computing the contact forces.
+
+    Returns
+    -------
+    float
+        The mean time of one step (s).
+    """
+    dynamics_file = parameters_file.parent / "dynamic" / "AgentDynamics.xml"
+    with CrowdMechanicsSimulation(parameters_file, library_path=library_path) as simulation:
+        simulation.set_number_threads(number_threads)
+        start = time.perf_counter()
+        for _ in range(nb_steps):
+            tree = ET.parse(dynamics_file)
+            for agent in tree.getroot().findall("Agent"):
+                dynamics = agent.find("Dynamics")
+                if dynamics is None:
+                    dynamics = ET.SubElement(agent, "Dynamics")
+                dynamics.set("Fp", "0.0,0.0")
+                dynamics.set("Mp", "0.0")
+            tree.write(dynamics_file)
+            simulation.step(dynamics_file.name)
+            kinematics = [agent.find("Kinematics") for agent in ET.parse(dynamics_file).getroot().findall("Agent")]
+        assert len(kinematics) == simulation.number_agents
+        return (time.perf_counter() - start) / nb_steps
+
+
+def time_in_memory_steps(parameters_file: Path, nb_steps: int, library_path: Path | None = None, number_threads: int = 1) -> float:
+    """
+    Measure the mean time of a decisional time step when the state is exchanged as NumPy arrays.
+
+    Parameters
+    ----------
+    parameters_file : Path
+        The path to the Parameters file of the scenario.
+    nb_steps : int
+        The number of timed steps.
+    library_path : Path | None
+        The path to the CrowdMechanics shared library. If None, the library built in ``src/mechanical_layer/build`` is used.
+    number_threads : int
+        The number of threads computing the contact forces.
+
+    Returns
+    -------
+    float
+        The mean time of one step (s).
+    """
+    with CrowdMechanicsSimulation(parameters_file, library_path=library_path) as simulation:
+        simulation.set_number_threads(number_threads)
+        driving_forces = np.zeros((simulation.number_agents, len(cst.MECHANICS_DRIVING_FORCES_COLUMNS)))
+        start = time.perf_counter()
+        for _ in range(nb_steps):
+            simulation.set_driving_forces(driving_forces)
+            simulation.step()
+            kinematics = simulation.get_kinematics()
+        assert kinematics.shape[0] == simulation.number_agents
+        return (time.perf_counter() - start) / nb_steps
+
+
+def main() -> None:
+    """Run the mechanical layer benchmark for the requested crowd sizes and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sizes", nargs="*", type=int, default=list(DEFAULT_CROWD_SIZES), help="Crowd sizes to benchmark.")
+    parser.add_argument("--steps", type=int, default=DEFAULT_NB_STEPS, help="Number of decisional time steps timed per size.")
+    parser.add_argument(
+        "--active",
+        action="store_true",
+        help="Pack the agents so that all of them are mechanically active, with a single mechanical time step per decisional step.",
+    )
+    parser.add_argument("--library", type=Path, default=None, help="Path to the CrowdMechanics shared library to benchmark.")
+    parser.add_argument("--threads", type=int, default=1, help="Number of threads computing the contact forces.")
+    args = parser.parse_args()
+    grid_spacing, mechanical_time_step = (ACTIVE_GRID_SPACING, TIME_STEP) if args.active else (GRID_SPACING, MECHANICAL_TIME_STEP)
+
+    print(f"{'agents':>8} {'XML exchange (ms/step)':>24} {'in-memory (ms/step)':>21}")
+    for number_agents in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            xml_scenario = write_scenario(Path(tmp_dir) / "xml", number_agents, grid_spacing, mechanical_time_step)
+            xml_time = time_xml_steps(xml_scenario, args.steps, args.library, args.threads)
+            in_memory_scenario = write_scenario(Path(tmp_dir) / "in_memory", number_agents, grid_spacing, mechanical_time_step)
+            in_memory_time = time_in_memory_steps(in_memory_scenario, args.steps, args.library, args.threads)
+        print(f"{number_agents:>8} {1e3 * xml_time:>24.2f} {1e3 * in_memory_time:>21.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark of the packing time of the Crowd packing algorithms against the crowd size."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import argparse
+import copy
+import time
+
+import numpy as np
+
+from configuration.models.crowd import Crowd
+
+#: Default crowd sizes used for the benchmark.
+DEFAULT_CROWD_SIZES: tuple[int, ...] = (25, 50, 100, 200)
+
+
+def time_packing(crowd: Crowd, engine: str) -> float:
+    """
+    Measure the time needed to pack a copy of the given crowd.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The unpacked crowd to pack.
+    engine : str
+        The packing engine, one of "all_pairs", "neighbour_search" or "vectorized".
+
+    Returns
+    -------
+    float
+        The packing time (s).
+    """
+    crowd_copy = copy.deepcopy(crowd)
+    np.random.seed(0)
+    start = time.perf_counter()
+    if engine == "vectorized":
+        crowd_copy.pack_agents_with_vectorized_forces()
+    else:
+        crowd_copy.pack_agents_with_forces(neighbour_search=engine == "neighbour_search")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the packing benchmark for the requested crowd sizes and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("sizes", nargs="*", type=int, default=list(DEFAULT_CROWD_SIZES), help="Crowd sizes to benchmark.")
+    parser.add_argument("--skip-all-pairs", action="store_true", help="Do not time the all-pairs packing.")
+    args = parser.parse_args()
+
+    print(f"{'agents':>8} {'all pairs (s)':>15} {'neighbour search (s)':>22} {'vectorized (s)':>16}")
+    for number_agents in args.sizes:
+        crowd = Crowd()
+        crowd.create_agents(number_agents=number_agents)
+        all_pairs_time = float("nan") if args.skip_all_pairs else time_packing(crowd, "all_pairs")
+        neighbour_search_time = time_packing(crowd, "neighbour_search")
+        vectorized_time = time_packing(crowd, "vectorized")
+        print(f"{number_agents:>8} {all_pairs_time:>15.2f} {neighbour_search_time:>22.2f} {vectorized_time:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
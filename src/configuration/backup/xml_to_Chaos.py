@@ -28,13 +28,187 @@
 import os
 import re
 import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from numpy.typing import NDArray
+
+import configuration.utils.constants as cst
 
 regex_nb = r"[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?"
 trajectories_csv_filename = "all_trajectories.csv"
+chaos_folder_name = "ForCHAOS"
+#: Columns of the table of the agent trajectories, in the order of the CSV file.
+trajectories_columns = ("t", "ID", "x", "y", "vx", "vy", "theta", "omega")
+
+#: Pattern of the paths of the AgentDynamics files, which give the time of the file.
+_filename_pattern = re.compile(rf".*(input|output) t=({regex_nb})\.xml")
+#: Pattern of the two-dimensional vectors (position and velocity) of the AgentDynamics files.
+_vector_pattern = re.compile(rf"({regex_nb}),({regex_nb})")
+#: Pattern of semicolon-separated lists of two-dimensional vectors, to check all the vectors of a file at once.
+_vectors_pattern = re.compile(rf"{regex_nb},{regex_nb}(?:;{regex_nb},{regex_nb})*")
+#: Pattern of semicolon-separated lists of numbers, to check all the angles and angular velocities of a file at once.
+_numbers_pattern = re.compile(rf"{regex_nb}(?:;{regex_nb})*")
+
+
+def get_agent_dynamics_files(folder_path: Path) -> list[tuple[float, Path]]:
+    """
+    Get the AgentDynamics files of a folder with their times, in chronological order.
+
+    Parameters
+    ----------
+    folder_path : Path
+        Path to the folder containing XML files.
+
+    Returns
+    -------
+    list[tuple[float, Path]]
+        The time of each file and its path, sorted by time. If several files share a time (to the millisecond), only the
+        last one in alphabetical order is kept.
+
+    Notes
+    -----
+    Assumes XML files are named with the pattern 'AgentDyn...input t=<time>.xml' or 'AgentDyn...output t=<time>.xml'.
+    """
+    folder_path.mkdir(parents=True, exist_ok=True)
+
+    files: dict[int, tuple[float, Path]] = {}
+    for fichier in sorted(folder_path.iterdir()):
+        if fichier.is_file() and fichier.name.startswith("AgentDyn") and fichier.name.endswith("xml"):
+            m = _filename_pattern.fullmatch(str(fichier))
+            if not m:
+                continue
+            time_loc = float(m.group(2))
+            files[int(1000 * time_loc)] = (time_loc, fichier)
+
+    return sorted(files.values())
+
+
+def read_agent_dynamics_file(file_path: Path) -> tuple[list[str], NDArray[np.float64]]:
+    """
+    Read the kinematics of the agents of one AgentDynamics file, in a single streaming pass.
+
+    The agents without an id, without complete kinematics or whose position or velocity is not a pair of numbers are
+    skipped. When all the values are well-formed numbers, which is the case of the files written by the mechanical layer,
+    they are converted to floats all at once.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path to the AgentDynamics file.
+
+    Returns
+    -------
+    list[str]
+        The ids of the agents, in the order of the file.
+    NDArray[np.float64]
+        Array of shape (number of agents, 6) whose columns are x, y, vx, vy, theta and omega.
+    """
+    ID_agents: list[str] = []
+    positions: list[str] = []
+    velocities: list[str] = []
+    thetas: list[str] = []
+    omegas: list[str] = []
+    for _, agent in ET.iterparse(file_path, events=("end",)):
+        if agent.tag != "Agent":
+            continue
+        ID_agent = agent.get("Id")
+        kinematics = agent.find("Kinematics")
+        agent.clear()
+        if ID_agent is None or kinematics is None:
+            continue
+
+        pos = kinematics.get("Position")
+        vel = kinematics.get("Velocity")
+        omega = kinematics.get("Omega")
+        theta = kinematics.get("Theta")
+        if pos is None or vel is None or omega is None or theta is None:
+            continue
+        ID_agents.append(ID_agent)
+        positions.append(pos)
+        velocities.append(vel)
+        thetas.append(theta)
+        omegas.append(omega)
+
+    if _vectors_pattern.fullmatch(";".join(positions + velocities)) and _numbers_pattern.fullmatch(";".join(thetas + omegas)):
+        kinematics = zip(positions, velocities, thetas, omegas, strict=True)
+        records = ",".join(f"{pos},{vel},{theta},{omega}" for pos, vel, theta, omega in kinematics)
+        return ID_agents, np.array(records.split(","), dtype=np.float64).reshape(-1, 6)
+
+    # Slow path, agent by agent, for the files with malformed values
+    valid_ID_agents: list[str] = []
+    values: list[tuple[float, float, float, float, float, float]] = []
+    for ID_agent, pos, vel, theta, omega in zip(ID_agents, positions, velocities, thetas, omegas, strict=True):
+        theta_value = float(theta)
+        omega_value = float(omega)
+        pos_match = _vector_pattern.fullmatch(pos)
+        vel_match = _vector_pattern.fullmatch(vel)
+        if not pos_match or not vel_match:
+            continue
+        valid_ID_agents.append(ID_agent)
+        values.append(
+            (
+                float(pos_match.group(1)),
+                float(pos_match.group(2)),
+                float(vel_match.group(1)),
+                float(vel_match.group(2)),
+                theta_value,
+                omega_value,
+            )
+        )
+
+    return valid_ID_agents, np.array(values, dtype=np.float64).reshape(-1, 6)
+
+
+def read_agent_trajectories_from_XML(folder_path: Path, workers: int = cst.DEFAULT_NB_WORKERS) -> pd.DataFrame:
+    """
+    Read the trajectories of the agents from the AgentDynamics files of a folder into a single table.
+
+    Each file is parsed once. With several workers, the files are parsed in parallel by a pool of processes.
+
+    Parameters
+    ----------
+    folder_path : Path
+        Path to the folder containing XML files.
+    workers : int
+        Number of worker processes used to parse the files.
+
+    Returns
+    -------
+    pd.DataFrame
+        Table with columns t, ID, x, y, vx, vy, theta and omega, with one row per agent and per time, sorted by time and
+        then by agent ID.
+
+    Raises
+    ------
+    ValueError
+        If `workers` is not a positive integer.
+    """
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError("'workers' should be a positive integer.")
+
+    files = get_agent_dynamics_files(folder_path)
+    paths = [file_path for _, file_path in files]
+    if workers == 1 or len(paths) < 2:
+        parsed_files = list(map(read_agent_dynamics_file, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(paths) // (4 * workers))
+            parsed_files = list(executor.map(read_agent_dynamics_file, paths, chunksize=chunksize))
+
+    times = np.array([time_loc for time_loc, _ in files], dtype=np.float64)
+    counts = [len(ID_agents) for ID_agents, _ in parsed_files]
+    values = np.concatenate([file_values for _, file_values in parsed_files]) if parsed_files else np.empty((0, 6))
+    trajectories = pd.DataFrame(values, columns=list(trajectories_columns[2:]))
+    trajectories.insert(0, "ID", [ID_agent for ID_agents, _ in parsed_files for ID_agent in ID_agents])
+    trajectories.insert(0, "t", np.repeat(times, counts))
+    # An agent appearing twice in the same file is only kept once, as in a dictionary
+    trajectories.drop_duplicates(subset=["t", "ID"], keep="last", inplace=True)
+    trajectories.sort_values(by=["t", "ID"], kind="stable", inplace=True, ignore_index=True)
+    return trajectories
 
 
 def get_list_of_agents_and_times_from_XML(
@@ -61,31 +235,12 @@ def get_list_of_agents_and_times_from_XML(
     -----
     Assumes XML files are named with the pattern 'AgentDyn...input t=<time>.xml'.
     """
-    folder_path.mkdir(parents=True, exist_ok=True)
-
+    files = get_agent_dynamics_files(folder_path)
     ID_agents: set[str] = set()
-    times: list[float] = []
-    filenames: dict[int, str] = {}
-
-    for fichier in folder_path.iterdir():
-        if fichier.is_file() and fichier.name.startswith("AgentDyn") and fichier.name.endswith("xml"):
-            print(f"Processing file: {fichier.name}")
-            pattern = re.compile(rf".*(input|output) t=({regex_nb})\.xml")
-            m = pattern.fullmatch(str(fichier))
-            if not m:
-                continue
-            time_loc = float(m.group(2))
-            times.append(time_loc)
-            filenames[int(1000 * time_loc)] = str(fichier)
-
-            agents_tree = ET.parse(fichier).getroot()
-            for agent in agents_tree:
-                agent_id = agent.get("Id")
-                if agent_id is not None:
-                    ID_agents.add(agent_id)
-            del agents_tree
+    for _, file_path in files:
+        ID_agents.update(read_agent_dynamics_file(file_path)[0])
 
-    return sorted(ID_agents), sorted(times), filenames
+    return sorted(ID_agents), [time_loc for time_loc, _ in files], {int(1000 * time_loc): str(path) for time_loc, path in files}
 
 
 def create_dict_of_agent_trajectories(
@@ -94,7 +249,8 @@ def create_dict_of_agent_trajectories(
     """
     Create a dictionary of agent trajectories from XML files in a folder.
 
-    For each agent, stores their position and velocity at each time point.
+    For each agent, stores their position and velocity at each time point. The dictionary is built from the table returned
+    by `read_agent_trajectories_from_XML`, which is more efficient for large numbers of files.
 
     Parameters
     ----------
@@ -111,64 +267,31 @@ def create_dict_of_agent_trajectories(
             'x': pos_x,
             'y': pos_y,
             'vx': vel_x,
-            'vy': vel_y
+            'vy': vel_y,
+            'theta': theta,
+            'omega': omega
         }.
 
     Notes
     -----
-    Assumes XML files are named and structured as expected by `get_list_of_agents_and_times_from_XML`.
+    Assumes XML files are named and structured as expected by `get_agent_dynamics_files`.
     """
-    ID_agents, times, filenames = get_list_of_agents_and_times_from_XML(folder_path)
-
-    agents: dict[str, dict[float, dict[str, float]]] = {ID: {} for ID in ID_agents}
-
-    for time_loc in times:
-        file_path = filenames[int(1000 * time_loc)]
-        agents_tree = ET.parse(file_path).getroot()
-
-        for agent in agents_tree:
-            ID_agent = agent.get("Id")
-            if ID_agent is None:
-                continue
-
-            kinematics = next(agent.iterfind("Kinematics"), None)
-            if kinematics is None:
-                continue
-
-            pos = kinematics.get("Position")
-            vel = kinematics.get("Velocity")
-            omega = kinematics.get("Omega")
-            theta = kinematics.get("Theta")
-            if pos is None or vel is None or omega is None or theta is None:
-                continue
-
-            pos_match = re.fullmatch(rf"({regex_nb}),({regex_nb})", pos)
-            vel_match = re.fullmatch(rf"({regex_nb}),({regex_nb})", vel)
-            omega_match = float(omega)
-            theta_match = float(theta)
+    times = [time_loc for time_loc, _ in get_agent_dynamics_files(folder_path)]
+    trajectories = read_agent_trajectories_from_XML(folder_path)
 
-            if not pos_match or not vel_match:
-                continue
-
-            agents[ID_agent][time_loc] = {
-                "x": float(pos_match.group(1)),
-                "y": float(pos_match.group(2)),
-                "vx": float(vel_match.group(1)),
-                "vy": float(vel_match.group(2)),
-                "theta": theta_match,
-                "omega": omega_match,
-            }
-
-        del agents_tree
+    agents: dict[str, dict[float, dict[str, float]]] = {ID: {} for ID in sorted(trajectories["ID"].unique())}
+    for row in trajectories.itertuples(index=False):
+        agents[row.ID][row.t] = {name: getattr(row, name) for name in trajectories_columns[2:]}
 
     return times, agents
 
 
-def export_XML_to_CSV(PathCSV: Path, PathXML: Path) -> None:
+def export_XML_to_CSV(PathCSV: Path, PathXML: Path, workers: int = cst.DEFAULT_NB_WORKERS) -> None:
     """
-    Export agent trajectories to a CSV file with header: t,ID,x,y,vx,vy.
+    Export agent trajectories to a CSV file with header: t,ID,x,y,vx,vy,theta,omega.
 
-    Each row of the CSV contains the time, agent ID, position (x, y), and velocity (vx, vy) for each agent at each time point.
+    Each row of the CSV contains the time, agent ID, position (x, y), velocity (vx, vy), orientation and angular velocity
+    of an agent at a time point, sorted by time and then by agent ID.
 
     Parameters
     ----------
@@ -176,24 +299,178 @@ def export_XML_to_CSV(PathCSV: Path, PathXML: Path) -> None:
         Path to the folder where the CSV file will be saved.
     PathXML : Path
         Path to the folder containing the XML files (AgentDynamics).
+    workers : int
+        Number of worker processes used to parse the XML files.
     """
-    times, agents = create_dict_of_agent_trajectories(PathXML)
-    ID_agents = sorted(agents.keys())
+    trajectories = read_agent_trajectories_from_XML(PathXML, workers)
     csv_path = PathCSV / trajectories_csv_filename
 
+    row_format = "\n%.4f,%s" + ",%.6f" * (len(trajectories_columns) - 2)
+    columns = [trajectories[name].tolist() for name in trajectories_columns]
     with open(csv_path, "w", encoding="utf-8") as monfichier:
-        monfichier.write("t,ID,x,y,vx,vy,theta,omega")
-        for time_loc in times:
-            for ID_agent in ID_agents:
-                posvel = agents[ID_agent].get(time_loc)
-                if posvel is not None:
-                    monfichier.write(
-                        f"\n{time_loc:.4f},{ID_agent},{posvel['x']:.6f},{posvel['y']:.6f},{posvel['vx']:.6f},{posvel['vy']:.6f},"
-                        f"{posvel['theta']:.6f},{posvel['omega']:.6f}",
-                    )
-
-
-def export_CSV_to_CHAOS(PathCSV: Path, dt: float) -> None:
+        monfichier.write(",".join(trajectories_columns))
+        monfichier.writelines(row_format % row for row in zip(*columns, strict=True))
+
+
+def interpolate_trajectories_on_grid(
+    trajectories: pd.DataFrame, dt: float
+) -> tuple[list[str | int], NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], NDArray[np.int64]]:
+    """
+    Interpolate the positions of all agents on a common time grid, in a single vectorized pass.
+
+    The grid goes from the first to the last time of the trajectories with a step `dt`. Each agent is given the times of the
+    grid from its first sample (included) to its last sample (excluded), with positions linearly interpolated between the
+    samples that surround them.
+
+    Parameters
+    ----------
+    trajectories : pd.DataFrame
+        Table of the trajectories, with columns t (s), ID, x (m) and y (m).
+    dt : float
+        Time step of the grid (s).
+
+    Returns
+    -------
+    list[str | int]
+        The sorted IDs of the agents (as integers if they all are).
+    NDArray[np.float64]
+        The times of the grid given to the agents, agent by agent.
+    NDArray[np.float64]
+        The interpolated positions along x.
+    NDArray[np.float64]
+        The interpolated positions along y.
+    NDArray[np.int64]
+        The index of the first row of each agent, followed by the total number of rows.
+    """
+    lignes = trajectories[["t", "ID", "x", "y"]].assign(
+        t=trajectories["t"].astype(float), ID=trajectories["ID"].astype(int, errors="ignore")
+    )
+    lignes = lignes.sort_values(by=["ID", "t"])
+    t_vec = np.arange(lignes["t"].min(), lignes["t"].max(), dt)
+
+    ID_codes, ID_agents = pd.factorize(lignes["ID"], sort=True)
+    times = lignes["t"].to_numpy(dtype=float)
+    xs = lignes["x"].to_numpy(dtype=float)
+    ys = lignes["y"].to_numpy(dtype=float)
+    sample_starts = np.searchsorted(ID_codes, np.arange(len(ID_agents) + 1))
+
+    # Times of the grid given to each agent: from its first sample (included) to its last sample (excluded)
+    first_grid = np.searchsorted(t_vec, times[sample_starts[:-1]], side="left")
+    last_grid = np.searchsorted(t_vec, times[sample_starts[1:] - 1], side="left")
+    nb_rows = np.maximum(last_grid - first_grid, 0)
+    row_starts = np.append(0, np.cumsum(nb_rows))
+    row_agents = np.repeat(np.arange(len(ID_agents)), nb_rows)
+    t_rows = t_vec[np.arange(row_starts[-1]) - np.repeat(row_starts[:-1] - first_grid, nb_rows)]
+
+    # Sort the samples and the grid times together by agent and time, the samples before the grid times they equal, so
+    # that the number of samples preceding a grid time gives the first sample after it
+    is_row = np.concatenate([np.zeros(len(times), dtype=bool), np.ones(len(t_rows), dtype=bool)])
+    order = np.lexsort((is_row, np.concatenate([times, t_rows]), np.concatenate([ID_codes, row_agents])))
+    nb_samples_before = np.cumsum(~is_row[order])
+    idx_after = np.empty(len(t_rows), dtype=np.int64)
+    idx_after[order[is_row[order]] - len(times)] = nb_samples_before[is_row[order]]
+    idx_before = idx_after - 1
+
+    # Linear interpolation
+    coef = (t_rows - times[idx_before]) / (times[idx_after] - times[idx_before])
+    x_interp = (1.0 - coef) * xs[idx_before] + coef * xs[idx_after]
+    y_interp = (1.0 - coef) * ys[idx_before] + coef * ys[idx_after]
+
+    return list(ID_agents), t_rows, x_interp, y_interp, row_starts
+
+
+def _format_CHAOS_trajectories(
+    times: NDArray[np.float64], xs: NDArray[np.float64], ys: NDArray[np.float64], row_starts: NDArray[np.int64]
+) -> list[str]:
+    """
+    Format the interpolated trajectories of consecutive agents as the content of ChAOS files.
+
+    Parameters
+    ----------
+    times : NDArray[np.float64]
+        The times of the rows of the agents.
+    xs : NDArray[np.float64]
+        The positions along x of the rows of the agents.
+    ys : NDArray[np.float64]
+        The positions along y of the rows of the agents.
+    row_starts : NDArray[np.int64]
+        The index of the first row of each agent, followed by the total number of rows.
+
+    Returns
+    -------
+    list[str]
+        The content of the file of each agent, with lines t, x, y, 0.0.
+    """
+    rows = ["%.3f,%.3f,%.3f,0.0\n" % row for row in zip(times.tolist(), xs.tolist(), ys.tolist(), strict=True)]
+    return ["".join(rows[start:end]) for start, end in zip(row_starts[:-1], row_starts[1:], strict=True)]
+
+
+def export_trajectories_to_CHAOS(
+    trajectories: pd.DataFrame, PathCHAOS: Path, dt: float, workers: int = cst.DEFAULT_NB_WORKERS, archive: bool = False
+) -> None:
+    """
+    Export a table of agent trajectories into one text file per agent, in the format required by the ChAOS software.
+
+    Parameters
+    ----------
+    trajectories : pd.DataFrame
+        Table of the trajectories, with columns t (s), ID, x (m) and y (m), such as the output of
+        `read_agent_trajectories_from_XML`.
+    PathCHAOS : Path
+        Path to the folder where the files are written or, with `archive`, path to the ZIP archive holding them.
+    dt : float
+        Timestep to use for interpolation in the CHAOS output.
+    workers : int
+        Number of worker processes used to format the files.
+    archive : bool
+        If True, the files are written as the members of a single ZIP archive instead of loose files.
+
+    Raises
+    ------
+    ValueError
+        If `workers` is not a positive integer.
+
+    Notes
+    -----
+    Each output file is named 'trajXXX.csv' where XXX is the zero-padded index of the agent in the sorted IDs.
+    Each line in the output file contains: t, x, y, 0.0
+    """
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError("'workers' should be a positive integer.")
+
+    ID_agents, times, xs, ys, row_starts = interpolate_trajectories_on_grid(trajectories, dt)
+    nb_agents = len(ID_agents)
+    if workers == 1 or nb_agents < 2:
+        contents = _format_CHAOS_trajectories(times, xs, ys, row_starts)
+    else:
+        # Blocks of consecutive agents, formatted by the workers
+        bounds = np.linspace(0, nb_agents, min(nb_agents, 4 * workers) + 1).astype(int)
+        blocks = [(row_starts[first], row_starts[last]) for first, last in zip(bounds[:-1], bounds[1:], strict=True)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            block_contents = executor.map(
+                _format_CHAOS_trajectories,
+                [times[start:end] for start, end in blocks],
+                [xs[start:end] for start, end in blocks],
+                [ys[start:end] for start, end in blocks],
+                [row_starts[first : last + 1] - row_starts[first] for first, last in zip(bounds[:-1], bounds[1:], strict=True)],
+            )
+            contents = [content for block in block_contents for content in block]
+
+    if archive:
+        PathCHAOS.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(PathCHAOS, "w", compression=zipfile.ZIP_DEFLATED) as archive_file:
+            for cpt_agent, content in enumerate(contents):
+                archive_file.writestr(f"traj{cpt_agent:03d}.csv", content)
+    else:
+        PathCHAOS.mkdir(parents=True, exist_ok=True)
+        for file in PathCHAOS.glob("traj*.csv"):
+            os.remove(file)  # clean old files
+        for cpt_agent, content in enumerate(contents):
+            with open(PathCHAOS / f"traj{cpt_agent:03d}.csv", "w", encoding="utf-8") as monfichier:
+                monfichier.write(content)
+
+
+def export_CSV_to_CHAOS(PathCSV: Path, dt: float, workers: int = cst.DEFAULT_NB_WORKERS, archive: bool = False) -> None:
     """
     Read agent trajectories from a CSV file and exports them into multiple text files in the format required by the ChAOS software.
 
@@ -205,6 +482,10 @@ def export_CSV_to_CHAOS(PathCSV: Path, dt: float) -> None:
         Path to the folder containing the CSV file containing columns: t, ID, x, y, vx, vy.
     dt : float
         Timestep to use for interpolation in the CHAOS output.
+    workers : int
+        Number of worker processes used to format the files.
+    archive : bool
+        If True, the files are written in a single ZIP archive, 'ForCHAOS.zip', instead of the 'ForCHAOS' folder.
 
     Notes
     -----
@@ -212,48 +493,10 @@ def export_CSV_to_CHAOS(PathCSV: Path, dt: float) -> None:
     Each line in the output file contains: t, x, y, 0.0
     """
     PathCSV.mkdir(parents=True, exist_ok=True)
-    PathCHAOS = PathCSV / "ForCHAOS"
-    PathCHAOS.mkdir(parents=True, exist_ok=True)
-    for file in PathCHAOS.glob("traj*.csv"):
-        os.remove(file)  # clean old files
+    PathCHAOS = PathCSV / chaos_folder_name
 
     path_to_CSV_main_file = PathCSV / trajectories_csv_filename
     lignes = pd.read_csv(path_to_CSV_main_file, sep=",", header=0, index_col=False)
-    lignes["t"] = lignes["t"].astype(float)
-    lignes.sort_values(by=["ID", "t"], inplace=True)
-
-    t_min = lignes["t"].min()
-    t_max = lignes["t"].max()
-    t_vec = np.arange(t_min, t_max, dt)
-
-    for cpt_agent, ID in enumerate(sorted(lignes["ID"].unique())):
-        lignes_loc = lignes[lignes["ID"] == ID].reset_index(drop=True)
-        times = lignes_loc["t"].values
-        xs = lignes_loc["x"].values
-        ys = lignes_loc["y"].values
-
-        out_path = PathCHAOS / f"traj{cpt_agent:03d}.csv"
-        with open(out_path, "w", encoding="utf-8") as monfichier:
-            for t in t_vec:
-                # Find indices before and after t
-                idx_after = np.searchsorted(times, t, side="right")
-                if idx_after == 0 or idx_after == len(times):
-                    # If t is outside the trajectory time range, skip
-                    continue
-                idx_before = idx_after - 1
-
-                t_before = times[idx_before]
-                t_after = times[idx_after]
-                x_before = xs[idx_before]
-                x_after = xs[idx_after]
-                y_before = ys[idx_before]
-                y_after = ys[idx_after]
-
-                # Linear interpolation
-                coef = (t - t_before) / (t_after - t_before)
-                x_interp = (1.0 - coef) * x_before + coef * x_after
-                y_interp = (1.0 - coef) * y_before + coef * y_after
-
-                monfichier.write(f"{t:.3f},{x_interp:.3f},{y_interp:.3f},0.0\n")
+    export_trajectories_to_CHAOS(lignes, PathCHAOS.with_suffix(".zip") if archive else PathCHAOS, dt, workers, archive)
 
     print("\n* Trajectories have been converted to Chaos-compatible files")
@@ -32,8 +32,9 @@ import numpy as np
 import pandas as pd
 import pedpy
 
+import configuration.utils.constants as cst
 from configuration.backup.dict_to_xml_and_reverse import geometry_xml_to_dict
-from configuration.backup.xml_to_Chaos import export_XML_to_CSV
+from configuration.backup.xml_to_Chaos import read_agent_trajectories_from_XML
 from configuration.utils.typing_custom import GeometryDataType
 
 
@@ -106,8 +107,121 @@ def GeometryDict_to_PedPyWalkableArea(geometry_dict: GeometryDataType) -> pedpy.
     return pedpy.WalkableArea(polygon=polygon, obstacles=obstacles or None)
 
 
+def resample_trajectories_to_frames(trajectories: pd.DataFrame) -> tuple[pd.DataFrame, float]:
+    """
+    Resample the trajectories of all pedestrians on a common grid of frames, in a single vectorized pass.
+
+    The frames are separated by the smallest time step between two samples of the same pedestrian, and the first frame is
+    the first time of the trajectories. The positions are linearly interpolated in time between the samples, and kept
+    constant before the first sample and after the last sample of each pedestrian. The pedestrians with a single sample
+    are dropped.
+
+    Parameters
+    ----------
+    trajectories : pd.DataFrame
+        Table of the trajectories, with columns t (s), ID, x (m) and y (m), such as the output of
+        `read_agent_trajectories_from_XML`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Table with columns id, frame, x and y, with one row per pedestrian and per frame, sorted by pedestrian and frame.
+    float
+        The time between two frames (s).
+
+    Raises
+    ------
+    ValueError
+        If the table has no usable rows, if two samples of a pedestrian share the same time, or if no pedestrian has at
+        least two samples.
+    """
+    df = trajectories[["t", "ID", "x", "y"]].dropna()
+    if df.empty:
+        raise ValueError("No usable rows found in the trajectories.")
+
+    # Normalize types + ordering
+    df = df.assign(
+        ID=df["ID"].astype(int, errors="ignore"),
+        t=pd.to_numeric(df["t"], errors="raise"),
+        x=pd.to_numeric(df["x"], errors="raise"),
+        y=pd.to_numeric(df["y"], errors="raise"),
+    ).sort_values(["ID", "t"], kind="stable")
+    ids = df["ID"].to_numpy()
+    times = df["t"].to_numpy(dtype=float)
+    xs = df["x"].to_numpy(dtype=float)
+    ys = df["y"].to_numpy(dtype=float)
+
+    # Samples of each pedestrian: starts[p] to starts[p + 1]. The pedestrians with a single sample are dropped.
+    new_ped = np.ones(len(ids), dtype=bool)
+    new_ped[1:] = ids[1:] != ids[:-1]
+    starts = np.append(np.flatnonzero(new_ped), len(ids))
+    nb_samples = np.diff(starts)
+    kept = nb_samples >= 2
+    if not kept.any():
+        raise ValueError("No usable pedestrian trajectories found (all too short/empty).")
+    ped_ids = ids[starts[:-1]][kept]
+
+    t0 = float(times.min())
+    duration = float(times.max()) - t0
+    dt = float(np.diff(times)[~new_ped[1:]].min())
+    if dt <= 0:
+        raise ValueError("Non-positive time differences found; cannot determine frame rate.")
+    if dt < 1e-4:
+        logging.warning(f"Very small time step detected ({dt:.2e}s); capping at 0.1s to avoid excessive frame rates.")
+        dt = 0.1
+    n_frames = int(np.floor(duration / dt)) + 1
+
+    kept_samples = np.repeat(kept, nb_samples)
+    times, xs, ys = times[kept_samples], xs[kept_samples], ys[kept_samples]
+    nb_samples = nb_samples[kept]
+    starts = np.append(0, np.cumsum(nb_samples))
+    nb_peds = len(nb_samples)
+
+    # Times in frames, shifted by pedestrian so that a single sorted search finds the samples around each frame
+    shift = n_frames + 2.0
+    sample_frames = (times - t0) / dt
+    grid = np.arange(n_frames, dtype=float)
+    ped_shifts = shift * np.arange(nb_peds, dtype=float)[:, None]
+    after = np.searchsorted(sample_frames + np.repeat(ped_shifts[:, 0], nb_samples), grid + ped_shifts, side="right")
+    np.clip(after, (starts[:-1] + 1)[:, None], (starts[1:] - 1)[:, None], out=after)
+    after = after.ravel()
+    before = after - 1
+    weight = (np.tile(grid, nb_peds) - sample_frames[before]) / (sample_frames[after] - sample_frames[before])
+    np.clip(weight, 0.0, 1.0, out=weight)
+
+    data = pd.DataFrame(
+        {
+            "id": np.repeat(ped_ids, n_frames),
+            "frame": np.tile(np.arange(n_frames, dtype=int), nb_peds),
+            "x": (1.0 - weight) * xs[before] + weight * xs[after],
+            "y": (1.0 - weight) * ys[before] + weight * ys[after],
+        }
+    )
+    return data, dt
+
+
+def trajectories_to_PedPy(trajectories: pd.DataFrame) -> pedpy.TrajectoryData:
+    """
+    Convert a table of trajectories to a TrajectoryData object used in PedPy Python library, without any intermediate file.
+
+    Parameters
+    ----------
+    trajectories : pd.DataFrame
+        Table of the trajectories, with columns t (s), ID, x (m) and y (m), such as the output of
+        `read_agent_trajectories_from_XML`.
+
+    Returns
+    -------
+    TrajectoryData
+        PedPy trajectory data with columns ["id", "frame", "x", "y"] and frame_rate = 1/dt, where the positions are
+        resampled as in `resample_trajectories_to_frames`.
+    """
+    data, dt = resample_trajectories_to_frames(trajectories)
+    return pedpy.TrajectoryData(data=data, frame_rate=1.0 / dt)
+
+
 def export_XML_to_PedPy(
-    PathAgentDynamicsXML: Path, PathGeometryXMLfile: Path, PathCSVfile: Path | None = None
+    PathAgentDynamicsXML: Path, PathGeometryXMLfile: Path, PathCSVfile: Path | None = None, workers: int = cst.DEFAULT_NB_WORKERS
 ) -> tuple[pedpy.TrajectoryData, pedpy.WalkableArea]:
     """
     Export trajectories from the AgentDynamics XML files to a TrajectoryData and WalkableArea objects used in PedPy Python library.
@@ -119,7 +233,10 @@ def export_XML_to_PedPy(
     PathGeometryXMLfile : Path
         Path to the XML file containing geometry information.
     PathCSVfile : Path | None
-        Optional path for the intermediate CSV. If None, uses xml_path.with_suffix(".csv").
+        Optional path to a CSV file of the trajectories, written beforehand by `export_XML_to_CSV`, which is read instead of
+        the AgentDynamics XML files. If None, the XML files are parsed directly, without any intermediate file.
+    workers : int
+        Number of worker processes used to parse the XML files.
 
     Returns
     -------
@@ -129,7 +246,6 @@ def export_XML_to_PedPy(
     Notes
     -----
     Assumes XML files are named with the pattern 'AgentDyn...input t=<time>.xml'.
-    The AgentDynamics XML files are first converted into a single CSV file and then converted into a TrajectoryData object.
     Expected CSV columns: t, ID, x, y.
     """
     if not PathAgentDynamicsXML.is_dir():
@@ -145,76 +261,11 @@ def export_XML_to_PedPy(
         raise ValueError("PathCSV must have a .csv extension if provided.")
 
     if PathCSVfile is None:
-        PathCSVfile = PathAgentDynamicsXML.with_suffix(".csv")
-        logging.info(f"No CSV path provided; using {PathCSVfile} as intermediate file.")
-        export_XML_to_CSV(PathCSVfile, PathAgentDynamicsXML)
-
-    df = pd.read_csv(PathCSVfile, usecols=["t", "ID", "x", "y"]).dropna()
-    if df.empty:
-        raise ValueError(f"No usable rows found in CSV: {PathCSVfile}")
-
-    # Normalize types + ordering
-    df["ID"] = df["ID"].astype(int, errors="ignore")
-    df["t"] = pd.to_numeric(df["t"], errors="raise")
-    df["x"] = pd.to_numeric(df["x"], errors="raise")
-    df["y"] = pd.to_numeric(df["y"], errors="raise")
-    df = df.dropna(subset=["t", "ID", "x", "y"]).sort_values(["ID", "t"])
-
-    t0 = float(df["t"].min())
-    t1 = float(df["t"].max())
-    duration = t1 - t0
-    if duration < 0:
-        raise ValueError("Invalid time range (tmax < tmin).")
-
-    dt = df.groupby("ID")["t"].diff().min().min()
-    if dt <= 0:
-        raise ValueError("Non-positive time differences found; cannot determine frame rate.")
-    if dt < 1e-4:
-        logging.warning(f"Very small time step detected ({dt:.2e}s); capping at 0.1s to avoid excessive frame rates.")
-        dt = 0.1
-
-    n_frames = int(np.floor(duration / dt)) + 1
-    grid = pd.to_timedelta(np.arange(n_frames) * dt, unit="s")  # TimedeltaIndex starting at 0
-
-    per_ped_dfs: list[pd.DataFrame] = []
-    for ped_id, g in df.groupby("ID", sort=False):
-        g = g.sort_values("t")
-        if len(g) < 2:
-            continue
-
-        # Make a time index relative to the global start so everyone shares frame=0
-        td = pd.to_timedelta(g["t"].to_numpy(dtype=float) - t0, unit="s")
-
-        # Create a DataFrame with x,y indexed by the relative time
-        ts = g[["x", "y"]].copy()
-        ts.index = td
-
-        # If duplicate timestamps exist, keep last sample
-        if ts.index.duplicated().any():
-            logging.warning(f"Duplicate timestamps for ped {ped_id}; keeping last.")
-            ts = ts[~ts.index.duplicated(keep="last")]
-
-        # Align to global grid and interpolate in time; then fill ends
-        ts = ts.reindex(grid).interpolate(method="time").ffill().bfill()
-
-        per_ped_dfs.append(
-            pd.DataFrame(
-                {
-                    "id": np.full(len(grid), ped_id),
-                    "frame": np.arange(len(grid), dtype=int),
-                    "x": ts["x"].to_numpy(),
-                    "y": ts["y"].to_numpy(),
-                }
-            )
-        )
-
-    if not per_ped_dfs:
-        raise ValueError("No usable pedestrian trajectories found (all too short/empty).")
-
-    data = pd.concat(per_ped_dfs, ignore_index=True)
-    frame_rate = 1.0 / dt
+        trajectories = read_agent_trajectories_from_XML(PathAgentDynamicsXML, workers)
+    else:
+        trajectories = pd.read_csv(PathCSVfile, usecols=["t", "ID", "x", "y"])
 
-    traj = pedpy.TrajectoryData(data=data, frame_rate=frame_rate)
+    traj = trajectories_to_PedPy(trajectories)
 
     with open(PathGeometryXMLfile, encoding="utf-8") as f:
         geometry_xml = f.read()
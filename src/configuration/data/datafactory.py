@@ -31,10 +31,13 @@ from typing import get_args
 
 import numpy as np
 import pandas as pd
+from scipy.interpolate import griddata
+from shapely.affinity import scale
 from shapely.geometry import MultiPolygon
 
 import configuration.utils.constants as cst
 import configuration.utils.functions as fun
+from configuration.models.shapes3D import Shapes3D
 from configuration.utils.typing_custom import Sex
 
 
@@ -143,6 +146,7 @@ def prepare_data() -> None:
     1. Prepares anthropometric data by calling `prepare_anthropometric_data()`.
     2. Prepares bike data by calling `prepare_bike_data()`.
     3. Prepares 3D body data by calling `prepare_3D_body_data()`.
+    4. Prepares the lookup table of the 3D scaling factors by calling `prepare_3D_scaling_table()`.
     """
     data_dir_path = Path(__file__).parent.parent.parent.parent.absolute() / "data"
     if (
@@ -156,7 +160,13 @@ def prepare_data() -> None:
         prepare_bike_data(data_dir_path)
         logging.info("Preparing 3D body data...")
         prepare_3D_body_data(data_dir_path)
+        fun.clear_data_cache()
         logging.info("Data prepared successfully")
+    if not (data_dir_path / "pkl" / "pedestrian3D_scaling_table.pkl").exists():
+        logging.info("Preparing the lookup table of the 3D scaling factors...")
+        prepare_3D_scaling_table(data_dir_path)
+        fun.clear_data_cache()
+        logging.info("Lookup table prepared successfully")
 
 
 def prepare_3D_body_data(data_dir_path: Path) -> None:
@@ -206,3 +216,83 @@ def prepare_3D_body_data(data_dir_path: Path) -> None:
 
         output_path = data_dir_path / "pkl" / f"{sex.name}_3dBody_light.pkl"
         fun.save_pickle(filtered_shapes3D, output_path)
+
+
+def prepare_3D_scaling_table(data_dir_path: Path) -> None:
+    """
+    Build the lookup table mapping target (chest depth, bideltoid breadth) to the scaling factors of the 3D pedestrian.
+
+    For each sex (male/female):
+
+    1. Loads the simplified 3D body from <sex>_3dBody_light.pkl and extracts its reference MultiPolygon (torso slice)
+    2. Scales the reference MultiPolygon on a regular grid of (x, y) scaling factors and measures its chest depth
+       and bideltoid breadth
+    3. Inverts this mapping by linear interpolation onto a regular grid of target chest depths and bideltoid breadths
+
+    The tables of both sexes are saved together in pedestrian3D_scaling_table.pkl. Grid nodes that cannot be
+    reached by the sampled scaling factors are stored as NaN.
+
+    Parameters
+    ----------
+    data_dir_path : Path
+        Path to root directory containing the "pkl" subdirectory with the <sex>_3dBody_light.pkl files.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the simplified 3D body pickle file for a sex is missing.
+    """
+    lowest_factor, highest_factor = cst.SCALING_TABLE_FACTOR_RANGE
+    scale_factors = np.linspace(float(lowest_factor), float(highest_factor), num=cst.SCALING_TABLE_NB_FACTORS)
+    chest_depths = np.arange(
+        cst.SCALING_TABLE_CHEST_DEPTH_RANGE[0], cst.SCALING_TABLE_CHEST_DEPTH_RANGE[1] + cst.SCALING_TABLE_STEP, cst.SCALING_TABLE_STEP
+    )
+    bideltoid_breadths = np.arange(
+        cst.SCALING_TABLE_BIDELTOID_BREADTH_RANGE[0],
+        cst.SCALING_TABLE_BIDELTOID_BREADTH_RANGE[1] + cst.SCALING_TABLE_STEP,
+        cst.SCALING_TABLE_STEP,
+    )
+    target_chest_depths, target_bideltoid_breadths = np.meshgrid(chest_depths, bideltoid_breadths, indexing="ij")
+
+    scaling_table: dict[str, dict[str, np.ndarray]] = {}
+    for sex in cst.Sex:
+        pickle_path = data_dir_path / "pkl" / f"{sex.name}_3dBody_light.pkl"
+        if not pickle_path.exists():
+            raise FileNotFoundError(f"Pickle file not found: {pickle_path}")
+        shapes3D: dict[float, MultiPolygon] = fun.load_pickle(str(pickle_path))
+        reference_multipolygon = Shapes3D(agent_type=cst.AgentTypes.pedestrian, shapes=shapes3D).get_reference_multipolygon()
+        homothety_center = reference_multipolygon.centroid
+
+        # Measure the scaled reference MultiPolygon for each pair of scaling factors, all at once
+        scaled_multipolygons = [
+            scale(reference_multipolygon, xfact=scale_factor_x, yfact=scale_factor_y, origin=homothety_center)
+            for scale_factor_x in scale_factors
+            for scale_factor_y in scale_factors
+        ]
+        sampled_shape = (len(scale_factors), len(scale_factors))
+        sampled_chest_depths = fun.compute_chest_depths_from_multipolygons(scaled_multipolygons).reshape(sampled_shape)
+        sampled_bideltoid_breadths = fun.compute_bideltoid_breadths_from_multipolygons(scaled_multipolygons).reshape(sampled_shape)
+
+        # Invert the sampled mapping onto the regular grid of target measures
+        sampled_scale_factors_x, sampled_scale_factors_y = np.meshgrid(scale_factors, scale_factors, indexing="ij")
+        sampled_measures = np.column_stack((sampled_chest_depths.ravel(), sampled_bideltoid_breadths.ravel()))
+        scaling_table[sex.name] = {
+            cst.PedestrianParts.chest_depth.name: chest_depths,
+            cst.PedestrianParts.bideltoid_breadth.name: bideltoid_breadths,
+            "scale_factor_x": griddata(
+                sampled_measures, sampled_scale_factors_x.ravel(), (target_chest_depths, target_bideltoid_breadths), method="linear"
+            ),
+            "scale_factor_y": griddata(
+                sampled_measures, sampled_scale_factors_y.ravel(), (target_chest_depths, target_bideltoid_breadths), method="linear"
+            ),
+        }
+
+    fun.save_pickle(scaling_table, data_dir_path / "pkl" / "pedestrian3D_scaling_table.pkl")
+
+
+if __name__ == "__main__":
+    # Regenerate the lookup table of the 3D scaling factors, e.g. after updating the 3D body templates
+    logging.basicConfig(level=logging.INFO)
+    logging.info("Preparing the lookup table of the 3D scaling factors...")
+    prepare_3D_scaling_table(Path(__file__).parent.parent.parent.parent.absolute() / "data")
+    logging.info("Lookup table prepared successfully")
@@ -0,0 +1 @@
+"""Mechanics subpackage offers a Python interface to the CrowdMechanics shared library that simulates the mechanical layer."""
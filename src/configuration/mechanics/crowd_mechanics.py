@@ -0,0 +1,480 @@
+"""Run crowd simulations with the handle-based API of the CrowdMechanics shared library."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import ctypes
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+import numpy as np
+from numpy.typing import NDArray
+
+import configuration.utils.constants as cst
+
+
+def get_default_library_path() -> Path:
+    """
+    Get the path of the CrowdMechanics shared library built in the ``src/mechanical_layer/build`` directory.
+
+    Returns
+    -------
+    Path
+        The path to the shared library, with the extension of the current platform.
+    """
+    extension = ".dylib" if sys.platform == "darwin" else ".so"
+    build_dir = Path(__file__).parent.parent.parent.absolute() / "mechanical_layer" / "build"
+    return build_dir / f"{cst.CROWD_MECHANICS_LIBRARY_NAME}{extension}"
+
+
+@lru_cache(maxsize=4)
+def load_crowd_mechanics_library(library_path: str) -> ctypes.CDLL:
+    """
+    Load the CrowdMechanics shared library and declare the signatures of its handle-based API.
+
+    The library is loaded only once per path and per process, and shared by all the simulations.
+
+    Parameters
+    ----------
+    library_path : str
+        The path to the shared library.
+
+    Returns
+    -------
+    ctypes.CDLL
+        The loaded library.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the shared library does not exist.
+    """
+    if not Path(library_path).is_file():
+        raise FileNotFoundError(f"The CrowdMechanics shared library was not found at {library_path}. Please build it first.")
+    library = ctypes.CDLL(library_path)
+
+    library.CrowdMechanics.argtypes = [ctypes.POINTER(ctypes.c_char_p)]
+    library.CrowdMechanics.restype = ctypes.c_int
+    library.CrowdMechanicsCreate.argtypes = [ctypes.POINTER(ctypes.c_char_p)]
+    library.CrowdMechanicsCreate.restype = ctypes.c_void_p
+    library.CrowdMechanicsStep.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    library.CrowdMechanicsStep.restype = ctypes.c_int
+    library.CrowdMechanicsGetNumberAgents.argtypes = [ctypes.c_void_p]
+    library.CrowdMechanicsGetNumberAgents.restype = ctypes.c_uint32
+    library.CrowdMechanicsGetAgentId.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+    library.CrowdMechanicsGetAgentId.restype = ctypes.c_char_p
+    library.CrowdMechanicsGetKinematics.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_double)]
+    library.CrowdMechanicsGetKinematics.restype = ctypes.c_int
+    library.CrowdMechanicsSetKinematics.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_double)]
+    library.CrowdMechanicsSetKinematics.restype = ctypes.c_int
+    library.CrowdMechanicsSetDrivingForces.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_double)]
+    library.CrowdMechanicsSetDrivingForces.restype = ctypes.c_int
+    library.CrowdMechanicsWriteDynamicsFile.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    library.CrowdMechanicsWriteDynamicsFile.restype = ctypes.c_int
+    library.CrowdMechanicsSetNumberThreads.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+    library.CrowdMechanicsSetNumberThreads.restype = ctypes.c_int
+    library.CrowdMechanicsGetNumberSubSteps.argtypes = [ctypes.c_void_p]
+    library.CrowdMechanicsGetNumberSubSteps.restype = ctypes.c_uint32
+    library.CrowdMechanicsGetNumberContacts.argtypes = [ctypes.c_void_p]
+    library.CrowdMechanicsGetNumberContacts.restype = ctypes.c_uint32
+    library.CrowdMechanicsGetContacts.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_double)]
+    library.CrowdMechanicsGetContacts.restype = ctypes.c_int
+    library.CrowdMechanicsDestroy.argtypes = [ctypes.c_void_p]
+    library.CrowdMechanicsDestroy.restype = None
+    return library
+
+
+class CrowdMechanicsSimulation:
+    """
+    Class representing one independent simulation of the mechanical layer.
+
+    The static XML files (parameters, materials, geometry and agents) and the initial agent dynamics file are read once,
+    when the simulation is created. The simulation is then advanced one decisional time step at a time with :meth:`step`.
+    Several simulations can live in the same process and be stepped concurrently from different threads, as the calls to
+    the shared library release the GIL. A given simulation is only stepped by one thread at a time.
+
+    As the static and dynamic directories given in the parameters file are relative to the current working directory,
+    simulations run concurrently should use absolute directories, and distinct dynamic directories.
+
+    Parameters
+    ----------
+    parameters_file : Path | str
+        Path to the Parameters XML file.
+    materials_file : str
+        Name of the Materials XML file, in the static directory.
+    geometry_file : str
+        Name of the Geometry XML file, in the static directory.
+    agents_file : str
+        Name of the Agents XML file, in the static directory.
+    dynamics_file : str
+        Name of the AgentDynamics XML file holding the initial state of the agents, in the dynamic directory.
+    library_path : Path | str | None
+        Path to the CrowdMechanics shared library. If None, the library built in ``src/mechanical_layer/build`` is used.
+    """
+
+    def __init__(
+        self,
+        parameters_file: Path | str,
+        materials_file: str = "Materials.xml",
+        geometry_file: str = "Geometry.xml",
+        agents_file: str = "Agents.xml",
+        dynamics_file: str = "AgentDynamics.xml",
+        library_path: Path | str | None = None,
+    ) -> None:
+        """
+        Create the simulation by reading the static files and the initial agent dynamics file.
+
+        Parameters
+        ----------
+        parameters_file : Path | str
+            Path to the Parameters XML file.
+        materials_file : str
+            Name of the Materials XML file, in the static directory.
+        geometry_file : str
+            Name of the Geometry XML file, in the static directory.
+        agents_file : str
+            Name of the Agents XML file, in the static directory.
+        dynamics_file : str
+            Name of the AgentDynamics XML file holding the initial state of the agents, in the dynamic directory.
+        library_path : Path | str | None
+            Path to the CrowdMechanics shared library. If None, the library built in ``src/mechanical_layer/build`` is used.
+
+        Raises
+        ------
+        RuntimeError
+            If the shared library could not create the simulation from the given files.
+        """
+        if library_path is None:
+            library_path = get_default_library_path()
+        self._library = load_crowd_mechanics_library(str(library_path))
+        self._lock = threading.Lock()
+        self._handle: int | None = None
+
+        files = [str(parameters_file), materials_file, geometry_file, agents_file, dynamics_file]
+        files_input = (ctypes.c_char_p * len(files))(*[file.encode("utf-8") for file in files])
+        handle = self._library.CrowdMechanicsCreate(files_input)
+        if not handle:
+            raise RuntimeError(f"The CrowdMechanics library could not create a simulation from {parameters_file}.")
+        self._handle = handle
+        self._number_agents = int(self._library.CrowdMechanicsGetNumberAgents(handle))
+        self._agent_ids = [self._library.CrowdMechanicsGetAgentId(handle, a).decode("utf-8") for a in range(self._number_agents)]
+
+    def __enter__(self) -> Self:
+        """
+        Enter the runtime context of the simulation.
+
+        Returns
+        -------
+        Self
+            The simulation itself.
+        """
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        """
+        Release the simulation when leaving the runtime context.
+
+        Parameters
+        ----------
+        exc_type : type[BaseException] | None
+            The type of the exception raised in the context, if any.
+        exc_value : BaseException | None
+            The exception raised in the context, if any.
+        traceback : TracebackType | None
+            The traceback of the exception raised in the context, if any.
+        """
+        self.close()
+
+    def __del__(self) -> None:
+        """Release the simulation when the object is garbage collected."""
+        if getattr(self, "_handle", None) is not None:
+            self.close()
+
+    @property
+    def number_agents(self) -> int:
+        """
+        Get the number of agents of the simulation.
+
+        Returns
+        -------
+        int
+            The number of agents.
+        """
+        return self._number_agents
+
+    @property
+    def agent_ids(self) -> list[str]:
+        """
+        Get the ids of the agents, in the order of the Agents file.
+
+        Returns
+        -------
+        list[str]
+            The user-given ids of the agents.
+        """
+        return list(self._agent_ids)
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the simulation has been released.
+
+        Returns
+        -------
+        bool
+            True if the simulation has been released, False otherwise.
+        """
+        return self._handle is None
+
+    @property
+    def number_sub_steps(self) -> int:
+        """
+        Get the number of sub-steps taken by the mechanical layer during the last decisional time step.
+
+        It is ``TimeStep / TimeStepMechanical`` with a fixed mechanical time step, fewer when the ``AdaptiveTimeStep``
+        attribute of the ``Mechanics`` tag of the parameters file is true, and 0 if no agent was mechanically active.
+
+        Returns
+        -------
+        int
+            The number of sub-steps.
+        """
+        with self._lock:
+            return int(self._library.CrowdMechanicsGetNumberSubSteps(self._get_handle()))
+
+    def _get_handle(self) -> int:
+        """
+        Get the handle of the simulation in the shared library.
+
+        Returns
+        -------
+        int
+            The handle of the simulation.
+
+        Raises
+        ------
+        ValueError
+            If the simulation has already been released.
+        """
+        if self._handle is None:
+            raise ValueError("The simulation has already been closed.")
+        return self._handle
+
+    def step(self, dynamics_file: str | None = None) -> None:
+        """
+        Advance the simulation by one decisional time step.
+
+        Parameters
+        ----------
+        dynamics_file : str | None
+            Name of an AgentDynamics XML file in the dynamic directory. The kinematics, driving forces and torques it holds
+            are loaded before the step, and the file is overwritten with the new kinematics of the agents afterwards.
+            If None, the simulation goes on from its in-memory state, which :meth:`set_kinematics` and
+            :meth:`set_driving_forces` can update between steps without any file.
+
+        Raises
+        ------
+        RuntimeError
+            If the shared library failed to advance the simulation.
+        """
+        encoded_file = None if dynamics_file is None else dynamics_file.encode("utf-8")
+        with self._lock:
+            if self._library.CrowdMechanicsStep(self._get_handle(), encoded_file) != 0:
+                raise RuntimeError("The CrowdMechanics library failed to advance the simulation.")
+
+    def get_kinematics(self) -> NDArray[np.float64]:
+        """
+        Get the current kinematics of all agents.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Array of shape (number of agents, 6) whose rows follow the order of the Agents file and whose columns are
+            given by ``MECHANICS_KINEMATICS_COLUMNS``: x (m), y (m), theta (rad), vx (m/s), vy (m/s), omega (rad/s).
+
+        Raises
+        ------
+        RuntimeError
+            If the shared library failed to copy the kinematics.
+        """
+        kinematics = np.empty((self._number_agents, len(cst.MECHANICS_KINEMATICS_COLUMNS)), dtype=np.float64)
+        kinematics_pointer = kinematics.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        with self._lock:
+            if self._library.CrowdMechanicsGetKinematics(self._get_handle(), kinematics_pointer) != 0:
+                raise RuntimeError("The CrowdMechanics library failed to copy the kinematics of the agents.")
+        return kinematics
+
+    def get_contacts(self) -> NDArray[np.float64]:
+        """
+        Get the contacts of the agents at the end of the last decisional time step.
+
+        The contacts between two agents are given once, by the agent of lower index, as in the AgentInteractions file.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Array of shape (number of contacts, 12) whose columns are given by ``MECHANICS_CONTACTS_COLUMNS``: the agent
+            (index in the Agents file) and its shape, the neighbouring agent and its shape (-1 for a wall), the obstacle
+            and its wall (-1 for an agent), the normal force (N), the tangential force (N) and the tangential relative
+            displacement (m) along x and y.
+
+        Raises
+        ------
+        RuntimeError
+            If the shared library failed to copy the contacts.
+        """
+        with self._lock:
+            handle = self._get_handle()
+            contacts = np.empty((self._library.CrowdMechanicsGetNumberContacts(handle), len(cst.MECHANICS_CONTACTS_COLUMNS)))
+            if self._library.CrowdMechanicsGetContacts(handle, contacts.ctypes.data_as(ctypes.POINTER(ctypes.c_double))) != 0:
+                raise RuntimeError("The CrowdMechanics library failed to copy the contacts of the agents.")
+        return contacts
+
+    def _as_agent_array(self, values: NDArray[np.float64], columns: tuple[str, ...], name: str) -> NDArray[np.float64]:
+        """
+        Convert per-agent values to the contiguous array of doubles expected by the shared library.
+
+        Parameters
+        ----------
+        values : NDArray[np.float64]
+            The values, with one row per agent (in the order of the Agents file) and one column per quantity.
+        columns : tuple[str, ...]
+            The names of the expected quantities.
+        name : str
+            The name of the values, for the error message.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            A C-contiguous float64 array of shape (number of agents, number of columns).
+
+        Raises
+        ------
+        ValueError
+            If the values do not have the expected shape.
+        """
+        array = np.ascontiguousarray(values, dtype=np.float64)
+        if array.shape != (self._number_agents, len(columns)):
+            raise ValueError(
+                f"'{name}' should have shape ({self._number_agents}, {len(columns)}) with columns {columns}, got {array.shape}."
+            )
+        return array
+
+    def set_kinematics(self, kinematics: NDArray[np.float64]) -> None:
+        """
+        Overwrite the kinematics of all agents.
+
+        Parameters
+        ----------
+        kinematics : NDArray[np.float64]
+            Array of shape (number of agents, 6), laid out as the output of :meth:`get_kinematics`.
+
+        Raises
+        ------
+        RuntimeError
+            If the shared library failed to set the kinematics.
+        """
+        array = self._as_agent_array(kinematics, cst.MECHANICS_KINEMATICS_COLUMNS, "kinematics")
+        array_pointer = array.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        with self._lock:
+            if self._library.CrowdMechanicsSetKinematics(self._get_handle(), array_pointer) != 0:
+                raise RuntimeError("The CrowdMechanics library failed to set the kinematics of the agents.")
+
+    def set_driving_forces(self, driving_forces: NDArray[np.float64]) -> None:
+        """
+        Set the driving forces and torques of all agents, used by the following calls to :meth:`step`.
+
+        Parameters
+        ----------
+        driving_forces : NDArray[np.float64]
+            Array of shape (number of agents, 3) whose rows follow the order of the Agents file and whose columns are
+            given by ``MECHANICS_DRIVING_FORCES_COLUMNS``: the driving force along x and y (N) and the driving torque (N.m).
+
+        Raises
+        ------
+        RuntimeError
+            If the shared library failed to set the driving forces and torques.
+        """
+        array = self._as_agent_array(driving_forces, cst.MECHANICS_DRIVING_FORCES_COLUMNS, "driving_forces")
+        array_pointer = array.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        with self._lock:
+            if self._library.CrowdMechanicsSetDrivingForces(self._get_handle(), array_pointer) != 0:
+                raise RuntimeError("The CrowdMechanics library failed to set the driving forces and torques of the agents.")
+
+    def write_dynamics_file(self, dynamics_file: Path | str) -> None:
+        """
+        Dump the current kinematics, driving forces and torques of all agents to an AgentDynamics XML file.
+
+        The file can be read back as the input of a later step, or archived for analysis.
+
+        Parameters
+        ----------
+        dynamics_file : Path | str
+            Path of the file to write (it is not relative to the dynamic directory).
+
+        Raises
+        ------
+        RuntimeError
+            If the shared library failed to write the file.
+        """
+        with self._lock:
+            if self._library.CrowdMechanicsWriteDynamicsFile(self._get_handle(), str(dynamics_file).encode("utf-8")) != 0:
+                raise RuntimeError(f"The CrowdMechanics library failed to write the dynamics file {dynamics_file}.")
+
+    def set_number_threads(self, number_threads: int) -> None:
+        """
+        Set the number of threads computing the contact forces in the mechanical layer, for the following calls to :meth:`step`.
+
+        It overrides the ``Threads`` attribute of the ``Mechanics`` tag of the parameters file. The results do not depend on
+        the number of threads, which is only used if the shared library was built with OpenMP.
+
+        Parameters
+        ----------
+        number_threads : int
+            The number of threads, at least 1.
+
+        Raises
+        ------
+        ValueError
+            If the number of threads is not a positive integer.
+        RuntimeError
+            If the shared library failed to set the number of threads.
+        """
+        if not isinstance(number_threads, int) or number_threads < 1:
+            raise ValueError(f"'number_threads' should be a positive integer, got {number_threads}.")
+        with self._lock:
+            if self._library.CrowdMechanicsSetNumberThreads(self._get_handle(), number_threads) != 0:
+                raise RuntimeError("The CrowdMechanics library failed to set the number of threads.")
+
+    def close(self) -> None:
+        """Release the simulation in the shared library. Calling it several times has no effect."""
+        with self._lock:
+            if self._handle is not None:
+                self._library.CrowdMechanicsDestroy(self._handle)
+                self._handle = None
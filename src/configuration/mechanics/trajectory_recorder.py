@@ -0,0 +1,577 @@
+"""Record the trajectories of the agents of a mechanical layer simulation in a single chunked binary file, and read them back."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+import numpy as np
+from numpy.typing import NDArray
+
+import configuration.utils.constants as cst
+from configuration.mechanics.crowd_mechanics import CrowdMechanicsSimulation
+
+#: Member of a trajectory file holding the ids of the agents.
+AGENT_IDS_MEMBER = "agent_ids.npy"
+
+
+def _chunk_member(chunk: int, quantity: str) -> str:
+    """
+    Get the name of the member of a trajectory file holding one quantity of one chunk.
+
+    Parameters
+    ----------
+    chunk : int
+        The index of the chunk.
+    quantity : str
+        The quantity: ``times``, ``kinematics``, ``contacts`` or ``contact_offsets``.
+
+    Returns
+    -------
+    str
+        The name of the member.
+    """
+    return f"chunk_{chunk:06d}_{quantity}.npy"
+
+
+def _write_member(archive: zipfile.ZipFile, name: str, array: NDArray[np.generic]) -> None:
+    """
+    Write an array to a member of a trajectory file, in the NPY format.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        The trajectory file, opened for writing or appending.
+    name : str
+        The name of the member.
+    array : NDArray[np.generic]
+        The array to write.
+    """
+    with archive.open(name, "w", force_zip64=True) as member:
+        np.lib.format.write_array(member, np.asanyarray(array), allow_pickle=False)
+
+
+def _read_member(archive: zipfile.ZipFile, name: str) -> NDArray[np.generic]:
+    """
+    Read the array stored in a member of a trajectory file.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        The trajectory file, opened for reading.
+    name : str
+        The name of the member.
+
+    Returns
+    -------
+    NDArray[np.generic]
+        The array stored in the member.
+    """
+    with archive.open(name) as member:
+        array: NDArray[np.generic] = np.lib.format.read_array(member, allow_pickle=False)
+    return array
+
+
+class TrajectoryRecorder:
+    """
+    Class streaming the states of the agents, and optionally their contacts, to a single trajectory file.
+
+    The frames are buffered in memory and appended to the file by chunks of ``frames_per_chunk`` frames. The file is a ZIP
+    archive of NPY arrays, which ``numpy.load`` can also open: each chunk holds the times of its frames
+    (``chunk_XXXXXX_times``), the kinematics of all agents as fixed-width records of shape (frames, agents, 6)
+    (``chunk_XXXXXX_kinematics``) and, if the contacts are recorded, the contacts of all its frames (``chunk_XXXXXX_contacts``,
+    laid out as ``MECHANICS_CONTACTS_COLUMNS``) with the index of the first contact of each frame
+    (``chunk_XXXXXX_contact_offsets``). The file is valid after each chunk, so that an interrupted run keeps the chunks
+    already written. Use :class:`TrajectoryReader` to read it back.
+
+    Parameters
+    ----------
+    trajectory_file : Path | str
+        Path of the trajectory file.
+    agent_ids : list[str]
+        The ids of the agents, in the order of the rows of the kinematics.
+    record_contacts : bool
+        Whether the contacts are recorded with the kinematics.
+    frames_per_chunk : int
+        Number of frames buffered before they are appended to the file.
+    compress : bool
+        Whether the chunks are compressed (deflate). Uncompressed chunks are larger, but faster to write and read.
+    append : bool
+        If True and the file exists, the frames are appended to the ones it already holds. Otherwise, the file is overwritten.
+    """
+
+    def __init__(
+        self,
+        trajectory_file: Path | str,
+        agent_ids: list[str],
+        record_contacts: bool = False,
+        frames_per_chunk: int = cst.TRAJECTORY_FRAMES_PER_CHUNK,
+        compress: bool = True,
+        append: bool = False,
+    ) -> None:
+        """
+        Create the trajectory file, or open it to append frames to it.
+
+        Parameters
+        ----------
+        trajectory_file : Path | str
+            Path of the trajectory file.
+        agent_ids : list[str]
+            The ids of the agents, in the order of the rows of the kinematics.
+        record_contacts : bool
+            Whether the contacts are recorded with the kinematics.
+        frames_per_chunk : int
+            Number of frames buffered before they are appended to the file.
+        compress : bool
+            Whether the chunks are compressed (deflate). Uncompressed chunks are larger, but faster to write and read.
+        append : bool
+            If True and the file exists, the frames are appended to the ones it already holds. Otherwise, the file is
+            overwritten.
+
+        Raises
+        ------
+        ValueError
+            If the number of frames per chunk is not a positive integer, or if the file to append to holds other agents,
+            or records the contacts differently.
+        """
+        if not isinstance(frames_per_chunk, int) or frames_per_chunk < 1:
+            raise ValueError(f"'frames_per_chunk' should be a positive integer, got {frames_per_chunk}.")
+        self._path = Path(trajectory_file)
+        self._agent_ids = list(agent_ids)
+        self._record_contacts = record_contacts
+        self._frames_per_chunk = frames_per_chunk
+        self._compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._times: list[float] = []
+        self._kinematics: list[NDArray[np.float64]] = []
+        self._contacts: list[NDArray[np.float64]] = []
+        self._closed = False
+
+        if append and self._path.is_file():
+            with TrajectoryReader(self._path) as reader:
+                if reader.agent_ids != self._agent_ids:
+                    raise ValueError(f"The trajectory file {self._path} holds other agents than the ones to record.")
+                if reader.number_frames > 0 and reader.has_contacts != record_contacts:
+                    raise ValueError(f"The trajectory file {self._path} does not record the contacts as requested.")
+                self._number_chunks = reader.number_chunks
+                self._number_frames = reader.number_frames
+                self._last_time = float(reader.times[-1]) if reader.number_frames > 0 else -np.inf
+        else:
+            with zipfile.ZipFile(self._path, "w", compression=self._compression) as archive:
+                _write_member(archive, AGENT_IDS_MEMBER, np.array(self._agent_ids, dtype=str))
+            self._number_chunks = 0
+            self._number_frames = 0
+            self._last_time = -np.inf
+
+    def __enter__(self) -> Self:
+        """
+        Enter the runtime context of the recorder.
+
+        Returns
+        -------
+        Self
+            The recorder itself.
+        """
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        """
+        Write the buffered frames and close the recorder when leaving the runtime context.
+
+        Parameters
+        ----------
+        exc_type : type[BaseException] | None
+            The type of the exception raised in the context, if any.
+        exc_value : BaseException | None
+            The exception raised in the context, if any.
+        traceback : TracebackType | None
+            The traceback of the exception raised in the context, if any.
+        """
+        self.close()
+
+    @property
+    def number_frames(self) -> int:
+        """
+        Get the number of frames recorded, including the ones not written to the file yet.
+
+        Returns
+        -------
+        int
+            The number of frames.
+        """
+        return self._number_frames + len(self._times)
+
+    def record(self, time: float, kinematics: NDArray[np.float64], contacts: NDArray[np.float64] | None = None) -> None:
+        """
+        Record the state of the agents at a given time.
+
+        Parameters
+        ----------
+        time : float
+            The time of the frame (s). It should be larger than the time of the previous frame.
+        kinematics : NDArray[np.float64]
+            Array of shape (number of agents, 6), laid out as ``MECHANICS_KINEMATICS_COLUMNS``.
+        contacts : NDArray[np.float64] | None
+            Array of shape (number of contacts, 12), laid out as ``MECHANICS_CONTACTS_COLUMNS``. It is required if the
+            contacts are recorded, and ignored otherwise.
+
+        Raises
+        ------
+        ValueError
+            If the recorder is closed, if the time does not increase, or if the arrays do not have the expected shapes.
+        """
+        if self._closed:
+            raise ValueError("The trajectory recorder has already been closed.")
+        if not time > self._last_time:
+            raise ValueError(f"The times of the frames should increase, got {time} after {self._last_time}.")
+        kinematics_array = np.array(kinematics, dtype=np.float64)
+        expected_shape = (len(self._agent_ids), len(cst.MECHANICS_KINEMATICS_COLUMNS))
+        if kinematics_array.shape != expected_shape:
+            raise ValueError(f"'kinematics' should have shape {expected_shape}, got {kinematics_array.shape}.")
+        if self._record_contacts:
+            if contacts is None:
+                raise ValueError("'contacts' should be given, as the recorder records the contacts.")
+            contacts_array = np.array(contacts, dtype=np.float64).reshape(-1, len(cst.MECHANICS_CONTACTS_COLUMNS))
+            self._contacts.append(contacts_array)
+
+        self._times.append(float(time))
+        self._kinematics.append(kinematics_array)
+        self._last_time = float(time)
+        if len(self._times) >= self._frames_per_chunk:
+            self.flush()
+
+    def record_simulation(self, simulation: CrowdMechanicsSimulation, time: float) -> None:
+        """
+        Record the current state of the agents of a simulation, and their contacts if they are recorded.
+
+        Parameters
+        ----------
+        simulation : CrowdMechanicsSimulation
+            The simulation, whose agents should be the ones of the recorder.
+        time : float
+            The time of the frame (s). It should be larger than the time of the previous frame.
+        """
+        contacts = simulation.get_contacts() if self._record_contacts else None
+        self.record(time, simulation.get_kinematics(), contacts)
+
+    def flush(self) -> None:
+        """Append the buffered frames to the file, as a new chunk."""
+        if not self._times:
+            return
+        with zipfile.ZipFile(self._path, "a", compression=self._compression) as archive:
+            _write_member(archive, _chunk_member(self._number_chunks, "times"), np.array(self._times))
+            _write_member(archive, _chunk_member(self._number_chunks, "kinematics"), np.stack(self._kinematics))
+            if self._record_contacts:
+                offsets = np.zeros(len(self._contacts) + 1, dtype=np.int64)
+                np.cumsum([len(contacts) for contacts in self._contacts], out=offsets[1:])
+                _write_member(archive, _chunk_member(self._number_chunks, "contacts"), np.concatenate(self._contacts))
+                _write_member(archive, _chunk_member(self._number_chunks, "contact_offsets"), offsets)
+        self._number_chunks += 1
+        self._number_frames += len(self._times)
+        self._times.clear()
+        self._kinematics.clear()
+        self._contacts.clear()
+
+    def close(self) -> None:
+        """Write the buffered frames and close the recorder. Calling it several times has no effect."""
+        if not self._closed:
+            self.flush()
+            self._closed = True
+
+
+class TrajectoryReader:
+    """
+    Class giving random access to the frames of a trajectory file written by :class:`TrajectoryRecorder`.
+
+    Only the times of the frames are read when the file is opened. The other quantities are read one chunk at a time, and the
+    last chunk read is kept in memory, so that reading the frames in order decompresses each chunk once.
+
+    Parameters
+    ----------
+    trajectory_file : Path | str
+        Path of the trajectory file.
+    """
+
+    def __init__(self, trajectory_file: Path | str) -> None:
+        """
+        Open the trajectory file and read the ids of the agents and the times of the frames.
+
+        Parameters
+        ----------
+        trajectory_file : Path | str
+            Path of the trajectory file.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the trajectory file does not exist.
+        """
+        self._path = Path(trajectory_file)
+        if not self._path.is_file():
+            raise FileNotFoundError(f"The trajectory file {self._path} was not found.")
+        self._archive = zipfile.ZipFile(self._path, "r")
+        names = set(self._archive.namelist())
+        self._agent_ids = [str(agent_id) for agent_id in _read_member(self._archive, AGENT_IDS_MEMBER)]
+        self._number_chunks = 0
+        while _chunk_member(self._number_chunks, "times") in names:
+            self._number_chunks += 1
+        chunk_times = [_read_member(self._archive, _chunk_member(chunk, "times")) for chunk in range(self._number_chunks)]
+        self._times = np.concatenate(chunk_times).astype(np.float64) if chunk_times else np.empty(0)
+        self._chunk_starts = np.cumsum([0] + [len(times) for times in chunk_times])
+        self._has_contacts = _chunk_member(0, "contacts") in names
+        self._cached_chunk = -1
+        self._cached_arrays: dict[str, NDArray[np.generic]] = {}
+
+    def __enter__(self) -> Self:
+        """
+        Enter the runtime context of the reader.
+
+        Returns
+        -------
+        Self
+            The reader itself.
+        """
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        """
+        Close the trajectory file when leaving the runtime context.
+
+        Parameters
+        ----------
+        exc_type : type[BaseException] | None
+            The type of the exception raised in the context, if any.
+        exc_value : BaseException | None
+            The exception raised in the context, if any.
+        traceback : TracebackType | None
+            The traceback of the exception raised in the context, if any.
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Get the number of frames of the trajectory.
+
+        Returns
+        -------
+        int
+            The number of frames.
+        """
+        return self.number_frames
+
+    @property
+    def agent_ids(self) -> list[str]:
+        """
+        Get the ids of the agents, in the order of the rows of the kinematics.
+
+        Returns
+        -------
+        list[str]
+            The ids of the agents.
+        """
+        return list(self._agent_ids)
+
+    @property
+    def number_frames(self) -> int:
+        """
+        Get the number of frames of the trajectory.
+
+        Returns
+        -------
+        int
+            The number of frames.
+        """
+        return len(self._times)
+
+    @property
+    def number_chunks(self) -> int:
+        """
+        Get the number of chunks of the trajectory file.
+
+        Returns
+        -------
+        int
+            The number of chunks.
+        """
+        return self._number_chunks
+
+    @property
+    def times(self) -> NDArray[np.float64]:
+        """
+        Get the times of all the frames.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The increasing times of the frames (s).
+        """
+        return self._times.copy()
+
+    @property
+    def has_contacts(self) -> bool:
+        """
+        Whether the trajectory file holds the contacts of the agents.
+
+        Returns
+        -------
+        bool
+            True if the contacts were recorded, False otherwise.
+        """
+        return self._has_contacts
+
+    def get_frame(self, time: float) -> int:
+        """
+        Get the index of the last frame recorded at or before a given time.
+
+        Parameters
+        ----------
+        time : float
+            The time (s).
+
+        Returns
+        -------
+        int
+            The index of the frame.
+
+        Raises
+        ------
+        ValueError
+            If the time is before the first frame.
+        """
+        frame = int(np.searchsorted(self._times, time, side="right")) - 1
+        if frame < 0:
+            raise ValueError(f"No frame was recorded at or before t={time}.")
+        return frame
+
+    def _locate(self, frame: int) -> tuple[int, int]:
+        """
+        Get the chunk holding a frame and the position of the frame in the chunk.
+
+        Parameters
+        ----------
+        frame : int
+            The index of the frame. Negative indices count from the last frame.
+
+        Returns
+        -------
+        tuple[int, int]
+            The index of the chunk and the position of the frame in the chunk.
+
+        Raises
+        ------
+        IndexError
+            If there is no such frame.
+        """
+        if not -self.number_frames <= frame < self.number_frames:
+            raise IndexError(f"Frame {frame} is out of range for a trajectory of {self.number_frames} frames.")
+        frame %= self.number_frames
+        chunk = int(np.searchsorted(self._chunk_starts, frame, side="right")) - 1
+        return chunk, frame - int(self._chunk_starts[chunk])
+
+    def _get_chunk_array(self, chunk: int, quantity: str) -> NDArray[np.generic]:
+        """
+        Get one quantity of one chunk, reading the chunk if it is not the last one read.
+
+        Parameters
+        ----------
+        chunk : int
+            The index of the chunk.
+        quantity : str
+            The quantity: ``kinematics``, ``contacts`` or ``contact_offsets``.
+
+        Returns
+        -------
+        NDArray[np.generic]
+            The array of the quantity in the chunk.
+        """
+        if chunk != self._cached_chunk:
+            self._cached_chunk = chunk
+            self._cached_arrays = {}
+        if quantity not in self._cached_arrays:
+            self._cached_arrays[quantity] = _read_member(self._archive, _chunk_member(chunk, quantity))
+        return self._cached_arrays[quantity]
+
+    def get_kinematics(self, frame: int) -> NDArray[np.float64]:
+        """
+        Get the kinematics of the agents at a given frame.
+
+        Parameters
+        ----------
+        frame : int
+            The index of the frame. Negative indices count from the last frame.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Array of shape (number of agents, 6), laid out as ``MECHANICS_KINEMATICS_COLUMNS``.
+        """
+        chunk, position = self._locate(frame)
+        return np.array(self._get_chunk_array(chunk, "kinematics")[position], dtype=np.float64)
+
+    def get_contacts(self, frame: int) -> NDArray[np.float64]:
+        """
+        Get the contacts of the agents at a given frame.
+
+        Parameters
+        ----------
+        frame : int
+            The index of the frame. Negative indices count from the last frame.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Array of shape (number of contacts, 12), laid out as ``MECHANICS_CONTACTS_COLUMNS``.
+
+        Raises
+        ------
+        ValueError
+            If the contacts were not recorded.
+        """
+        if not self._has_contacts:
+            raise ValueError(f"The trajectory file {self._path} does not hold the contacts of the agents.")
+        chunk, position = self._locate(frame)
+        offsets = self._get_chunk_array(chunk, "contact_offsets")
+        contacts = self._get_chunk_array(chunk, "contacts")
+        return np.array(contacts[offsets[position] : offsets[position + 1]], dtype=np.float64)
+
+    def iter_kinematics(self) -> Iterator[tuple[float, NDArray[np.float64]]]:
+        """
+        Iterate over the frames of the trajectory, in order.
+
+        Yields
+        ------
+        tuple[float, NDArray[np.float64]]
+            The time of each frame (s) and the kinematics of the agents, laid out as ``MECHANICS_KINEMATICS_COLUMNS``.
+        """
+        for frame, time in enumerate(self._times):
+            yield float(time), self.get_kinematics(frame)
+
+    def close(self) -> None:
+        """Close the trajectory file. Calling it several times has no effect."""
+        self._archive.close()
+        self._cached_arrays = {}
@@ -49,22 +49,36 @@ class Agent:
     measures : dict[str, float | Sex] | AgentMeasures
         The measures associated with the agent. Can be a dictionary with measure names as keys and float values
         or Sex (Literal["male","female"]), or an AgentMeasures object.
+    shapes3D_enabled : bool
+        Whether the agent has 3D shapes. They are only created when `shapes3D` is first accessed.
+    shapes3D_seed : int | None
+        Seed of the global NumPy random state while the 3D shapes are created, if any.
     """
 
     def __init__(
         self,
         agent_type: cst.AgentTypes,
         measures: dict[str, float | Sex] | AgentMeasures,
+        shapes3D_enabled: bool = True,
+        shapes3D_seed: int | None = None,
     ) -> None:
         """
         Initialize an Agent instance.
 
+        The 2D shapes are created right away, whereas the creation of the 3D shapes, which is about as costly, is deferred
+        until they are first accessed, so that agents only used in 2D never pay for it.
+
         Parameters
         ----------
         agent_type : AgentTypes
             The type of the agent.
         measures : dict[str, float | Sex] | AgentMeasures
             The measures associated with the agent.
+        shapes3D_enabled : bool
+            Whether the agent has 3D shapes. If False, `shapes3D` is None.
+        shapes3D_seed : int | None
+            Seed of the global NumPy random state while the 3D shapes are created, so that they do not depend on when
+            they are first accessed. If None, the current global random state is used.
 
         Raises
         ------
@@ -74,7 +88,11 @@ class Agent:
         self._agent_type = self._validate_agent_type(agent_type)
         self._measures = self._initialize_measures(agent_type, measures)
         self._shapes2D = self._initialize_shapes2D(agent_type)
-        self._shapes3D = self._initialize_shapes3D(agent_type)
+        self._shapes3D: Shapes3D | None = None
+        self._shapes3D_pending = bool(shapes3D_enabled)
+        self._shapes3D_seed = shapes3D_seed
+        # Position (x, y) and accumulated rotation of the 3D body requested before its creation, see `place_body3D`
+        self._pending_body3D_placement: tuple[float, float, float] | None = None
 
         if self._shapes2D.shapes:
             # Compute the moment of inertia of the agent being created
@@ -84,25 +102,9 @@ class Agent:
             )
 
             # Set the initial orientation of the shapes2D to 0.0°
-            centroids = [
-                s["object"].centroid for s in self._shapes2D.shapes.values() if isinstance(s["object"], (MultiPolygon, Polygon))
-            ]
-            shapes2D_centroid = MultiPoint(centroids).centroid
-            for name, shape in self._shapes2D.shapes.items():
-                self._shapes2D.shapes[name]["object"] = affin.rotate(shape["object"], -90, origin=shapes2D_centroid, use_radians=False)
-                self._shapes2D.shapes[name]["object"] = affin.translate(
-                    self._shapes2D.shapes[name]["object"], xoff=-shapes2D_centroid.x, yoff=-shapes2D_centroid.y
-                )
-
-        # Set the initial orientation of the shapes3D to 0.0°
-        if self._shapes3D.shapes:
-            centroids = [mp.centroid for mp in self._shapes3D.shapes.values() if isinstance(mp, (MultiPolygon, Polygon))]
-            centroid_body = MultiPoint(centroids).centroid
-            for height, multipolygon in self._shapes3D.shapes.items():
-                self._shapes3D.shapes[height] = affin.rotate(multipolygon, -90, origin=centroid_body, use_radians=False)
-                self._shapes3D.shapes[height] = affin.translate(
-                    self._shapes3D.shapes[height], xoff=-centroid_body.x, yoff=-centroid_body.y
-                )
+            shapes2D_centroid = self.get_position()
+            self._shapes2D.rotate(-90, origin=shapes2D_centroid)
+            self._shapes2D.translate(-shapes2D_centroid.x, -shapes2D_centroid.y)
 
     def _validate_agent_type(self, agent_type: cst.AgentTypes) -> cst.AgentTypes:
         """
@@ -194,6 +196,14 @@ class Agent:
         shapes3D = Shapes3D(agent_type=agent_type)
         if agent_type == cst.AgentTypes.pedestrian:
             shapes3D.create_pedestrian3D(self._measures)
+
+        # Set the initial orientation of the shapes3D to 0.0°
+        if shapes3D.shapes:
+            centroids = [mp.centroid for mp in shapes3D.shapes.values() if isinstance(mp, (MultiPolygon, Polygon))]
+            centroid_body = MultiPoint(centroids).centroid
+            for height, multipolygon in shapes3D.shapes.items():
+                shapes3D.shapes[height] = affin.rotate(multipolygon, -90, origin=centroid_body, use_radians=False)
+                shapes3D.shapes[height] = affin.translate(shapes3D.shapes[height], xoff=-centroid_body.x, yoff=-centroid_body.y)
         return shapes3D
 
     @property
@@ -251,15 +261,12 @@ class Agent:
             self.translate(wanted_position.x - current_position.x, wanted_position.y - current_position.y)
             self.rotate(wanted_orientation - current_orientation)
 
-            # Create and update the 3D shapes if they exist
-            if self.shapes3D is not None:
-                self.shapes3D.create_pedestrian3D(self._measures)
-            else:
-                self.shapes3D = Shapes3D(agent_type=cst.AgentTypes.pedestrian)
-            self.shapes3D.create_pedestrian3D(self._measures)
-            current_position = self.get_centroid_body3D()
-            self.translate_body3D(dx=wanted_position.x - current_position.x, dy=wanted_position.y - current_position.y, dz=0.0)
-            self.rotate_body3D(angle=wanted_orientation - 90)
+            # Update the 3D shapes if they exist, the ones not created yet will be created from the new measures
+            if self._shapes3D is not None:
+                self._shapes3D.create_pedestrian3D(self._measures)
+                current_position = self.get_centroid_body3D()
+                self.translate_body3D(dx=wanted_position.x - current_position.x, dy=wanted_position.y - current_position.y, dz=0.0)
+                self.rotate_body3D(angle=wanted_orientation - 90)
 
         if self.agent_type == cst.AgentTypes.bike:
             if isinstance(value, dict):
@@ -294,13 +301,14 @@ class Agent:
     @property
     def shapes3D(self) -> Shapes3D | None:
         """
-        Access the agent's 3D geometric representations.
+        Access the agent's 3D geometric representations, creating them on first access.
 
         Returns
         -------
         Shapes3D | None
             Dataclass object holding all 3D shapes defining the agent's 3D features, if available. None if not set.
         """
+        self.build_shapes3D()
         return self._shapes3D
 
     @shapes3D.setter
@@ -323,6 +331,41 @@ class Agent:
         if isinstance(value, dict):
             value = Shapes3D(agent_type=self.agent_type, shapes=value)
         self._shapes3D = value
+        self._shapes3D_pending = False
+        self._pending_body3D_placement = None
+
+    def build_shapes3D(self) -> None:
+        """
+        Create the 3D shapes of the agent if they are enabled but not created yet.
+
+        They are created with the global NumPy random state seeded with `shapes3D_seed` if it is given, and the placement
+        recorded by `place_body3D` before their creation is then applied.
+        """
+        if not self._shapes3D_pending:
+            return
+        if self._shapes3D_seed is None:
+            shapes3D = self._initialize_shapes3D(self.agent_type)
+        else:
+            with fun.temporary_random_seed(self._shapes3D_seed):
+                shapes3D = self._initialize_shapes3D(self.agent_type)
+        self._shapes3D = shapes3D
+        self._shapes3D_pending = False
+        if self._pending_body3D_placement is not None and shapes3D.shapes:
+            x, y, angle = self._pending_body3D_placement
+            self._pending_body3D_placement = None
+            self.place_body3D(Point(x, y), angle)
+
+    @property
+    def shapes3D_pending(self) -> bool:
+        """
+        Tell whether the 3D shapes of the agent are enabled but not created yet.
+
+        Returns
+        -------
+        bool
+            True if the 3D shapes will be created when `shapes3D` is first accessed.
+        """
+        return self._shapes3D_pending
 
     def translate(self, dx: float, dy: float) -> None:
         """
@@ -339,9 +382,7 @@ class Agent:
         -----
         - Does not affect 3D shapes.
         """
-        for name, shape in self.shapes2D.shapes.items():
-            shape_object = shape["object"]
-            self.shapes2D.shapes[name]["object"] = affin.translate(shape_object, xoff=dx, yoff=dy)
+        self.shapes2D.translate(dx, dy)
 
     def rotate(self, angle: float) -> None:
         """
@@ -356,10 +397,7 @@ class Agent:
         -----
         Does not affect 3D shapes.
         """
-        rotation_axis = self.get_position()
-        for name, shape in self.shapes2D.shapes.items():
-            shape_object = shape["object"]
-            self.shapes2D.shapes[name]["object"] = affin.rotate(shape_object, angle, origin=rotation_axis, use_radians=False)
+        self.shapes2D.rotate(angle, origin=self.get_position())
 
     def get_position(self) -> Point:
         """
@@ -370,11 +408,8 @@ class Agent:
         Point
             The mean of the centroids of all composite shapes of the 2D representation of the agent.
         """
-        multipoint = []
-        for shape in self.shapes2D.shapes.values():
-            if isinstance(shape["object"], (MultiPolygon, Polygon)):
-                multipoint.append(shape["object"].centroid)
-        return MultiPoint(multipoint).centroid
+        centroids = [self.shapes2D.get_shape_centroid(name) for name in self.shapes2D.shapes]
+        return MultiPoint(centroids).centroid
 
     def translate_body3D(self, dx: float, dy: float, dz: float) -> None:
         """
@@ -427,6 +462,31 @@ class Agent:
             rotated_body3D[height] = affin.rotate(multipolygon, angle, origin=centroid_body, use_radians=False)
         self.shapes3D.shapes = rotated_body3D
 
+    def place_body3D(self, position: Point, angle: float) -> None:
+        """
+        Rotate the 3D body around its centroid, then move its centroid to the given position and its lowest slice to z = 0.
+
+        If the 3D body is not created yet, the placement is recorded and applied when it is created. Successive placements
+        of a body not created yet are composed: their rotations add up and the last position is kept.
+
+        Parameters
+        ----------
+        position : Point
+            The wanted position of the centroid of the 3D body (cm).
+        angle : float
+            Rotation angle in degrees (positive counter-clockwise).
+        """
+        if self._shapes3D_pending:
+            previous_angle = 0.0 if self._pending_body3D_placement is None else self._pending_body3D_placement[2]
+            self._pending_body3D_placement = (position.x, position.y, previous_angle + angle)
+            return
+        self.rotate_body3D(angle)
+        actual_position = self.get_centroid_body3D()
+        if self.shapes3D is None:
+            raise ValueError("No 3D shapes available for the agent.")
+        actual_lowest_height = min(float(height) for height in self.shapes3D.shapes.keys())
+        self.translate_body3D(dx=position.x - actual_position.x, dy=position.y - actual_position.y, dz=0.0 - actual_lowest_height)
+
     def get_centroid_body3D(self) -> Point:
         """
         Calculate the centroid of the agent's 3D body.
@@ -464,9 +524,8 @@ class Agent:
             raise ValueError("It does not make sense to use the 'get_delta_GtoGi' function for agents other than pedestrians.")
         delta_GtoGi = {}
         agent_center: Point = self.get_position()
-        for name, shape in self.shapes2D.shapes.items():
-            shape_center_x: float = shape["object"].centroid.x
-            shape_center_y: float = shape["object"].centroid.y
+        for name in self.shapes2D.shapes:
+            shape_center_x, shape_center_y = self.shapes2D.get_shape_centroid(name)
             delta_GtoGi[name] = (shape_center_x - agent_center.x, shape_center_y - agent_center.y)
         return delta_GtoGi
 
@@ -25,18 +25,55 @@
 # The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
 # you accept its terms.
 
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Any
+
 import numpy as np
+import shapely
 import shapely.affinity as affin
 from numpy.typing import NDArray
-from shapely.geometry import Point, Polygon
+from scipy.spatial import cKDTree
+from shapely.geometry import MultiPolygon, Point, Polygon
 
 import configuration.utils.constants as cst
+import configuration.utils.functions as fun
 from configuration.models.agents import Agent
-from configuration.models.measures import CrowdMeasures, create_pedestrian_measures, draw_agent_measures, draw_agent_type
+from configuration.models.measures import (
+    AgentMeasures,
+    CrowdMeasures,
+    create_agent_measures_from_table,
+    create_pedestrian_measures,
+    draw_agent_measures,
+    draw_agent_type,
+    draw_crowd_measures_table,
+)
 from configuration.models.shapes2D import Shapes2D
+from configuration.models.shapes3D import Shapes3D
 from configuration.utils.typing_custom import DynamicCrowdDataType, GeometryDataType, StaticCrowdDataType
 
 
+@dataclass
+class InterpenetrationState:
+    """
+    Contributions of the agents of a crowd to its interpenetration, as computed by `Crowd.calculate_interpenetration`.
+
+    The contributions of an agent are only computed again when its shapes differ from the recorded ones.
+    """
+
+    #: The shapes of each agent (disk centers and radii, other shapes) when its contributions were computed.
+    shape_signatures: list[tuple[object, ...]]
+    #: The 2D geometric shape of each agent.
+    geometries: list[Polygon | MultiPolygon]
+    #: The boundaries with which the contributions were computed.
+    boundaries: Polygon
+    #: The non-zero interpenetration areas (cm²) between pairs of agents ``(i, j)`` with ``i < j``.
+    pair_areas: dict[tuple[int, int], float] = field(default_factory=dict)
+    #: The area (cm²) of each agent that lies outside the boundaries.
+    boundary_areas: NDArray[np.float64] = field(default_factory=lambda: np.zeros(0))
+
+
 class Crowd:
     """
     Class representing a crowd of pedestrians in a room.
@@ -54,6 +91,8 @@ class Crowd:
     boundaries : Polygon | None
         A shapely Polygon instance defining the boundaries.
         If None, a default large square boundary is created.
+    shapes3D_enabled : bool
+        Whether the agents created by the crowd have 3D shapes.
     """
 
     def __init__(
@@ -61,6 +100,7 @@ class Crowd:
         measures: dict[str, float] | CrowdMeasures | None = None,
         agents: list[Agent] | None = None,
         boundaries: Polygon | None = None,
+        shapes3D_enabled: bool = True,
     ) -> None:
         """
         Initialize the class instance with measures, agents, and boundaries.
@@ -78,6 +118,9 @@ class Crowd:
         boundaries : Polygon | None
             A shapely Polygon instance defining the boundaries.
             If None, a default large square boundary is created.
+        shapes3D_enabled : bool
+            Whether the agents created by the crowd have 3D shapes. Disabling them saves the creation of the 3D bodies
+            when the crowd is only used in 2D. It does not affect the agents provided in `agents`.
 
         Raises
         ------
@@ -124,6 +167,8 @@ class Crowd:
             self._agents = []
 
         self._boundaries = boundaries
+        self._interpenetration_state: InterpenetrationState | None = None
+        self.shapes3D_enabled = bool(shapes3D_enabled)
 
     @property
     def agents(self) -> list[Agent]:
@@ -223,52 +268,241 @@ class Crowd:
         if self.measures.agent_statistics:
             drawn_agent_type = draw_agent_type(self.measures)
             drawn_agent_measures = draw_agent_measures(drawn_agent_type, self.measures)
-            self.agents.append(Agent(agent_type=drawn_agent_type, measures=drawn_agent_measures))
+            self.agents.append(
+                Agent(agent_type=drawn_agent_type, measures=drawn_agent_measures, shapes3D_enabled=self.shapes3D_enabled)
+            )
 
         # Case 2: Use the default ANSURII database if no other data is available
         elif not self.measures.agent_statistics:
-            drawn_agent_data = np.random.choice(np.array(list(self.measures.default_database.values()), dtype="object"))
+            records = list(self.measures.default_database.values())
+            drawn_agent_data = records[np.random.choice(len(records))]
             agent_measures = create_pedestrian_measures(drawn_agent_data)
-            self.agents.append(Agent(agent_type=cst.AgentTypes.pedestrian, measures=agent_measures))
+            self.agents.append(
+                Agent(agent_type=cst.AgentTypes.pedestrian, measures=agent_measures, shapes3D_enabled=self.shapes3D_enabled)
+            )
 
-    def create_agents(self, number_agents: int = cst.DEFAULT_AGENT_NUMBER) -> None:
+    def create_agents(
+        self, number_agents: int = cst.DEFAULT_AGENT_NUMBER, workers: int = cst.DEFAULT_NB_WORKERS, seed: int | None = None
+    ) -> None:
         """
         Create multiple agents in the crowd from the given CrowdMeasures (ANSURII database by default).
 
+        The types and measures of all the agents are first drawn at once with `draw_crowd_measures_table`,
+        then the agents are built from them. Without a seed and with a single worker, both steps use the global
+        NumPy random state. Otherwise, the measures and each agent are drawn from their own random streams,
+        spawned from the seed, so that the created crowd only depends on the seed and not on the number of workers.
+        The 3D shapes are then created with the seed of their agent, right away in the worker processes, or when they
+        are first accessed if a single worker is used.
+
         Parameters
         ----------
         number_agents : int
             Number of agents to create.
+        workers : int
+            Number of worker processes used to create the agents.
+        seed : int | None
+            Seed of the random streams of the agents. If None and several workers are used, it is drawn from
+            the global NumPy random state.
+
+        Raises
+        ------
+        ValueError
+            If `workers` is not a positive integer.
         """
-        for _ in range(number_agents):
-            self.add_one_agent()
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("'workers' should be a positive integer.")
+
+        if workers == 1 and seed is None:
+            measures_table = draw_crowd_measures_table(number_agents, self.measures)
+            self.agents.extend(
+                Agent(agent_type=agent_measures.agent_type, measures=agent_measures, shapes3D_enabled=self.shapes3D_enabled)
+                for agent_measures in create_agent_measures_from_table(measures_table)
+            )
+            return
+
+        if seed is None:
+            seed = int(np.random.randint(np.iinfo(np.int32).max))
+        table_seed, *agent_seeds = (int(child_seed) for child_seed in np.random.SeedSequence(seed).generate_state(number_agents + 1))
+        with fun.temporary_random_seed(table_seed):
+            measures_table = draw_crowd_measures_table(number_agents, self.measures)
+        agents_measures = create_agent_measures_from_table(measures_table)
+
+        if workers == 1:
+            self.agents.extend(map(_create_agent_from_seed, agents_measures, agent_seeds, repeat(self.shapes3D_enabled)))
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, number_agents // (4 * workers))
+            # The 3D shapes are fitted in the workers, with the same seeds as if they were created on first access
+            enabled = self.shapes3D_enabled
+            self.agents.extend(
+                executor.map(
+                    _create_agent_from_seed, agents_measures, agent_seeds, repeat(enabled), repeat(enabled), chunksize=chunksize
+                )
+            )
 
-    def calculate_interpenetration(self) -> tuple[float, float]:
+    def calculate_interpenetration(self, incremental: bool = False) -> tuple[float, float]:
         """
         Compute the total interpenetration area between pedestrians and between pedestrians and boundaries.
 
+        Only the pairs of agents whose bounding boxes overlap, found with a Shapely STRtree, are intersected. When two
+        pedestrians only overlap through one pair of disks, their interpenetration is the exact area of the lens of these
+        disks, otherwise it is the area of the intersection of their polygons. Only the agents that are not contained in
+        the boundaries are intersected with them.
+
+        Parameters
+        ----------
+        incremental : bool
+            Whether to reuse the contributions of the agents computed by the previous call, so that only the agents whose
+            shapes have changed since then (or all agents if the boundaries or the number of agents have changed) are
+            intersected again.
+
         Returns
         -------
-        float
-            The total interpenetration area between pedestrians and between pedestrians and boundaries.
+        tuple[float, float]
+            The total interpenetration area between agents and the total area of the agents outside the boundaries (cm²).
+        """
+        if not incremental:
+            self._interpenetration_state = None
+        state = self.update_interpenetration_state()
+        return float(sum(state.pair_areas.values())), float(np.sum(state.boundary_areas))
+
+    def update_interpenetration_state(self) -> InterpenetrationState:
+        """
+        Update the contributions of the agents to the interpenetration, for the agents whose shapes have changed.
+
+        Returns
+        -------
+        InterpenetrationState
+            The up-to-date contributions of all the agents.
         """
-        interpenetration_between_agents = 0.0
-        interpenetration_with_boundaries = 0.0
         n_agents = self.get_number_agents()
+        shape_signatures = [Crowd.get_shape_signature(agent) for agent in self.agents]
+        state = self._interpenetration_state
+        if state is None or len(state.shape_signatures) != n_agents:
+            state = InterpenetrationState(shape_signatures, [Polygon()] * n_agents, self.boundaries, {}, np.zeros(n_agents))
+            moved_agents = np.arange(n_agents)
+        else:
+            moved_agents = np.flatnonzero([new != old for new, old in zip(shape_signatures, state.shape_signatures, strict=True)])
+        self._interpenetration_state = state
+
+        # Refresh the geometries of the moved agents and drop their former overlaps
+        is_moved = np.zeros(n_agents, dtype=bool)
+        is_moved[moved_agents] = True
+        for i_agent in moved_agents:
+            state.geometries[i_agent] = self.agents[i_agent].shapes2D.get_geometric_shape()
+        state.shape_signatures = shape_signatures
+        state.pair_areas = {pair: area for pair, area in state.pair_areas.items() if not (is_moved[pair[0]] or is_moved[pair[1]])}
+
+        # Interpenetration with the boundaries, for all agents if the boundaries have changed
+        outside_agents = moved_agents if state.boundaries is self.boundaries else np.arange(n_agents)
+        state.boundaries = self.boundaries
+        state.boundary_areas[outside_agents] = self.calculate_areas_outside_boundaries([state.geometries[i] for i in outside_agents])
+        if len(moved_agents) == 0:
+            return state
+
+        # Interpenetration between the moved agents and all the agents whose bounding boxes overlap theirs
+        geometries = np.array(state.geometries, dtype=object)
+        query_indices, tree_indices = shapely.STRtree(geometries).query(geometries[moved_agents])
+        first_agents, second_agents = moved_agents[query_indices], tree_indices
+        # Pairs of two moved agents are found twice, they are only kept once
+        kept = (first_agents != second_agents) & ~(is_moved[second_agents] & (second_agents < first_agents))
+        pairs = np.sort(np.column_stack((first_agents[kept], second_agents[kept])), axis=1)
+        pair_areas = self.calculate_pair_interpenetrations(geometries, pairs)
+        for (i_agent, j_agent), area in zip(pairs[pair_areas > 0.0], pair_areas[pair_areas > 0.0], strict=True):
+            state.pair_areas[int(i_agent), int(j_agent)] = float(area)
+        return state
 
-        # Loop over all agents in the crowd
-        for i_agent, current_agent in enumerate(self.agents):
-            current_geometric = current_agent.shapes2D.get_geometric_shape()
-            # Loop over all other agents in the crowd
-            for j in range(i_agent + 1, n_agents):
-                neigh_agent = self.agents[j]
-                neigh_geometric = neigh_agent.shapes2D.get_geometric_shape()
-                # Compute interpenetration between current agent and neighbor
-                interpenetration_between_agents += current_geometric.intersection(neigh_geometric).area
-            # Compute interpenetration with the boundaries
-            interpenetration_with_boundaries += current_geometric.difference(self.boundaries).area
+    @staticmethod
+    def get_shape_signature(agent: Agent) -> tuple[object, ...]:
+        """
+        Describe the 2D shapes of an agent, so that the agents that have moved can be detected.
 
-        return interpenetration_between_agents, interpenetration_with_boundaries
+        Parameters
+        ----------
+        agent : Agent
+            The agent.
+
+        Returns
+        -------
+        tuple[object, ...]
+            The name and the center and radius of each disk, or the name and Shapely object of the other shapes.
+        """
+        return tuple(
+            (name, shape["x"], shape["y"], shape["radius"]) if shape["type"] == cst.ShapeTypes.disk.name else (name, shape["object"])
+            for name, shape in agent.shapes2D.shapes.items()
+        )
+
+    def calculate_pair_interpenetrations(self, geometries: NDArray[np.object_], pairs: NDArray[np.int64]) -> NDArray[np.float64]:
+        """
+        Compute the interpenetration areas between pairs of agents.
+
+        The disks of the two pedestrians of each pair are intersected analytically. If a single pair of disks overlaps,
+        its lens is the intersection of the two pedestrians, otherwise their polygons are intersected with Shapely.
+
+        Parameters
+        ----------
+        geometries : NDArray[np.object_]
+            The 2D geometric shape of each agent of the crowd.
+        pairs : NDArray[np.int64]
+            The indices of the two agents of each pair, as an array of shape (n_pairs, 2).
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The interpenetration area of each pair (cm²).
+        """
+        # Disks of the agents involved in the pairs, agents with other shapes have no disk
+        disk_counts = np.zeros(self.get_number_agents(), dtype=np.int64)
+        first_disks = np.zeros(self.get_number_agents(), dtype=np.int64)
+        disks: list[tuple[float, float, float]] = []
+        for i_agent in np.unique(pairs):
+            shapes = self.agents[i_agent].shapes2D.shapes.values()
+            if all(shape["type"] == cst.ShapeTypes.disk.name for shape in shapes):
+                first_disks[i_agent] = len(disks)
+                disk_counts[i_agent] = len(shapes)
+                disks.extend((float(shape["x"]), float(shape["y"]), float(shape["radius"])) for shape in shapes)
+        disk_array = np.array(disks, dtype=np.float64).reshape(-1, 3)
+
+        # Lens areas of all the pairs of disks of each pair of agents
+        disk_counts_a, disk_counts_b = disk_counts[pairs[:, 0]], disk_counts[pairs[:, 1]]
+        disk_pairs_per_pair = disk_counts_a * disk_counts_b
+        pair_of_disk_pair = np.repeat(np.arange(len(pairs)), disk_pairs_per_pair)
+        local_disk_pair = np.arange(len(pair_of_disk_pair)) - np.repeat(
+            np.cumsum(disk_pairs_per_pair) - disk_pairs_per_pair, disk_pairs_per_pair
+        )
+        disks_a = first_disks[pairs[pair_of_disk_pair, 0]] + local_disk_pair // disk_counts_b[pair_of_disk_pair]
+        disks_b = first_disks[pairs[pair_of_disk_pair, 1]] + local_disk_pair % disk_counts_b[pair_of_disk_pair]
+        lens_areas = fun.compute_disk_intersection_areas(
+            np.linalg.norm(disk_array[disks_a, :2] - disk_array[disks_b, :2], axis=1), disk_array[disks_a, 2], disk_array[disks_b, 2]
+        )
+        n_overlaps = np.bincount(pair_of_disk_pair[lens_areas > 0.0], minlength=len(pairs))
+        areas = np.bincount(pair_of_disk_pair, weights=lens_areas, minlength=len(pairs))
+
+        # Polygon intersections for the agents that are not made of disks, or that overlap through several pairs of disks
+        polygonal = (disk_pairs_per_pair == 0) | (n_overlaps > 1)
+        areas[polygonal] = shapely.area(shapely.intersection(geometries[pairs[polygonal, 0]], geometries[pairs[polygonal, 1]]))
+        return areas
+
+    def calculate_areas_outside_boundaries(self, geometries: list[Polygon | MultiPolygon]) -> NDArray[np.float64]:
+        """
+        Compute the areas of the parts of some agents that lie outside the boundaries.
+
+        Parameters
+        ----------
+        geometries : list[Polygon | MultiPolygon]
+            The 2D geometric shapes of the agents.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The area of each agent outside the boundaries (cm²).
+        """
+        geometry_array = np.array(geometries, dtype=object)
+        areas = np.zeros(len(geometries))
+        outside = ~shapely.contains(self.boundaries, geometry_array)
+        areas[outside] = shapely.area(shapely.difference(geometry_array[outside], self.boundaries))
+        return areas
 
     def calculate_covered_area(self) -> float:
         """
@@ -279,10 +513,7 @@ class Crowd:
         float
             The total area covered by all 2D agents.
         """
-        total_area = 0.0
-        for agent in self.agents:
-            total_area += agent.shapes2D.get_geometric_shape().area
-        return total_area
+        return float(np.sum(shapely.area([agent.shapes2D.get_geometric_shape() for agent in self.agents])))
 
     @staticmethod
     def calculate_contact_force(agent_centroid: Point, other_centroid: Point) -> NDArray[np.float64]:
@@ -421,7 +652,10 @@ class Crowd:
 
     @staticmethod
     def check_validity_parameters_agents_packing(
-        repulsion_length: float, desired_direction: float, variable_orientation: bool
+        repulsion_length: float,
+        desired_direction: float,
+        variable_orientation: bool,
+        neighbour_search: bool = cst.DEFAULT_NEIGHBOUR_SEARCH,
     ) -> None:
         """
         Validate the input parameters for agent packing.
@@ -434,6 +668,8 @@ class Crowd:
             The desired direction.
         variable_orientation : bool
             A flag indicating whether variable orientation is enabled.
+        neighbour_search : bool
+            A flag indicating whether the spatial-index neighbour search is enabled.
         """
         if not isinstance(repulsion_length, float):
             raise TypeError("`repulsion_length` should be a float.")
@@ -441,28 +677,329 @@ class Crowd:
             raise TypeError("`desired_direction` should be a float.")
         if not isinstance(variable_orientation, bool):
             raise TypeError("`variable_orientation` should be a boolean.")
+        if not isinstance(neighbour_search, bool):
+            raise TypeError("`neighbour_search` should be a boolean.")
         if repulsion_length <= 0:
             raise ValueError("`repulsion_length` should be a strictly positive float.")
 
+    @staticmethod
+    def find_packing_neighbours(geometries: list[Polygon | MultiPolygon], search_radius: float) -> list[list[int]]:
+        """
+        Find, for each agent, the agents whose bounding boxes lie within a given distance of its own bounding box.
+
+        The search relies on a Shapely STRtree built from the provided geometries, so that the cost is roughly
+        linear in the number of agents instead of quadratic.
+
+        Parameters
+        ----------
+        geometries : list[Polygon | MultiPolygon]
+            The 2D geometric shapes of the agents.
+        search_radius : float
+            Distance (cm) by which the bounding box of each agent is enlarged before querying the tree.
+
+        Returns
+        -------
+        list[list[int]]
+            For each agent, the sorted indices of its candidate neighbours (the agent itself excluded).
+
+        Notes
+        -----
+        The returned lists stay valid for an interaction range ``search_radius - margin`` as long as no edge
+        of the bounding box of any agent has moved by more than ``margin / 2`` since the query: the gap between
+        two bounding boxes can then shrink by at most ``margin``.
+        """
+        tree = shapely.STRtree(geometries)
+        bounds = shapely.bounds(geometries)
+        search_boxes = shapely.box(
+            bounds[:, 0] - search_radius,
+            bounds[:, 1] - search_radius,
+            bounds[:, 2] + search_radius,
+            bounds[:, 3] + search_radius,
+        )
+        input_indices, tree_indices = tree.query(search_boxes)
+        order = np.lexsort((tree_indices, input_indices))
+
+        neighbours: list[list[int]] = [[] for _ in geometries]
+        for i_agent, j_agent in zip(input_indices[order], tree_indices[order], strict=True):
+            if i_agent != j_agent:
+                neighbours[i_agent].append(int(j_agent))
+        return neighbours
+
     def update_shapes3D_based_on_shapes2D(self) -> None:
         """
         Update the position and orientation of 3D shapes of all agents based on their 2D shapes.
 
         This method iterates through each agent in the crowd and updates its 3D shapes position and orientation
-        based on the corresponding 2D shapes.
+        based on the corresponding 2D shapes. The 3D bodies that exist are moved all at once, the placement of the
+        ones not created yet is recorded with `Agent.place_body3D`, and the agents whose 3D shapes are disabled are skipped.
         """
-        for agent in self.agents:
-            desired_orientation = agent.get_agent_orientation()
-            actual_orientation = 0.0
-            agent.rotate_body3D(desired_orientation - actual_orientation)
-            desired_position = agent.get_position()
-            actual_position = agent.get_centroid_body3D()
-            actual_lowest_height = min(float(height) for height in agent.shapes3D.shapes.keys())
-            agent.translate_body3D(
-                dx=desired_position.x - actual_position.x,
-                dy=desired_position.y - actual_position.y,
-                dz=0.0 - actual_lowest_height,
+        desired_orientations = np.array([agent.get_agent_orientation() for agent in self.agents])
+        actual_orientation = 0.0
+        desired_positions = self.get_agent_positions()
+        for agent, (x, y), orientation in zip(self.agents, desired_positions, desired_orientations, strict=True):
+            if agent.shapes3D_pending:
+                agent.place_body3D(Point(x, y), orientation - actual_orientation)
+        created = np.array(
+            [i_agent for i_agent, agent in enumerate(self.agents) if not agent.shapes3D_pending and agent.shapes3D is not None],
+            dtype=np.int64,
+        )
+        if len(created) == 0:
+            return
+
+        actual_positions = self.get_bodies3D_centroids(created)
+        actual_lowest_heights = np.array(
+            [min(float(height) for height in body3D.shapes.keys()) for body3D in self.get_bodies3D(created)]
+        )
+        translations = np.column_stack((desired_positions[created] - actual_positions, 0.0 - actual_lowest_heights))
+        self.transform_bodies3D(
+            translations, desired_orientations[created] - actual_orientation, rotation_centers=actual_positions, agent_indices=created
+        )
+
+    def get_agent_positions(self) -> NDArray[np.float64]:
+        """
+        Get the positions of all agents, as computed by `Agent.get_position`.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The position of each agent (cm), as an array of shape (n_agents, 2).
+        """
+        positions = np.zeros((self.get_number_agents(), 2))
+        for i_agent, agent in enumerate(self.agents):
+            positions[i_agent] = np.mean([agent.shapes2D.get_shape_centroid(name) for name in agent.shapes2D.shapes], axis=0)
+        return positions
+
+    def get_bodies3D(self, agent_indices: NDArray[np.int64] | None = None) -> list[Shapes3D]:
+        """
+        Get the 3D bodies of the agents, creating the ones that do not exist yet.
+
+        Parameters
+        ----------
+        agent_indices : NDArray[np.int64] | None
+            The indices of the agents, all agents if None.
+
+        Returns
+        -------
+        list[Shapes3D]
+            The 3D body of each agent.
+
+        Raises
+        ------
+        ValueError
+            If an agent has no 3D shapes.
+        """
+        indices = range(self.get_number_agents()) if agent_indices is None else agent_indices.tolist()
+        bodies3D: list[Shapes3D] = []
+        for i_agent in indices:
+            body3D = self.agents[i_agent].shapes3D
+            if body3D is None or not body3D.shapes:
+                raise ValueError(f"No 3D shapes available for agent {i_agent}.")
+            bodies3D.append(body3D)
+        return bodies3D
+
+    def get_bodies3D_centroids(self, agent_indices: NDArray[np.int64] | None = None) -> NDArray[np.float64]:
+        """
+        Get the centroids of the 3D bodies of the agents, as computed by `Agent.get_centroid_body3D`.
+
+        The centroids of all the slices of all the bodies are computed with a single vectorized Shapely call.
+
+        Parameters
+        ----------
+        agent_indices : NDArray[np.int64] | None
+            The indices of the agents, all agents if None.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The centroid of the 3D body of each agent (cm), as an array of shape (n_agents, 2).
+        """
+        slices, slice_owners = self.get_bodies3D_slices(agent_indices)
+        slice_centroids = shapely.get_coordinates(shapely.centroid(slices))
+        n_agents = self.get_number_agents() if agent_indices is None else len(agent_indices)
+        slices_per_agent = np.bincount(slice_owners, minlength=n_agents)
+        return (
+            np.column_stack(
+                [np.bincount(slice_owners, weights=slice_centroids[:, axis], minlength=len(slices_per_agent)) for axis in (0, 1)]
+            )
+            / slices_per_agent[:, None]
+        )
+
+    def get_bodies3D_slices(self, agent_indices: NDArray[np.int64] | None = None) -> tuple[NDArray[np.object_], NDArray[np.int64]]:
+        """
+        Gather the slices of the 3D bodies of the agents into a single array.
+
+        Parameters
+        ----------
+        agent_indices : NDArray[np.int64] | None
+            The indices of the agents, all agents if None.
+
+        Returns
+        -------
+        tuple[NDArray[np.object_], NDArray[np.int64]]
+            - The MultiPolygon slices of all the bodies, agent by agent, in the order of the shapes3D dictionaries.
+            - The position, among the selected agents, of the agent owning each slice.
+        """
+        slices: list[MultiPolygon] = []
+        slice_owners: list[int] = []
+        for i_body, body3D in enumerate(self.get_bodies3D(agent_indices)):
+            slices.extend(body3D.shapes.values())
+            slice_owners.extend([i_body] * len(body3D.shapes))
+        return np.array(slices, dtype=object), np.array(slice_owners, dtype=np.int64)
+
+    @staticmethod
+    def rotate_and_translate_points(
+        points: NDArray[np.float64],
+        owners: NDArray[np.int64],
+        rotation_centers: NDArray[np.float64],
+        angles: NDArray[np.float64],
+        translations: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """
+        Rotate points around the rotation center of their owner, then translate them with the translation of their owner.
+
+        The rotation matrices are those of `shapely.affinity.rotate`, so that right angles give exact rotations.
+
+        Parameters
+        ----------
+        points : NDArray[np.float64]
+            The points to move (cm), as an array of shape (n_points, 2).
+        owners : NDArray[np.int64]
+            The index of the agent owning each point.
+        rotation_centers : NDArray[np.float64]
+            The rotation center of each agent (cm), as an array of shape (n_agents, 2).
+        angles : NDArray[np.float64]
+            The rotation angle of each agent in degrees (positive for counter-clockwise).
+        translations : NDArray[np.float64]
+            The translation of each agent (cm), as an array of shape (n_agents, 2).
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The moved points (cm).
+        """
+        cos_angles, sin_angles = np.cos(np.radians(angles)), np.sin(np.radians(angles))
+        cos_angles[np.abs(cos_angles) < 2.5e-16] = 0.0
+        sin_angles[np.abs(sin_angles) < 2.5e-16] = 0.0
+        cos_points, sin_points = cos_angles[owners], sin_angles[owners]
+        relative_points = points - rotation_centers[owners]
+        return (
+            rotation_centers[owners]
+            + translations[owners]
+            + np.column_stack(
+                (
+                    cos_points * relative_points[:, 0] - sin_points * relative_points[:, 1],
+                    sin_points * relative_points[:, 0] + cos_points * relative_points[:, 1],
+                )
             )
+        )
+
+    def transform_agents(self, translations: NDArray[np.float64], angles: NDArray[np.float64] | None = None) -> None:
+        """
+        Rotate the 2D shapes of each agent around its position, then translate them, for all agents at once.
+
+        The disk centers of all agents are moved with NumPy, and the other shapes (e.g. bikes) with a single
+        `shapely.transform` call. The result is the same as calling `Agent.rotate` then `Agent.translate` for each agent.
+
+        Parameters
+        ----------
+        translations : NDArray[np.float64]
+            The translation of each agent (cm), as an array of shape (n_agents, 2).
+        angles : NDArray[np.float64] | None
+            The rotation angle of each agent in degrees (positive for counter-clockwise), no rotation if None.
+
+        Raises
+        ------
+        ValueError
+            If the translations or angles do not match the number of agents.
+        """
+        n_agents = self.get_number_agents()
+        translations = np.asarray(translations, dtype=np.float64)
+        angles = np.zeros(n_agents) if angles is None else np.asarray(angles, dtype=np.float64)
+        if translations.shape != (n_agents, 2) or angles.shape != (n_agents,):
+            raise ValueError(f"Expected translations of shape ({n_agents}, 2) and angles of shape ({n_agents},).")
+        positions = self.get_agent_positions()
+
+        # Gather the disks and the other shapes of all agents
+        disks: list[dict[str, Any]] = []
+        disk_owners: list[int] = []
+        other_shapes: list[dict[str, Any]] = []
+        other_owners: list[int] = []
+        for i_agent, agent in enumerate(self.agents):
+            for shape in agent.shapes2D.shapes.values():
+                if shape["type"] == cst.ShapeTypes.disk.name:
+                    disks.append(shape)
+                    disk_owners.append(i_agent)
+                else:
+                    other_shapes.append(shape)
+                    other_owners.append(i_agent)
+
+        if disks:
+            disk_centers = np.array([(disk["x"], disk["y"]) for disk in disks], dtype=np.float64)
+            disk_centers = Crowd.rotate_and_translate_points(disk_centers, np.array(disk_owners), positions, angles, translations)
+            for disk, (x, y) in zip(disks, disk_centers.tolist(), strict=True):
+                disk["x"], disk["y"] = x, y
+        if other_shapes:
+            geometries = np.array([shape["object"] for shape in other_shapes], dtype=object)
+            point_owners = np.repeat(other_owners, shapely.get_num_coordinates(geometries))
+            geometries = shapely.transform(
+                geometries, lambda points: Crowd.rotate_and_translate_points(points, point_owners, positions, angles, translations)
+            )
+            for shape, geometry in zip(other_shapes, geometries, strict=True):
+                shape["object"] = geometry
+
+    def transform_bodies3D(
+        self,
+        translations: NDArray[np.float64],
+        angles: NDArray[np.float64] | None = None,
+        rotation_centers: NDArray[np.float64] | None = None,
+        agent_indices: NDArray[np.int64] | None = None,
+    ) -> None:
+        """
+        Rotate the 3D body of each agent around the centroid of its body, then translate it, for all agents at once.
+
+        The slices of all the bodies are moved with a single `shapely.transform` call and the shapes3D dictionaries are
+        rebuilt in bulk. The result is the same as calling `Agent.rotate_body3D` then `Agent.translate_body3D` for each agent.
+
+        Parameters
+        ----------
+        translations : NDArray[np.float64]
+            The translation of each agent along the x, y and z axes (cm), as an array of shape (n_agents, 3).
+        angles : NDArray[np.float64] | None
+            The rotation angle of each agent in degrees (positive for counter-clockwise), no rotation if None.
+        rotation_centers : NDArray[np.float64] | None
+            The centroid of the 3D body of each agent (cm), computed with `get_bodies3D_centroids` if None.
+        agent_indices : NDArray[np.int64] | None
+            The indices of the agents to move, all agents if None. The other arguments are then given for these agents only.
+
+        Raises
+        ------
+        ValueError
+            If the translations or angles do not match the number of agents.
+        """
+        n_agents = self.get_number_agents() if agent_indices is None else len(agent_indices)
+        translations = np.asarray(translations, dtype=np.float64)
+        angles = np.zeros(n_agents) if angles is None else np.asarray(angles, dtype=np.float64)
+        if translations.shape != (n_agents, 3) or angles.shape != (n_agents,):
+            raise ValueError(f"Expected translations of shape ({n_agents}, 3) and angles of shape ({n_agents},).")
+        if n_agents == 0:
+            return
+        if rotation_centers is None:
+            rotation_centers = self.get_bodies3D_centroids(agent_indices)
+
+        bodies3D = self.get_bodies3D(agent_indices)
+        slices, slice_owners = self.get_bodies3D_slices(agent_indices)
+        point_owners = np.repeat(slice_owners, shapely.get_num_coordinates(slices))
+        slices = shapely.transform(
+            slices,
+            lambda points: Crowd.rotate_and_translate_points(points, point_owners, rotation_centers, angles, translations[:, :2]),
+        )
+
+        i_slice = 0
+        for body3D, dz in zip(bodies3D, translations[:, 2].tolist(), strict=True):
+            heights = list(body3D.shapes.keys())
+            agent_slices = slices[i_slice : i_slice + len(heights)]
+            body3D.shapes = {float(height) + dz: slice_ for height, slice_ in zip(heights, agent_slices, strict=True)}
+            i_slice += len(heights)
 
     def translate_crowd(self, dx: float, dy: float) -> None:
         """
@@ -475,8 +1012,7 @@ class Crowd:
         dy : float
             The offset to translate in the y-direction.
         """
-        for agent in self.agents:
-            agent.translate(dx, dy)
+        self.transform_agents(np.tile([dx, dy], (self.get_number_agents(), 1)))
         self.boundaries = affin.translate(self.boundaries, dx, dy)
 
         # Update the 3d shapes only if all agents are pedestrians
@@ -488,6 +1024,7 @@ class Crowd:
         repulsion_length: float = cst.DEFAULT_REPULSION_LENGTH,
         desired_direction: float = cst.DEFAULT_DESIRED_DIRECTION,
         variable_orientation: bool = cst.DEFAULT_VARIABLE_ORIENTATION,
+        neighbour_search: bool = cst.DEFAULT_NEIGHBOUR_SEARCH,
     ) -> None:
         """
         Simulate crowd dynamics using physics-based forces to resolve agent overlaps.
@@ -506,6 +1043,15 @@ class Crowd:
         variable_orientation : bool
             Whether to apply rotational forces during packing. When True, enables
             random angular adjustments based on collision forces.
+        neighbour_search : bool
+            Whether to restrict agent-agent interactions to the neighbours returned by a spatial index (STRtree)
+            rebuilt at each iteration. Repulsive forces are then neglected beyond
+            ``REPULSION_CUTOFF_FACTOR * repulsion_length``, which makes each iteration roughly linear in the number
+            of agents instead of quadratic. The tree is queried with a radius of
+            ``repulsion_cutoff + NEIGHBOUR_SEARCH_MARGIN`` and queried again within the iteration as soon as one
+            edge of the bounding box of an agent has moved (translation or rotation) by more than
+            ``NEIGHBOUR_SEARCH_MARGIN / 2`` since the last query, so that no pair of agents closer than the cutoff
+            is ever missed.
 
         Notes
         -----
@@ -523,6 +1069,7 @@ class Crowd:
             repulsion_length=repulsion_length,
             desired_direction=desired_direction,
             variable_orientation=variable_orientation,
+            neighbour_search=neighbour_search,
         )
 
         # Initially, all agents have 0° orientation (head facing right) and are at (0,0),
@@ -532,22 +1079,33 @@ class Crowd:
             current_agent.translate(center_of_boundaries.x, center_of_boundaries.y)
             current_agent.rotate(desired_direction)
 
+        repulsion_cutoff = cst.REPULSION_CUTOFF_FACTOR * repulsion_length
+        all_agent_indices = list(range(self.get_number_agents()))
+
         Temperature = cst.INITIAL_TEMPERATURE
         for _ in range(cst.MAX_NB_ITERATIONS):
+            # Compute the geometries once per iteration, they are refreshed below each time an agent moves
+            geometries = [agent.shapes2D.get_geometric_shape() for agent in self.agents]
+            centroids: list[Point] = [geometric.centroid for geometric in geometries]
+            if neighbour_search:
+                neighbours = Crowd.find_packing_neighbours(geometries, repulsion_cutoff + cst.NEIGHBOUR_SEARCH_MARGIN)
+                queried_bounds = shapely.bounds(geometries)
+
             # Check for overlaps and apply forces if necessary
             for i_agent, current_agent in enumerate(self.agents):
                 # Format: [x_translation (cm), y_translation (cm), rotation (degrees)]
                 forces: NDArray[np.float64] = np.array([0.0, 0.0, 0.0])
-                current_geometric = current_agent.shapes2D.get_geometric_shape()
-                current_centroid: Point = current_geometric.centroid
+                current_geometric = geometries[i_agent]
+                current_centroid = centroids[i_agent]
 
                 # Compute repulsive force between agents
-                for j_agent, neigh_agent in enumerate(self.agents):
+                for j_agent in neighbours[i_agent] if neighbour_search else all_agent_indices:
                     if i_agent == j_agent:
                         continue
-                    neigh_geometric = neigh_agent.shapes2D.get_geometric_shape()
-                    neigh_centroid: Point = neigh_geometric.centroid
-                    forces[:-1] += Crowd.calculate_repulsive_force(current_centroid, neigh_centroid, repulsion_length)
+                    neigh_geometric = geometries[j_agent]
+                    neigh_centroid = centroids[j_agent]
+                    if not neighbour_search or current_centroid.distance(neigh_centroid) <= repulsion_cutoff:
+                        forces[:-1] += Crowd.calculate_repulsive_force(current_centroid, neigh_centroid, repulsion_length)
                     if current_geometric.intersects(neigh_geometric):
                         forces[:-1] += Crowd.calculate_contact_force(current_centroid, neigh_centroid)
                         forces[-1] += Crowd.calculate_rotational_force(Temperature)
@@ -567,9 +1125,28 @@ class Crowd:
                 elif self.boundaries.contains(new_position):
                     current_agent.translate(forces[:-1][0], forces[:-1][1])
 
+                # Refresh the cached geometry of the agent that has just moved
+                geometries[i_agent] = current_agent.shapes2D.get_geometric_shape()
+                centroids[i_agent] = geometries[i_agent].centroid
+
+                # Query the tree again once the agent has moved far enough to invalidate the neighbour lists
+                if neighbour_search:
+                    bounds_shift = np.max(np.abs(np.asarray(geometries[i_agent].bounds) - queried_bounds[i_agent]))
+                    if bounds_shift > 0.5 * cst.NEIGHBOUR_SEARCH_MARGIN:
+                        neighbours = Crowd.find_packing_neighbours(geometries, repulsion_cutoff + cst.NEIGHBOUR_SEARCH_MARGIN)
+                        queried_bounds = shapely.bounds(geometries)
+
             # Decrease the temperature at each iteration
             Temperature = max(0.0, Temperature - cst.ADDITIVE_COOLING)
 
+        self.translate_packed_crowd_to_origin()
+
+    def translate_packed_crowd_to_origin(self) -> None:
+        """
+        Translate the packed crowd (and its boundaries) so that its minimum x and y coordinates are at (0, 0).
+
+        If the crowd has no boundaries, the minimum coordinates are those of the agents, otherwise those of the boundaries.
+        """
         # If no boundaries translate all agents and wall to get the minimum x-coordinates and minimum y-coordinates at (0., 0.)
         if self.boundaries.is_empty:
             min_x = min(min(agent.shapes2D.get_geometric_shape().bounds[0] for agent in self.agents), self.boundaries.bounds[0])
@@ -579,12 +1156,263 @@ class Crowd:
             min_y = min(y for _, y in self.boundaries.exterior.coords)
         self.translate_crowd(-min_x, -min_y)
 
+    def get_disk_arrays(self) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Flatten the disks of all agents into contiguous arrays.
+
+        Disks are ordered agent by agent, and for each agent in the order of its shapes dictionary.
+
+        Returns
+        -------
+        tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.int64]]
+            - The centers of the disks (cm), as an array of shape (n_disks, 2).
+            - The radii of the disks (cm), as an array of shape (n_disks,).
+            - The index of the agent owning each disk, as an array of shape (n_disks,).
+
+        Raises
+        ------
+        ValueError
+            If an agent has a shape that is not a disk.
+        """
+        disks: list[tuple[float, float, float]] = []
+        disk_owners: list[int] = []
+        for i_agent, agent in enumerate(self.agents):
+            for name, shape in agent.shapes2D.shapes.items():
+                if shape["type"] != cst.ShapeTypes.disk.name:
+                    raise ValueError(f"Shape '{name}' of agent {i_agent} is a {shape['type']}, only disks can be flattened.")
+                disks.append((float(shape["x"]), float(shape["y"]), float(shape["radius"])))
+                disk_owners.append(i_agent)
+
+        disk_array = np.array(disks, dtype=np.float64).reshape(-1, 3)
+        return disk_array[:, :2].copy(), disk_array[:, 2].copy(), np.array(disk_owners, dtype=np.int64)
+
+    def pack_agents_with_vectorized_forces(
+        self,
+        repulsion_length: float = cst.DEFAULT_REPULSION_LENGTH,
+        desired_direction: float = cst.DEFAULT_DESIRED_DIRECTION,
+        variable_orientation: bool = cst.DEFAULT_VARIABLE_ORIENTATION,
+    ) -> None:
+        """
+        Resolve agent overlaps with the forces of `pack_agents_with_forces`, computed in batch on disk arrays.
+
+        All the disks of the crowd are flattened into contiguous NumPy arrays (centers, radii and owning agent),
+        so that repulsion, disk-disk contacts and rotations are evaluated for every agent at once at each iteration.
+        Candidate pairs of agents are found with a k-d tree on the agent positions and repulsive forces are neglected
+        beyond ``REPULSION_CUTOFF_FACTOR * repulsion_length``. The shapes of the agents are only updated once, at the end.
+
+        Parameters
+        ----------
+        repulsion_length : float
+            Exponential decay coefficient for repulsive forces between agents.
+            Higher values increase the effective range of repulsion.
+        desired_direction : float
+            Initial orientation angle in degrees for all agents.
+        variable_orientation : bool
+            Whether to apply rotational forces during packing. When True, enables
+            random angular adjustments based on collision forces.
+
+        Notes
+        -----
+        - Only agents made of disks (i.e. pedestrians) are supported.
+        - Contrary to `pack_agents_with_forces`, where agents are moved one after the other, all agents are
+          moved simultaneously at each iteration. Agents therefore start from a sunflower spiral around the center
+          instead of a single point, and each agent of a pair in contact takes half of the contact displacement.
+          The packed crowds are statistically similar but not identical.
+        - The position of an agent is the mean of the centers of its disks, as given by `Agent.get_position`.
+        """
+        Crowd.check_validity_parameters_agents_packing(
+            repulsion_length=repulsion_length,
+            desired_direction=desired_direction,
+            variable_orientation=variable_orientation,
+        )
+
+        # Initially, all agents have 0° orientation (head facing right) and are at (0,0),
+        # so we need to rotate them to the desired direction and translate them to the center of the boundaries
+        center_of_boundaries = self.boundaries.centroid if not self.boundaries.is_empty else Point(0.0, 0.0)
+        for current_agent in self.agents:
+            current_agent.translate(center_of_boundaries.x, center_of_boundaries.y)
+            current_agent.rotate(desired_direction)
+
+        disk_centers, disk_radii, disk_owners = self.get_disk_arrays()
+        n_agents = self.get_number_agents()
+        disks_per_agent = np.bincount(disk_owners, minlength=n_agents)
+        first_disk_of_agent = np.concatenate(([0], np.cumsum(disks_per_agent)[:-1]))
+        repulsion_cutoff = cst.REPULSION_CUTOFF_FACTOR * repulsion_length
+
+        # Since all agents move simultaneously, they are first spread on a sunflower spiral around the center,
+        # with one agent per mean agent area, otherwise they would all receive the same push from the same position.
+        # Agents whose spiral position falls outside the boundaries start at the center.
+        mean_agent_area = np.pi * float(np.sum(disk_radii**2)) / n_agents
+        spiral_index = np.arange(n_agents)
+        spiral_radius = np.sqrt(mean_agent_area * spiral_index / np.pi)
+        spiral_angle = spiral_index * np.pi * (3.0 - np.sqrt(5.0))
+        spiral_offsets = np.column_stack((spiral_radius * np.cos(spiral_angle), spiral_radius * np.sin(spiral_angle)))
+        if not self.boundaries.is_empty:
+            spiral_positions = spiral_offsets + np.array([center_of_boundaries.x, center_of_boundaries.y])
+            spiral_offsets[~shapely.contains_xy(self.boundaries, spiral_positions[:, 0], spiral_positions[:, 1])] = 0.0
+        disk_centers = disk_centers + spiral_offsets[disk_owners]
+
+        Temperature = cst.INITIAL_TEMPERATURE
+        for _ in range(cst.MAX_NB_ITERATIONS):
+            positions = (
+                np.column_stack(
+                    (
+                        np.bincount(disk_owners, weights=disk_centers[:, 0], minlength=n_agents),
+                        np.bincount(disk_owners, weights=disk_centers[:, 1], minlength=n_agents),
+                    )
+                )
+                / disks_per_agent[:, np.newaxis]
+            )
+            extents = np.zeros(n_agents)
+            np.maximum.at(extents, disk_owners, np.linalg.norm(disk_centers - positions[disk_owners], axis=1) + disk_radii)
+
+            # Format: [x_translation (cm), y_translation (cm)] and rotation (degrees)
+            forces = np.zeros((n_agents, 2))
+            torques = np.zeros(n_agents)
+
+            # Pairs of agents close enough to repel each other or to be in contact, in both directions
+            search_radius = max(repulsion_cutoff, 2.0 * float(np.max(extents)))
+            pairs = cKDTree(positions).query_pairs(search_radius, output_type="ndarray")
+            in_contact = Crowd._agents_in_contact(
+                pairs, extents, positions, disk_centers, disk_radii, disks_per_agent, first_disk_of_agent
+            )
+            agent_ids = np.concatenate((pairs[:, 0], pairs[:, 1]))
+            other_ids = np.concatenate((pairs[:, 1], pairs[:, 0]))
+            in_contact = np.concatenate((in_contact, in_contact))
+
+            # Repulsive and contact forces between agents, random forces when the positions coincide
+            delta = positions[agent_ids] - positions[other_ids]
+            distance = np.linalg.norm(delta, axis=1)
+            coincide = distance == 0.0
+            direction = delta / np.where(coincide, 1.0, distance)[:, np.newaxis]
+            repulsion = np.exp(-distance / repulsion_length)[:, np.newaxis] * direction
+            repulsion[distance > repulsion_cutoff] = 0.0
+            repulsion[coincide] = np.random.rand(int(coincide.sum()), 2)
+            contact = 0.5 * cst.INTENSITY_TRANSLATIONAL_FORCE * direction[in_contact]
+            contact[coincide[in_contact]] = np.random.rand(int((coincide & in_contact).sum()), 2)
+            np.add.at(forces, agent_ids, repulsion)
+            np.add.at(forces, agent_ids[in_contact], contact)
+            np.add.at(
+                torques,
+                agent_ids[in_contact],
+                np.random.uniform(-cst.INTENSITY_ROTATIONAL_FORCE, cst.INTENSITY_ROTATIONAL_FORCE, int(in_contact.sum()))
+                * Temperature,
+            )
+
+            # Forces between agents and walls
+            if not self.boundaries.is_empty:
+                disk_points = shapely.points(disk_centers)
+                disk_outside = ~shapely.contains_xy(self.boundaries, disk_centers[:, 0], disk_centers[:, 1]) | (
+                    shapely.distance(self.boundaries.exterior, disk_points) < disk_radii
+                )
+                agents_outside = np.flatnonzero(np.bincount(disk_owners, weights=disk_outside, minlength=n_agents) > 0)
+                position_points = shapely.points(positions[agents_outside])
+                nearest_points = shapely.get_coordinates(
+                    shapely.line_interpolate_point(
+                        self.boundaries.exterior, shapely.line_locate_point(self.boundaries.exterior, position_points)
+                    )
+                )
+                delta_wall = positions[agents_outside] - nearest_points
+                distance_wall = np.linalg.norm(delta_wall, axis=1)
+                wall_forces = (
+                    cst.INTENSITY_TRANSLATIONAL_FORCE * delta_wall / np.where(distance_wall > 0.0, distance_wall, 1.0)[:, np.newaxis]
+                )
+                wall_forces[distance_wall == 0.0] = np.random.rand(int((distance_wall == 0.0).sum()), 2)
+                forces[agents_outside] += wall_forces
+                torques[agents_outside] += (
+                    np.random.uniform(-cst.INTENSITY_ROTATIONAL_FORCE, cst.INTENSITY_ROTATIONAL_FORCE, len(agents_outside))
+                    * Temperature
+                )
+
+            # Rotate pedestrians around their position
+            if variable_orientation:
+                angles = np.radians(torques)[disk_owners]
+                relative_centers = disk_centers - positions[disk_owners]
+                cos_angles, sin_angles = np.cos(angles), np.sin(angles)
+                disk_centers = positions[disk_owners] + np.column_stack(
+                    (
+                        cos_angles * relative_centers[:, 0] - sin_angles * relative_centers[:, 1],
+                        sin_angles * relative_centers[:, 0] + cos_angles * relative_centers[:, 1],
+                    )
+                )
+
+            # Translate pedestrians, only if their new position stays inside the boundaries
+            if not self.boundaries.is_empty:
+                new_positions = positions + forces
+                forces[~shapely.contains_xy(self.boundaries, new_positions[:, 0], new_positions[:, 1])] = 0.0
+            disk_centers = disk_centers + forces[disk_owners]
+
+            # Decrease the temperature at each iteration
+            Temperature = max(0.0, Temperature - cst.ADDITIVE_COOLING)
+
+        # Write the packed disk centers back into the shapes of the agents
+        i_disk = 0
+        for agent in self.agents:
+            for shape in agent.shapes2D.shapes.values():
+                shape["x"], shape["y"] = float(disk_centers[i_disk, 0]), float(disk_centers[i_disk, 1])
+                i_disk += 1
+
+        self.translate_packed_crowd_to_origin()
+
+    @staticmethod
+    def _agents_in_contact(
+        pairs: NDArray[np.int64],
+        extents: NDArray[np.float64],
+        positions: NDArray[np.float64],
+        disk_centers: NDArray[np.float64],
+        disk_radii: NDArray[np.float64],
+        disks_per_agent: NDArray[np.int64],
+        first_disk_of_agent: NDArray[np.int64],
+    ) -> NDArray[np.bool_]:
+        """
+        Determine which pairs of agents have at least one pair of overlapping disks.
+
+        Parameters
+        ----------
+        pairs : NDArray[np.int64]
+            Pairs of agent indices, as an array of shape (n_pairs, 2).
+        extents : NDArray[np.float64]
+            For each agent, the largest distance (cm) between its position and the boundary of its disks.
+        positions : NDArray[np.float64]
+            The positions of the agents (cm), as an array of shape (n_agents, 2).
+        disk_centers : NDArray[np.float64]
+            The centers of the disks (cm), as an array of shape (n_disks, 2).
+        disk_radii : NDArray[np.float64]
+            The radii of the disks (cm).
+        disks_per_agent : NDArray[np.int64]
+            The number of disks of each agent.
+        first_disk_of_agent : NDArray[np.int64]
+            The index of the first disk of each agent in the disk arrays.
+
+        Returns
+        -------
+        NDArray[np.bool_]
+            For each pair, whether the two agents are in contact.
+        """
+        in_contact = np.zeros(len(pairs), dtype=bool)
+
+        # Only the pairs whose bounding circles overlap can be in contact
+        agent_a, agent_b = pairs[:, 0], pairs[:, 1]
+        close = np.flatnonzero(np.linalg.norm(positions[agent_a] - positions[agent_b], axis=1) < extents[agent_a] + extents[agent_b])
+        if close.size == 0:
+            return in_contact
+        agent_a, agent_b = agent_a[close], agent_b[close]
+
+        # Enumerate every disk of agent a against every disk of agent b
+        disk_pairs_per_pair = disks_per_agent[agent_a] * disks_per_agent[agent_b]
+        pair_of_disk_pair = np.repeat(np.arange(close.size), disk_pairs_per_pair)
+        rank = np.arange(pair_of_disk_pair.size) - np.repeat(np.cumsum(disk_pairs_per_pair) - disk_pairs_per_pair, disk_pairs_per_pair)
+        n_disks_b = disks_per_agent[agent_b][pair_of_disk_pair]
+        disk_a = first_disk_of_agent[agent_a][pair_of_disk_pair] + rank // n_disks_b
+        disk_b = first_disk_of_agent[agent_b][pair_of_disk_pair] + rank % n_disks_b
+        overlap = np.linalg.norm(disk_centers[disk_a] - disk_centers[disk_b], axis=1) < disk_radii[disk_a] + disk_radii[disk_b]
+
+        in_contact[close] = np.bincount(pair_of_disk_pair, weights=overlap, minlength=close.size) > 0
+        return in_contact
+
     def unpack_crowd(self) -> None:
         """Translate all agents in the crowd to the origin (0, 0)."""
-        for agent in self.agents:
-            current_position: Point = agent.get_position()
-            translation_vector = np.array([-current_position.x, -current_position.y])
-            agent.translate(*translation_vector)
+        self.transform_agents(-self.get_agent_positions())
 
     def pack_agents_on_grid(self, grid_size_x: float = cst.GRID_SIZE_X, grid_size_y: float = cst.GRID_SIZE_Y) -> None:
         """
@@ -608,10 +1436,10 @@ class Crowd:
         x_offset = -min(agent.shapes2D.get_geometric_shape().bounds[0] for agent in self.agents)
         y_offset = -min(agent.shapes2D.get_geometric_shape().bounds[1] for agent in self.agents)
 
-        for i, agent in enumerate(self.agents):
-            pos = agent.get_position()
-            col, row = i % best_n_cols, i // best_n_cols
-            agent.translate(col * grid_size_x + x_offset - pos.x, row * grid_size_y + y_offset - pos.y)
+        agent_indices = np.arange(self.get_number_agents())
+        cols, rows = agent_indices % best_n_cols, agent_indices // best_n_cols
+        grid_positions = np.column_stack((cols * grid_size_x + x_offset, rows * grid_size_y + y_offset))
+        self.transform_agents(grid_positions - self.get_agent_positions())
 
         if all(agent.agent_type == cst.AgentTypes.pedestrian for agent in self.agents):
             self.update_shapes3D_based_on_shapes2D()
@@ -860,3 +1688,37 @@ def create_agents_from_dynamic_static_geometry_parameters(
         all_agents.append(new_agent)
 
     return Crowd(agents=all_agents, boundaries=boundaries)
+
+
+def _create_agent_from_seed(
+    agent_measures: AgentMeasures, seed: int, shapes3D_enabled: bool = True, build_shapes3D: bool = False
+) -> Agent:
+    """
+    Create an agent from its measures with the global NumPy random state temporarily seeded.
+
+    The 3D shapes of the agent are created with the same seed, either right away or when they are first accessed, so that
+    they do not depend on where and when they are created.
+
+    Parameters
+    ----------
+    agent_measures : AgentMeasures
+        The measures of the agent.
+    seed : int
+        The seed of the random stream of the agent.
+    shapes3D_enabled : bool
+        Whether the agent has 3D shapes.
+    build_shapes3D : bool
+        Whether to create the 3D shapes right away, e.g. in a worker process, instead of on first access.
+
+    Returns
+    -------
+    Agent
+        The created agent.
+    """
+    with fun.temporary_random_seed(seed):
+        agent = Agent(
+            agent_type=agent_measures.agent_type, measures=agent_measures, shapes3D_enabled=shapes3D_enabled, shapes3D_seed=seed
+        )
+    if build_shapes3D:
+        agent.build_shapes3D()
+    return agent
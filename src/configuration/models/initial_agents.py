@@ -25,7 +25,7 @@
 # The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
 # you accept its terms.
 
-from pathlib import Path
+from collections.abc import Mapping
 
 from shapely.geometry import MultiPolygon, Point, box
 from shapely.ops import unary_union
@@ -60,8 +60,8 @@ class InitialPedestrian:
             Agent type set to pedestrian
         _shapes2D : ShapeDataType
             2D shape object
-        _shapes3D : dict[float, MultiPolygon]
-            3D body layers mapped to z-height coordinates
+        _shapes3D : Mapping[float, MultiPolygon]
+            3D body layers mapped to z-height coordinates, shared read-only with the other initial pedestrians
         _measures : dict[str, float | Sex | None]
             Biomechanical measurements including:
                 - sex: Biological sex (Literal["male","female"])
@@ -81,8 +81,7 @@ class InitialPedestrian:
 
         self._agent_type: cst.AgentTypes = cst.AgentTypes.pedestrian
         self._shapes2D: ShapeDataType = self._initialize_shapes()
-        dir_path = Path(__file__).parent.parent.parent.parent.absolute() / "data" / "pkl"
-        self._shapes3D: dict[float, MultiPolygon] = fun.load_pickle(str(dir_path / f"{sex}_3dBody_light.pkl"))
+        self._shapes3D: Mapping[float, MultiPolygon] = fun.load_body_template(sex)
 
         # Initialize measures
         bideltoid_breadth: float = 0.0
@@ -227,14 +226,14 @@ class InitialPedestrian:
         return self._measures
 
     @property
-    def shapes3D(self) -> dict[float, MultiPolygon]:
+    def shapes3D(self) -> Mapping[float, MultiPolygon]:
         """
         Get the 3D body representation of the pedestrian.
 
         Returns
         -------
-        dict[float, MultiPolygon]
-            A dictionary where:
+        Mapping[float, MultiPolygon]
+            A read-only mapping where:
                 - Keys are float representing the height of each pedestrian slice.
                 - Values are "MultiPolygon" objects representing the 2D geometry of each layer or slice.
         """
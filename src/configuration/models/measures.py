@@ -25,10 +25,12 @@
 # The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
 # you accept its terms.
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from pathlib import Path
+from typing import Any
 
 import numpy as np
+import pandas as pd
 
 import configuration.utils.constants as cst
 from configuration.utils import functions as fun
@@ -113,13 +115,15 @@ class AgentMeasures:
 class CrowdMeasures:
     """Collection of dictionaries (databases and statistics) representing the characteristics of the crowd, used to create agents."""
 
-    default_database: dict[int, dict[str, float]] = field(default_factory=dict)
+    default_database: Mapping[int, Mapping[str, float | str]] = field(default_factory=dict)
     agent_statistics: dict[str, float] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         """
         Validate the crowd measures after the dataclass initialization and loads the ANSURII dataset into the `default_database`.
 
+        The ANSURII dataset is shared by all the crowd measures of the process and is read-only.
+
         Raises
         ------
         ValueError
@@ -128,14 +132,13 @@ class CrowdMeasures:
             If any required statistics are missing in `agent_statistics`.
         """
         # Check if the provided databases are dictionaries
-        if not isinstance(self.default_database, dict):
+        if not isinstance(self.default_database, Mapping):
             raise ValueError("default_database should be a dictionary.")
         if not isinstance(self.agent_statistics, dict):
             raise ValueError("agent_statistics should be a dictionary.")
 
         # Fill the default database with the ANSURII dataset
-        dir_path = Path(__file__).parent.parent.parent.parent.absolute() / "data" / "pkl"
-        self.default_database = (fun.load_pickle(str(dir_path / "ANSUREIIPublic.pkl"))).transpose().to_dict()
+        self.default_database = fun.load_default_database()
 
         # Check if the agent statistics are provided for all parts
         if self.agent_statistics:
@@ -319,13 +322,186 @@ def draw_agent_type(crowd_measures: CrowdMeasures) -> cst.AgentTypes:
     return cst.AgentTypes.pedestrian
 
 
-def create_pedestrian_measures(agent_data: dict[str, float]) -> AgentMeasures:
+def draw_crowd_measures_table(number_agents: int, crowd_measures: CrowdMeasures) -> pd.DataFrame:
+    """
+    Draw at once the types and measures of several agents, as a table with one row per agent.
+
+    This is the batch counterpart of `draw_agent_type` and `draw_agent_measures` (or of the uniform draw of records
+    from the ANSURII database when no agent statistics are provided): each measure is drawn for all the agents
+    in a single vectorized call instead of once per agent.
+
+    Parameters
+    ----------
+    number_agents : int
+        The number of agents to draw.
+    crowd_measures : CrowdMeasures
+        The measures from which the agents are drawn. The agent statistics are used if available,
+        otherwise the records are drawn from the ANSURII database.
+
+    Returns
+    -------
+    pd.DataFrame
+        A table with the following columns:
+            - agent_type : str
+                The name of the type of the agent ("pedestrian" or "bike").
+            - sex : Literal["male","female"] or None
+                The sex of the pedestrians, None for bikes.
+            - one column per pedestrian and bike part, and weight : float
+                The measures of the agents, NaN for the parts that do not belong to the agent type.
+
+    Raises
+    ------
+    ValueError
+        If `number_agents` is negative.
+    """
+    if number_agents < 0:
+        raise ValueError("The number of agents should be a non-negative integer.")
+    if crowd_measures.agent_statistics:
+        return _draw_measures_table_from_statistics(number_agents, crowd_measures)
+    return _draw_measures_table_from_default_database(number_agents)
+
+
+def _create_empty_measures_table(number_agents: int) -> pd.DataFrame:
+    """
+    Create a measures table of pedestrians with undefined measures.
+
+    Parameters
+    ----------
+    number_agents : int
+        The number of rows of the table.
+
+    Returns
+    -------
+    pd.DataFrame
+        The table with the columns described in `draw_crowd_measures_table`.
+    """
+    table = pd.DataFrame(
+        {
+            "agent_type": np.full(number_agents, cst.AgentTypes.pedestrian.name, dtype=object),
+            cst.PedestrianParts.sex.name: np.full(number_agents, None, dtype=object),
+        }
+    )
+    for part_enum in [*list(cst.PedestrianParts)[1:], *cst.BikeParts, cst.CommonMeasures.weight]:
+        table[part_enum.name] = np.full(number_agents, np.nan)
+    return table
+
+
+def _draw_measures_table_from_statistics(number_agents: int, crowd_measures: CrowdMeasures) -> pd.DataFrame:
+    """
+    Draw the measures table from the agent statistics with vectorized truncated normal draws.
+
+    Parameters
+    ----------
+    number_agents : int
+        The number of agents to draw.
+    crowd_measures : CrowdMeasures
+        An object containing statistical measures for the crowd.
+
+    Returns
+    -------
+    pd.DataFrame
+        The table with the columns described in `draw_crowd_measures_table`.
+
+    Raises
+    ------
+    ValueError
+        If the sum of pedestrian and bike proportions is not equal to 1, or if the male proportion is not in [0,1].
+    """
+    stats = crowd_measures.agent_statistics
+    if stats["pedestrian_proportion"] + stats["bike_proportion"] != 1.0:
+        raise ValueError("The proportions of pedestrian and bike agents should sum to 1.")
+    if not 0 <= stats["male_proportion"] <= 1:
+        raise ValueError("Probability p must be between 0 and 1.")
+
+    table = _create_empty_measures_table(number_agents)
+
+    # Draw the agent types with the same tower sampling as `draw_agent_type`, then the sex of the pedestrians
+    is_pedestrian = np.random.uniform(0, 1, number_agents) <= stats["pedestrian_proportion"]
+    is_male = np.random.uniform(0, 1, number_agents) < stats["male_proportion"]
+    table.loc[~is_pedestrian, "agent_type"] = cst.AgentTypes.bike.name
+    table.loc[is_pedestrian & is_male, cst.PedestrianParts.sex.name] = "male"
+    table.loc[is_pedestrian & ~is_male, cst.PedestrianParts.sex.name] = "female"
+
+    # Draw each measure of each group of agents at once
+    groups = [
+        (is_pedestrian & is_male, "male_", [*list(cst.PedestrianParts)[1:], cst.CommonMeasures.weight]),
+        (is_pedestrian & ~is_male, "female_", [*list(cst.PedestrianParts)[1:], cst.CommonMeasures.weight]),
+        (~is_pedestrian, "", [*cst.BikeParts, cst.CommonMeasures.weight]),
+    ]
+    for mask, prefix, part_enums in groups:
+        for part_enum in part_enums:
+            part_prefix = "bike_" if not prefix and part_enum == cst.CommonMeasures.weight else prefix
+            table.loc[mask, part_enum.name] = fun.draw_from_trunc_normal_array(
+                stats[f"{part_prefix}{part_enum.name}_mean"],
+                stats[f"{part_prefix}{part_enum.name}_std_dev"],
+                stats[f"{part_prefix}{part_enum.name}_min"],
+                stats[f"{part_prefix}{part_enum.name}_max"],
+                size=int(mask.sum()),
+            )
+    return table
+
+
+def _draw_measures_table_from_default_database(number_agents: int) -> pd.DataFrame:
+    """
+    Draw uniformly the measures table of pedestrians from the records of the ANSURII database.
+
+    Parameters
+    ----------
+    number_agents : int
+        The number of agents to draw.
+
+    Returns
+    -------
+    pd.DataFrame
+        The table with the columns described in `draw_crowd_measures_table`.
+    """
+    database = fun.load_default_database_table()
+    drawn_records = database.iloc[np.random.randint(0, len(database), size=number_agents)]
+
+    table = _create_empty_measures_table(number_agents)
+    table[cst.PedestrianParts.sex.name] = drawn_records["sex"].to_numpy(dtype=object)
+    table[cst.PedestrianParts.bideltoid_breadth.name] = drawn_records["bideltoid breadth [cm]"].to_numpy(dtype=np.float64)
+    table[cst.PedestrianParts.chest_depth.name] = drawn_records["chest depth [cm]"].to_numpy(dtype=np.float64)
+    table[cst.PedestrianParts.height.name] = drawn_records["height [cm]"].to_numpy(dtype=np.float64)
+    table[cst.CommonMeasures.weight.name] = drawn_records["weight [kg]"].to_numpy(dtype=np.float64)
+    return table
+
+
+def create_agent_measures_from_table(table: pd.DataFrame) -> list[AgentMeasures]:
+    """
+    Create the AgentMeasures objects of the agents described by a measures table.
+
+    Parameters
+    ----------
+    table : pd.DataFrame
+        A table with the columns described in `draw_crowd_measures_table`.
+
+    Returns
+    -------
+    list[AgentMeasures]
+        The measures of each agent of the table, in the same order.
+    """
+    part_names = {
+        cst.AgentTypes.pedestrian: [*[part.name for part in list(cst.PedestrianParts)[1:]], cst.CommonMeasures.weight.name],
+        cst.AgentTypes.bike: [*[part.name for part in cst.BikeParts], cst.CommonMeasures.weight.name],
+    }
+    agent_measures = []
+    for record in table.to_dict(orient="records"):
+        agent_type = cst.AgentTypes[record["agent_type"]]
+        measures: dict[str, float | Sex] = {part_name: float(record[part_name]) for part_name in part_names[agent_type]}
+        if agent_type == cst.AgentTypes.pedestrian:
+            measures = {cst.PedestrianParts.sex.name: record[cst.PedestrianParts.sex.name], **measures}
+        agent_measures.append(AgentMeasures(agent_type=agent_type, measures=measures))
+    return agent_measures
+
+
+def create_pedestrian_measures(agent_data: Mapping[str, Any]) -> AgentMeasures:
     """
     Create pedestrian-specific AgentMeasures object.
 
     Parameters
     ----------
-    agent_data : dict[str, float]
+    agent_data : Mapping[str, Any]
         A dictionary containing pedestrian measurements. Expected keys are:
             - "sex": The sex of the pedestrian (either "male" or "female").
             - "bideltoid breadth [cm]": Shoulder width in centimeters.
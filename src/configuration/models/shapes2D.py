@@ -29,6 +29,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
+import shapely.affinity as affin
 from numpy.typing import NDArray
 from scipy.optimize import dual_annealing
 from shapely.affinity import scale
@@ -51,10 +52,17 @@ class Shapes2D:
 
     1. Provide a dictionary of pre-defined Shapely shapes as input
     2. Specify the type of shape and its characteristics to create it
+
+    Disks are stored exactly, by the coordinates ``x`` and ``y`` of their center and their ``radius`` (cm), whereas
+    rectangles and polygons are stored as Shapely objects under the key ``object``. The Shapely polygons of the disks
+    are only built when they are requested (plotting, intersections, ...), and cached until the disks move.
     """
 
     agent_type: cst.AgentTypes
     shapes: ShapeDataType = field(default_factory=dict)
+    _disk_polygons: dict[str, tuple[tuple[float, float, float], Polygon]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """
@@ -67,7 +75,8 @@ class Shapes2D:
         ValueError
             If the `shapes` attribute is not a dictionary.
         ValueError
-            If any shape in the `shapes` dictionary is not a valid Shapely object (Point or Polygon).
+            If any shape in the `shapes` dictionary is not a valid Shapely object (Point or Polygon), or a disk
+            without a numerical center and radius.
         ValueError
             If the reference direction is not within the range (-180.0, 180.0].
         """
@@ -79,10 +88,25 @@ class Shapes2D:
         if not isinstance(self.shapes, dict):
             raise ValueError("shapes should be a dictionary.")
 
-        # Validate that the provided shapes are valid Shapely objects
-        for shape_name, shape in self.shapes.items():
-            if not isinstance(shape.get("object"), (Point, Polygon)):
+        # Validate that the provided shapes are valid Shapely objects, or disks given by their center and radius
+        self.shapes = dict(self.shapes)
+        for shape_name, shape in list(self.shapes.items()):
+            if shape.get("type") == cst.ShapeTypes.disk.name and "object" not in shape:
+                if not all(isinstance(shape.get(key), (int, float)) for key in ("x", "y", "radius")):
+                    raise ValueError(f"The disk '{shape_name}' should have a numerical 'x', 'y' and 'radius'.")
+            elif not isinstance(shape.get("object"), (Point, Polygon)):
                 raise ValueError(f"Invalid shape type for '{shape_name}': {type(shape.get('object'))}")
+            elif shape.get("type") == cst.ShapeTypes.disk.name:
+                # Disks given as buffered polygons are converted to their center and radius, on a copy of the caller's entry
+                shape = dict(shape)
+                self.shapes[shape_name] = shape
+                disk = shape.pop("object")
+                if not isinstance(disk, Polygon):
+                    raise ValueError(f"The disk '{shape_name}' should be given as a Polygon, not a {type(disk)}.")
+                center = disk.centroid
+                vertices = np.array(disk.exterior.coords, dtype=np.float64)
+                shape["x"], shape["y"] = float(center.x), float(center.y)
+                shape["radius"] = float(np.max(np.hypot(vertices[:, 0] - center.x, vertices[:, 1] - center.y)))
 
     def add_shape(self, name: str, shape_type: ShapeType, material: MaterialType, **kwargs: Any) -> None:
         r"""
@@ -134,16 +158,17 @@ class Shapes2D:
         fun.validate_material(material)
 
         if shape_type == cst.ShapeTypes.disk.name:
-            center = (kwargs.get("x"), kwargs.get("y"))
-            radius = kwargs.get("radius")
-            if not isinstance(center, tuple) or not isinstance(radius, (int, float)):
-                raise ValueError("For a disk, 'center' must be a tuple and 'radius' must be a number.")
+            x, y, radius = kwargs.get("x"), kwargs.get("y"), kwargs.get("radius")
+            if not isinstance(x, (int, float)) or not isinstance(y, (int, float)) or not isinstance(radius, (int, float)):
+                raise ValueError("For a disk, 'x', 'y' and 'radius' must be numbers.")
             if not isinstance(material, str):
                 raise ValueError("'material' must be a string.")
             self.shapes[name] = {
                 "type": cst.ShapeTypes.disk.name,
                 "material": material,
-                "object": Point(center).buffer(radius, quad_segs=cst.DISK_QUAD_SEGS),
+                "x": float(x),
+                "y": float(y),
+                "radius": float(radius),
             }
 
         elif shape_type == cst.ShapeTypes.rectangle.name:
@@ -220,15 +245,12 @@ class Shapes2D:
             material = shape.get("material")
             # Retrieve the parameters of each shape according to its type
             if shape["type"] == cst.ShapeTypes.disk.name:
-                disk: Polygon = shape["object"]
-                disk_center = disk.centroid
-                disk_radius = disk.exterior.distance(disk.centroid)
                 params[name] = {
                     "type": cst.ShapeTypes.disk.name,
-                    "radius": float(np.round(disk_radius * cst.CM_TO_M, 3)),
+                    "radius": float(np.round(float(shape["radius"]) * cst.CM_TO_M, 3)),
                     "material": material,
-                    "x": float(np.round(disk_center.x * cst.CM_TO_M, 3)),
-                    "y": float(np.round(disk_center.y * cst.CM_TO_M, 3)),
+                    "x": float(np.round(float(shape["x"]) * cst.CM_TO_M, 3)),
+                    "y": float(np.round(float(shape["y"]) * cst.CM_TO_M, 3)),
                 }
             elif shape["type"] == cst.ShapeTypes.rectangle.name:
                 rect: Polygon = shape["object"]
@@ -266,18 +288,60 @@ class Shapes2D:
         """
         return len(self.shapes)
 
-    def create_pedestrian_shapes(self, measurements: AgentMeasures) -> None:
+    @staticmethod
+    def solve_pedestrian_scaling(
+        initial_pedestrian: InitialPedestrian, wanted_chest_depth: float, wanted_bideltoid_breadth: float
+    ) -> tuple[float, float] | None:
+        """
+        Compute in closed form the scaling factors that fit the initial pedestrian to the wanted measures.
+
+        The radii of the disks are scaled by the y-scaling factor and the centers are scaled along the x-axis
+        around the position of the initial pedestrian. The chest depth (twice the radius of disk2) therefore only
+        depends on the y-scaling factor, which is solved first, and the bideltoid breadth then fixes the x-scaling factor.
+
+        Parameters
+        ----------
+        initial_pedestrian : InitialPedestrian
+            The template pedestrian whose disks are scaled.
+        wanted_chest_depth : float
+            The wanted chest depth (cm).
+        wanted_bideltoid_breadth : float
+            The wanted bideltoid breadth (cm).
+
+        Returns
+        -------
+        tuple[float, float] | None
+            The x and y scaling factors, or None if they fall outside the bounds accepted by the optimizer.
+        """
+        homothety_center = initial_pedestrian.get_position()
+        disk_centers = initial_pedestrian.get_disk_centers()
+        disk_radii = initial_pedestrian.get_disk_radii()
+
+        scale_factor_y = wanted_chest_depth / (2.0 * disk_radii[2])
+        scale_factor_x = (0.5 * wanted_bideltoid_breadth - homothety_center.x - disk_radii[4] * scale_factor_y) / (
+            disk_centers[4].x - homothety_center.x
+        )
+
+        lower_bound, upper_bound = cst.PEDESTRIAN_SCALING_BOUNDS
+        if not (lower_bound <= scale_factor_x <= upper_bound and lower_bound <= scale_factor_y <= upper_bound):
+            return None
+        return float(scale_factor_x), float(scale_factor_y)
+
+    def create_pedestrian_shapes(self, measurements: AgentMeasures, use_optimizer: bool = False) -> None:
         """
         Create the shapes of a pedestrian based on the provided measures.
 
         This method generates the shapes of a pedestrian agent by scaling initial disk centers and radii
-        according to the provided measurements. To find the correct scalings, it uses an optimization algorithm
-        to minimize the difference between the desired and actual chest depth and bideltoid breadth.
+        according to the provided measurements. The scalings are computed in closed form with
+        `solve_pedestrian_scaling`. If they cannot be found that way, or if requested, an optimization algorithm
+        is used to minimize the difference between the desired and actual chest depth and bideltoid breadth.
 
         Parameters
         ----------
         measurements : AgentMeasures
             An object containing the measurements of the pedestrian agent.
+        use_optimizer : bool
+            Whether to always find the scalings with the optimization algorithm instead of the closed-form solution.
 
         Raises
         ------
@@ -332,16 +396,25 @@ class Shapes2D:
 
             return float(penalty_chest + penalty_shoulder_breadth)
 
-        # Optimize the scaling factors to minimize the penalty
-        bounds = np.array([[1e-5, 3.0], [1e-5, 3.0]])
-        guess_parameters = np.array([0.9, 0.9])
-        optimized_scaling = dual_annealing(
-            objectif_fun,
-            bounds=bounds,
-            maxfun=cst.NB_FUNCTION_EVALS,
-            x0=guess_parameters,
-        )
-        optimized_scale_factor_x, optimized_scale_factor_y = optimized_scaling.x
+        # Solve the scaling factors in closed form, and optimize them to minimize the penalty otherwise
+        scaling = None
+        if not use_optimizer:
+            scaling = Shapes2D.solve_pedestrian_scaling(
+                initial_pedestrian,
+                float(measurements.measures[cst.PedestrianParts.chest_depth.name]),
+                float(measurements.measures[cst.PedestrianParts.bideltoid_breadth.name]),
+            )
+        if scaling is None:
+            bounds = np.array([cst.PEDESTRIAN_SCALING_BOUNDS, cst.PEDESTRIAN_SCALING_BOUNDS])
+            guess_parameters = np.array([0.9, 0.9])
+            optimized_scaling = dual_annealing(
+                objectif_fun,
+                bounds=bounds,
+                maxfun=cst.NB_FUNCTION_EVALS,
+                x0=guess_parameters,
+            )
+            scaling = tuple(optimized_scaling.x)
+        optimized_scale_factor_x, optimized_scale_factor_y = scaling
 
         # Adjust the initial pedestrian shapes based on the optimized scaling factors
         adjusted_centers = [
@@ -351,14 +424,15 @@ class Shapes2D:
         adjusted_radii = [disk_radius * optimized_scale_factor_y for disk_radius in initial_pedestrian.get_disk_radii()]
 
         # Create the adjusted shapes for the pedestrian
-        disks = [{"center": center, "radius": radius} for center, radius in zip(adjusted_centers, adjusted_radii, strict=False)]
-        adjusted_shapes = {
+        adjusted_shapes: ShapeDataType = {
             f"disk{i}": {
                 "type": cst.ShapeTypes.disk.name,
                 "material": cst.MaterialNames.human_naked.name,
-                "object": Point(disk["center"]).buffer(disk["radius"], quad_segs=cst.DISK_QUAD_SEGS),
+                "x": float(center.x),
+                "y": float(center.y),
+                "radius": float(radius),
             }
-            for i, disk in enumerate(disks)
+            for i, (center, radius) in enumerate(zip(adjusted_centers, adjusted_radii, strict=False))
         }
 
         self.shapes = adjusted_shapes
@@ -516,6 +590,98 @@ class Shapes2D:
         }
         self.shapes = adjusted_shapes
 
+    def translate(self, dx: float, dy: float) -> None:
+        """
+        Translate all shapes by the specified offsets in x and y directions.
+
+        Only the centers of the disks are moved, the other shapes are translated with Shapely.
+
+        Parameters
+        ----------
+        dx : float
+            Translation offset along the x-axis (cm).
+        dy : float
+            Translation offset along the y-axis (cm).
+        """
+        for shape in self.shapes.values():
+            if shape["type"] == cst.ShapeTypes.disk.name:
+                shape["x"] = float(shape["x"]) + dx
+                shape["y"] = float(shape["y"]) + dy
+            else:
+                shape["object"] = affin.translate(shape["object"], xoff=dx, yoff=dy)
+
+    def rotate(self, angle: float, origin: Point) -> None:
+        """
+        Rotate all shapes around a point by the specified angle.
+
+        Only the centers of the disks are rotated, the other shapes are rotated with Shapely.
+
+        Parameters
+        ----------
+        angle : float
+            Rotation angle in degrees (positive for counter-clockwise).
+        origin : Point
+            The center of the rotation (cm).
+        """
+        # Same rotation matrix as shapely.affinity.rotate, so that right angles give exact rotations
+        cos_angle, sin_angle = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+        cos_angle = 0.0 if abs(cos_angle) < 2.5e-16 else float(cos_angle)
+        sin_angle = 0.0 if abs(sin_angle) < 2.5e-16 else float(sin_angle)
+        for shape in self.shapes.values():
+            if shape["type"] == cst.ShapeTypes.disk.name:
+                relative_x, relative_y = float(shape["x"]) - origin.x, float(shape["y"]) - origin.y
+                shape["x"] = origin.x + cos_angle * relative_x - sin_angle * relative_y
+                shape["y"] = origin.y + sin_angle * relative_x + cos_angle * relative_y
+            else:
+                shape["object"] = affin.rotate(shape["object"], angle, origin=origin, use_radians=False)
+
+    def get_shape_centroid(self, name: str) -> tuple[float, float]:
+        """
+        Return the centroid of a shape, which is the center of a disk.
+
+        Parameters
+        ----------
+        name : str
+            The name of the shape.
+
+        Returns
+        -------
+        tuple[float, float]
+            The coordinates of the centroid of the shape (cm).
+        """
+        shape = self.shapes[name]
+        if shape["type"] == cst.ShapeTypes.disk.name:
+            return float(shape["x"]), float(shape["y"])
+        centroid = self.get_shape_object(name).centroid
+        return float(centroid.x), float(centroid.y)
+
+    def get_shape_object(self, name: str) -> Polygon:
+        """
+        Return the Shapely polygon of a shape.
+
+        The polygon of a disk is built from its center and radius with ``DISK_QUAD_SEGS`` segments per quarter circle,
+        and reused as long as the disk does not change.
+
+        Parameters
+        ----------
+        name : str
+            The name of the shape.
+
+        Returns
+        -------
+        Polygon
+            The Shapely polygon of the shape (cm).
+        """
+        shape = self.shapes[name]
+        if shape["type"] != cst.ShapeTypes.disk.name:
+            return shape["object"]
+        disk = (float(shape["x"]), float(shape["y"]), float(shape["radius"]))
+        cached = self._disk_polygons.get(name)
+        if cached is None or cached[0] != disk:
+            cached = (disk, Point(disk[0], disk[1]).buffer(disk[2], quad_segs=cst.DISK_QUAD_SEGS))
+            self._disk_polygons[name] = cached
+        return cached[1]
+
     def get_geometric_shapes(self) -> list[Polygon]:
         """
         Return the geometric shapes that constitute a pedestrian physical shape.
@@ -525,7 +691,7 @@ class Shapes2D:
         list[Polygon]
             A list of Polygon objects representing the individual shapes.
         """
-        return [shape["object"] for shape in self.shapes.values()]
+        return [self.get_shape_object(name) for name in self.shapes]
 
     def get_geometric_shape(self) -> Polygon | MultiPolygon:
         """
@@ -26,9 +26,11 @@
 # you accept its terms.
 
 from dataclasses import dataclass, field
+from pathlib import Path
 
 import numpy as np
 from numpy.typing import NDArray
+from scipy.interpolate import RegularGridInterpolator
 from scipy.optimize import dual_annealing
 from shapely.affinity import scale
 from shapely.geometry import MultiPoint, MultiPolygon
@@ -77,7 +79,44 @@ class Shapes3D:
             except ValueError:
                 raise ValueError(f"Invalid height type for '{height}': {type(height)}") from None
 
-    def create_pedestrian3D(self, measurements: AgentMeasures) -> None:
+    @staticmethod
+    def lookup_pedestrian_scaling(sex: str, wanted_chest_depth: float, wanted_bideltoid_breadth: float) -> tuple[float, float] | None:
+        """
+        Interpolate the scaling factors fitting the 3D pedestrian to the wanted measures from the precomputed lookup table.
+
+        The table is built by `configuration.data.datafactory.prepare_3D_scaling_table` and can be regenerated with
+        ``python -m configuration.data.datafactory``.
+
+        Parameters
+        ----------
+        sex : str
+            The sex of the pedestrian ("male" or "female").
+        wanted_chest_depth : float
+            The wanted chest depth (cm).
+        wanted_bideltoid_breadth : float
+            The wanted bideltoid breadth (cm).
+
+        Returns
+        -------
+        tuple[float, float] | None
+            The x and y scaling factors, or None if the table is missing or does not cover the wanted measures.
+        """
+        table_path = Path(__file__).parent.parent.parent.parent.absolute() / "data" / "pkl" / "pedestrian3D_scaling_table.pkl"
+        if not table_path.exists():
+            return None
+        scaling_table = fun.load_pickle(str(table_path))[sex]
+        grid = (scaling_table[cst.PedestrianParts.chest_depth.name], scaling_table[cst.PedestrianParts.bideltoid_breadth.name])
+        wanted_measures = (wanted_chest_depth, wanted_bideltoid_breadth)
+        if not all(axis[0] <= measure <= axis[-1] for axis, measure in zip(grid, wanted_measures, strict=True)):
+            return None
+
+        scale_factor_x = float(RegularGridInterpolator(grid, scaling_table["scale_factor_x"])(wanted_measures))
+        scale_factor_y = float(RegularGridInterpolator(grid, scaling_table["scale_factor_y"])(wanted_measures))
+        if np.isnan(scale_factor_x) or np.isnan(scale_factor_y):
+            return None
+        return scale_factor_x, scale_factor_y
+
+    def create_pedestrian3D(self, measurements: AgentMeasures, use_optimizer: bool = False) -> None:
         """
         Create a 3D representation of a pedestrian based on provided measurements.
 
@@ -85,6 +124,8 @@ class Shapes3D:
         ----------
         measurements : AgentMeasures
             An object containing the target measurements of the pedestrian, including sex, bideltoid breadth, chest depth, and height.
+        use_optimizer : bool
+            Whether to always find the x and y scaling factors with the optimization algorithm instead of the lookup table.
 
         Raises
         ------
@@ -94,8 +135,10 @@ class Shapes3D:
         Notes
         -----
         - The method uses an initial pedestrian representation based on the provided sex.
-        - Scaling factors are calculated for each dimension (x, y, z) based on
-          the ratio of target measurements to initial measurements.
+        - The x and y scaling factors are interpolated from the lookup table built by `prepare_3D_scaling_table`.
+          If the table does not cover the wanted measures, or if the interpolated factors miss them by more than
+          `SCALING_TABLE_TOLERANCE`, they are optimized with dual annealing instead.
+        - The z scaling factor is the ratio of the target height to the initial height.
         """
         # Extract sex from measurements and create initial pedestrian object
         sex_name = measurements.measures[cst.PedestrianParts.sex.name]
@@ -149,11 +192,21 @@ class Shapes3D:
             penalty_bideltoid: float = (scaled_bideltoid_breadth - wanted_bideltoid_breadth) ** 2
             return float(penalty_chest + penalty_bideltoid)
 
-        # Optimize the scaling factors to minimize the penalty
-        bounds = np.array([[1e-5, 3.0], [1e-5, 3.0]])
-        guess_parameters = np.array([scale_factor_x, scale_factor_y])
-        optimized_scaling = dual_annealing(objectif_fun, bounds=bounds, x0=guess_parameters, maxfun=cst.NB_FUNCTION_EVALS)
-        optimized_scale_factor_x, optimized_scale_factor_y = optimized_scaling.x
+        # Interpolate the scaling factors from the lookup table and check that they fit the wanted measures
+        scaling = None if use_optimizer else self.lookup_pedestrian_scaling(sex_name, wanted_chest_depth, wanted_bideltoid_breadth)
+        if scaling is not None:
+            guess_parameters = np.array(scaling)
+            if objectif_fun(guess_parameters) > 2.0 * cst.SCALING_TABLE_TOLERANCE**2:
+                scaling = None
+        else:
+            guess_parameters = np.array([scale_factor_x, scale_factor_y])
+
+        # Otherwise, optimize the scaling factors to minimize the penalty
+        if scaling is None:
+            bounds = np.array([cst.PEDESTRIAN_SCALING_BOUNDS, cst.PEDESTRIAN_SCALING_BOUNDS])
+            optimized_scaling = dual_annealing(objectif_fun, bounds=bounds, x0=guess_parameters, maxfun=cst.NB_FUNCTION_EVALS)
+            scaling = tuple(optimized_scaling.x)
+        optimized_scale_factor_x, optimized_scale_factor_y = scaling
 
         # Initialize dictionary to store scaled 3D shapes
         current_body3D: ShapeDataType = {}
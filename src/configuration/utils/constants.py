@@ -54,10 +54,26 @@ M_TO_CM: float = 100.0
 DISK_QUAD_SEGS: int = 10
 #: Size of the minimum distance between two points when simplifying polygons representing one contour of a 3D agent.
 POLYGON_TOLERANCE: float = 0.04
+#: Largest difference (cm) between the coordinates of two boundary points considered aligned when measuring a breadth or depth.
+BREADTH_DEPTH_TOLERANCE: float = 1e-1
 #: Size of the altitude bins, chosen to reduce the number of contours used to represent a 3D agent
 DISTANCE_BTW_TARGET_KEYS_ALTITUDES: float = 2.0
 #: Maximum number of iterations for the dual annealing optimization algorithm used to fit the 2D shape of an agent.
 NB_FUNCTION_EVALS: int = 80
+#: Bounds of the x and y scaling factors applied to the initial pedestrian to fit its 2D shape to the wanted measures.
+PEDESTRIAN_SCALING_BOUNDS: tuple[float, float] = (1e-5, 3.0)
+#: Range of the x and y scaling factors sampled when building the lookup table of the 3D pedestrian scaling factors.
+SCALING_TABLE_FACTOR_RANGE: tuple[float, float] = (0.2, 2.5)
+#: Number of x and y scaling factors sampled when building the lookup table of the 3D pedestrian scaling factors.
+SCALING_TABLE_NB_FACTORS: int = 100
+#: Range of chest depths (cm) covered by the lookup table of the 3D pedestrian scaling factors.
+SCALING_TABLE_CHEST_DEPTH_RANGE: tuple[float, float] = (10.0, 50.0)
+#: Range of bideltoid breadths (cm) covered by the lookup table of the 3D pedestrian scaling factors.
+SCALING_TABLE_BIDELTOID_BREADTH_RANGE: tuple[float, float] = (25.0, 80.0)
+#: Step (cm) between two consecutive chest depths or bideltoid breadths of the lookup table of the 3D pedestrian scaling factors.
+SCALING_TABLE_STEP: float = 0.5
+#: Maximum error (cm) on the chest depth and bideltoid breadth accepted from the lookup table before falling back to the optimizer.
+SCALING_TABLE_TOLERANCE: float = 0.5
 #: Default number of disks used to approximate the 2D shape of a pedestrian.
 DISK_NUMBER: int = 5
 
@@ -116,6 +132,8 @@ KINETIC_FRICTION_HUMANNAKED_HUMANNAKED: float = 0.4
 # Crowd class
 #: Default number of agents in the crowd.
 DEFAULT_AGENT_NUMBER: int = 4
+#: Default number of worker processes used to create the agents of a crowd (1 creates them in the current process).
+DEFAULT_NB_WORKERS: int = 1
 #: Maximum number of attempts to place an agent in the crowd without overlap for the packing algorithm.
 MAX_NB_ITERATIONS: int = 130
 #: Default repulsion length (cm) used in the packing algorithm to avoid initial overlaps between agents.
@@ -124,6 +142,12 @@ DEFAULT_REPULSION_LENGTH: float = 5.0
 DEFAULT_DESIRED_DIRECTION: float = 0.0
 #: Boolean variable selecting between pseudo‑random orientation and perfect alignment for all agents in the crowd.
 DEFAULT_VARIABLE_ORIENTATION: bool = False
+#: Boolean variable selecting whether the packing algorithm restricts agent-agent interactions to spatially close neighbours.
+DEFAULT_NEIGHBOUR_SEARCH: bool = False
+#: Multiple of the repulsion length beyond which the repulsive force between two agents is neglected (exp(-7) ≈ 1e-3).
+REPULSION_CUTOFF_FACTOR: float = 7.0
+#: Extra distance (cm) added to the neighbour search radius, the neighbours are queried again once an agent moves by half of it.
+NEIGHBOUR_SEARCH_MARGIN: float = 10.0
 #: Large value used to represent infinity.
 INFINITE: float = 1.0e10
 #: Intensity of the random forces (degrees) applied to agents during the packing algorithm to help them escape local overlaps.
@@ -180,6 +204,34 @@ INITIAL_TANGENTIAL_RELATIVE_DISPLACEMENT_X: float = 0.0
 INITIAL_TANGENTIAL_RELATIVE_DISPLACEMENT_Y: float = 0.0
 
 
+# Mechanical layer
+#: Name of the CrowdMechanics shared library, without its platform-dependent extension (.so on Linux, .dylib on macOS).
+CROWD_MECHANICS_LIBRARY_NAME: str = "libCrowdMechanics"
+#: Kinematic quantities returned by the mechanical layer for each agent (m, m, rad, m/s, m/s, rad/s).
+MECHANICS_KINEMATICS_COLUMNS: tuple[str, ...] = ("x", "y", "theta", "vx", "vy", "omega")
+#: Driving quantities given to the mechanical layer for each agent: force along x and y (N) and torque (N.m).
+MECHANICS_DRIVING_FORCES_COLUMNS: tuple[str, ...] = ("fp_x", "fp_y", "mp")
+#: Quantities returned by the mechanical layer for each contact: the agent and its shape, the neighbouring agent and its shape
+#: (-1 for a wall), the obstacle and its wall (-1 for an agent), the normal force (N), the tangential force (N) and the
+#: tangential relative displacement (m) along x and y.
+MECHANICS_CONTACTS_COLUMNS: tuple[str, ...] = (
+    "agent",
+    "shape",
+    "neighbour",
+    "neighbour_shape",
+    "wall",
+    "corner",
+    "fn_x",
+    "fn_y",
+    "ft_x",
+    "ft_y",
+    "slip_x",
+    "slip_y",
+)
+#: Default number of frames stored in each chunk of a trajectory file written by the trajectory recorder.
+TRAJECTORY_FRAMES_PER_CHUNK: int = 500
+
+
 class BackupDataTypes(Enum):
     """Enum for backup data types."""
 
@@ -28,12 +28,15 @@
 import csv
 import io
 import pickle
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
+import shapely
 from numpy.typing import NDArray
 from scipy.stats import truncnorm
 from shapely.geometry import MultiPolygon, Polygon
@@ -42,7 +45,7 @@ import configuration.utils.constants as cst
 from configuration.utils.typing_custom import Sex
 
 
-@lru_cache(maxsize=4)
+@lru_cache(maxsize=8)
 def load_pickle(file_path: str) -> Any:
     """
     Load data from a pickle file.
@@ -74,6 +77,179 @@ def load_pickle(file_path: str) -> Any:
     return data
 
 
+class ReadOnlyDict(Mapping[Any, Any]):
+    """
+    Read-only mapping, used to share cached data between callers without copying it.
+
+    Copies return the mapping itself since it is immutable, and unpickling rebuilds a new read-only mapping.
+
+    Parameters
+    ----------
+    data : Mapping[Any, Any]
+        The items of the mapping, which are copied.
+    """
+
+    def __init__(self, data: Mapping[Any, Any]) -> None:
+        """
+        Initialize the mapping with a copy of the given items.
+
+        Parameters
+        ----------
+        data : Mapping[Any, Any]
+            The items of the mapping.
+        """
+        self._data: dict[Any, Any] = dict(data)
+
+    def __getitem__(self, key: Any) -> Any:
+        """
+        Get the value of a key.
+
+        Parameters
+        ----------
+        key : Any
+            The key.
+
+        Returns
+        -------
+        Any
+            The value of the key.
+        """
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Iterate over the keys, in insertion order.
+
+        Returns
+        -------
+        Iterator[Any]
+            An iterator over the keys.
+        """
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """
+        Get the number of items.
+
+        Returns
+        -------
+        int
+            The number of items.
+        """
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        """
+        Represent the mapping as its items.
+
+        Returns
+        -------
+        str
+            The representation of the mapping.
+        """
+        return f"{type(self).__name__}({self._data!r})"
+
+    def __copy__(self) -> "ReadOnlyDict":
+        """
+        Return the mapping itself, which is immutable.
+
+        Returns
+        -------
+        ReadOnlyDict
+            The mapping itself.
+        """
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "ReadOnlyDict":
+        """
+        Return the mapping itself, whose cached values are never modified.
+
+        Parameters
+        ----------
+        memo : dict[int, Any]
+            The memo dictionary of `copy.deepcopy`.
+
+        Returns
+        -------
+        ReadOnlyDict
+            The mapping itself.
+        """
+        return self
+
+    def __reduce__(self) -> tuple[type["ReadOnlyDict"], tuple[dict[Any, Any]]]:
+        """
+        Pickle the mapping through a plain copy of its items.
+
+        Returns
+        -------
+        tuple[type[ReadOnlyDict], tuple[dict[Any, Any]]]
+            The class and the arguments used to rebuild the mapping.
+        """
+        return type(self), (dict(self._data),)
+
+
+def load_default_database_table() -> pd.DataFrame:
+    """
+    Load the ANSURII database as a DataFrame with one row per individual.
+
+    The DataFrame is the one cached by `load_pickle` and shared by every caller, so it must not be modified.
+
+    Returns
+    -------
+    pd.DataFrame
+        The ANSURII database.
+    """
+    dir_path = Path(__file__).parent.parent.parent.parent.absolute() / "data" / "pkl"
+    database: pd.DataFrame = load_pickle(str(dir_path / "ANSUREIIPublic.pkl"))
+    return database
+
+
+@lru_cache(maxsize=1)
+def load_default_database() -> Mapping[int, Mapping[str, float | str]]:
+    """
+    Load the ANSURII database once per process, as read-only records indexed by their row in the DataFrame.
+
+    The returned dictionary is shared by every caller, so it and its records are read-only. Call
+    `clear_data_cache` after regenerating ANSUREIIPublic.pkl to reload it.
+
+    Returns
+    -------
+    Mapping[int, Mapping[str, float | str]]
+        The ANSURII records, each one mapping the column names to the values of one individual.
+    """
+    database = load_default_database_table().to_dict(orient="index")
+    return ReadOnlyDict({index: ReadOnlyDict(record) for index, record in database.items()})
+
+
+@lru_cache(maxsize=2)
+def load_body_template(sex: Sex) -> Mapping[float, MultiPolygon]:
+    """
+    Load the simplified 3D body of the initial pedestrian of the given sex once per process.
+
+    The returned dictionary is shared by every caller, so it is read-only. Call `clear_data_cache` after
+    regenerating <sex>_3dBody_light.pkl to reload it.
+
+    Parameters
+    ----------
+    sex : Sex
+        The sex of the initial pedestrian ("male" or "female").
+
+    Returns
+    -------
+    Mapping[float, MultiPolygon]
+        The horizontal slices of the 3D body indexed by their altitude (cm).
+    """
+    dir_path = Path(__file__).parent.parent.parent.parent.absolute() / "data" / "pkl"
+    return ReadOnlyDict(load_pickle(str(dir_path / f"{sex}_3dBody_light.pkl")))
+
+
+def clear_data_cache() -> None:
+    """Invalidate the process-wide cache of the pickle files, the ANSURII database and the 3D body templates."""
+    load_pickle.cache_clear()
+    load_default_database.cache_clear()
+    load_body_template.cache_clear()
+
+
 def save_pickle(data: Any, file_path: Path) -> None:
     """
     Save data to a pickle file.
@@ -226,6 +402,61 @@ def draw_from_trunc_normal(mean: float, std_dev: float, min_val: float, max_val:
     return float(truncnorm.rvs(a, b, loc=mean, scale=std_dev))
 
 
+def draw_from_trunc_normal_array(
+    mean: float | NDArray[np.float64],
+    std_dev: float | NDArray[np.float64],
+    min_val: float | NDArray[np.float64],
+    max_val: float | NDArray[np.float64],
+    size: int,
+) -> NDArray[np.float64]:
+    """
+    Draw several samples at once from truncated normal distributions.
+
+    This is the vectorized counterpart of `draw_from_trunc_normal`: the parameters are either scalars or arrays
+    of length `size`, in which case each sample is drawn from its own distribution.
+
+    Parameters
+    ----------
+    mean : float | NDArray[np.float64]
+        The mean of the normal distributions.
+    std_dev : float | NDArray[np.float64]
+        The standard deviation of the normal distributions.
+    min_val : float | NDArray[np.float64]
+        The lower bound of the truncated normal distributions.
+    max_val : float | NDArray[np.float64]
+        The upper bound of the truncated normal distributions.
+    size : int
+        The number of samples to draw.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        The samples drawn from the truncated normal distributions.
+
+    Raises
+    ------
+    ValueError
+        If any std_dev is less than or equal to zero, or if any min_val is greater than or equal to max_val.
+    """
+    mean, std_dev = np.asarray(mean, dtype=np.float64), np.asarray(std_dev, dtype=np.float64)
+    min_val, max_val = np.asarray(min_val, dtype=np.float64), np.asarray(max_val, dtype=np.float64)
+    if np.any(std_dev <= 0):
+        raise ValueError("Standard deviation must be greater than zero.")
+
+    if np.any(min_val >= max_val):
+        raise ValueError("min_val must be less than max_val.")
+
+    if size == 0:
+        return np.empty(0, dtype=np.float64)
+
+    # Calculate standardized bounds for truncation
+    a = (min_val - mean) / std_dev
+    b = (max_val - mean) / std_dev
+
+    # Draw the samples from the truncated normal distributions
+    return np.asarray(truncnorm.rvs(a, b, loc=mean, scale=std_dev, size=size), dtype=np.float64)
+
+
 def draw_sex(p: float) -> Sex:
     """
     Randomly draw a sex (`male` or `female`) based on the input proportion of `male`.
@@ -298,50 +529,108 @@ def compute_moment_of_inertia(geometric_shape: Polygon | MultiPolygon, weight: f
     -----
     For the MultiPolygon case, it computes the moment of inertia for each polygon and sums them up, weighted by their respective areas.
     """
+    return float(compute_moments_of_inertia([geometric_shape], [weight])[0])
 
-    def polygon_inertia(polygon: Polygon, poly_weight: float) -> float:
-        """
-        Compute the moment of inertia for a 2D Polygon.
 
-        Parameters
-        ----------
-        polygon : Polygon
-            The geometrical representation as a Polygon object (cm).
-        poly_weight : float
-            The agent weight (kg).
+def compute_moments_of_inertia(
+    geometric_shapes: list[Polygon | MultiPolygon], weights: list[float] | NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Compute the moments of inertia of several 2D Polygons or MultiPolygons at once.
 
-        Returns
-        -------
-        float
-            The moment of inertia of the polygon (kg·m²).
-        """
-        vertices = np.array(polygon.exterior.coords)
-        centroid = np.array(polygon.centroid.coords[0])
-        vertices = vertices - centroid  # Shift to centroid
-        N = len(vertices) - 1  # Last point repeats the first
-        rho = poly_weight / polygon.area  # Density (mass per unit area)
-        I_z = 0.0
-        for n in range(N):
-            Pn = np.array(vertices[n])
-            Pn1 = np.array(vertices[(n + 1) % N])
-            cross_product_magnitude = abs(cross2d(Pn, Pn1))
-            dot_product_terms = np.dot(Pn, Pn) + np.dot(Pn, Pn1) + np.dot(Pn1, Pn1)
-            I_z += cross_product_magnitude * dot_product_terms
-        moment_of_inertia: float = rho * I_z / 12.0
-        moment_of_inertia *= 1e-4  # convert to kg·m^2
-        return moment_of_inertia
-
-    if isinstance(geometric_shape, Polygon):
-        return polygon_inertia(geometric_shape, weight)
-    if isinstance(geometric_shape, MultiPolygon):
-        total_area = geometric_shape.area
-        moment = 0.0
-        for poly in geometric_shape.geoms:
-            poly_area = poly.area
-            poly_weight = weight * (poly_area / total_area)
-            moment += polygon_inertia(poly, poly_weight)
-        return moment
-    raise TypeError("Input must be a Shapely Polygon or MultiPolygon.")
+    The vertices of all the shapes are gathered in a single array with ``shapely.get_coordinates``, and the contribution of
+    each edge is computed in a vectorized way, then summed per polygon. Each polygon is given a share of the weight of its
+    shape proportional to its area, and its moment of inertia is computed about its own centroid, as in
+    `compute_moment_of_inertia`.
+
+    Parameters
+    ----------
+    geometric_shapes : list[Polygon | MultiPolygon]
+        The geometrical representations as shapely Polygon or MultiPolygon objects (cm).
+    weights : list[float] | NDArray[np.float64]
+        The weights of the agents (kg), one per shape.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        The moment of inertia of each shape (kg·m²).
+
+    Raises
+    ------
+    TypeError
+        If a shape is not a Shapely Polygon or MultiPolygon.
+    ValueError
+        If the number of weights differs from the number of shapes.
+    """
+    if not all(isinstance(geometric_shape, (Polygon, MultiPolygon)) for geometric_shape in geometric_shapes):
+        raise TypeError("Input must be a Shapely Polygon or MultiPolygon.")
+    weights_array = np.asarray(weights, dtype=np.float64)
+    if weights_array.shape != (len(geometric_shapes),):
+        raise ValueError(f"Expected {len(geometric_shapes)} weights, got an array of shape {weights_array.shape}.")
+
+    shapes = np.array(geometric_shapes, dtype=object)
+    polygons, shape_index = shapely.get_parts(shapes, return_index=True)
+    polygon_areas = shapely.area(polygons)
+    polygon_weights = weights_array[shape_index] * (polygon_areas / shapely.area(shapes)[shape_index])
+    centroids = shapely.get_coordinates(shapely.centroid(polygons))
+
+    # Vertices of the exterior of each polygon, shifted to its centroid. The edges join consecutive vertices of a ring.
+    vertices, polygon_index = shapely.get_coordinates(shapely.get_exterior_ring(polygons), return_index=True)
+    vertices -= centroids[polygon_index]
+    Pn, Pn1 = vertices[:-1], vertices[1:]
+    is_edge = polygon_index[:-1] == polygon_index[1:]
+    cross_product_magnitude = np.abs(Pn[:, 0] * Pn1[:, 1] - Pn[:, 1] * Pn1[:, 0])
+    dot_product_terms = np.einsum("ij,ij->i", Pn, Pn) + np.einsum("ij,ij->i", Pn, Pn1) + np.einsum("ij,ij->i", Pn1, Pn1)
+    I_z = np.bincount(
+        polygon_index[:-1][is_edge], weights=(cross_product_magnitude * dot_product_terms)[is_edge], minlength=len(polygons)
+    )
+
+    rho = polygon_weights / polygon_areas  # Density (mass per unit area)
+    polygon_moments = rho * I_z / 12.0
+    polygon_moments *= 1e-4  # convert to kg·m^2
+    return np.bincount(shape_index, weights=polygon_moments, minlength=len(geometric_shapes))
+
+
+def compute_disk_intersection_areas(
+    distances: NDArray[np.float64], radii_a: NDArray[np.float64], radii_b: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Compute the exact areas of the intersections (lenses) of pairs of disks.
+
+    For more details on the area of the intersection of two circles, refer to:
+    https://mathworld.wolfram.com/Circle-CircleIntersection.html.
+
+    Parameters
+    ----------
+    distances : NDArray[np.float64]
+        The distances between the centers of the disks of each pair.
+    radii_a : NDArray[np.float64]
+        The radii of the first disk of each pair.
+    radii_b : NDArray[np.float64]
+        The radii of the second disk of each pair.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        The area of the intersection of the disks of each pair, in the square of the unit of the inputs.
+    """
+    distances, radii_a, radii_b = np.broadcast_arrays(
+        np.asarray(distances, dtype=np.float64), np.asarray(radii_a, dtype=np.float64), np.asarray(radii_b, dtype=np.float64)
+    )
+    areas = np.zeros(distances.shape)
+
+    # One disk lies inside the other one
+    nested = distances <= np.abs(radii_a - radii_b)
+    areas[nested] = np.pi * np.minimum(radii_a[nested], radii_b[nested]) ** 2
+
+    # The circles cross each other
+    crossing = ~nested & (distances < radii_a + radii_b)
+    d, r_a, r_b = distances[crossing], radii_a[crossing], radii_b[crossing]
+    cos_half_angle_a = np.clip((d**2 + r_a**2 - r_b**2) / (2.0 * d * r_a), -1.0, 1.0)
+    cos_half_angle_b = np.clip((d**2 + r_b**2 - r_a**2) / (2.0 * d * r_b), -1.0, 1.0)
+    kite_area = 0.5 * np.sqrt(np.maximum((-d + r_a + r_b) * (d + r_a - r_b) * (d - r_a + r_b) * (d + r_a + r_b), 0.0))
+    areas[crossing] = r_a**2 * np.arccos(cos_half_angle_a) + r_b**2 * np.arccos(cos_half_angle_b) - kite_area
+    return areas
 
 
 def validate_material(material: str) -> None:
@@ -385,6 +674,117 @@ def rotate_vectors(vector_dict: dict[str, tuple[float, float]], theta: float) ->
     return rotated_dict
 
 
+def _compute_range_extrema(
+    values: NDArray[np.float64], starts: NDArray[np.int64], ends: NDArray[np.int64]
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Compute the minimum and maximum of ``values[start:end]`` for many non-empty ranges at once.
+
+    The extrema are read in a sparse table, where level ``k`` holds the extrema of the ``2**k`` consecutive values
+    starting at each index, so that each range is covered by two overlapping power-of-two blocks.
+
+    Parameters
+    ----------
+    values : NDArray[np.float64]
+        The values, of shape (n,).
+    starts : NDArray[np.int64]
+        The first index of each range.
+    ends : NDArray[np.int64]
+        The index after the last one of each range, larger than the first index.
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.float64]]
+        The minimum and the maximum of the values over each range.
+    """
+    range_minima = np.empty(len(starts))
+    range_maxima = np.empty(len(starts))
+    if len(starts) == 0:
+        return range_minima, range_maxima
+
+    # Level of the largest power-of-two block that fits in each range
+    levels = np.frexp((ends - starts).astype(np.float64))[1] - 1
+    block_minima, block_maxima = values, values
+    for level in range(int(levels.max()) + 1):
+        if level > 0:
+            half_block = 1 << (level - 1)
+            block_minima = np.minimum(block_minima[:-half_block], block_minima[half_block:])
+            block_maxima = np.maximum(block_maxima[:-half_block], block_maxima[half_block:])
+        in_level = levels == level
+        first_block = starts[in_level]
+        last_block = ends[in_level] - (1 << level)
+        range_minima[in_level] = np.minimum(block_minima[first_block], block_minima[last_block])
+        range_maxima[in_level] = np.maximum(block_maxima[first_block], block_maxima[last_block])
+    return range_minima, range_maxima
+
+
+def _compute_largest_aligned_distances(multi_polygons: list[MultiPolygon], axis: int) -> NDArray[np.float64]:
+    """
+    Compute the largest distance along an axis between two points of the boundary of each MultiPolygon.
+
+    Only pairs of points whose coordinates along the other axis differ by at most ``BREADTH_DEPTH_TOLERANCE`` are
+    considered. The points of all the MultiPolygons are sorted at once by MultiPolygon and by coordinate along the other
+    axis, so that the points aligned with each point form a window of the sorted array, whose extrema along the measured
+    axis are read with `_compute_range_extrema`.
+
+    Parameters
+    ----------
+    multi_polygons : list[MultiPolygon]
+        The MultiPolygon objects to measure.
+    axis : int
+        The axis along which the distances are measured: 0 for x, 1 for y.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        The largest distance for each MultiPolygon.
+
+    Raises
+    ------
+    ValueError
+        If an input is not a Shapely MultiPolygon.
+    """
+    if not all(isinstance(multi_polygon, MultiPolygon) for multi_polygon in multi_polygons):
+        raise ValueError("Input must be a Shapely MultiPolygon object.")
+    max_distances = np.zeros(len(multi_polygons))
+    if len(multi_polygons) == 0:
+        return max_distances
+
+    # Combine boundary coordinates from all polygons, subtracting the centroid of their MultiPolygon
+    geometries = np.array(multi_polygons, dtype=object)
+    all_coords, owners = shapely.get_coordinates(shapely.boundary(geometries), return_index=True)
+    all_coords -= shapely.get_coordinates(shapely.centroid(geometries))[owners]
+
+    # Sort points by MultiPolygon, then by their coordinate along the other axis
+    order = np.lexsort((all_coords[:, 1 - axis], owners))
+    owners = owners[order]
+    measured = all_coords[order, axis]
+    aligned = all_coords[order, 1 - axis]
+
+    # The points aligned with a point are those that follow it in the same MultiPolygon, up to the tolerance. The ends of
+    # these windows are searched on a key that increases along the sorted points, then corrected to match the test exactly.
+    n_points = len(measured)
+    points = np.arange(n_points)
+    owner_ends = np.searchsorted(owners, owners, side="right")
+    key_spacing = float(np.ptp(aligned)) + 2.0 * cst.BREADTH_DEPTH_TOLERANCE + 1.0
+    sort_key = owners * key_spacing + (aligned - aligned.min())
+    window_ends = np.clip(np.searchsorted(sort_key, sort_key + cst.BREADTH_DEPTH_TOLERANCE, side="right"), points + 1, owner_ends)
+    while True:
+        too_short = window_ends < owner_ends
+        too_short[too_short] = aligned[window_ends[too_short]] - aligned[too_short] <= cst.BREADTH_DEPTH_TOLERANCE
+        too_long = aligned[window_ends - 1] - aligned > cst.BREADTH_DEPTH_TOLERANCE
+        if not (too_short.any() or too_long.any()):
+            break
+        window_ends += too_short.astype(np.int64) - too_long.astype(np.int64)
+
+    # Largest distance between each point and the points of its window, then over the points of each MultiPolygon
+    window_minima, window_maxima = _compute_range_extrema(measured, points, window_ends)
+    point_distances = np.maximum(window_maxima - measured, measured - window_minima)
+    first_points = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    max_distances[owners[first_points]] = np.maximum.reduceat(point_distances, first_points)
+    return max_distances
+
+
 def compute_bideltoid_breadth_from_multipolygon(multi_polygon: MultiPolygon) -> float:
     """
     Compute the largest horizontal distance (bideltoid breadth) between points in a MultiPolygon object.
@@ -404,34 +804,25 @@ def compute_bideltoid_breadth_from_multipolygon(multi_polygon: MultiPolygon) ->
     To accelerate that function, only pairs of points with almost the same y-coordinate are considered.
     Therefore it is assumed that the input is a MultiPolygon object coming from the body3D of a pedestrian that has not been rotated.
     """
-    if not isinstance(multi_polygon, MultiPolygon):
-        raise ValueError("Input must be a Shapely MultiPolygon object.")
+    return float(compute_bideltoid_breadths_from_multipolygons([multi_polygon])[0])
 
-    # Assuming multi_polygon is a Shapely MultiPolygon object
-    center_of_mass = multi_polygon.centroid
 
-    # Combine boundary coordinates from all polygons, subtracting centroid
-    all_coords = np.array(
-        [(coord[0] - center_of_mass.x, coord[1] - center_of_mass.y) for poly in multi_polygon.geoms for coord in poly.boundary.coords]
-    )
-
-    # Sort points by their y-coordinate
-    sorted_coords = all_coords[np.argsort(all_coords[:, 1])]
+def compute_bideltoid_breadths_from_multipolygons(multi_polygons: list[MultiPolygon]) -> NDArray[np.float64]:
+    """
+    Compute the bideltoid breadth of several MultiPolygon objects at once, such as all the slices of a 3D body.
 
-    # Use a sliding window to find pairs of points with similar y-coordinates
-    tolerance = 1e-1  # Adjust this value based on precision needs
-    max_distance = 0.0
-    i = 0
-    while i < len(sorted_coords):
-        j = i + 1
-        while j < len(sorted_coords) and abs(sorted_coords[j, 1] - sorted_coords[i, 1]) <= tolerance:
-            # Compute horizontal distance (x-difference)
-            distance = abs(sorted_coords[j, 0] - sorted_coords[i, 0])
-            max_distance = max(max_distance, distance)
-            j += 1
-        i += 1
+    Parameters
+    ----------
+    multi_polygons : list[MultiPolygon]
+        The MultiPolygon objects.
 
-    return max_distance
+    Returns
+    -------
+    NDArray[np.float64]
+        The largest horizontal distance (bideltoid breadth) of each MultiPolygon, as computed by
+        `compute_bideltoid_breadth_from_multipolygon`.
+    """
+    return _compute_largest_aligned_distances(multi_polygons, axis=0)
 
 
 def compute_chest_depth_from_multipolygon(multi_polygon: MultiPolygon) -> float:
@@ -453,34 +844,25 @@ def compute_chest_depth_from_multipolygon(multi_polygon: MultiPolygon) -> float:
     To accelerate that function, only pairs of points with almost the same x-coordinate are considered.
     Therefore it is assumed that the input is a MultiPolygon object coming from the body3D of a pedestrian that has not been rotated.
     """
-    if not isinstance(multi_polygon, MultiPolygon):
-        raise ValueError("Input must be a Shapely MultiPolygon object.")
+    return float(compute_chest_depths_from_multipolygons([multi_polygon])[0])
 
-    # Assuming multi_polygon is a Shapely MultiPolygon object
-    center_of_mass = multi_polygon.centroid
 
-    # Combine boundary coordinates from all polygons, subtracting centroid
-    all_coords = np.array(
-        [(coord[0] - center_of_mass.x, coord[1] - center_of_mass.y) for poly in multi_polygon.geoms for coord in poly.boundary.coords]
-    )
-
-    # Sort points by their x-coordinate
-    sorted_coords = all_coords[np.argsort(all_coords[:, 0])]
+def compute_chest_depths_from_multipolygons(multi_polygons: list[MultiPolygon]) -> NDArray[np.float64]:
+    """
+    Compute the chest depth of several MultiPolygon objects at once, such as all the slices of a 3D body.
 
-    # Use a sliding window to find pairs of points with similar x-coordinates
-    tolerance = 1e-1  # Adjust this value based on precision needs
-    max_distance = 0.0
-    i = 0
-    while i < len(sorted_coords):
-        j = i + 1
-        while j < len(sorted_coords) and abs(sorted_coords[j, 0] - sorted_coords[i, 0]) <= tolerance:
-            # Compute vertical distance (y-difference)
-            distance = abs(sorted_coords[j, 1] - sorted_coords[i, 1])
-            max_distance = max(max_distance, distance)
-            j += 1
-        i += 1
+    Parameters
+    ----------
+    multi_polygons : list[MultiPolygon]
+        The MultiPolygon objects.
 
-    return max_distance
+    Returns
+    -------
+    NDArray[np.float64]
+        The largest vertical distance (chest depth) of each MultiPolygon, as computed by
+        `compute_chest_depth_from_multipolygon`.
+    """
+    return _compute_largest_aligned_distances(multi_polygons, axis=1)
 
 
 def from_string_to_tuple(string: str) -> tuple[float, float]:
@@ -741,3 +1123,28 @@ def G_from_E_nu(E: float, nu: float) -> float:
     The elastic moduli are assumed to be for 2D systems and thus have units of N/m.
     """
     return E / (2 * (1 + nu))
+
+
+@contextmanager
+def temporary_random_seed(seed: int) -> Iterator[None]:
+    """
+    Seed the global NumPy random state within a context, and restore it afterwards.
+
+    The measures drawing and the optimizers used to fit the shapes all rely on the global NumPy random state.
+
+    Parameters
+    ----------
+    seed : int
+        The seed of the global NumPy random state within the context.
+
+    Yields
+    ------
+    None
+        Control is yielded back to the caller with the seeded random state.
+    """
+    random_state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        yield
+    finally:
+        np.random.set_state(random_state)
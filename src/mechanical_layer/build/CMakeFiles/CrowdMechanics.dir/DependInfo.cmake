@@ -0,0 +1,33 @@
+
+# Consider dependencies only in project.
+set(CMAKE_DEPENDS_IN_PROJECT_ONLY OFF)
+
+# The set of languages for which implicit dependencies are needed:
+set(CMAKE_DEPENDS_LANGUAGES
+  )
+
+# The set of dependency files which are needed:
+set(CMAKE_DEPENDS_DEPENDENCY_FILES
+  "/root/package/src/mechanical_layer/3rdparty/tinyxml/tinyxml2.cpp" "CMakeFiles/CrowdMechanics.dir/3rdparty/tinyxml/tinyxml2.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/3rdparty/tinyxml/tinyxml2.cpp.o.d"
+  "/root/package/src/mechanical_layer/src/Agent.cpp" "CMakeFiles/CrowdMechanics.dir/src/Agent.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/src/Agent.cpp.o.d"
+  "/root/package/src/mechanical_layer/src/Crowd.cpp" "CMakeFiles/CrowdMechanics.dir/src/Crowd.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/src/Crowd.cpp.o.d"
+  "/root/package/src/mechanical_layer/src/Global.cpp" "CMakeFiles/CrowdMechanics.dir/src/Global.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/src/Global.cpp.o.d"
+  "/root/package/src/mechanical_layer/src/InputStatic.cpp" "CMakeFiles/CrowdMechanics.dir/src/InputStatic.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/src/InputStatic.cpp.o.d"
+  "/root/package/src/mechanical_layer/src/Main.cpp" "CMakeFiles/CrowdMechanics.dir/src/Main.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/src/Main.cpp.o.d"
+  "/root/package/src/mechanical_layer/src/MechanicalLayer.cpp" "CMakeFiles/CrowdMechanics.dir/src/MechanicalLayer.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/src/MechanicalLayer.cpp.o.d"
+  "/root/package/src/mechanical_layer/src/Simulation.cpp" "CMakeFiles/CrowdMechanics.dir/src/Simulation.cpp.o" "gcc" "CMakeFiles/CrowdMechanics.dir/src/Simulation.cpp.o.d"
+  )
+
+# Pairs of files generated by the same build rule.
+set(CMAKE_MULTIPLE_OUTPUT_PAIRS
+  "/root/package/src/mechanical_layer/build/libCrowdMechanics.so" "/root/package/src/mechanical_layer/build/libCrowdMechanics.so.1.0.1"
+  "/root/package/src/mechanical_layer/build/libCrowdMechanics.so.1" "/root/package/src/mechanical_layer/build/libCrowdMechanics.so.1.0.1"
+  )
+
+
+# Targets to which this target links.
+set(CMAKE_TARGET_LINKED_INFO_FILES
+  )
+
+# Fortran module output directory.
+set(CMAKE_Fortran_TARGET_MODULE_DIR "")
@@ -0,0 +1,27 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/CrowdMechanics.dir/3rdparty/tinyxml/tinyxml2.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/3rdparty/tinyxml/tinyxml2.cpp.o.d"
+  "CMakeFiles/CrowdMechanics.dir/src/Agent.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/src/Agent.cpp.o.d"
+  "CMakeFiles/CrowdMechanics.dir/src/Crowd.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/src/Crowd.cpp.o.d"
+  "CMakeFiles/CrowdMechanics.dir/src/Global.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/src/Global.cpp.o.d"
+  "CMakeFiles/CrowdMechanics.dir/src/InputStatic.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/src/InputStatic.cpp.o.d"
+  "CMakeFiles/CrowdMechanics.dir/src/Main.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/src/Main.cpp.o.d"
+  "CMakeFiles/CrowdMechanics.dir/src/MechanicalLayer.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/src/MechanicalLayer.cpp.o.d"
+  "CMakeFiles/CrowdMechanics.dir/src/Simulation.cpp.o"
+  "CMakeFiles/CrowdMechanics.dir/src/Simulation.cpp.o.d"
+  "libCrowdMechanics.pdb"
+  "libCrowdMechanics.so"
+  "libCrowdMechanics.so.1"
+  "libCrowdMechanics.so.1.0.1"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang CXX)
+  include(CMakeFiles/CrowdMechanics.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
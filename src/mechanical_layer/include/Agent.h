@@ -69,7 +69,7 @@ struct Agent
           const std::vector<double>& radius_shapes, double theta_body_init, double mass, double moi);
     ~Agent();
 
-    void move();
+    void move(double dt);
     /**
      * @brief The method gets the current position of the agent
      *
@@ -28,15 +28,29 @@
 #ifndef SRC_MECHANICAL_LAYER_INCLUDE_CROWDMECHANICS_H_
 #define SRC_MECHANICAL_LAYER_INCLUDE_CROWDMECHANICS_H_
 
-#include "Crowd.h"
 #include "Global.h"
-#include "InputStatic.h"
+#include "Simulation.h"
 
 /*  Main    */
 extern "C"
 {
     //  extern C is a trick for Python ctypes to work
     int CrowdMechanics(char** files);
+
+    /*  Handle-based API: each handle is an independent simulation  */
+    Simulation* CrowdMechanicsCreate(char** files);
+    int CrowdMechanicsStep(Simulation* simulation, const char* dynamicsFile);
+    uint32_t CrowdMechanicsGetNumberAgents(const Simulation* simulation);
+    const char* CrowdMechanicsGetAgentId(const Simulation* simulation, uint32_t agent);
+    int CrowdMechanicsGetKinematics(const Simulation* simulation, double* kinematics);
+    int CrowdMechanicsSetKinematics(Simulation* simulation, const double* kinematics);
+    int CrowdMechanicsSetDrivingForces(Simulation* simulation, const double* drivingForces);
+    int CrowdMechanicsWriteDynamicsFile(const Simulation* simulation, const char* dynamicsFile);
+    int CrowdMechanicsSetNumberThreads(Simulation* simulation, uint32_t nThreads);
+    uint32_t CrowdMechanicsGetNumberSubSteps(const Simulation* simulation);
+    uint32_t CrowdMechanicsGetNumberContacts(const Simulation* simulation);
+    int CrowdMechanicsGetContacts(const Simulation* simulation, double* contacts);
+    void CrowdMechanicsDestroy(Simulation* simulation);
 }
 
 #endif   // SRC_MECHANICAL_LAYER_INCLUDE_CROWDMECHANICS_H_
@@ -54,29 +54,8 @@ extern int2 operator+(int2 const& a, int2 const& b);
 extern int2 operator-(int2 const& a, int2 const& b);
 extern int2 operator*(int2 const& a, int2 const& b);
 /*
-    Global variables
+    Material properties
                         */
-extern bool loadStaticData;
-
-//  Geometry
-extern std::vector<std::vector<double2>> listObstacles;
-extern double Lx;
-extern double Ly;
-
-extern uint32_t nAgents;                           //  Number of agents
-extern std::map<std::string, uint32_t> agentMap;   //  Correspondence between user-given ids and internal ids
-extern std::vector<std::string> agentMapInverse;   //  Inverse version for output
-struct Agent;                                      //  Defined in Agents.h
-extern Agent** agents;                             //  The array of pointers to the agent objects
-
-//  Time variables
-extern double dt;        //  Time between two calls of the library
-extern double dt_mech;   //  Time step of the mechanical layer
-
-/*  Mechanical layer    */
-extern std::vector<double2> agentProperties;   //  1 / tau_mech: translational and rotational damping
-extern uint32_t nMaterials;
-extern double** intrinsicProperties;
 constexpr int nIntrinsicProperties = 2;
 #if !defined(DOXYGEN_SHOULD_SKIP_THIS)
 enum __attribute__((__packed__))
@@ -85,7 +64,6 @@ enum __attribute__((__packed__))
     SHEAR_MODULUS = 1,   //  G
 };
 #endif   // DOXYGEN_SHOULD_SKIP_THIS
-extern double*** binaryProperties;
 constexpr int nBinaryProperties = 5;
 #if !defined(DOXYGEN_SHOULD_SKIP_THIS)
 enum __attribute__((__packed__))
@@ -97,18 +75,36 @@ enum __attribute__((__packed__))
     FRICTION_SLIDING = 4,       //  mu_dyn
 };
 #endif   // DOXYGEN_SHOULD_SKIP_THIS
-extern std::vector<int32_t> obstaclesMaterial;
-extern std::map<uint32_t, int32_t> shapesMaterial;
-
-//  Paths
-extern std::string pathStatic;
-extern std::string pathDynamic;
+/*
+    Contacts output
+                    */
+constexpr int nContactValues = 12;
+#if !defined(DOXYGEN_SHOULD_SKIP_THIS)
+enum __attribute__((__packed__))
+{
+    CONTACT_AGENT = 0,             //  Agent, in the order of the Agents file
+    CONTACT_SHAPE = 1,             //  Shape of the agent
+    CONTACT_NEIGHBOUR = 2,         //  Neighbouring agent, -1 for a wall
+    CONTACT_NEIGHBOUR_SHAPE = 3,   //  Shape of the neighbouring agent, -1 for a wall
+    CONTACT_WALL = 4,              //  Obstacle, -1 for an agent
+    CONTACT_CORNER = 5,            //  Wall (corner) of the obstacle, -1 for an agent
+    CONTACT_FORCE_ORTHO = 6,       //  Fn, 2 values
+    CONTACT_FORCE_TAN = 8,         //  Ft, 2 values
+    CONTACT_SLIP = 10,             //  Tangential relative displacement, 2 values
+};
+#endif   // DOXYGEN_SHOULD_SKIP_THIS
 
 /*
     Model parameters and user-defined constants
                                                 */
 //  Maximum speed of an agent
 constexpr double vMaxAgent = 7.;
+//  Adaptive time step of the mechanical layer: largest sub-step during a contact, as a fraction of the inverse of the angular
+//  frequency (or of the damping rate) of the contact
+constexpr double adaptiveStiffnessFactor = 0.05;
+//  Adaptive time step of the mechanical layer: largest growth of an indentation during a sub-step, as a fraction of the
+//  radius of the smaller shape
+constexpr double adaptiveIndentationFactor = 0.01;
 
 /*
     Function declarations
@@ -117,8 +113,7 @@ constexpr double vMaxAgent = 7.;
 std::pair<int, double2> parse2DComponents(const char* line);
 
 //  Physics
-inline double get_interval(const double x, const double length);
+double get_interval(const double x, const double length);
 std::pair<double, double2> get_distance_to_wall_and_closest_point(double2 vertexA, double2 vertexB, const double2& C);
-double get_distance(const double2& A, const double2& B);
 
 #endif   // SRC_MECHANICAL_LAYER_INCLUDE_GLOBAL_H_
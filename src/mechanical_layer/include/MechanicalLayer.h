@@ -28,8 +28,14 @@
 #ifndef SRC_MECHANICAL_LAYER_INCLUDE_MECHANICALLAYER_H_
 #define SRC_MECHANICAL_LAYER_INCLUDE_MECHANICALLAYER_H_
 
+#include <cstdint>
+#include <functional>
+#include <unordered_map>
+#include <utility>
+
 #include "Agent.h"
 #include "Global.h"
+#include "Simulation.h"
 
 //  Helper list to make indices explicit
 #if !defined(DOXYGEN_SHOULD_SKIP_THIS)
@@ -40,6 +46,41 @@ enum __attribute__((__packed__)) interactionsOutput_e
     FORCE_TAN = 2,
 };
 #endif   // DOXYGEN_SHOULD_SKIP_THIS
+
+/**
+ * @brief Hash of the keys of the contacts, (shape, shape) or (shape, obstacle, wall), stored in hash tables.
+ */
+struct ContactHash
+{
+    size_t operator()(const std::pair<unsigned, unsigned>& contact) const
+    {
+        return std::hash<uint64_t>()((static_cast<uint64_t>(contact.first) << 32) | contact.second);
+    }
+    size_t operator()(const std::tuple<unsigned, int, int>& contact) const
+    {
+        uint64_t wall = (static_cast<uint64_t>(static_cast<uint32_t>(std::get<1>(contact))) << 16) ^
+                        static_cast<uint64_t>(static_cast<uint32_t>(std::get<2>(contact)));
+        return std::hash<uint64_t>()((static_cast<uint64_t>(std::get<0>(contact)) << 32) ^ wall);
+    }
+};
+
+/**
+ * @brief Contacts of one shape that start or end while its forces are computed.
+ *
+ * The forces on the shapes may be computed by several threads: the contact tables are then only read, or updated in place
+ * for the contacts of the shape, and the contacts that start or end are recorded here to be applied once all the shapes
+ * are done.
+ */
+struct ContactChanges
+{
+    std::vector<std::pair<unsigned, double2>> startedContacts;             //  Neighbouring shape and slip of new contacts
+    std::vector<std::pair<unsigned, std::array<double2, 3>>> newOutputs;   //  Neighbouring shape and output of new contacts
+    std::vector<unsigned> endedContacts;                                   //  Neighbouring shape of ended contacts
+    std::vector<std::pair<int2, double2>> startedWallContacts;             //  (Obstacle, wall) and slip of new contacts
+    std::vector<std::pair<int2, std::array<double2, 3>>> newWallOutputs;   //  (Obstacle, wall) and output of new contacts
+    std::vector<int2> endedWallContacts;                                   //  (Obstacle, wall) of ended contacts
+};
+
 struct MechanicalLayer
 /**
  * @brief Class representing the mechanical behavior of a crowd of pedestrians.
@@ -48,64 +89,93 @@ struct MechanicalLayer
  * It keeps track of the positions, velocities, orientations, and forces acting on each pedestrian.
  * The class also provides methods for updating the positions and velocities of the pedestrians
  * and saving the configuration to a file.
+ *
+ * A simulation keeps a single instance, created when it is initialised, as a workspace that is reused by every call to
+ * run(): its vectors keep their memory from one decisional step to the next, and the tangential relative displacements
+ * of the contacts stay in memory instead of being read back from the Interactions file.
  */
 {
    private:
-    unsigned nb_active_agents;      //  Number of mechanically active agens
-    unsigned nb_active_shapes;      //  Number of pedestrians (each pedestrian is a collection of active agents)
-    std::vector<double2> vgn;       //  Velocity of the center of mass (CM) of each pedestrian at t
-    std::vector<double2> vgnp1;     //  Velocity of the CM of each pedestrian at t+dt
-    std::vector<double2> rgcomp;    //  Initial positions of all the components of the pedestrians
-    std::vector<double2> rgn;       //  Positions of the CM of each pedestrian at t
-    std::vector<double2> rgnp1;     //  Positions of the CM of each pedestrian at t+dt
-    std::vector<double2> delta;     //  Difference between position of the CM of each component and
-                                    //  the CM of their associated pedestrian
-    std::vector<double> thetn;      //  Orientation wrt x-axis at t
-    std::vector<double> thetnp1;    //  Orientation wrt x-axis at t+dt
-    std::vector<double> wn;         //  Angular velocity at t
-    std::vector<double> wnp1;       //  Angular velocity at t+dt
-    std::vector<double> wdesired;   //  Desired orientation wrt x-axis
-                                    //  Forces have the dimension of an acceleration
-    std::vector<double2> Fp;        //  Propelling force v_des/tau_mech
-    std::vector<double2> Forthon;   //  Orthogonal force (hertz) wrt contact surface at time t
-    std::vector<double2> Ftn;       //  Tangential force wrt contact surface at time t
-    std::vector<double> taun;       //  Torque at time t (moment projected on z-axis) expressed at the CM
-    std::vector<std::list<int>> neighbours;
+    Simulation& sim;                  //  The simulation the mechanically active agents belong to
+    double dt_mech;                   //  Time step of the mechanical layer
+    unsigned nbThreads;               //  Number of threads computing the forces on the shapes
+    std::string interactionsFile;     //  Output Interactions file
+    unsigned nb_active_agents;        //  Number of mechanically active agens
+    unsigned nb_active_shapes;        //  Number of pedestrians (each pedestrian is a collection of active agents)
+    std::vector<double2> vgn;         //  Velocity of the center of mass (CM) of each pedestrian at t
+    std::vector<double2> vgnp1;       //  Velocity of the CM of each pedestrian at t+dt
+    std::vector<double2> rgn;         //  Positions of the CM of each pedestrian at t
+    std::vector<double2> rgnp1;       //  Positions of the CM of each pedestrian at t+dt
+    std::vector<double2> delta;       //  Difference between position of the CM of each component and
+                                      //  the CM of their associated pedestrian
+    std::vector<double> thetn;        //  Orientation wrt x-axis at t
+    std::vector<double> thetnp1;      //  Orientation wrt x-axis at t+dt
+    std::vector<double> wn;           //  Angular velocity at t
+    std::vector<double> wnp1;         //  Angular velocity at t+dt
+    std::vector<double> wdesired;     //  Desired orientation wrt x-axis
+                                      //  Forces have the dimension of an acceleration
+    std::vector<double2> Fp;          //  Propelling force v_des/tau_mech
+    std::vector<double2> Forthon;     //  Orthogonal force (hertz) wrt contact surface at time t
+    std::vector<double2> Ftn;         //  Tangential force wrt contact surface at time t
+    std::vector<double> taun;         //  Torque at time t (moment projected on z-axis) expressed at the CM
+    std::vector<double2> forthonp1;   //  Orthogonal force at time t+dt
+    std::vector<double2> ftnp1;       //  Tangential force at time t+dt
+    std::vector<double> taunp1;       //  Torque at time t+dt
+
     std::vector<unsigned> active_shapeIDagent;         //  Pedestrian id of each shape
     std::vector<unsigned> active_shapeIDshape_crowd;   //  Shape id of each pedestrian
     std::vector<double> radius;                        //  Radius off all shapes of actives agents
     std::vector<unsigned> size_agents;
-    std::map<unsigned, unsigned> agentIds;
     std::vector<unsigned> agentActiveIds;
     std::vector<std::vector<unsigned>> neighbours_shape;
     std::vector<unsigned> agentIDshape;
     std::vector<double> masses;
     std::vector<double> mois;
     std::vector<double2> damping;
+    std::vector<unsigned> shapeIDagent_crowd;   //  Agent id of each shape of the crowd
+    std::vector<uint32_t> shapesMaterial;       //  Material id of each shape of actives agents
 
-    //  Tangential relative displacement when in contact
-    std::map<std::pair<unsigned, unsigned>, double2> slip;
-    std::map<std::tuple<unsigned, int, int>, double2> slip_wall;
+    //  Tangential relative displacement when in contact, between shapes of the crowd (ids of _ids_shapes),
+    //  kept from one decisional step to the next
+    std::unordered_map<std::pair<unsigned, unsigned>, double2, ContactHash> slip;
+    std::unordered_map<std::tuple<unsigned, int, int>, double2, ContactHash> slip_wall;
 
     //  For output purposes: the following variables will contain:
     //    - a copy of slip
     //    - fortho from shape to shape
     //    - ft from shape to shape
-    std::map<std::pair<unsigned, unsigned>, std::array<double2, 3>> interactionsOutput;
-    std::map<std::tuple<unsigned, int, int>, std::array<double2, 3>> interactionsOutputWall;
+    //  They are sorted by key when the Interactions file is written
+    std::unordered_map<std::pair<unsigned, unsigned>, std::array<double2, 3>, ContactHash> interactionsOutput;
+    std::unordered_map<std::tuple<unsigned, int, int>, std::array<double2, 3>, ContactHash> interactionsOutputWall;
+
+    std::vector<std::tuple<double2, double2, double>> shapesMotion;   //  Forces and torque on each shape
+    std::vector<ContactChanges> contactChanges;                       //  Contacts of each shape that start or end
+    std::vector<double> shapesSpeed;                                  //  Largest speed of each shape during a sub-step
+    std::vector<double> agentsContactStiffness;                       //  Sum of the stiffnesses of the contacts of each agent
+    std::vector<double> agentsContactDamping;                         //  Sum of the dampings of the contacts of each agent
+    std::vector<double> agentsInverseMass;                            //  Inverse of the effective mass of each agent
 
-    std::tuple<double2, double2, double> get_interactions(unsigned cpt_shape, bool AtTimen);
+    std::tuple<double2, double2, double> get_interactions(unsigned cpt_shape, bool AtTimen, ContactChanges& changes);
+    void computeShapesMotion(bool AtTimen);
+    void applyContactChanges();
+    void prepareActiveAgents();
+    void determineNeighbouringShapes();
     void loop();
-    //  AgentInteractions is an input and output file (ie "dynamic") of this process
-    int readInteractionsInputFile(const std::string& interactionsFile);
+    std::pair<double, bool> getAdaptiveTimeStep(double remainingTime);
+    void relax(double duration);
+    void endSubStep();
     std::pair<bool, bool> existsContacts();   //  Do contacts exist?
-    void generateInteractionsOutputFile(const std::string& interactionsFile, const std::pair<bool, bool>& exists);
+    void generateInteractionsOutputFile(const std::pair<bool, bool>& exists);
+    void storeContacts();
 
    public:
     /// Constructor for the MechanicalLayer class.
-    explicit MechanicalLayer(std::list<Agent*>& mech_active_agents);
+    explicit MechanicalLayer(Simulation& simulation);
     /// Destructor for the MechanicalLayer class.
     ~MechanicalLayer();
+    //  AgentInteractions is an input (read when the simulation is initialised) and an output file of this process
+    int readInteractionsInputFile(const std::string& file);
+    void run();
 };
 
 #endif   // SRC_MECHANICAL_LAYER_INCLUDE_MECHANICALLAYER_H_"
@@ -0,0 +1,128 @@
+/*
+    Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+    Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+    This software is a computer program designed to generate a realistic crowd from anthropometric data and
+    simulate the mechanical interactions that occur within it and with obstacles.
+
+    This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+    of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+    license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+    As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+    the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+    economic rights,  and the successive licensors  have only  limited liability.
+
+    In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+    and/or developing or reproducing the software by the user in light of its specific status of free software,
+    that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+    for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+    encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+    the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+    same conditions as regards security.
+
+    The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+    you accept its terms.
+*/
+
+#ifndef SRC_MECHANICAL_LAYER_INCLUDE_SIMULATION_H_
+#define SRC_MECHANICAL_LAYER_INCLUDE_SIMULATION_H_
+
+#include "Agent.h"
+#include "Global.h"
+
+struct MechanicalLayer;
+
+struct Simulation
+/**
+ * @brief The complete state of one crowd simulation.
+ *
+ * Everything that the library needs between two decisional time steps (static data read from the XML files, the agents and
+ * their current kinematics) lives in this structure, so that a single process can host as many independent simulations as
+ * needed. Two different simulations can be stepped concurrently from different threads; a given simulation must not.
+ */
+{
+    bool loadStaticData = true;   ///<  Whether the static data still needs to be (re)loaded on the next call
+
+    //  Geometry
+    std::vector<std::vector<double2>> listObstacles;   ///<  The walls, as lists of corners
+    double Lx = 0.;                                    ///<  Size of the domain along x
+    double Ly = 0.;                                    ///<  Size of the domain along y
+
+    uint32_t nAgents = 0;                       ///<  Number of agents
+    std::map<std::string, uint32_t> agentMap;   ///<  Correspondence between user-given ids and internal ids
+    std::vector<std::string> agentMapInverse;   ///<  Inverse version for output
+    Agent** agents = nullptr;                   ///<  The array of pointers to the agent objects
+    std::vector<Agent*> mech_active_agents;     ///<  Mechanically active agents
+    std::vector<bool> mechanicallyActive;       ///<  Whether each agent (by internal id) is in mech_active_agents
+
+    //  Neighbour search
+    double2 cellSize = {0., 0.};                                            ///<  Size of the cells of the neighbour grid
+    double wallMargin = 0.;                                                 ///<  Margin with which the walls were last binned
+    std::map<int2, std::vector<std::pair<unsigned, unsigned>>> wallCells;   ///<  Walls (obstacle, wall) close to each cell
+
+    //  Time variables
+    double dt = 0.;        ///<  Time between two calls of the library
+    double dt_mech = 0.;   ///<  Time step of the mechanical layer
+
+    unsigned nThreads = 1;           ///<  Number of threads computing the contact forces in the mechanical layer
+    bool adaptiveTimeStep = false;   ///<  Whether the sub-steps of the mechanical layer adapt to the contacts
+    unsigned nSubSteps = 0;          ///<  Number of sub-steps of the mechanical layer during the last decisional step
+    std::vector<double> contacts;    ///<  Contacts at the end of the last decisional step, nContactValues values each
+
+    /*  Mechanical layer    */
+    std::vector<double2> agentProperties;         ///<  1 / tau_mech: translational and rotational damping
+    uint32_t nMaterials = 0;                      ///<  Number of materials
+    double** intrinsicProperties = nullptr;       ///<  Intrinsic properties of the materials (see the enum in Global.h)
+    double*** binaryProperties = nullptr;         ///<  Binary properties of each pair of materials (see the enum in Global.h)
+    std::vector<int32_t> obstaclesMaterial;       ///<  Material of each obstacle
+    std::map<uint32_t, int32_t> shapesMaterial;   ///<  Material of each shape
+    MechanicalLayer* mechanicalLayer = nullptr;   ///<  Workspace of the mechanical layer, with the contacts between steps
+
+    //  Paths
+    std::string pathStatic;    ///<  Folder where the static data should be saved
+    std::string pathDynamic;   ///<  Folder where the dynamic data should be placed
+
+    Simulation() = default;
+    Simulation(const Simulation&) = delete;
+    Simulation& operator=(const Simulation&) = delete;
+    ~Simulation();
+
+    /*  Read input files (InputStatic.cpp)  */
+    int readParameters(const std::string& file);
+    int readMaterials(const std::string& file, std::map<std::string, int32_t>& materialMapping);
+    int readGeometry(const std::string& file, std::map<std::string, int32_t>& materialMapping);
+    int readAgents(const std::string& file, std::vector<unsigned>& nShapesPerAgent, std::vector<unsigned>& shapeIDagent,
+                   std::vector<int>& edges, std::vector<double>& radii, std::vector<double>& masses, std::vector<double>& mois,
+                   std::vector<double2>& delta_gtos, std::map<std::string, int32_t>& materialMapping);
+    int initialise(char** files);
+    //  Computes k_n and k_t for the given materials
+    double computeStiffnessNormal(const uint32_t i, const uint32_t j) const;
+    double computeStiffnessTangential(const uint32_t i, const uint32_t j) const;
+    void clearMaterials();
+    void clearAgents();
+
+    /*  Handle the crowd (Crowd.cpp)    */
+    //     Initialise scene
+    int initialiseSetting(const std::string& dynamicsFile, std::vector<unsigned>& nb_shapes_allagents,
+                          std::vector<unsigned>& shapeIDagent, std::vector<int>& edges, std::vector<double>& radius_allshapes,
+                          std::vector<double>& masses, std::vector<double>& mois, std::vector<double2>& delta_gtos);
+    int updateSetting(const std::string& dynamicsFile);
+    void setKinematics(uint32_t a, const double2& position, const double2& velocity, double theta, double omega);
+    void setDrivingForces(uint32_t a, const double2& Fp, double Mp);
+    //      Prepare mechanical layer
+    bool is_mechanically_active(const Agent* agent) const;
+    void set_mechanically_active(Agent* agent);
+    bool get_future_collision();
+    void determine_agents_neighbours();
+    int2 get_cell(const double2& r) const;
+    void binWalls(double margin);
+    double get_distance(const double2& A, const double2& B) const;
+    //      Handle mechanical layer
+    int handleMechanicalLayer();
+    //      Output
+    void generateDynamicsOutputFile(const std::string& dynamicsFile);
+    int writeDynamicsFile(const std::string& dynamicsFile) const;
+};
+
+#endif   // SRC_MECHANICAL_LAYER_INCLUDE_SIMULATION_H_
@@ -101,8 +101,10 @@ Agent::~Agent() = default;
  *
  * This function updates the position and orientation of the agent based on its current velocity (_vx, _vy)
  * and angular velocity (_w). The movement is performed over a small time interval (dt).
+ *
+ * @param dt The duration of the movement
  */
-void Agent::move()
+void Agent::move(const double dt)
 {
     _x += _vx * dt;
     _y += _vy * dt;
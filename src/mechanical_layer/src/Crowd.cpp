@@ -25,19 +25,16 @@
     you accept its terms.
 */
 
-#include "Crowd.h"
-
 #include <algorithm>
 #include <fstream>
 #include <vector>
 
 #include "../3rdparty/tinyxml/tinyxml2.h"
 #include "MechanicalLayer.h"
+#include "Simulation.h"
 
-using std::string, std::vector, std::list, std::cerr, std::cout, std::endl, std::ranges::find, std::ofstream;
-
-//  Global variable: Mechanically active agents
-list<Agent*> mech_active_agents;
+using std::string, std::vector, std::list, std::pair, std::cerr, std::cout, std::endl, std::ofstream, std::max, std::min, std::sort,
+    std::unique, std::lower_bound;
 
 /**
  * @brief The function creates all agents from the data stored by InputStatic.cpp.
@@ -56,9 +53,9 @@ list<Agent*> mech_active_agents;
  *         EXIT_FAILURE otherwise
  *         (the return code comes from updateSetting())
  */
-int initialiseSetting(const std::string& dynamicsFile, std::vector<unsigned>& nb_shapes_allagents, std::vector<unsigned>& shapeIDagent,
-                      std::vector<int>& edges, std::vector<double>& radius_allshapes, std::vector<double>& masses,
-                      std::vector<double>& mois, std::vector<double2>& delta_gtos)
+int Simulation::initialiseSetting(const std::string& dynamicsFile, std::vector<unsigned>& nb_shapes_allagents,
+                                  std::vector<unsigned>& shapeIDagent, std::vector<int>& edges, std::vector<double>& radius_allshapes,
+                                  std::vector<double>& masses, std::vector<double>& mois, std::vector<double2>& delta_gtos)
 {
     /*  Allocate agents */
     agents = new Agent*[nAgents];
@@ -101,7 +98,7 @@ int initialiseSetting(const std::string& dynamicsFile, std::vector<unsigned>& nb
  * @return EXIT_SUCCESS if no issue with the Dynamics file
  *         EXIT_FAILURE otherwise
  */
-int updateSetting(const string& dynamicsFile)
+int Simulation::updateSetting(const string& dynamicsFile)
 {
     /*  Create agents: read the dynamics file first  */
     tinyxml2::XMLDocument document;
@@ -204,23 +201,8 @@ int updateSetting(const string& dynamicsFile)
             return EXIT_FAILURE;
         }
         //  Update agent with the kinematics and dynamics
-        agents[a]->_x = position.first;
-        agents[a]->_y = position.second;
-        agents[a]->_theta = theta;
-        agents[a]->_vx = velocity.first;
-        agents[a]->_vy = velocity.second;
-        agents[a]->_w = omega;
-        agents[a]->_Fp = (1 / agents[a]->_mass) * Fp;
-        const double inverseTauMechTranslation = agentProperties[a].first;
-        const double inverseTauMechRotation = agentProperties[a].second;
-        agents[a]->_vx_des = agents[a]->_Fp.first / inverseTauMechTranslation;   //  vx_des := Fpx/m * tau_mech
-        agents[a]->_vy_des = agents[a]->_Fp.second / inverseTauMechTranslation;
-        agents[a]->_w_des = Mp / inverseTauMechRotation / agents[a]->_moi;   //  w_des  := Mp/I  * tau_mech
-        if (!(agents[a]->_vx_des == 0. && agents[a]->_vy_des == 0.))
-            agents[a]->_theta_des = atan2(agents[a]->_vy_des, agents[a]->_vx_des);
-        else
-            agents[a]->_theta_des = 0.;
-        agents[a]->_neighbours.clear();
+        setKinematics(a, position, velocity, theta, omega);
+        setDrivingForces(a, Fp, Mp);
 
         agentElement = agentElement->NextSiblingElement("Agent");
         agentCounter++;
@@ -237,6 +219,47 @@ int updateSetting(const string& dynamicsFile)
     return EXIT_SUCCESS;
 }
 
+/**
+ * @brief Sets the kinematics of an agent.
+ *
+ * @param a The internal id of the agent
+ * @param position The position of the center of mass
+ * @param velocity The velocity of the center of mass
+ * @param theta The orientation
+ * @param omega The angular velocity
+ */
+void Simulation::setKinematics(const uint32_t a, const double2& position, const double2& velocity, const double theta,
+                               const double omega)
+{
+    agents[a]->_x = position.first;
+    agents[a]->_y = position.second;
+    agents[a]->_theta = theta;
+    agents[a]->_vx = velocity.first;
+    agents[a]->_vy = velocity.second;
+    agents[a]->_w = omega;
+}
+
+/**
+ * @brief Sets the driving force and torque of an agent, and the desired velocities that derive from them.
+ *
+ * @param a The internal id of the agent
+ * @param Fp The driving force
+ * @param Mp The driving torque
+ */
+void Simulation::setDrivingForces(const uint32_t a, const double2& Fp, const double Mp)
+{
+    agents[a]->_Fp = (1 / agents[a]->_mass) * Fp;
+    const double inverseTauMechTranslation = agentProperties[a].first;
+    const double inverseTauMechRotation = agentProperties[a].second;
+    agents[a]->_vx_des = agents[a]->_Fp.first / inverseTauMechTranslation;   //  vx_des := Fpx/m * tau_mech
+    agents[a]->_vy_des = agents[a]->_Fp.second / inverseTauMechTranslation;
+    agents[a]->_w_des = Mp / inverseTauMechRotation / agents[a]->_moi;   //  w_des  := Mp/I  * tau_mech
+    if (!(agents[a]->_vx_des == 0. && agents[a]->_vy_des == 0.))
+        agents[a]->_theta_des = atan2(agents[a]->_vy_des, agents[a]->_vx_des);
+    else
+        agents[a]->_theta_des = 0.;
+}
+
 /**
  * @brief Updates the list of neighbors for each agent in the crowd.
  *
@@ -245,42 +268,165 @@ int updateSetting(const string& dynamicsFile)
  * that can be traveled by an agent within dt seconds at max speed vMaxAgent. We multiply it by 2 in the "extreme"
  * case of two pedestrians walking (running) fast towards each other. All this ensures that all agents who can
  * potentially collide within dt are taken into account.
+ *
+ * Instead of testing all pairs of agents and all walls, the (periodic) domain is divided into a grid of cells at least as
+ * large as the critical distance between two agents, so that the neighbours of an agent lie in its own cell or in the 8
+ * surrounding ones. The walls are binned in the cells they are close to (see binWalls()), again only when the cell size or
+ * the wall margin (which depends on dt and vMaxAgent) changes.
+ * The lists are sorted by id, as with an exhaustive search.
  */
-void determine_agents_neighbours()
+void Simulation::determine_agents_neighbours()
 {
     const double criticalDistanceWall = dt * vMaxAgent;
     const double criticalDistance = 2 * criticalDistanceWall;
+    double maxRadius = 0.;
+    for (uint32_t a = 0; a < nAgents; a++)
+    {
+        agents[a]->_neighbours.clear();
+        agents[a]->_neighbours_walls.clear();
+        maxRadius = max(maxRadius, agents[a]->_radius);
+    }
+
+    /*  Build the grid, and bin the walls again if its size or the wall margin changed  */
+    const double minimalCellSize = criticalDistance + 2 * maxRadius;
+    const int2 nCells(max(1, static_cast<int>(Lx / minimalCellSize)), max(1, static_cast<int>(Ly / minimalCellSize)));
+    const double newWallMargin = criticalDistanceWall + maxRadius;
+    if (const double2 newCellSize(Lx / nCells.first, Ly / nCells.second); newCellSize != cellSize || newWallMargin != wallMargin)
+    {
+        cellSize = newCellSize;
+        wallMargin = newWallMargin;
+        binWalls(wallMargin);
+    }
+
+    /*  Sort the agents by cell (the index of the cell is taken modulo the number of cells, as the domain is periodic) */
+    vector<int2> cellOfAgent(nAgents);
+    vector<pair<int, uint32_t>> agentsByCell(nAgents);
+    for (uint32_t a = 0; a < nAgents; a++)
+    {
+        const int2 cell = get_cell(agents[a]->get_r());
+        cellOfAgent[a] = int2((cell.first % nCells.first + nCells.first) % nCells.first,
+                              (cell.second % nCells.second + nCells.second) % nCells.second);
+        agentsByCell[a] = {cellOfAgent[a].first * nCells.second + cellOfAgent[a].second, a};
+    }
+    sort(agentsByCell.begin(), agentsByCell.end());
 
     for (uint32_t a1 = 0; a1 < nAgents; a1++)
     {
         Agent* agent1 = agents[a1];
+        const double2 r1 = agent1->get_r();
         //  First, check walls
-        for (uint32_t iobs = 0; iobs < listObstacles.size(); iobs++)
+        if (const auto cellWalls = wallCells.find(get_cell(r1)); cellWalls != wallCells.end())
         {
-            for (uint32_t iwall = 0; iwall < listObstacles[iobs].size() - 1; iwall++)
+            for (const auto& [iobs, iwall] : cellWalls->second)
             {
-                auto [distance, closest_point] = get_distance_to_wall_and_closest_point(
-                    listObstacles[iobs][iwall], listObstacles[iobs][iwall + 1], agent1->get_r());
+                auto [distance, closest_point] =
+                    get_distance_to_wall_and_closest_point(listObstacles[iobs][iwall], listObstacles[iobs][iwall + 1], r1);
                 if (distance < criticalDistanceWall + agent1->_radius)
                     agent1->_neighbours_walls.emplace_back(iobs, iwall);
             }
         }
-        //  Then, other agents
-        for (uint32_t a2 = a1 + 1; a2 < nAgents; a2++)
+        //  Then, other agents in the surrounding cells (each cell once, even if there are less than 3 cells along an axis)
+        vector<int> surroundingCells;
+        for (int i = -1; i <= 1; i++)
+        {
+            for (int j = -1; j <= 1; j++)
+            {
+                const int ix = (cellOfAgent[a1].first + i + nCells.first) % nCells.first;
+                const int iy = (cellOfAgent[a1].second + j + nCells.second) % nCells.second;
+                surroundingCells.push_back(ix * nCells.second + iy);
+            }
+        }
+        sort(surroundingCells.begin(), surroundingCells.end());
+        surroundingCells.erase(unique(surroundingCells.begin(), surroundingCells.end()), surroundingCells.end());
+        for (const int cell : surroundingCells)
         {
-            Agent* agent2 = agents[a2];
+            for (auto it = lower_bound(agentsByCell.begin(), agentsByCell.end(), pair<int, uint32_t>(cell, a1 + 1));
+                 it != agentsByCell.end() && it->first == cell; ++it)
+            {
+                Agent* agent2 = agents[it->second];
+                if (const double r = get_distance(r1, agent2->get_r()); r < criticalDistance + agent1->_radius + agent2->_radius)
+                {
+                    agent1->_neighbours.push_back(agent2->_id);
+                    agent2->_neighbours.push_back(agent1->_id);
+                }
+            }
+        }
+    }
+    for (uint32_t a = 0; a < nAgents; a++) agents[a]->_neighbours.sort();
+}
 
-            const double2 r1 = agent1->get_r();
-            const double2 r2 = agent2->get_r();
-            if (const double r = get_distance(r1, r2); r < criticalDistance + agent1->_radius + agent2->_radius)
+/**
+ * @brief Gets the cell of the neighbour grid that contains a point, without periodicity.
+ *
+ * @param r The coordinates of the point
+ *
+ * @return The indices of the cell along x and y
+ */
+int2 Simulation::get_cell(const double2& r) const
+{
+    return int2(static_cast<int>(floor(r.first / cellSize.first)), static_cast<int>(floor(r.second / cellSize.second)));
+}
+
+/**
+ * @brief Bins the wall segments in the cells of the neighbour grid.
+ *
+ * A wall is stored in every cell that contains points closer to it than the given margin, so that the walls that
+ * may neighbour an agent are all found in its own cell. For each row of cells, the part of the wall close enough to
+ * the row is found, and its extent along x (widened by the margin) gives the cells of the row to fill.
+ * The walls are stored in the order of the exhaustive search, ie by obstacle and then by wall.
+ *
+ * @param margin The largest distance between an agent's center and a neighbouring wall
+ */
+void Simulation::binWalls(const double margin)
+{
+    wallCells.clear();
+    for (uint32_t iobs = 0; iobs < listObstacles.size(); iobs++)
+    {
+        for (uint32_t iwall = 0; iwall < listObstacles[iobs].size() - 1; iwall++)
+        {
+            const double2& A = listObstacles[iobs][iwall];
+            const double2& B = listObstacles[iobs][iwall + 1];
+            const int rowMin = static_cast<int>(floor((min(A.second, B.second) - margin) / cellSize.second));
+            const int rowMax = static_cast<int>(floor((max(A.second, B.second) + margin) / cellSize.second));
+            for (int row = rowMin; row <= rowMax; row++)
             {
-                agent1->_neighbours.push_back(agent2->_id);
-                agent2->_neighbours.push_back(agent1->_id);
+                //  Part of the wall [A + tLow AB, A + tHigh AB] less than the margin away from the row along y
+                double tLow = 0., tHigh = 1.;
+                if (const double dy = B.second - A.second; dy != 0.)
+                {
+                    tLow = (row * cellSize.second - margin - A.second) / dy;
+                    tHigh = ((row + 1) * cellSize.second + margin - A.second) / dy;
+                    if (tLow > tHigh)
+                        std::swap(tLow, tHigh);
+                    tLow = max(tLow, 0.);
+                    tHigh = min(tHigh, 1.);
+                    if (tLow > tHigh)
+                        continue;
+                }
+                const double xLow = A.first + tLow * (B.first - A.first);
+                const double xHigh = A.first + tHigh * (B.first - A.first);
+                const int colMin = static_cast<int>(floor((min(xLow, xHigh) - margin) / cellSize.first));
+                const int colMax = static_cast<int>(floor((max(xLow, xHigh) + margin) / cellSize.first));
+                for (int col = colMin; col <= colMax; col++) wallCells[int2(col, row)].emplace_back(iobs, iwall);
             }
         }
     }
 }
 
+/**
+ * Calculates the Euclidean distance between two points in the (periodic) domain of the simulation.
+ *
+ * @param A The coordinates of the first point.
+ * @param B The coordinates of the second point.
+ * @return The Euclidean distance between the two points.
+ */
+double Simulation::get_distance(const double2& A, const double2& B) const
+{
+    const double x_mod = get_interval(A.first - B.first, Lx);
+    const double y_mod = get_interval(A.second - B.second, Ly);
+    return sqrt(pow(x_mod, 2) + pow(y_mod, 2));
+}
+
 /**
  * @brief Executes the mechanical layer.
  *
@@ -288,23 +434,24 @@ void determine_agents_neighbours()
  * It performs the following steps:
  * 1. Handles mechanically active agents using the mechanical layer.
  * 2. Handles non-mechanically active agents (simple positional update)
- * 3. Generates an output file with the new position and velocity, plus their angular counterparts.
  *
- * @param dynamicsFile The input dynamics file will be overwritten with the output of the mechanical layer.
+ * @return EXIT_SUCCESS if the mechanical layer ran without issue, EXIT_FAILURE otherwise
  */
-void handleMechanicalLayer(const std::string& dynamicsFile)
+int Simulation::handleMechanicalLayer()
 {
     /*  Handle mechanically active agents: mechanical layer */
+    nSubSteps = 0;
+    contacts.clear();
     if (get_future_collision())
     {
         try
         {
-            const MechanicalLayer* crowdMech = new MechanicalLayer(mech_active_agents);
-            delete crowdMech;
+            mechanicalLayer->run();
         }
         catch (const std::exception& e)
         {
-            exit(EXIT_FAILURE);
+            cerr << "Error: " << e.what() << endl;
+            return EXIT_FAILURE;
         }
     }
 
@@ -321,28 +468,41 @@ void handleMechanicalLayer(const std::string& dynamicsFile)
         agent->_vx = (1.0 - exp(-dt * inverseTauMechTranslation)) * agent->_vx_des + exp(-dt * inverseTauMechTranslation) * agent->_vx;
         agent->_vy = (1.0 - exp(-dt * inverseTauMechTranslation)) * agent->_vy_des + exp(-dt * inverseTauMechTranslation) * agent->_vy;
         agent->_w = (1.0 - exp(-dt * inverseTauMechRotation)) * agent->_w_des + exp(-dt * inverseTauMechRotation) * agent->_w;
-        agent->move();
+        agent->move(dt);
     }
 
-    /*  Save output of mechanical layer to file */
-    generateDynamicsOutputFile(dynamicsFile);
+    return EXIT_SUCCESS;
 }
 
 /**
  * @brief Checks if the given agent is mechanically active in the crowd.
- * An agent is considered mechanically active if it is present in the mech_active_agents container.
+ * An agent is considered mechanically active if it is present in the mech_active_agents container,
+ * which is tracked by the mechanicallyActive flags so that the check takes constant time.
  *
  * @param agent The agent to check.
  * @return True if the agent is mechanically active, false otherwise.
  */
-bool is_mechanically_active(const Agent* agent) { return (find(mech_active_agents, agent) != mech_active_agents.end()); }
+bool Simulation::is_mechanically_active(const Agent* agent) const { return mechanicallyActive[agent->_id]; }
+
+/**
+ * @brief Adds the given agent to the mechanically active agents, if it is not already one of them.
+ *
+ * @param agent The agent to add.
+ */
+void Simulation::set_mechanically_active(Agent* agent)
+{
+    if (mechanicallyActive[agent->_id])
+        return;
+    mechanicallyActive[agent->_id] = true;
+    mech_active_agents.push_back(agent);
+}
 
 /**
  * @brief Checks if there will be any future collisions between agents in the crowd.
  *
  * @return true if there will be future collisions, false otherwise.
  */
-bool get_future_collision()
+bool Simulation::get_future_collision()
 {
     //  Test new positions
     for (uint32_t a = 0; a < nAgents; a++)
@@ -356,6 +516,7 @@ bool get_future_collision()
 
     //  Check if overlaps
     mech_active_agents.clear();
+    mechanicallyActive.assign(nAgents, false);
     for (uint32_t a = 0; a < nAgents; a++)
     {
         Agent* agent1 = agents[a];
@@ -364,8 +525,7 @@ bool get_future_collision()
         {
             double2 middlePointWall = 0.5 * (listObstacles[iobs][iwall] + listObstacles[iobs][iwall + 1]);
             if ((!(agent1->get_r() - middlePointWall)) < agent1->_radius + 1e-1)
-                if (!is_mechanically_active(agent1))
-                    mech_active_agents.push_back(agent1);
+                set_mechanically_active(agent1);
         }
         //  Loop over current agent's neighbours
         for (const unsigned agent2_id : agent1->_neighbours)
@@ -373,10 +533,8 @@ bool get_future_collision()
             if (Agent* agent2 = agents[agent2_id];
                 (!(agent1->get_r() - agent2->get_r())) < fabs(agent1->_radius + agent2->_radius) + 1e-1)
             {
-                if (!is_mechanically_active(agent1))
-                    mech_active_agents.push_back(agent1);
-                if (!is_mechanically_active(agent2))
-                    mech_active_agents.push_back(agent2);
+                set_mechanically_active(agent1);
+                set_mechanically_active(agent2);
             }
         }
     }
@@ -395,19 +553,14 @@ bool get_future_collision()
     for (uint32_t a = 0; a < nAgents; a++)
     {
         if (Agent* agent = agents[a];
-            pow(agent->_vx - agent->_vx_des, 2) + pow(agent->_vy - agent->_vy_des, 2) + pow(agent->_w - agent->_w_des, 2) > 1e-4 &&
-            !is_mechanically_active(agent))
-            mech_active_agents.push_back(agent);
+            pow(agent->_vx - agent->_vx_des, 2) + pow(agent->_vy - agent->_vy_des, 2) + pow(agent->_w - agent->_w_des, 2) > 1e-4)
+            set_mechanically_active(agent);
     }
 
-    //  Add neighbours of active agents
-    for (const Agent* agent : mech_active_agents)
+    //  Add neighbours of active agents (the agents added on the way are visited too)
+    for (size_t i = 0; i < mech_active_agents.size(); i++)
     {
-        for (const unsigned neighbour : agent->_neighbours)
-        {
-            if (!is_mechanically_active(agents[neighbour]))
-                mech_active_agents.push_back(agents[neighbour]);
-        }
+        for (const unsigned neighbour : mech_active_agents[i]->_neighbours) set_mechanically_active(agents[neighbour]);
     }
     return (!mech_active_agents.empty());
 }
@@ -417,7 +570,7 @@ bool get_future_collision()
  *
  * @param dynamicsFile The name of the file.
  */
-void generateDynamicsOutputFile(const std::string& dynamicsFile)
+void Simulation::generateDynamicsOutputFile(const std::string& dynamicsFile)
 {
     //  We'll  build the output from the input (the structure and fields are exactly the same)
     tinyxml2::XMLDocument inputDoc;
@@ -451,3 +604,41 @@ void generateDynamicsOutputFile(const std::string& dynamicsFile)
 
     outputDoc.close();
 }
+
+/**
+ * @brief The function writes the current state of all the agents, in the order of the Agents file, to a dynamics file.
+ *
+ * Unlike generateDynamicsOutputFile(), the driving forces and torques are written as well, so that the file can be used
+ * as the input of a later call.
+ *
+ * @param dynamicsFile The name of the file.
+ *
+ * @return EXIT_SUCCESS if the file could be written, EXIT_FAILURE otherwise
+ */
+int Simulation::writeDynamicsFile(const std::string& dynamicsFile) const
+{
+    ofstream outputDoc(dynamicsFile);
+    if (!outputDoc)
+    {
+        cerr << "Error: Could not write the dynamics file " << dynamicsFile << endl;
+        return EXIT_FAILURE;
+    }
+
+    outputDoc << R"(<?xml version="1.0" encoding="utf-8"?>)" << endl;
+    outputDoc << "<Agents>" << endl;
+    for (uint32_t a = 0; a < nAgents; a++)
+    {
+        const Agent* agent = agents[a];
+        const double2 Fp = agent->_mass * agent->_Fp;
+        const double Mp = agent->_w_des * agentProperties[a].second * agent->_moi;
+        outputDoc << "    <Agent Id=\"" << agentMapInverse[a] << "\">" << endl;
+        outputDoc << "        <Kinematics Position=\"" << agent->_x << "," << agent->_y << "\" ";
+        outputDoc << "Velocity=\"" << agent->_vx << "," << agent->_vy << "\" ";
+        outputDoc << "Theta=\"" << agent->_theta << "\" Omega=\"" << agent->_w << "\"/>" << endl;
+        outputDoc << "        <Dynamics Fp=\"" << Fp.first << "," << Fp.second << "\" Mp=\"" << Mp << "\"/>" << endl;
+        outputDoc << "    </Agent>" << endl;
+    }
+    outputDoc << "</Agents>";
+
+    return outputDoc ? EXIT_SUCCESS : EXIT_FAILURE;
+}
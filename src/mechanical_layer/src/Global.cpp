@@ -62,40 +62,6 @@ int2 operator-(int2 const& a, int2 const& b) { return {a.first - b.first, a.seco
 //  Element-wise multiplication
 int2 operator*(int2 const& a, int2 const& b) { return {a.first * b.first, a.second * b.second}; }
 
-/*
-    Global variables
-                        */
-bool loadStaticData = true;   //  In case of several calls to the library, this flag says if the
-                              //  static data needs to be reloaded (eg when a user is using the GUI
-                              //  application and changes the geometry and/or agents.
-
-uint32_t nAgents;
-map<string, uint32_t> agentMap;   //  Correspondence between user-given ids and internal ids
-vector<string> agentMapInverse;   //  Inverse version for output
-Agent** agents;                   //  The array of pointers to the agent objects
-
-//  Geometry
-double Lx;
-double Ly;
-vector<vector<double2>> listObstacles;
-
-//  Basic parameters
-double dt;        //  Time step of the main loop.
-double dt_mech;   //  Time step of the mechanical layer.
-
-/*  Mechanical layer  */
-//  Materials
-vector<double2> agentProperties;
-uint32_t nMaterials;
-double** intrinsicProperties;
-double*** binaryProperties;
-vector<int32_t> obstaclesMaterial;
-map<uint32_t, int32_t> shapesMaterial;
-
-//  Paths
-string pathStatic;    //  Folder where the static  data should be saved
-string pathDynamic;   //  Folder where the dynamic data should be placed
-
 /*
     Utilities functions
                         */
@@ -170,18 +136,4 @@ pair<double, double2> get_distance_to_wall_and_closest_point(double2 vertexA, do
  *
  * @return The interval of the value within the specified length.
  */
-inline double get_interval(const double x, const double length) { return fmod(x + 0.5 * length, length) - 0.5 * length; }
-
-/**
- * Calculates the Euclidean distance between two points in a 2D space lattice.
- *
- * @param A The coordinates of the first point.
- * @param B The coordinates of the second point.
- * @return The Euclidean distance between the two points.
- */
-double get_distance(const double2& A, const double2& B)
-{
-    const double x_mod = get_interval(A.first - B.first, Lx);
-    const double y_mod = get_interval(A.second - B.second, Ly);
-    return sqrt(pow(x_mod, 2) + pow(y_mod, 2));
-}
+double get_interval(const double x, const double length) { return fmod(x + 0.5 * length, length) - 0.5 * length; }
@@ -25,14 +25,13 @@
     you accept its terms.
 */
 
-#include "InputStatic.h"
-
 #include <fstream>
 #include <map>
 #include <string>
 #include <vector>
 
 #include "../3rdparty/tinyxml/tinyxml2.h"
+#include "Simulation.h"
 
 using std::cout, std::cerr, std::string, std::endl, std::vector, std::map;
 
@@ -44,7 +43,7 @@ using std::cout, std::cerr, std::string, std::endl, std::vector, std::map;
  * @return EXIT_FAILURE in case of issue in the XML file (missing or unreadable field)
  *         EXIT_SUCCESS otherwise
  */
-int readParameters(const std::string& file)
+int Simulation::readParameters(const std::string& file)
 {
     tinyxml2::XMLDocument document;
     document.LoadFile(file.data());
@@ -77,6 +76,22 @@ int readParameters(const std::string& file)
         cerr << R"(Error: Could not read "TimeStepMechanical" attribute in )" << file << endl;
         return EXIT_FAILURE;
     }
+    /*  Optional settings of the mechanical layer (kept as they are if not given)    */
+    if (const tinyxml2::XMLElement* mechanicsElement = parametersElement->FirstChildElement("Mechanics"))
+    {
+        if (const tinyxml2::XMLError error = mechanicsElement->QueryUnsignedAttribute("Threads", &nThreads);
+            (error != tinyxml2::XML_SUCCESS && error != tinyxml2::XML_NO_ATTRIBUTE) || nThreads == 0)
+        {
+            cerr << R"(Error: Could not read a positive "Threads" attribute in )" << file << endl;
+            return EXIT_FAILURE;
+        }
+        if (const tinyxml2::XMLError error = mechanicsElement->QueryBoolAttribute("AdaptiveTimeStep", &adaptiveTimeStep);
+            error != tinyxml2::XML_SUCCESS && error != tinyxml2::XML_NO_ATTRIBUTE)
+        {
+            cerr << R"(Error: Could not read the "AdaptiveTimeStep" attribute in )" << file << endl;
+            return EXIT_FAILURE;
+        }
+    }
     /*  Input and Output directories    */
     const char *staticDirectory, *dynamicDirectory;
     if (const tinyxml2::XMLElement* directoriesElement = parametersElement->FirstChildElement("Directories"))
@@ -106,26 +121,11 @@ int readParameters(const std::string& file)
  * @return EXIT_FAILURE in case of issue in the XML file (missing or unreadable field)
  *         EXIT_SUCCESS otherwise
  */
-int readMaterials(const std::string& file, std::map<std::string, int32_t>& materialMapping)
+int Simulation::readMaterials(const std::string& file, std::map<std::string, int32_t>& materialMapping)
 {
     //  If the library is called from many runs where the user forces firstRun=True because of changed static
-    //  data, we first clear the global variables
-    if (intrinsicProperties)
-    {
-        delete intrinsicProperties[YOUNG_MODULUS];
-        delete intrinsicProperties[SHEAR_MODULUS];
-        intrinsicProperties = nullptr;
-        for (uint8_t n = 0; n < nBinaryProperties; n++)
-        {
-            for (uint32_t m = 0; m < nMaterials; m++)
-            {
-                delete binaryProperties[n][m];
-                binaryProperties[n][m] = nullptr;
-            }
-            delete binaryProperties[n];
-            binaryProperties[n] = nullptr;
-        }
-    }
+    //  data, we first clear the materials
+    clearMaterials();
     tinyxml2::XMLDocument document;
     document.LoadFile(file.data());
     if (document.ErrorID() != 0)
@@ -301,15 +301,17 @@ int readMaterials(const std::string& file, std::map<std::string, int32_t>& mater
  * @return EXIT_FAILURE in case of issue in the XML file (missing or unreadable field)
  *         EXIT_SUCCESS otherwise
  */
-int readGeometry(const std::string& file, std::map<std::string, int32_t>& materialMapping)
+int Simulation::readGeometry(const std::string& file, std::map<std::string, int32_t>& materialMapping)
 {
     //  If the library is called from many runs where the user forces firstRun=True because of changed static
-    //  data, we first clear the global variables
+    //  data, we first clear the geometry
     if (!listObstacles.empty())
     {
         listObstacles.clear();
         obstaclesMaterial.clear();
     }
+    //  The walls will be binned again in the neighbour grid
+    cellSize = {0., 0.};
     tinyxml2::XMLDocument document;
     document.LoadFile(file.data());
     if (document.ErrorID() != 0)
@@ -415,24 +417,11 @@ int readGeometry(const std::string& file, std::map<std::string, int32_t>& materi
  * @return EXIT_FAILURE in case of issue in the XML file (missing or unreadable field)
  *         EXIT_SUCCESS otherwise
  */
-int readAgents(const std::string& file, std::vector<unsigned>& nShapesPerAgent, std::vector<unsigned>& shapeIDagent,
-               std::vector<int>& edges, std::vector<double>& radii, std::vector<double>& masses, std::vector<double>& mois,
-               std::vector<double2>& delta_gtos, std::map<std::string, int32_t>& materialMapping)
+int Simulation::readAgents(const std::string& file, std::vector<unsigned>& nShapesPerAgent, std::vector<unsigned>& shapeIDagent,
+                           std::vector<int>& edges, std::vector<double>& radii, std::vector<double>& masses, std::vector<double>& mois,
+                           std::vector<double2>& delta_gtos, std::map<std::string, int32_t>& materialMapping)
 {
-    if (agents)
-    {
-        for (uint32_t a = 0; a < nAgents; ++a)
-        {
-            delete agents[a];
-            agents[a] = nullptr;
-        }
-        delete agents;
-        agents = nullptr;
-        agentMap.clear();
-        agentMapInverse.clear();
-        agentProperties.clear();
-        shapesMaterial.clear();
-    }
+    clearAgents();
     tinyxml2::XMLDocument document;
     document.LoadFile(file.data());
     if (document.ErrorID() != 0)
@@ -572,7 +561,7 @@ int readAgents(const std::string& file, std::vector<unsigned>& nShapesPerAgent,
  *
  * @return The value of k_n
  */
-double computeStiffnessNormal(const uint32_t i, const uint32_t j)
+double Simulation::computeStiffnessNormal(const uint32_t i, const uint32_t j) const
 {
     const double Ei = intrinsicProperties[YOUNG_MODULUS][i];
     const double Ej = intrinsicProperties[YOUNG_MODULUS][j];
@@ -589,7 +578,7 @@ double computeStiffnessNormal(const uint32_t i, const uint32_t j)
  *
  * @return The value of k_t
  */
-double computeStiffnessTangential(const uint32_t i, const uint32_t j)
+double Simulation::computeStiffnessTangential(const uint32_t i, const uint32_t j) const
 {
     const double Ei = intrinsicProperties[YOUNG_MODULUS][i];
     const double Ej = intrinsicProperties[YOUNG_MODULUS][j];
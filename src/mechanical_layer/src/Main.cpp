@@ -25,13 +25,18 @@
     you accept its terms.
 */
 
-#include <map>
+#include <algorithm>
+#include <mutex>
+#include <new>
 #include <string>
-#include <vector>
 
 #include "CrowdMechanics.h"
 
-using std::string, std::map, std::vector;
+using std::string, std::mutex, std::scoped_lock, std::nothrow;
+
+//  The simulation used by CrowdMechanics(), which keeps its state from one call to the next
+static Simulation defaultSimulation;
+static mutex defaultSimulationMutex;
 
 //  extern C is a trick for Python ctypes to work
 extern "C"
@@ -41,6 +46,7 @@ extern "C"
      *
      * It reads static and dynamic XML files,
      * stores everything and simulates the dynamics of the agents.
+     * All the calls share the same simulation: use CrowdMechanicsCreate() to run several independent simulations.
      *
      * @param files An array of file names. They should be given in a precise order:
      *      - Parameters (directories, time step...)
@@ -56,46 +62,265 @@ extern "C"
      */
     int CrowdMechanics(char** files)
     {
+        const scoped_lock lock(defaultSimulationMutex);
+        Simulation& simulation = defaultSimulation;
+
         /*  Read general PARAMETERS  */
-        if (const string parametersFile = files[0]; readParameters(parametersFile) == EXIT_FAILURE)
+        if (const string parametersFile = files[0]; simulation.readParameters(parametersFile) == EXIT_FAILURE)
             return EXIT_FAILURE;
         //  Store the dynamics file name, whether it is the first run or not
-        const string dynamicsFile = pathDynamic + files[4];
+        const string dynamicsFile = simulation.pathDynamic + files[4];
 
-        if (loadStaticData)
+        if (simulation.loadStaticData)
         {
-            /*  Read MATERIALS  */
-            //  Mapping between user-given id's and indexes in the program
-            map<string, int32_t> materialMapping;
-            if (const string materialsFile = pathStatic + files[1]; readMaterials(materialsFile, materialMapping) == EXIT_FAILURE)
+            if (simulation.initialise(files) == EXIT_FAILURE)
                 return EXIT_FAILURE;
+        }
+        else if (simulation.updateSetting(dynamicsFile) == EXIT_FAILURE)
+            return EXIT_FAILURE;
 
-            /*  Read GEOMETRY   */
-            if (const string geometryFile = pathStatic + files[2]; readGeometry(geometryFile, materialMapping) == EXIT_FAILURE)
-                return EXIT_FAILURE;
+        /*  Main program procedure  */
+        if (simulation.handleMechanicalLayer() == EXIT_FAILURE)
+            return EXIT_FAILURE;
+        simulation.generateDynamicsOutputFile(dynamicsFile);
 
-            /*  Read AGENTS */
-            vector<unsigned> nb_shapes_allagents, shapeIDagent;
-            vector<int> edges;
-            vector<double> radius_allshapes, masses, mois;
-            vector<double2> delta_gtos;
-            if (const string agentsFile = pathStatic + files[3];
-                readAgents(agentsFile, nb_shapes_allagents, shapeIDagent, edges, radius_allshapes, masses, mois, delta_gtos,
-                           materialMapping) == EXIT_FAILURE)
-                return EXIT_FAILURE;
+        return EXIT_SUCCESS;
+    }
+
+    /**
+     * @brief Creates a new, independent, simulation.
+     *
+     * The static XML files and the initial dynamics file are read once and for all. The simulation is then advanced
+     * with CrowdMechanicsStep() and must be released with CrowdMechanicsDestroy().
+     *
+     * @param files An array of file names, in the same order as for CrowdMechanics().
+     *
+     * @return  A handle on the new simulation, or a null pointer in case of issue(s) with any of the XML files' contents
+     */
+    Simulation* CrowdMechanicsCreate(char** files)
+    {
+        auto* simulation = new (nothrow) Simulation();
+        if (!simulation)
+            return nullptr;
+        if (simulation->readParameters(files[0]) == EXIT_FAILURE || simulation->initialise(files) == EXIT_FAILURE)
+        {
+            delete simulation;
+            return nullptr;
+        }
+        return simulation;
+    }
 
-            /*  Initialise simulation  */
-            if (initialiseSetting(dynamicsFile, nb_shapes_allagents, shapeIDagent, edges, radius_allshapes, masses, mois,
-                                  delta_gtos) == EXIT_FAILURE)
+    /**
+     * @brief Advances a simulation by one decisional time step.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param dynamicsFile The name of an agent dynamics file in the dynamic directory. Its kinematics, driving forces and torques
+     *                     are loaded before the step, and it is overwritten with the new kinematics afterwards, as in
+     *                     CrowdMechanics(). If null, the current state and driving forces and torques of the simulation are used.
+     *
+     * @return  EXIT_SUCCESS if the step executed successfully.
+     *          EXIT_FAILURE otherwise
+     */
+    int CrowdMechanicsStep(Simulation* simulation, const char* dynamicsFile)
+    {
+        if (!simulation)
+            return EXIT_FAILURE;
+
+        string dynamicsPath;
+        if (dynamicsFile)
+        {
+            dynamicsPath = simulation->pathDynamic + dynamicsFile;
+            if (simulation->updateSetting(dynamicsPath) == EXIT_FAILURE)
                 return EXIT_FAILURE;
         }
-        else if (updateSetting(dynamicsFile) == EXIT_FAILURE)
+        else
+            simulation->determine_agents_neighbours();
+
+        if (simulation->handleMechanicalLayer() == EXIT_FAILURE)
             return EXIT_FAILURE;
+        if (dynamicsFile)
+            simulation->generateDynamicsOutputFile(dynamicsPath);
 
-        /*  Main program procedure  */
-        handleMechanicalLayer(dynamicsFile);
+        return EXIT_SUCCESS;
+    }
+
+    /**
+     * @brief Gets the number of agents of a simulation.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     *
+     * @return The number of agents
+     */
+    uint32_t CrowdMechanicsGetNumberAgents(const Simulation* simulation) { return simulation ? simulation->nAgents : 0; }
+
+    /**
+     * @brief Gets the user-given id of an agent.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param agent The internal index of the agent, ie its rank in the Agents file.
+     *
+     * @return The id of the agent, or a null pointer if there is no such agent
+     */
+    const char* CrowdMechanicsGetAgentId(const Simulation* simulation, const uint32_t agent)
+    {
+        if (!simulation || agent >= simulation->nAgents)
+            return nullptr;
+        return simulation->agentMapInverse[agent].c_str();
+    }
+
+    /**
+     * @brief Copies the current kinematics of all agents.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param kinematics An array of 6 * (number of agents) doubles, filled agent by agent (in the order of the Agents file)
+     *                   with x, y, theta, vx, vy and omega.
+     *
+     * @return  EXIT_SUCCESS if the kinematics were copied.
+     *          EXIT_FAILURE otherwise
+     */
+    int CrowdMechanicsGetKinematics(const Simulation* simulation, double* kinematics)
+    {
+        if (!simulation || !kinematics)
+            return EXIT_FAILURE;
+        for (uint32_t a = 0; a < simulation->nAgents; a++)
+        {
+            const Agent* agent = simulation->agents[a];
+            double* row = kinematics + 6 * a;
+            row[0] = agent->_x;
+            row[1] = agent->_y;
+            row[2] = agent->_theta;
+            row[3] = agent->_vx;
+            row[4] = agent->_vy;
+            row[5] = agent->_w;
+        }
+        return EXIT_SUCCESS;
+    }
+
+    /**
+     * @brief Overwrites the kinematics of all agents.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param kinematics An array of 6 * (number of agents) doubles, laid out as in CrowdMechanicsGetKinematics().
+     *
+     * @return  EXIT_SUCCESS if the kinematics were set.
+     *          EXIT_FAILURE otherwise
+     */
+    int CrowdMechanicsSetKinematics(Simulation* simulation, const double* kinematics)
+    {
+        if (!simulation || !kinematics)
+            return EXIT_FAILURE;
+        for (uint32_t a = 0; a < simulation->nAgents; a++)
+        {
+            const double* row = kinematics + 6 * a;
+            simulation->setKinematics(a, {row[0], row[1]}, {row[3], row[4]}, row[2], row[5]);
+        }
+        return EXIT_SUCCESS;
+    }
 
-        loadStaticData = false;
+    /**
+     * @brief Sets the driving forces and torques of all agents, used by the following calls to CrowdMechanicsStep().
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param drivingForces An array of 3 * (number of agents) doubles, filled agent by agent (in the order of the Agents file)
+     *                      with the x and y components of the driving force Fp and the driving torque Mp.
+     *
+     * @return  EXIT_SUCCESS if the driving forces and torques were set.
+     *          EXIT_FAILURE otherwise
+     */
+    int CrowdMechanicsSetDrivingForces(Simulation* simulation, const double* drivingForces)
+    {
+        if (!simulation || !drivingForces)
+            return EXIT_FAILURE;
+        for (uint32_t a = 0; a < simulation->nAgents; a++)
+        {
+            const double* row = drivingForces + 3 * a;
+            simulation->setDrivingForces(a, {row[0], row[1]}, row[2]);
+        }
         return EXIT_SUCCESS;
     }
+
+    /**
+     * @brief Dumps the current kinematics, driving forces and torques of all agents to an agent dynamics file.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param dynamicsFile The path of the file to write (it is not relative to the dynamic directory).
+     *
+     * @return  EXIT_SUCCESS if the file was written.
+     *          EXIT_FAILURE otherwise
+     */
+    int CrowdMechanicsWriteDynamicsFile(const Simulation* simulation, const char* dynamicsFile)
+    {
+        if (!simulation || !dynamicsFile)
+            return EXIT_FAILURE;
+        return simulation->writeDynamicsFile(dynamicsFile);
+    }
+
+    /**
+     * @brief Sets the number of threads computing the contact forces in the mechanical layer of a simulation.
+     *
+     * The results do not depend on the number of threads. It is only used if the library was built with OpenMP.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param nThreads The number of threads, at least 1.
+     *
+     * @return  EXIT_SUCCESS if the number of threads was set.
+     *          EXIT_FAILURE otherwise
+     */
+    int CrowdMechanicsSetNumberThreads(Simulation* simulation, uint32_t nThreads)
+    {
+        if (!simulation || nThreads == 0)
+            return EXIT_FAILURE;
+        simulation->nThreads = nThreads;
+        return EXIT_SUCCESS;
+    }
+
+    /**
+     * @brief Gets the number of sub-steps taken by the mechanical layer during the last decisional time step.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     *
+     * @return The number of sub-steps, 0 if no agent was mechanically active (or if the handle is NULL).
+     */
+    uint32_t CrowdMechanicsGetNumberSubSteps(const Simulation* simulation) { return simulation ? simulation->nSubSteps : 0; }
+
+    /**
+     * @brief Gets the number of contacts at the end of the last decisional time step.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     *
+     * @return The number of contacts returned by CrowdMechanicsGetContacts() (0 if the handle is NULL).
+     */
+    uint32_t CrowdMechanicsGetNumberContacts(const Simulation* simulation)
+    {
+        return simulation ? static_cast<uint32_t>(simulation->contacts.size() / nContactValues) : 0;
+    }
+
+    /**
+     * @brief Copies the contacts at the end of the last decisional time step.
+     *
+     * Each contact is given once, by the agent of lower index for the contacts between two agents.
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate().
+     * @param contacts An array of 12 * (number of contacts) doubles, filled contact by contact with the agent (in the order of
+     *                 the Agents file), its shape, the neighbouring agent and its shape (-1 for a wall), the obstacle and the
+     *                 wall of the obstacle (-1 for an agent), then the x and y components of the normal force Fn, of the
+     *                 tangential force Ft and of the tangential relative displacement.
+     *
+     * @return  EXIT_SUCCESS if the contacts were copied.
+     *          EXIT_FAILURE otherwise
+     */
+    int CrowdMechanicsGetContacts(const Simulation* simulation, double* contacts)
+    {
+        if (!simulation || (!contacts && !simulation->contacts.empty()))
+            return EXIT_FAILURE;
+        std::ranges::copy(simulation->contacts, contacts);
+        return EXIT_SUCCESS;
+    }
+
+    /**
+     * @brief Releases a simulation created by CrowdMechanicsCreate().
+     *
+     * @param simulation The handle returned by CrowdMechanicsCreate(). It must not be used afterwards.
+     */
+    void CrowdMechanicsDestroy(Simulation* simulation) { delete simulation; }
 }
@@ -29,6 +29,7 @@
 
 #include <sys/stat.h>
 
+#include <algorithm>
 #include <array>
 #include <fstream>
 #include <map>
@@ -40,49 +41,131 @@
 
 #include "../3rdparty/tinyxml/tinyxml2.h"
 
-using std::list, std::map, std::set, std::vector, std::string, std::tuple, std::pair, std::cout, std::cerr, std::endl, std::ofstream,
-    std::fmin, std::runtime_error;
+using std::array, std::list, std::map, std::set, std::vector, std::string, std::tuple, std::pair, std::cout, std::cerr, std::endl,
+    std::ofstream, std::fmin, std::runtime_error;
 
 /**
  * @brief Constructor for the MechanicalLayer class.
  *
- * It is the main function of the mechanical layer. It will "prepare" the mechanically active agents,
- * read the Interactions file to get possible already existing contacts, loop on dt_mech and produce
- * the output Interactions file.
+ * It creates the (empty) workspace of the mechanical layer of a simulation, once its agents have been created.
  *
- * @param mech_active_agents Reference to a list of pointers to Agent objects representing the active agents in the crowd.
+ * @param simulation The simulation whose mechanically active agents (sim.mech_active_agents) are handled.
  */
-MechanicalLayer::MechanicalLayer(list<Agent*>& mech_active_agents)
-    : nb_active_agents(mech_active_agents.size()),
-      nb_active_shapes(0),
-      vgn(nb_active_agents),
-      vgnp1(nb_active_agents),
-      rgn(nb_active_agents),
-      rgnp1(nb_active_agents),
-      delta(0),
-      thetn(nb_active_agents),
-      thetnp1(nb_active_agents),
-      wn(nb_active_agents),
-      wnp1(nb_active_agents),
-      wdesired(nb_active_agents),
-      Fp(nb_active_agents),
-      Forthon(nb_active_agents),
-      Ftn(nb_active_agents),
-      taun(nb_active_agents),
-      neighbours(nb_active_agents),
-      active_shapeIDagent(0),
-      active_shapeIDshape_crowd(0),
-      radius(0),
-      size_agents(nb_active_agents),
-      neighbours_shape(nb_active_agents),
-      agentIDshape(nb_active_agents + 1, 0),
-      masses(nb_active_agents),
-      mois(nb_active_agents),
-      damping(nb_active_agents)
+MechanicalLayer::MechanicalLayer(Simulation& simulation)
+    : sim(simulation),
+      dt_mech(simulation.dt_mech),
+      nbThreads(simulation.nThreads),
+      interactionsFile(simulation.pathDynamic + "AgentInteractions.xml"),
+      nb_active_agents(0),
+      nb_active_shapes(0)
 {
-    /*  Preliminary definitions and initialisation  */
+    for (uint32_t a = 0; a < sim.nAgents; a++)
+    {
+        for (const unsigned shape : sim.agents[a]->_ids_shapes)
+        {
+            if (shape >= shapeIDagent_crowd.size())
+                shapeIDagent_crowd.resize(shape + 1);
+            shapeIDagent_crowd[shape] = a;
+        }
+    }
+}
+
+/**
+ * @brief Destructor for the CrowdMech class.
+ */
+MechanicalLayer::~MechanicalLayer() = default;
+
+/**
+ * @brief It is the main function of the mechanical layer. It will "prepare" the mechanically active agents,
+ * loop on dt_mech, transfer the computed data to the agents and produce the output Interactions file.
+ *
+ * With an adaptive time step, each sub-step is chosen by getAdaptiveTimeStep() instead, and the agents follow the analytic
+ * relaxation of the agents that are not mechanically active while none of them is in contact.
+ */
+void MechanicalLayer::run()
+{
+    //  The parameters are read again by each call to CrowdMechanics()
+    dt_mech = sim.dt_mech;
+    nbThreads = sim.nThreads;
+    interactionsFile = sim.pathDynamic + "AgentInteractions.xml";
+
+    prepareActiveAgents();
+    determineNeighbouringShapes();
+
+    /*  MECHANICAL Loop */
+    if (!sim.adaptiveTimeStep)
+    {
+        for (unsigned t = 0; t < static_cast<unsigned>(sim.dt / dt_mech); t++)
+        {
+            loop();
+            sim.nSubSteps++;
+        }
+    }
+    else
+    {
+        //  The remaining time is compared to a small fraction of dt to ignore rounding errors
+        for (double remainingTime = sim.dt; remainingTime > 1e-9 * sim.dt; sim.nSubSteps++)
+        {
+            auto [subStep, inContact] = getAdaptiveTimeStep(remainingTime);
+            if (inContact)
+            {
+                dt_mech = subStep;
+                loop();
+            }
+            else
+                relax(subStep);
+            remainingTime -= subStep;
+        }
+    }
+
+    /*  Update the positions and velocities of mechanically active agents   */
+    unsigned cpt_agent = 0;
+    for (Agent* agent : sim.mech_active_agents)
+    {
+        agent->_x = rgn[cpt_agent].first;
+        agent->_y = rgn[cpt_agent].second;
+        agent->_vx = vgn[cpt_agent].first;
+        agent->_vy = vgn[cpt_agent].second;
+        agent->_theta = thetn[cpt_agent];
+        agent->_w = wn[cpt_agent];
+        cpt_agent++;
+    }
+
+    /*  Output the interactions file */
+    generateInteractionsOutputFile(existsContacts());
+    storeContacts();
+    interactionsOutput.clear();
+    interactionsOutputWall.clear();
+}
+
+/**
+ * @brief Fills the workspace with the current state of the mechanically active agents.
+ *
+ * The vectors are resized rather than reallocated, so that they keep their memory from one call to the next.
+ * The contacts of the agents that are no longer mechanically active are forgotten, as these agents are too far
+ * from any other agent and from the walls to be in contact.
+ */
+void MechanicalLayer::prepareActiveAgents()
+{
+    vector<Agent*>& mech_active_agents = sim.mech_active_agents;
     //  Sort mechanically active agents to have agent/shapes in ascending order
-    mech_active_agents.sort([](auto const& a, auto const& b) { return (a->_id) < (b->_id); });
+    std::ranges::sort(mech_active_agents, [](auto const& a, auto const& b) { return (a->_id) < (b->_id); });
+    nb_active_agents = mech_active_agents.size();
+    nb_active_shapes = 0;
+
+    for (vector<double2>* agentVector : {&vgn, &vgnp1, &rgn, &rgnp1, &Fp, &Forthon, &Ftn, &forthonp1, &ftnp1, &damping})
+        agentVector->resize(nb_active_agents);
+    for (vector<double>* agentVector : {&thetn, &thetnp1, &wn, &wnp1, &wdesired, &taun, &taunp1, &masses, &mois})
+        agentVector->resize(nb_active_agents);
+    size_agents.resize(nb_active_agents);
+    agentIDshape.assign(nb_active_agents + 1, 0);
+    active_shapeIDagent.clear();
+    active_shapeIDshape_crowd.clear();
+    agentActiveIds.clear();
+    delta.clear();
+    radius.clear();
+    shapesMaterial.clear();
+
     unsigned cpt_agent = 0;
     for (Agent* agent : mech_active_agents)
     {
@@ -90,8 +173,8 @@ MechanicalLayer::MechanicalLayer(list<Agent*>& mech_active_agents)
         {
             active_shapeIDagent.push_back(cpt_agent);
             active_shapeIDshape_crowd.push_back(agent->_ids_shapes[cpt_shape]);
+            shapesMaterial.push_back(sim.shapesMaterial[agent->_ids_shapes[cpt_shape]]);
         }
-        agentIds[agent->_id] = cpt_agent;
         agentActiveIds.push_back(agent->_id);
         vector<double2> delta_gtos_agent = agent->get_delta_gtos();
         delta.insert(delta.end(), (delta_gtos_agent).begin(), (delta_gtos_agent).end());
@@ -104,7 +187,7 @@ MechanicalLayer::MechanicalLayer(list<Agent*>& mech_active_agents)
         wn[cpt_agent] = agent->_w;
         masses[cpt_agent] = agent->_mass;
         mois[cpt_agent] = agent->_moi;
-        damping[cpt_agent] = agentProperties[agent->_id];
+        damping[cpt_agent] = sim.agentProperties[agent->_id];
 
         rgnp1[cpt_agent] = double2(agent->_x, agent->_y);
         thetnp1[cpt_agent] = agent->_theta;
@@ -128,81 +211,92 @@ MechanicalLayer::MechanicalLayer(list<Agent*>& mech_active_agents)
         agentIDshape[a + 1] = length;
     }
 
-    //  Get neighbouring shapes id of each agent
-    cpt_agent = 0;
-    for (const Agent* agent : mech_active_agents)
+    //  Forget the contacts of agents that are not mechanically active anymore
+    std::erase_if(slip,
+                  [this](const auto& contact)
+                  {
+                      return !sim.mechanicallyActive[shapeIDagent_crowd[contact.first.first]] ||
+                             !sim.mechanicallyActive[shapeIDagent_crowd[contact.first.second]];
+                  });
+    std::erase_if(slip_wall,
+                  [this](const auto& contact) { return !sim.mechanicallyActive[shapeIDagent_crowd[get<0>(contact.first)]]; });
+}
+
+/**
+ * @brief Gets the neighbouring shapes of each mechanically active agent.
+ *
+ * Two agents are neighbours if they are within 5*(r1+r2) where r1 and r2 are the size of their body (the radius of the smallest
+ * circle containing all the shapes). The candidates are found with a grid of cells larger than the largest such distance, so
+ * that the neighbours of an agent are all in its cell or in the 8 surrounding ones. The neighbouring shapes of each agent are
+ * sorted, so that the forces are summed in the same order as with an exhaustive search.
+ */
+void MechanicalLayer::determineNeighbouringShapes()
+{
+    const vector<Agent*>& mech_active_agents = sim.mech_active_agents;
+    neighbours_shape.resize(nb_active_agents);
+    for (vector<unsigned>& neighbours : neighbours_shape) neighbours.clear();
+
+    double maxRadius = 0.;
+    for (const Agent* agent : mech_active_agents) maxRadius = std::max(maxRadius, agent->_radius);
+    const double cellSize = 10.0 * maxRadius;
+    if (cellSize <= 0.)
+        return;
+
+    //  Sort the agents by cell
+    vector<pair<int2, unsigned>> agentsByCell(nb_active_agents);
+    for (unsigned cpt_agent = 0; cpt_agent < nb_active_agents; cpt_agent++)
     {
-        unsigned cpt_agent2 = 0;
-        for (const Agent* agent2 : mech_active_agents)
+        const int2 cell(static_cast<int>(floor(rgn[cpt_agent].first / cellSize)),
+                        static_cast<int>(floor(rgn[cpt_agent].second / cellSize)));
+        agentsByCell[cpt_agent] = {cell, cpt_agent};
+    }
+    std::ranges::sort(agentsByCell);
+
+    for (unsigned cpt_agent = 0; cpt_agent < nb_active_agents; cpt_agent++)
+    {
+        const Agent* agent = mech_active_agents[cpt_agent];
+        const int2 cell(static_cast<int>(floor(rgn[cpt_agent].first / cellSize)),
+                        static_cast<int>(floor(rgn[cpt_agent].second / cellSize)));
+        for (int i = -1; i <= 1; i++)
         {
-            if (cpt_agent2 > cpt_agent)
+            for (int j = -1; j <= 1; j++)
             {
-                //  Include as neighbour if within 5*(r1+r2) where r1 and r2 are the size of the body (the radius of the smallest
-                //  circle containing all the shapes)
-                if (const double distance = !(rgn[cpt_agent] - rgn[cpt_agent2]); distance < 5.0 * (agent->_radius + agent2->_radius))
+                const int2 neighbourCell(cell.first + i, cell.second + j);
+                for (auto it = std::ranges::lower_bound(agentsByCell, pair<int2, unsigned>(neighbourCell, cpt_agent + 1));
+                     it != agentsByCell.end() && it->first == neighbourCell; ++it)
                 {
-                    for (unsigned cpt_shape(agentIDshape[cpt_agent2]); cpt_shape < agentIDshape[cpt_agent2] + size_agents[cpt_agent2];
-                         ++cpt_shape)
-                        neighbours_shape[cpt_agent].push_back(cpt_shape);
-                    for (unsigned cpt_shape(agentIDshape[cpt_agent]); cpt_shape < agentIDshape[cpt_agent] + size_agents[cpt_agent];
-                         ++cpt_shape)
-                        neighbours_shape[cpt_agent2].push_back(cpt_shape);
+                    const unsigned cpt_agent2 = it->second;
+                    const Agent* agent2 = mech_active_agents[cpt_agent2];
+                    if (const double distance = !(rgn[cpt_agent] - rgn[cpt_agent2]);
+                        distance < 5.0 * (agent->_radius + agent2->_radius))
+                    {
+                        for (unsigned cpt_shape(agentIDshape[cpt_agent2]);
+                             cpt_shape < agentIDshape[cpt_agent2] + size_agents[cpt_agent2]; ++cpt_shape)
+                            neighbours_shape[cpt_agent].push_back(cpt_shape);
+                        for (unsigned cpt_shape(agentIDshape[cpt_agent]); cpt_shape < agentIDshape[cpt_agent] + size_agents[cpt_agent];
+                             ++cpt_shape)
+                            neighbours_shape[cpt_agent2].push_back(cpt_shape);
+                    }
                 }
             }
-            cpt_agent2++;
         }
-        cpt_agent++;
-    }
-
-    /*  Check if an Interactions File already exists    */
-    const string interactionsFile = pathDynamic + "AgentInteractions.xml";
-    struct stat buffer{};
-    if (stat(interactionsFile.c_str(), &buffer) != -1)
-        if (readInteractionsInputFile(interactionsFile) == EXIT_FAILURE)
-            throw runtime_error("Issue while reading interactions file");
-
-    /*  MECHANICAL Loop */
-    for (unsigned t = 0; t < static_cast<unsigned>(dt / dt_mech); t++)
-    {
-        loop();
     }
-
-    /*  Update the positions and velocities of mechanically active agents   */
-    cpt_agent = 0;
-    for (Agent* agent : mech_active_agents)
-    {
-        agent->_x = rgn[cpt_agent].first;
-        agent->_y = rgn[cpt_agent].second;
-        agent->_vx = vgn[cpt_agent].first;
-        agent->_vy = vgn[cpt_agent].second;
-        agent->_theta = thetn[cpt_agent];
-        agent->_w = wn[cpt_agent];
-        cpt_agent++;
-    }
-
-    /*  Output the interactions file */
-    generateInteractionsOutputFile(interactionsFile, existsContacts());
+    for (vector<unsigned>& neighbours : neighbours_shape) std::ranges::sort(neighbours);
 }
 
-/**
- * @brief Destructor for the CrowdMech class.
- *
- * This destructor transfers computed data to the agents.
- */
-MechanicalLayer::~MechanicalLayer()   // destructor transfers computed data to the agents
-    = default;
-
 /**
  * @brief This function read the interactions file to store the possible already existing contacts.
  * 			slip and slip_wall are the ones who get filled
+ *          It is called once, when the simulation is initialised: the contacts are then kept in memory.
  *
- * @param interactionsFile the name of the file
+ * @param file the name of the file
  *
  * return EXIT_FAILURE in case of problem with the XML file
  *		  EXIT_SUCCESS otherwise
  */
-int MechanicalLayer::readInteractionsInputFile(const std::string& interactionsFile)
+int MechanicalLayer::readInteractionsInputFile(const std::string& file)
 {
+    const string& interactionsFile = file;
     tinyxml2::XMLDocument document;
     document.LoadFile(interactionsFile.data());
     if (document.ErrorID() != 0)
@@ -233,6 +327,12 @@ int MechanicalLayer::readInteractionsInputFile(const std::string& interactionsFi
             cerr << "Error: Agents must have an Id in file " << interactionsFile << endl;
             return EXIT_FAILURE;
         }
+        if (!sim.agentMap.contains(agent1ExternId))
+        {
+            cerr << "Error: unknown agent " << agent1ExternId << " in " << interactionsFile << endl;
+            return EXIT_FAILURE;
+        }
+        const Agent* agent1 = sim.agents[sim.agentMap[agent1ExternId]];
         //  Interactions with other agents
         const tinyxml2::XMLElement* agent2Element = agent1Element->FirstChildElement("Agent");
         while (agent2Element)
@@ -243,6 +343,12 @@ int MechanicalLayer::readInteractionsInputFile(const std::string& interactionsFi
                 cerr << "Error: Agents must have an Id in file " << interactionsFile << endl;
                 return EXIT_FAILURE;
             }
+            if (!sim.agentMap.contains(agent2ExternId))
+            {
+                cerr << "Error: unknown agent " << agent2ExternId << " in " << interactionsFile << endl;
+                return EXIT_FAILURE;
+            }
+            const Agent* agent2 = sim.agents[sim.agentMap[agent2ExternId]];
             //  Read interactions
             const tinyxml2::XMLElement* interactionElement = agent2Element->FirstChildElement("Interaction");
             while (interactionElement)
@@ -271,11 +377,17 @@ int MechanicalLayer::readInteractionsInputFile(const std::string& interactionsFi
                     cerr << "Error: Could not parse components of tangential relative displacement in " << interactionsFile << endl;
                     return EXIT_FAILURE;
                 }
-                uint32_t cpt_shape = agentIDshape[agentIds[agentMap[agent1ExternId]]] + shapeParent;
-                uint32_t cpt_shape_neigh = agentIDshape[agentIds[agentMap[agent2ExternId]]] + shapeChild;
+                if (shapeParent < 0 || shapeParent >= static_cast<int32_t>(agent1->_nb_shapes) || shapeChild < 0 ||
+                    shapeChild >= static_cast<int32_t>(agent2->_nb_shapes))
+                {
+                    cerr << "Error: unknown shape in interaction between agents in " << interactionsFile << endl;
+                    return EXIT_FAILURE;
+                }
+                const uint32_t shape = agent1->_ids_shapes[shapeParent];
+                const uint32_t shape_neigh = agent2->_ids_shapes[shapeChild];
 
-                slip[{cpt_shape, cpt_shape_neigh}] = inputSlip;
-                slip[{cpt_shape_neigh, cpt_shape}] = -1 * inputSlip;
+                slip[{shape, shape_neigh}] = inputSlip;
+                slip[{shape_neigh, shape}] = -1 * inputSlip;
 
                 interactionElement = interactionElement->NextSiblingElement("Interaction");
             }
@@ -317,8 +429,12 @@ int MechanicalLayer::readInteractionsInputFile(const std::string& interactionsFi
                      << interactionsFile << endl;
                 return EXIT_FAILURE;
             }
-            uint32_t cpt_shape = agentIDshape[agentIds[agentMap[agent1ExternId]]] + shape;
-            slip_wall[{cpt_shape, iobs, iwall}] = inputSlipWall;
+            if (shape < 0 || shape >= static_cast<int32_t>(agent1->_nb_shapes))
+            {
+                cerr << "Error: unknown shape in interaction between agent and wall in " << interactionsFile << endl;
+                return EXIT_FAILURE;
+            }
+            slip_wall[{agent1->_ids_shapes[shape], iobs, iwall}] = inputSlipWall;
 
             wallElement = wallElement->NextSiblingElement("Wall");
         }
@@ -333,12 +449,14 @@ int MechanicalLayer::readInteractionsInputFile(const std::string& interactionsFi
  *
  * @param cpt_shape The index of the shape.
  * @param AtTimen Flag indicating whether to calculate the forces at time n or n+1.
+ * @param changes The contacts of the shape that start or end, to be applied by applyContactChanges().
  *
  * @return A tuple containing the tangential force, normal force, and torque.
  */
-tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_shape, bool AtTimen)
+tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_shape, bool AtTimen, ContactChanges& changes)
 {
     unsigned cpt_agent = active_shapeIDagent[cpt_shape];
+    unsigned shape = active_shapeIDshape_crowd[cpt_shape];   //  Id of the shape in the crowd, for the contacts
     double UnmZetadt = 1.0 - dt_mech * damping[cpt_agent].first;
     double2 delta_GtoS = AtTimen ? delta[cpt_shape] : delta[cpt_shape] + ((thetnp1[cpt_agent] - thetn[cpt_agent]) ^ delta[cpt_shape]);
     double2 posagent = AtTimen ? rgn[cpt_agent] : rgnp1[cpt_agent];   //  Center of mass of the agent
@@ -357,6 +475,7 @@ tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_s
     for (unsigned cpt_shape_neigh : neighbours_shape[cpt_agent])
     {
         unsigned cpt_neigh = active_shapeIDagent[cpt_shape_neigh];
+        unsigned shape_neigh = active_shapeIDshape_crowd[cpt_shape_neigh];
         double2 delta_GtoS_neigh = AtTimen
                                        ? delta[cpt_shape_neigh]
                                        : delta[cpt_shape_neigh] + ((thetnp1[cpt_neigh] - thetn[cpt_neigh]) ^ delta[cpt_shape_neigh]);
@@ -394,56 +513,68 @@ tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_s
             double2 vortho_ij = (vij % n_ij) * n_ij;
             double2 vt_ij = vij - vortho_ij;
 
-            //  If the map does not contain this pair ie the slip is not initialized, we initialize it
+            //  If the table does not contain this pair ie the slip is not initialized, we initialize it
             //  Otherwise: we increment it
-            if (!slip.contains({cpt_shape, cpt_shape_neigh}))
-                slip[{cpt_shape, cpt_shape_neigh}] = double2(0., 0.);
-            else
+            auto slipIterator = slip.find({shape, shape_neigh});
+            const bool newContact = slipIterator == slip.end();
+            double2 newSlip(0., 0.);
+            double2& slip_ij = newContact ? newSlip : slipIterator->second;
+            if (!newContact)
             {
-                double2 slip_prime = slip[{cpt_shape, cpt_shape_neigh}];
+                double2 slip_prime = slip_ij;
                 //  Rotation of the slip to take into account the rotation of the contact reference frame
                 //  from t to t+dt_mech (D.R. Vyas, J.M. Ottino, R.M. Lueptow et al. 2025)
                 double2 slip_projected = slip_prime - (slip_prime % n_ij) * n_ij;
                 double2 slip_new = slip_prime;
                 if ((!slip_projected) > 0.)
                     slip_new = (!slip_prime / !slip_projected) * slip_projected;
-                slip[{cpt_shape, cpt_shape_neigh}] = slip_new + dt_mech * vt_ij;
+                slip_ij = slip_new + dt_mech * vt_ij;
             }
             //  For the output Interactions file:
-            //  We will only put the N(N-1)/2 pairs, ie cpt_shape_neigh>cpt_shape
-            if (!interactionsOutput.contains({cpt_shape_neigh, cpt_shape}))
-                interactionsOutput[{cpt_shape, cpt_shape_neigh}][SLIP] = slip[{cpt_shape, cpt_shape_neigh}];
+            //  We will only put the N(N-1)/2 pairs, ie cpt_shape_neigh>cpt_shape (both shapes see the same contact)
+            array<double2, 3> output;
+            output[SLIP] = slip_ij;
 
-            uint32_t shapeMaterialId = shapesMaterial[active_shapeIDshape_crowd[cpt_shape]];
-            uint32_t shapeNeighbourMaterialId = shapesMaterial[active_shapeIDshape_crowd[cpt_shape_neigh]];
+            uint32_t shapeMaterialId = shapesMaterial[cpt_shape];
+            uint32_t shapeNeighbourMaterialId = shapesMaterial[cpt_shape_neigh];
             /*  Normal interactions */
-            double k_n = binaryProperties[STIFFNESS_NORMAL][shapeMaterialId][shapeNeighbourMaterialId];
-            double Gamma_n = binaryProperties[DAMPING_NORMAL][shapeMaterialId][shapeNeighbourMaterialId];
+            double k_n = sim.binaryProperties[STIFFNESS_NORMAL][shapeMaterialId][shapeNeighbourMaterialId];
+            double Gamma_n = sim.binaryProperties[DAMPING_NORMAL][shapeMaterialId][shapeNeighbourMaterialId];
             double2 fnij_elastic = k_n * h * n_ij;
             double2 fnij_viscous = -Gamma_n * vortho_ij;
             double2 fnij = fnij_elastic + fnij_viscous;
             fortho = fortho + fnij;
-            if (!interactionsOutput.contains({cpt_shape_neigh, cpt_shape}))
-                interactionsOutput[{cpt_shape, cpt_shape_neigh}][FORCE_ORTHO] = fnij;
+            output[FORCE_ORTHO] = fnij;
 
             /*  Tangential interactions */
-            double k_t = binaryProperties[STIFFNESS_TANGENTIAL][shapeMaterialId][shapeNeighbourMaterialId];
-            double Gamma_t = binaryProperties[DAMPING_TANGENTIAL][shapeMaterialId][shapeNeighbourMaterialId];
-            double2 ftij_static = -k_t * slip[{cpt_shape, cpt_shape_neigh}] - Gamma_t * vt_ij;
-            double mu_dyn = binaryProperties[FRICTION_SLIDING][shapeMaterialId][shapeNeighbourMaterialId];
+            double k_t = sim.binaryProperties[STIFFNESS_TANGENTIAL][shapeMaterialId][shapeNeighbourMaterialId];
+            double Gamma_t = sim.binaryProperties[DAMPING_TANGENTIAL][shapeMaterialId][shapeNeighbourMaterialId];
+            double2 ftij_static = -k_t * slip_ij - Gamma_t * vt_ij;
+            double mu_dyn = sim.binaryProperties[FRICTION_SLIDING][shapeMaterialId][shapeNeighbourMaterialId];
             double2 t_vij = double2(0., 0.);
             double2 ftij = double2(0., 0.);
             if ((!ftij_static) > mu_dyn * !fnij)
             {
                 t_vij = (1. / !ftij_static) * ftij_static;
                 ftij = mu_dyn * !fnij * t_vij;
-                slip[{cpt_shape, cpt_shape_neigh}] = -(1. / k_t) * (mu_dyn * !fnij * t_vij + Gamma_t * vt_ij);
+                slip_ij = -(1. / k_t) * (mu_dyn * !fnij * t_vij + Gamma_t * vt_ij);
             }
             else
                 ftij = ftij_static;
             ft = ft + ftij;
-            if (!interactionsOutput.contains({cpt_shape_neigh, cpt_shape}))
-                interactionsOutput[{cpt_shape, cpt_shape_neigh}][FORCE_TAN] = ftij;
+            output[FORCE_TAN] = ftij;
+
+            //  The tables are only updated in place here, new contacts are added by applyContactChanges()
+            if (newContact)
+                changes.startedContacts.emplace_back(cpt_shape_neigh, slip_ij);
+            if (cpt_shape < cpt_shape_neigh)
+            {
+                if (auto outputIterator = interactionsOutput.find({cpt_shape, cpt_shape_neigh});
+                    outputIterator != interactionsOutput.end())
+                    outputIterator->second = output;
+                else
+                    changes.newOutputs.emplace_back(cpt_shape_neigh, output);
+            }
 
             /*  Torque  */
             double torqnij = (1. ^ dcG) % fnij;
@@ -453,20 +584,14 @@ tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_s
         }
         else
         {
-            if (slip.contains({cpt_shape, cpt_shape_neigh}))
-            {
-                slip.erase({cpt_shape, cpt_shape_neigh});
-                if (interactionsOutput.contains({cpt_shape, cpt_shape_neigh}))
-                    interactionsOutput.erase({cpt_shape, cpt_shape_neigh});
-                else if (interactionsOutput.contains({cpt_shape_neigh, cpt_shape}))
-                    interactionsOutput.erase({cpt_shape_neigh, cpt_shape});
-            }
+            if (slip.contains({shape, shape_neigh}))
+                changes.endedContacts.push_back(cpt_shape_neigh);
         }
     }
 
     /*  Interactions with walls */
     int iobs = 0;
-    for (vector<double2> const& wall_it : listObstacles)
+    for (vector<double2> const& wall_it : sim.listObstacles)
     {
         int iwall = 0;
         for (auto it = wall_it.begin(); next(it) != wall_it.end(); ++it)
@@ -491,13 +616,15 @@ tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_s
                 double2 vortho_iw = (viw % n_iw) * n_iw;
                 double2 vt_iw = viw - vortho_iw;
 
-                //  If the map does not contain this pair ie the slip is not initialized, we initialize it
+                //  If the table does not contain this pair ie the slip is not initialized, we initialize it
                 //  Otherwise: we increment it
-                if (!slip_wall.contains({cpt_shape, iobs, iwall}))
-                    slip_wall[{cpt_shape, iobs, iwall}] = double2(0., 0.);
-                else
+                auto slipIterator = slip_wall.find({shape, iobs, iwall});
+                const bool newContact = slipIterator == slip_wall.end();
+                double2 newSlip(0., 0.);
+                double2& slip_iw = newContact ? newSlip : slipIterator->second;
+                if (!newContact)
                 {
-                    double2 slip_wall_prime = slip_wall[{cpt_shape, iobs, iwall}];
+                    double2 slip_wall_prime = slip_iw;
                     //  Rotation of the slip to take into account the rotation of the contact reference frame
                     //  from t to t+dt_mech (D.R. Vyas, J.M. Ottino, R.M. Lueptow et al. 2025)
                     double2 slip_wall_projected = slip_wall_prime - (slip_wall_prime % n_iw) * n_iw;
@@ -506,42 +633,52 @@ tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_s
                     {
                         slip_wall_new = (!slip_wall_prime / !slip_wall_projected) * slip_wall_projected;
                     }
-                    slip_wall[{cpt_shape, iobs, iwall}] = slip_wall[{cpt_shape, iobs, iwall}] + dt_mech * vt_iw;
+                    slip_iw = slip_iw + dt_mech * vt_iw;
                 }
                 //  For the Interactions output file:
-                interactionsOutputWall[{cpt_shape, iobs, iwall}][SLIP] = slip_wall[{cpt_shape, iobs, iwall}];
+                array<double2, 3> output;
+                output[SLIP] = slip_iw;
 
-                uint32_t shapeMaterialId = shapesMaterial[active_shapeIDshape_crowd[cpt_shape]];
-                uint32_t obstacleMaterialId = obstaclesMaterial[iobs];
+                uint32_t shapeMaterialId = shapesMaterial[cpt_shape];
+                uint32_t obstacleMaterialId = sim.obstaclesMaterial[iobs];
 
                 /*  Normal interactions  */
-                double k_n_wall = binaryProperties[STIFFNESS_NORMAL][shapeMaterialId][obstacleMaterialId];
-                double Gamma_n_wall = binaryProperties[DAMPING_NORMAL][shapeMaterialId][obstacleMaterialId];
+                double k_n_wall = sim.binaryProperties[STIFFNESS_NORMAL][shapeMaterialId][obstacleMaterialId];
+                double Gamma_n_wall = sim.binaryProperties[DAMPING_NORMAL][shapeMaterialId][obstacleMaterialId];
                 double2 fniw_elastic = k_n_wall * h * n_iw;
                 double2 fniw_viscous = -Gamma_n_wall * vortho_iw;
                 double2 fniw = fniw_elastic + fniw_viscous;
                 fortho = fortho + fniw;
-                interactionsOutputWall[{cpt_shape, iobs, iwall}][FORCE_ORTHO] = fniw;
+                output[FORCE_ORTHO] = fniw;
 
                 /*  Tangential interactions  */
-                double k_t_wall = binaryProperties[STIFFNESS_TANGENTIAL][shapeMaterialId][obstacleMaterialId];
-                double Gamma_t_wall = binaryProperties[DAMPING_TANGENTIAL][shapeMaterialId][obstacleMaterialId];
-                double2 ftiw_static = -k_t_wall * slip_wall[{cpt_shape, iobs, iwall}] - Gamma_t_wall * vt_iw;
+                double k_t_wall = sim.binaryProperties[STIFFNESS_TANGENTIAL][shapeMaterialId][obstacleMaterialId];
+                double Gamma_t_wall = sim.binaryProperties[DAMPING_TANGENTIAL][shapeMaterialId][obstacleMaterialId];
+                double2 ftiw_static = -k_t_wall * slip_iw - Gamma_t_wall * vt_iw;
                 double2 t_viw = double2(0., 0.);
                 double2 ftiw = double2(0., 0.);
-                double mu_dyn_wall = binaryProperties[FRICTION_SLIDING][shapeMaterialId][obstacleMaterialId];
+                double mu_dyn_wall = sim.binaryProperties[FRICTION_SLIDING][shapeMaterialId][obstacleMaterialId];
                 if ((!ftiw_static) > mu_dyn_wall * !fniw)
                 {
                     t_viw = (1.0 / !ftiw_static) * ftiw_static;
                     ftiw = mu_dyn_wall * !fniw * t_viw;
-                    slip_wall[{cpt_shape, iobs, iwall}] = -(1.0 / k_t_wall) * (mu_dyn_wall * !fniw * t_viw + Gamma_t_wall * vt_iw);
+                    slip_iw = -(1.0 / k_t_wall) * (mu_dyn_wall * !fniw * t_viw + Gamma_t_wall * vt_iw);
                 }
                 else
                 {
                     ftiw = ftiw_static;
                 }
                 ft = ft + ftiw;
-                interactionsOutputWall[{cpt_shape, iobs, iwall}][FORCE_TAN] = ftiw;
+                output[FORCE_TAN] = ftiw;
+
+                //  The tables are only updated in place here, new contacts are added by applyContactChanges()
+                if (newContact)
+                    changes.startedWallContacts.emplace_back(int2(iobs, iwall), slip_iw);
+                if (auto outputIterator = interactionsOutputWall.find({cpt_shape, iobs, iwall});
+                    outputIterator != interactionsOutputWall.end())
+                    outputIterator->second = output;
+                else
+                    changes.newWallOutputs.emplace_back(int2(iobs, iwall), output);
 
                 /*  Torque  */
                 double torqniw = (1. ^ dcG) % fniw;
@@ -551,11 +688,8 @@ tuple<double2, double2, double> MechanicalLayer::get_interactions(unsigned cpt_s
             }
             else
             {
-                if (slip_wall.contains({cpt_shape, iobs, iwall}))
-                {
-                    slip_wall.erase({cpt_shape, iobs, iwall});
-                    interactionsOutputWall.erase({cpt_shape, iobs, iwall});
-                }
+                if (slip_wall.contains({shape, iobs, iwall}))
+                    changes.endedWallContacts.emplace_back(iobs, iwall);
             }
             iwall++;
         }
@@ -590,9 +724,10 @@ void MechanicalLayer::loop()
 
     //  Loop over shapes for forces and momentum
     //  Calculation is done at time n
+    computeShapesMotion(true);
     for (unsigned cpt_shape = 0; cpt_shape < nb_active_shapes; cpt_shape++)
     {
-        auto Motion = get_interactions(cpt_shape, true);
+        const auto& Motion = shapesMotion[cpt_shape];
         const unsigned cpt_agent(active_shapeIDagent[cpt_shape]);
         Forthon[cpt_agent] =   //  Resultant of normal forces (applied on the contact point)
             Forthon[cpt_agent] + (1. / masses[cpt_agent]) * get<0>(Motion);
@@ -614,13 +749,14 @@ void MechanicalLayer::loop()
 
     //  Loop over shapes for velocities
     //  Calculation is done at time n+1
-    vector<double2> forthonp1(nb_active_agents, double2(0, 0));
-    vector<double2> ftnp1(nb_active_agents, double2(0, 0));
-    vector<double> taunp1(nb_active_agents, 0.);
+    std::ranges::fill(forthonp1, double2(0, 0));
+    std::ranges::fill(ftnp1, double2(0, 0));
+    std::ranges::fill(taunp1, 0.);
 
+    computeShapesMotion(false);
     for (unsigned cpt_shape = 0; cpt_shape < nb_active_shapes; cpt_shape++)
     {
-        auto Motion = get_interactions(cpt_shape, false);
+        const auto& Motion = shapesMotion[cpt_shape];
         const unsigned cpt_agent(active_shapeIDagent[cpt_shape]);
         forthonp1[cpt_agent] = forthonp1[cpt_agent] + get<0>(Motion);
         ftnp1[cpt_agent] = ftnp1[cpt_agent] + get<1>(Motion);
@@ -642,6 +778,15 @@ void MechanicalLayer::loop()
         wnp1[cpt_agent] = wn[cpt_agent] + 0.5 * dt_mech * (taun[cpt_agent] + taunp1[cpt_agent]);
     }
 
+    endSubStep();
+}
+
+/**
+ * @brief Rotates the shapes of the agents and moves the agents to their position, velocity, orientation and angular velocity
+ * at the end of the sub-step.
+ */
+void MechanicalLayer::endSubStep()
+{
     //  Update relative positions of the shapes
     for (unsigned cpt_shape = 0; cpt_shape < nb_active_shapes; cpt_shape++)
     {
@@ -666,6 +811,202 @@ void MechanicalLayer::loop()
     }
 }
 
+/**
+ * @brief Chooses the next sub-step of the mechanical layer, when the time step is adaptive.
+ *
+ * The speed of each shape is bounded by the largest of its current and desired velocities, plus its rotation. The pairs of
+ * shapes (or shape and wall) that may come into contact before the end of the decisional time step are resolved as
+ * contacts: the stiffnesses and dampings of all the contacts of an agent add up, and the sub-step is at most
+ * adaptiveStiffnessFactor times the inverse of the largest angular frequency (or damping rate) that they allow, bounded
+ * with the Gershgorin theorem. The indentation of these contacts cannot grow by more than adaptiveIndentationFactor times
+ * the radius of the smaller shape either. If no shapes are in contact, the sub-step can instead reach the first time at
+ * which two of them may touch. The sub-step is never smaller than TimeStepMechanical, unless less time remains.
+ *
+ * @param remainingTime The time left until the end of the decisional time step.
+ *
+ * @return The sub-step, and whether some shapes are in contact at the current time.
+ */
+pair<double, bool> MechanicalLayer::getAdaptiveTimeStep(double remainingTime)
+{
+    shapesSpeed.resize(nb_active_shapes);
+    for (unsigned cpt_shape = 0; cpt_shape < nb_active_shapes; cpt_shape++)
+    {
+        const unsigned cpt_agent = active_shapeIDagent[cpt_shape];
+        const double2 vdesired = (1. / damping[cpt_agent].first) * Fp[cpt_agent];
+        shapesSpeed[cpt_shape] =
+            std::max(!vgn[cpt_agent], !vdesired) + std::max(fabs(wn[cpt_agent]), fabs(wdesired[cpt_agent])) * !delta[cpt_shape];
+    }
+    //  Stiffness and damping of the contacts of each agent, and inverse of its effective mass at the contact points,
+    //  including its rotation around its CM
+    agentsContactStiffness.assign(nb_active_agents, 0.);
+    agentsContactDamping.assign(nb_active_agents, 0.);
+    agentsInverseMass.resize(nb_active_agents);
+    for (unsigned cpt_agent = 0; cpt_agent < nb_active_agents; cpt_agent++)
+    {
+        double lever = 0.;
+        for (unsigned cpt_shape = agentIDshape[cpt_agent]; cpt_shape < agentIDshape[cpt_agent + 1]; cpt_shape++)
+            lever = std::max(lever, !delta[cpt_shape] + radius[cpt_shape]);
+        agentsInverseMass[cpt_agent] = 1. / masses[cpt_agent] + lever * lever / mois[cpt_agent];
+    }
+
+    bool inContact = false;
+    double freeSubStep = remainingTime;      //  Time before two shapes may touch
+    double contactSubStep = remainingTime;   //  Sub-step resolving the contacts
+    auto addContact = [&](unsigned cpt_agent, double gap, double closingSpeed, double stiffness, double Gamma, double smallerRadius)
+    {
+        if (gap > 0. && gap >= closingSpeed * remainingTime)   //  No contact before the end of the decisional time step
+            return false;
+        if (gap <= 0.)
+            inContact = true;
+        else
+            freeSubStep = std::min(freeSubStep, gap / closingSpeed);
+        if (closingSpeed > 0.)
+            contactSubStep = std::min(contactSubStep, adaptiveIndentationFactor * smallerRadius / closingSpeed);
+        agentsContactStiffness[cpt_agent] += stiffness;
+        agentsContactDamping[cpt_agent] += Gamma;
+        return true;
+    };
+
+    for (unsigned cpt_shape = 0; cpt_shape < nb_active_shapes; cpt_shape++)
+    {
+        const unsigned cpt_agent = active_shapeIDagent[cpt_shape];
+        const double2 posshape = rgn[cpt_agent] + delta[cpt_shape];
+        const uint32_t shapeMaterialId = shapesMaterial[cpt_shape];
+
+        /*  Contacts between agents, each pair of shapes once  */
+        for (unsigned cpt_shape_neigh : neighbours_shape[cpt_agent])
+        {
+            if (cpt_shape_neigh < cpt_shape)
+                continue;
+            const unsigned cpt_neigh = active_shapeIDagent[cpt_shape_neigh];
+            const uint32_t shapeNeighbourMaterialId = shapesMaterial[cpt_shape_neigh];
+            const double gap = !(posshape - (rgn[cpt_neigh] + delta[cpt_shape_neigh])) - radius[cpt_shape] - radius[cpt_shape_neigh];
+            const double stiffness = std::max(sim.binaryProperties[STIFFNESS_NORMAL][shapeMaterialId][shapeNeighbourMaterialId],
+                                              sim.binaryProperties[STIFFNESS_TANGENTIAL][shapeMaterialId][shapeNeighbourMaterialId]);
+            const double Gamma = std::max(sim.binaryProperties[DAMPING_NORMAL][shapeMaterialId][shapeNeighbourMaterialId],
+                                          sim.binaryProperties[DAMPING_TANGENTIAL][shapeMaterialId][shapeNeighbourMaterialId]);
+            if (addContact(cpt_agent, gap, shapesSpeed[cpt_shape] + shapesSpeed[cpt_shape_neigh], stiffness, Gamma,
+                           std::min(radius[cpt_shape], radius[cpt_shape_neigh])))
+            {
+                agentsContactStiffness[cpt_neigh] += stiffness;
+                agentsContactDamping[cpt_neigh] += Gamma;
+            }
+        }
+
+        /*  Contacts with walls */
+        for (size_t iobs = 0; iobs < sim.listObstacles.size(); iobs++)
+        {
+            const vector<double2>& wall_it = sim.listObstacles[iobs];
+            const uint32_t obstacleMaterialId = sim.obstaclesMaterial[iobs];
+            for (auto it = wall_it.begin(); next(it) != wall_it.end(); ++it)
+            {
+                const double distance = get_distance_to_wall_and_closest_point(*it, *(next(it)), posshape).first;
+                addContact(cpt_agent, distance - radius[cpt_shape], shapesSpeed[cpt_shape],
+                           std::max(sim.binaryProperties[STIFFNESS_NORMAL][shapeMaterialId][obstacleMaterialId],
+                                    sim.binaryProperties[STIFFNESS_TANGENTIAL][shapeMaterialId][obstacleMaterialId]),
+                           std::max(sim.binaryProperties[DAMPING_NORMAL][shapeMaterialId][obstacleMaterialId],
+                                    sim.binaryProperties[DAMPING_TANGENTIAL][shapeMaterialId][obstacleMaterialId]),
+                           radius[cpt_shape]);
+            }
+        }
+    }
+
+    //  The largest eigenvalue of the stiffness (or damping) matrix divided by the masses is at most twice the largest sum of
+    //  the stiffnesses (or dampings) of the contacts of an agent divided by its mass
+    for (unsigned cpt_agent = 0; cpt_agent < nb_active_agents; cpt_agent++)
+    {
+        const double rate = std::max(sqrt(2. * agentsContactStiffness[cpt_agent] * agentsInverseMass[cpt_agent]),
+                                     2. * agentsContactDamping[cpt_agent] * agentsInverseMass[cpt_agent]);
+        if (rate > 0.)
+            contactSubStep = std::min(contactSubStep, adaptiveStiffnessFactor / rate);
+    }
+    const double subStep = inContact ? contactSubStep : std::max(contactSubStep, freeSubStep);
+    return {std::max(subStep, std::min(sim.dt_mech, remainingTime)), inContact};
+}
+
+/**
+ * @brief Moves the mechanically active agents when none of them is in contact, with the analytic relaxation of the
+ * velocities towards the desired ones that is used for the agents that are not mechanically active.
+ *
+ * The positions and orientations are integrated exactly along the relaxation.
+ *
+ * @param duration The duration of the relaxation.
+ */
+void MechanicalLayer::relax(double duration)
+{
+    for (unsigned cpt_agent = 0; cpt_agent < nb_active_agents; cpt_agent++)
+    {
+        /// dv/dt = (v_des - v) / tau_mech  ==> v(t)= v_des (1 - e^-t/tau_mech) + v(t=0) e^-t/tau_mech
+        const double decayTranslation = exp(-duration * damping[cpt_agent].first);
+        const double decayRotation = exp(-duration * damping[cpt_agent].second);
+        const double2 vdesired = (1. / damping[cpt_agent].first) * Fp[cpt_agent];
+        vgnp1[cpt_agent] = (1.0 - decayTranslation) * vdesired + decayTranslation * vgn[cpt_agent];
+        wnp1[cpt_agent] = (1.0 - decayRotation) * wdesired[cpt_agent] + decayRotation * wn[cpt_agent];
+        rgnp1[cpt_agent] =
+            rgn[cpt_agent] + duration * vdesired + ((1.0 - decayTranslation) / damping[cpt_agent].first) * (vgn[cpt_agent] - vdesired);
+        thetnp1[cpt_agent] = thetn[cpt_agent] + duration * wdesired[cpt_agent] +
+                             (1.0 - decayRotation) / damping[cpt_agent].second * (wn[cpt_agent] - wdesired[cpt_agent]);
+    }
+    endSubStep();
+}
+
+/**
+ * @brief Computes the forces and torque on each active shape, at time n or n+1, and updates the contacts.
+ *
+ * With more than one thread, the shapes are shared between the threads. The result does not depend on the number of
+ * threads: the forces on each shape are computed in the same order, they are summed over the shapes of each agent by the
+ * caller in the order of the shapes, and each shape only updates its own contacts.
+ *
+ * @param AtTimen Flag indicating whether to calculate the forces at time n or n+1.
+ */
+void MechanicalLayer::computeShapesMotion(bool AtTimen)
+{
+    shapesMotion.resize(nb_active_shapes);
+    contactChanges.resize(nb_active_shapes);
+    //  The shapes are handed out by chunks of 64: smaller crowds are not worth the cost of the threads
+#pragma omp parallel for schedule(dynamic, 64) num_threads(nbThreads) if (nbThreads > 1 && nb_active_shapes > 64)
+    for (unsigned cpt_shape = 0; cpt_shape < nb_active_shapes; cpt_shape++)
+        shapesMotion[cpt_shape] = get_interactions(cpt_shape, AtTimen, contactChanges[cpt_shape]);
+    applyContactChanges();
+}
+
+/**
+ * @brief Adds the contacts that started and removes the contacts that ended during the last computation of the forces.
+ */
+void MechanicalLayer::applyContactChanges()
+{
+    for (unsigned cpt_shape = 0; cpt_shape < nb_active_shapes; cpt_shape++)
+    {
+        ContactChanges& changes = contactChanges[cpt_shape];
+        const unsigned shape = active_shapeIDshape_crowd[cpt_shape];
+        for (auto const& [cpt_shape_neigh, slip_ij] : changes.startedContacts)
+            slip.emplace(pair(shape, active_shapeIDshape_crowd[cpt_shape_neigh]), slip_ij);
+        for (auto const& [cpt_shape_neigh, output] : changes.newOutputs)
+            interactionsOutput.emplace(pair(cpt_shape, cpt_shape_neigh), output);
+        for (const unsigned cpt_shape_neigh : changes.endedContacts)
+        {
+            slip.erase({shape, active_shapeIDshape_crowd[cpt_shape_neigh]});
+            interactionsOutput.erase({std::min(cpt_shape, cpt_shape_neigh), std::max(cpt_shape, cpt_shape_neigh)});
+        }
+        for (auto const& [wall, slip_iw] : changes.startedWallContacts)
+            slip_wall.emplace(tuple(shape, wall.first, wall.second), slip_iw);
+        for (auto const& [wall, output] : changes.newWallOutputs)
+            interactionsOutputWall.emplace(tuple(cpt_shape, wall.first, wall.second), output);
+        for (const int2& wall : changes.endedWallContacts)
+        {
+            slip_wall.erase({shape, wall.first, wall.second});
+            interactionsOutputWall.erase({cpt_shape, wall.first, wall.second});
+        }
+
+        changes.startedContacts.clear();
+        changes.newOutputs.clear();
+        changes.endedContacts.clear();
+        changes.startedWallContacts.clear();
+        changes.newWallOutputs.clear();
+        changes.endedWallContacts.clear();
+    }
+}
+
 /**
  * @brief For output: do contacts exist?
  *
@@ -698,11 +1039,10 @@ pair<bool, bool> MechanicalLayer::existsContacts()
 /**
  * @brief Outputs interactions between shapes.
  *
- * @param interactionsFile The name of the file to be written.
  * @param exists A boolean saying if there exists agent-agent or agent-wall contacts
  *
  */
-void MechanicalLayer::generateInteractionsOutputFile(const string& interactionsFile, const pair<bool, bool>& exists)
+void MechanicalLayer::generateInteractionsOutputFile(const pair<bool, bool>& exists)
 {
     if (!exists.first && !exists.second)
     {
@@ -715,43 +1055,52 @@ void MechanicalLayer::generateInteractionsOutputFile(const string& interactionsF
     outputDoc << R"(<?xml version="1.0" encoding="utf-8"?>)" << endl;
     outputDoc << "<Interactions>" << endl;
 
+    //  The contacts are stored in hash tables: sort them to write them agent by agent, in ascending order
+    vector<pair<pair<unsigned, unsigned>, array<double2, 3>>> agentContacts(interactionsOutput.begin(), interactionsOutput.end());
+    vector<pair<tuple<unsigned, int, int>, array<double2, 3>>> wallContacts(interactionsOutputWall.begin(),
+                                                                            interactionsOutputWall.end());
+    std::ranges::sort(agentContacts, [](auto const& c1, auto const& c2) { return c1.first < c2.first; });
+    std::ranges::sort(wallContacts, [](auto const& c1, auto const& c2) { return c1.first < c2.first; });
+    size_t nextAgentContact = 0;   //  First contact with agents that has not been written yet
+    size_t nextWallContact = 0;    //  First contact with walls that has not been written yet
+
     /*  Loop over active agents */
     set<unsigned> parent;                        //  Variable to remember if we have opening tags for parents
     set<pair<unsigned, unsigned>> parentChild;   //  Variable to remember if we have an opening child tag
     for (uint32_t a = 0; a < nb_active_agents; a++)
     {
         //  First, collisions with agents
-        if (exists.first && !interactionsOutput.empty())
+        if (exists.first && !agentContacts.empty())
         {
-            for (auto iterator = interactionsOutput.begin(); iterator != interactionsOutput.end();)
+            for (; nextAgentContact < agentContacts.size(); nextAgentContact++)
             {
-                auto shape = iterator->first.first;
+                auto const& [key, output] = agentContacts[nextAgentContact];
+                auto shape = key.first;
                 const uint32_t agent = active_shapeIDagent[shape];
                 if (agent > a)
                     break;
                 //  If we're here, agent = a
-                auto output = iterator->second;
                 if (output[SLIP] == double2(0., 0.) && output[FORCE_ORTHO] == double2(0., 0.) && output[FORCE_TAN] == double2(0., 0.))
                     continue;
                 if (!parent.contains(a))
                 {
                     if (!parent.empty())
                         outputDoc << "    </Agent>" << endl;
-                    outputDoc << "    <Agent Id=\"" << agentMapInverse[agentActiveIds[agent]] << "\">" << endl;
+                    outputDoc << "    <Agent Id=\"" << sim.agentMapInverse[agentActiveIds[agent]] << "\">" << endl;
                     parent.insert(a);
                 }
-                auto shapeNeighbour = iterator->first.second;
+                auto shapeNeighbour = key.second;
                 const uint32_t neighbour = active_shapeIDagent[shapeNeighbour];
                 if (!parentChild.contains({agent, neighbour}))
                 {
                     if (!parentChild.empty() && parentChild.rbegin()->first == agent)
                         //  We have switched to another child within the same agent -> insert child closing tag
                         outputDoc << "        </Agent>" << endl;
-                    outputDoc << "        <Agent Id=\"" << agentMapInverse[agentActiveIds[neighbour]] << "\">" << endl;
+                    outputDoc << "        <Agent Id=\"" << sim.agentMapInverse[agentActiveIds[neighbour]] << "\">" << endl;
                     parentChild.insert({agent, neighbour});
                 }
-                outputDoc << "            <Interaction ParentShape=\"" << (shape - agentIDshape[agentActiveIds[agent]]) << "\" "
-                          << "ChildShape=\"" << (shapeNeighbour - agentIDshape[agentActiveIds[neighbour]]) << "\" ";
+                outputDoc << "            <Interaction ParentShape=\"" << (shape - agentIDshape[agent]) << "\" "
+                          << "ChildShape=\"" << (shapeNeighbour - agentIDshape[neighbour]) << "\" ";
                 if (output[SLIP] != double2(0., 0.))
                     outputDoc << "TangentialRelativeDisplacement=\"" << output[SLIP].first << "," << output[SLIP].second << "\" ";
                 if (output[FORCE_ORTHO] != double2(0., 0.))
@@ -759,34 +1108,32 @@ void MechanicalLayer::generateInteractionsOutputFile(const string& interactionsF
                 if (output[FORCE_TAN] != double2(0., 0.))
                     outputDoc << "Ft=\"" << output[FORCE_TAN].first << "," << output[FORCE_TAN].second << "\" ";
                 outputDoc << "/>" << endl;
-                interactionsOutput.erase(iterator++);
             }
             if (!parentChild.empty() && parentChild.rbegin()->first == a)
                 //  If there were entries for the current agent, we need to close the last Agent child
                 outputDoc << "        </Agent>" << endl;
         }
         //  Second, collision with walls
-        if (exists.second && !interactionsOutputWall.empty())
+        if (exists.second && !wallContacts.empty())
         {
-            for (auto iterator = interactionsOutputWall.begin(); iterator != interactionsOutputWall.end();)
+            for (; nextWallContact < wallContacts.size(); nextWallContact++)
             {
-                auto key = iterator->first;
+                auto const& [key, output] = wallContacts[nextWallContact];
                 const uint32_t shape = get<0>(key);
                 const uint32_t agent = active_shapeIDagent[shape];
                 //  If the current element of interactionsOutputWall is not the same as the last parent, end
                 if (agent > a)
                     break;
-                auto output = iterator->second;
                 if (output[0] == double2(0., 0.) && output[1] == double2(0., 0.) && output[2] == double2(0., 0.))
                     continue;
                 if (!parent.contains(a))
                 {
                     if (!parent.empty())
                         outputDoc << "    </Agent>" << endl;
-                    outputDoc << "    <Agent Id=\"" << agentMapInverse[agentActiveIds[agent]] << "\">" << endl;
+                    outputDoc << "    <Agent Id=\"" << sim.agentMapInverse[agentActiveIds[agent]] << "\">" << endl;
                     parent.insert(a);
                 }
-                outputDoc << "        <Wall ShapeId=\"" << (shape - agentIDshape[agentActiveIds[agent]]) << "\" "
+                outputDoc << "        <Wall ShapeId=\"" << (shape - agentIDshape[agent]) << "\" "
                           << "WallId=\"" << get<1>(key) << "\" CornerId=\"" << get<2>(key) << "\" ";
                 outputDoc << "TangentialRelativeDisplacement=\"" << output[SLIP].first << "," << output[SLIP].second << "\" ";
                 if (output[FORCE_ORTHO] != double2(0., 0.))
@@ -794,8 +1141,6 @@ void MechanicalLayer::generateInteractionsOutputFile(const string& interactionsF
                 if (output[FORCE_TAN] != double2(0., 0.))
                     outputDoc << "Ft=\"" << output[FORCE_TAN].first << "," << output[FORCE_TAN].second << "\" ";
                 outputDoc << "/>" << endl;
-                //  Erase the entry in slip_wall to make the next sequential search "easier"
-                interactionsOutputWall.erase(iterator++);
             }
         }
     }
@@ -804,3 +1149,49 @@ void MechanicalLayer::generateInteractionsOutputFile(const string& interactionsF
 
     outputDoc.close();
 }
+
+/**
+ * @brief Copies the contacts of the mechanically active agents to the simulation, for CrowdMechanicsGetContacts().
+ *
+ * Each contact takes nContactValues values (see the enum in Global.h). As in the interactions file, the contacts between two
+ * agents are given once, by the agent of lower index, and the contacts whose forces and tangential relative displacement are
+ * all zero are skipped. The contacts with agents come first, then the contacts with walls, each sorted by shape.
+ */
+void MechanicalLayer::storeContacts()
+{
+    sim.contacts.clear();
+    vector<pair<pair<unsigned, unsigned>, array<double2, 3>>> agentContacts(interactionsOutput.begin(), interactionsOutput.end());
+    vector<pair<tuple<unsigned, int, int>, array<double2, 3>>> wallContacts(interactionsOutputWall.begin(),
+                                                                            interactionsOutputWall.end());
+    std::ranges::sort(agentContacts, [](auto const& c1, auto const& c2) { return c1.first < c2.first; });
+    std::ranges::sort(wallContacts, [](auto const& c1, auto const& c2) { return c1.first < c2.first; });
+    sim.contacts.reserve(nContactValues * (agentContacts.size() + wallContacts.size()));
+
+    auto addContact = [this](unsigned shape, int neighbour, int neighbourShape, int wall, int corner, const array<double2, 3>& output)
+    {
+        if (output[SLIP] == double2(0., 0.) && output[FORCE_ORTHO] == double2(0., 0.) && output[FORCE_TAN] == double2(0., 0.))
+            return;
+        const unsigned activeAgent = active_shapeIDagent[shape];
+        array<double, nContactValues> values{};
+        values[CONTACT_AGENT] = agentActiveIds[activeAgent];
+        values[CONTACT_SHAPE] = shape - agentIDshape[activeAgent];
+        values[CONTACT_NEIGHBOUR] = neighbour;
+        values[CONTACT_NEIGHBOUR_SHAPE] = neighbourShape;
+        values[CONTACT_WALL] = wall;
+        values[CONTACT_CORNER] = corner;
+        values[CONTACT_FORCE_ORTHO] = output[FORCE_ORTHO].first;
+        values[CONTACT_FORCE_ORTHO + 1] = output[FORCE_ORTHO].second;
+        values[CONTACT_FORCE_TAN] = output[FORCE_TAN].first;
+        values[CONTACT_FORCE_TAN + 1] = output[FORCE_TAN].second;
+        values[CONTACT_SLIP] = output[SLIP].first;
+        values[CONTACT_SLIP + 1] = output[SLIP].second;
+        sim.contacts.insert(sim.contacts.end(), values.begin(), values.end());
+    };
+    for (auto const& [key, output] : agentContacts)
+    {
+        const unsigned activeNeighbour = active_shapeIDagent[key.second];
+        addContact(key.first, static_cast<int>(agentActiveIds[activeNeighbour]),
+                   static_cast<int>(key.second - agentIDshape[activeNeighbour]), -1, -1, output);
+    }
+    for (auto const& [key, output] : wallContacts) addContact(get<0>(key), -1, -1, get<1>(key), get<2>(key), output);
+}
@@ -0,0 +1,149 @@
+/*
+    Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+    Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+    This software is a computer program designed to generate a realistic crowd from anthropometric data and
+    simulate the mechanical interactions that occur within it and with obstacles.
+
+    This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+    of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+    license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+    As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+    the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+    economic rights,  and the successive licensors  have only  limited liability.
+
+    In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+    and/or developing or reproducing the software by the user in light of its specific status of free software,
+    that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+    for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+    encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+    the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+    same conditions as regards security.
+
+    The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+    you accept its terms.
+*/
+/*
+    Lifetime of a simulation: loading of the static data and release of the memory.
+*/
+
+#include "Simulation.h"
+
+#include <sys/stat.h>
+
+#include <map>
+#include <string>
+#include <vector>
+
+#include "MechanicalLayer.h"
+
+using std::string, std::map, std::vector;
+
+/**
+ * @brief Releases all the memory held by the simulation.
+ */
+Simulation::~Simulation()
+{
+    clearAgents();
+    clearMaterials();
+}
+
+/**
+ * @brief Reads all the static XML files and the initial state of the agents.
+ *
+ * @param files An array of file names, given in the same order as for CrowdMechanics():
+ *      - Parameters (directories, time step...)
+ *      - Materials (with Young's modulus and the shear modulus)
+ *      - Geometry (obstacles)
+ *      - Agents
+ *      - Agent dynamics (current kinematics, and driving forces and torques)
+ * The existing contacts are also read from the AgentInteractions file of the dynamic directory, if there is one.
+ *
+ * @return  EXIT_SUCCESS if all the files were read successfully.
+ *          EXIT_FAILURE in case of issue(s) with any of the XML files' contents
+ */
+int Simulation::initialise(char** files)
+{
+    /*  Read MATERIALS  */
+    //  Mapping between user-given id's and indexes in the program
+    map<string, int32_t> materialMapping;
+    if (const string materialsFile = pathStatic + files[1]; readMaterials(materialsFile, materialMapping) == EXIT_FAILURE)
+        return EXIT_FAILURE;
+
+    /*  Read GEOMETRY   */
+    if (const string geometryFile = pathStatic + files[2]; readGeometry(geometryFile, materialMapping) == EXIT_FAILURE)
+        return EXIT_FAILURE;
+
+    /*  Read AGENTS */
+    vector<unsigned> nb_shapes_allagents, shapeIDagent;
+    vector<int> edges;
+    vector<double> radius_allshapes, masses, mois;
+    vector<double2> delta_gtos;
+    if (const string agentsFile = pathStatic + files[3];
+        readAgents(agentsFile, nb_shapes_allagents, shapeIDagent, edges, radius_allshapes, masses, mois, delta_gtos,
+                   materialMapping) == EXIT_FAILURE)
+        return EXIT_FAILURE;
+
+    /*  Initialise simulation  */
+    if (const string dynamicsFile = pathDynamic + files[4];
+        initialiseSetting(dynamicsFile, nb_shapes_allagents, shapeIDagent, edges, radius_allshapes, masses, mois, delta_gtos) ==
+        EXIT_FAILURE)
+        return EXIT_FAILURE;
+
+    /*  Create the workspace of the mechanical layer, with the existing contacts */
+    mechanicalLayer = new MechanicalLayer(*this);
+    const string interactionsFile = pathDynamic + "AgentInteractions.xml";
+    struct stat buffer{};
+    if (stat(interactionsFile.c_str(), &buffer) != -1 && mechanicalLayer->readInteractionsInputFile(interactionsFile) == EXIT_FAILURE)
+        return EXIT_FAILURE;
+
+    loadStaticData = false;
+    return EXIT_SUCCESS;
+}
+
+/**
+ * @brief Frees the intrinsic and binary properties of the materials.
+ */
+void Simulation::clearMaterials()
+{
+    if (intrinsicProperties)
+    {
+        for (uint32_t i = 0; i < nIntrinsicProperties; i++) delete[] intrinsicProperties[i];
+        delete[] intrinsicProperties;
+        intrinsicProperties = nullptr;
+    }
+    if (binaryProperties)
+    {
+        for (uint32_t n = 0; n < nBinaryProperties; n++)
+        {
+            for (uint32_t m = 0; m < nMaterials; m++) delete[] binaryProperties[n][m];
+            delete[] binaryProperties[n];
+        }
+        delete[] binaryProperties;
+        binaryProperties = nullptr;
+    }
+    nMaterials = 0;
+}
+
+/**
+ * @brief Frees the agents and everything that refers to them.
+ */
+void Simulation::clearAgents()
+{
+    delete mechanicalLayer;
+    mechanicalLayer = nullptr;
+    mech_active_agents.clear();
+    mechanicallyActive.clear();
+    if (agents)
+    {
+        for (uint32_t a = 0; a < nAgents; ++a) delete agents[a];
+        delete[] agents;
+        agents = nullptr;
+    }
+    nAgents = 0;
+    agentMap.clear();
+    agentMapInverse.clear();
+    agentProperties.clear();
+    shapesMaterial.clear();
+}
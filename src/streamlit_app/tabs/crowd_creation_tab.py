@@ -155,7 +155,9 @@ def update_crowd(boundaries: Polygon, num_agents: int) -> Crowd:
 
 def display_interpenetration_warning() -> None:
     """Display a warning if interpenetration is too high."""
-    interpenetration_between_agents, interpenetration_with_boundaries = st.session_state.current_crowd.calculate_interpenetration()
+    interpenetration_between_agents, interpenetration_with_boundaries = st.session_state.current_crowd.calculate_interpenetration(
+        incremental=True
+    )
     string_packing = " or pack closely." if st.session_state.selected_packing_option == st.session_state.pack_options["grid"] else "."
     if interpenetration_between_agents > 1e-4:
         st.warning(
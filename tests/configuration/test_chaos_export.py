@@ -0,0 +1,86 @@
+"""Tests of the export of the agent trajectories to the files of the ChAOS software."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from configuration.backup import xml_to_Chaos
+from tests.configuration.test_xml_trajectories_ingestion import write_agent_dynamics_files
+
+#: Time step of the ChAOS files (s).
+CHAOS_DT = 0.05
+
+
+def test_interpolate_trajectories_on_grid() -> None:
+    """Test that each agent gets the grid times from its first sample to its last one, with interpolated positions."""
+    trajectories = pd.DataFrame(
+        {
+            "t": [0.0, 0.2, 0.4, 0.1, 0.3, 0.3],
+            "ID": [2, 2, 2, 1, 1, 5],
+            "x": [0.0, 1.0, 3.0, 5.0, 6.0, 9.0],
+            "y": [0.0, -1.0, -3.0, 0.0, 0.0, 9.0],
+        }
+    )
+    ID_agents, times, xs, ys, row_starts = xml_to_Chaos.interpolate_trajectories_on_grid(trajectories, 0.1)
+
+    assert ID_agents == [1, 2, 5]
+    np.testing.assert_array_equal(row_starts, [0, 2, 6, 6])
+    np.testing.assert_allclose(times, [0.1, 0.2, 0.0, 0.1, 0.2, 0.3])
+    np.testing.assert_allclose(xs, [5.0, 5.5, 0.0, 0.5, 1.0, 2.0])
+    np.testing.assert_allclose(ys, [0.0, 0.0, 0.0, -0.5, -1.0, -2.0])
+
+
+def test_export_trajectories_to_CHAOS(tmp_path: Path) -> None:
+    """
+    Test that the ChAOS files are the same from the CSV file, from the table of the trajectories and in an archive.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the XML, CSV and ChAOS files are written.
+    """
+    write_agent_dynamics_files(tmp_path / "xml")
+    xml_to_Chaos.export_XML_to_CSV(tmp_path, tmp_path / "xml")
+    xml_to_Chaos.export_CSV_to_CHAOS(tmp_path, CHAOS_DT)
+    csv_files = {path.name: path.read_text(encoding="utf-8") for path in (tmp_path / xml_to_Chaos.chaos_folder_name).iterdir()}
+    assert sorted(csv_files) == ["traj000.csv", "traj001.csv", "traj002.csv", "traj003.csv"]
+    assert csv_files["traj000.csv"].split("\n")[:2] == ["0.000,2.000,2.125,0.0", "0.050,2.500,2.625,0.0"]
+
+    trajectories = xml_to_Chaos.read_agent_trajectories_from_XML(tmp_path / "xml")
+    xml_to_Chaos.export_trajectories_to_CHAOS(trajectories, tmp_path / "from_table", CHAOS_DT, workers=2)
+    assert {path.name: path.read_text(encoding="utf-8") for path in (tmp_path / "from_table").iterdir()} == csv_files
+
+    xml_to_Chaos.export_CSV_to_CHAOS(tmp_path, CHAOS_DT, archive=True)
+    with zipfile.ZipFile(tmp_path / f"{xml_to_Chaos.chaos_folder_name}.zip") as archive:
+        assert {name: archive.read(name).decode("utf-8") for name in archive.namelist()} == csv_files
+
+    with pytest.raises(ValueError):
+        xml_to_Chaos.export_trajectories_to_CHAOS(trajectories, tmp_path / "from_table", CHAOS_DT, workers=0)
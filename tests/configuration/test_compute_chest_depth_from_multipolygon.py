@@ -37,9 +37,15 @@ Tests cover:
 
 import numpy as np
 import pytest
+import shapely
 from shapely.geometry import MultiPolygon, Polygon
 
-from configuration.utils.functions import compute_chest_depth_from_multipolygon
+import configuration.utils.constants as cst
+from configuration.utils.functions import (
+    compute_chest_depth_from_multipolygon,
+    compute_chest_depths_from_multipolygons,
+    load_body_template,
+)
 
 
 def test_simple_vertical_rectangle() -> None:
@@ -90,3 +96,47 @@ def test_irregular_shape() -> None:
     assert np.isclose(depth, 4.0, atol=1e-6)
     assert np.isclose(depth, 4.0, atol=1e-6)
     assert np.isclose(depth, 4.0, atol=1e-6)
+
+
+def brute_force_depth(mp: MultiPolygon) -> float:
+    """
+    Compute the largest vertical distance by comparing all pairs of boundary points.
+
+    Parameters
+    ----------
+    mp : MultiPolygon
+        The MultiPolygon to measure.
+
+    Returns
+    -------
+    float
+        The largest distance between two points with almost the same x-coordinate.
+    """
+    coords = shapely.get_coordinates(mp.boundary)
+    aligned = np.abs(coords[:, None, 0] - coords[None, :, 0]) <= cst.BREADTH_DEPTH_TOLERANCE
+    distances = np.abs(coords[:, None, 1] - coords[None, :, 1])
+    return float(np.max(distances[aligned]))
+
+
+def test_dense_slices_match_brute_force() -> None:
+    """Test that densified slices of a 3D body are measured as with a comparison of all pairs of points."""
+    slices = list(load_body_template("male").values())[::20]
+    for mp in slices:
+        dense_mp = MultiPolygon(list(shapely.get_parts(shapely.segmentize(mp, 0.3))))
+        assert np.isclose(compute_chest_depth_from_multipolygon(dense_mp), brute_force_depth(dense_mp), rtol=0.0, atol=1e-9)
+
+
+def test_batch_matches_single_calls() -> None:
+    """Test that the batch measurement of all the slices of a 3D body matches the measurement of each slice."""
+    slices = list(load_body_template("female").values())
+    depths = compute_chest_depths_from_multipolygons(slices)
+    assert depths.shape == (len(slices),)
+    assert np.array_equal(depths, [compute_chest_depth_from_multipolygon(mp) for mp in slices])
+    assert compute_chest_depths_from_multipolygons([]).shape == (0,)
+
+
+def test_batch_non_multipolygon_input() -> None:
+    """Should raise ValueError if any input of a batch is not a MultiPolygon."""
+    poly = Polygon([(0, 0), (1, 0), (1, 1)])
+    with pytest.raises(ValueError):
+        compute_chest_depths_from_multipolygons([MultiPolygon([poly]), poly])
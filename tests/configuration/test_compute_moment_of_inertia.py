@@ -37,10 +37,11 @@ Tests cover:
 
 import math
 
+import numpy as np
 import pytest
 from shapely.geometry import MultiPolygon, Polygon
 
-from configuration.utils.functions import compute_moment_of_inertia
+from configuration.utils.functions import compute_moment_of_inertia, compute_moments_of_inertia
 
 
 def test_square_polygon() -> None:
@@ -94,3 +95,31 @@ def test_scaling_with_area() -> None:
     square2 = Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])
     I2 = compute_moment_of_inertia(square2, weight * 4)
     assert math.isclose(I2, I1 * 16, rel_tol=1e-6)
+
+
+def test_batch_matches_single_shapes() -> None:
+    """Test that the batch computation agrees with the shape-by-shape computation."""
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    triangle = Polygon([(0, 0), (4, 0), (1, 3)])
+    mp = MultiPolygon([Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]), Polygon([(2, 0), (5, 0), (5, 2), (2, 2)])])
+    shapes = [square, triangle, mp, square]
+    weights = [2.0, 70.0, 55.0, 0.0]
+    result = compute_moments_of_inertia(shapes, weights)
+    expected = [compute_moment_of_inertia(shape, weight) for shape, weight in zip(shapes, weights, strict=True)]
+    assert result.shape == (4,)
+    assert np.allclose(result, expected, rtol=1e-12, atol=0.0)
+    assert math.isclose(result[0], (2.0 / 6.0) * 1e-4, rel_tol=1e-6)
+
+
+def test_batch_empty_input() -> None:
+    """Test that an empty batch returns an empty array."""
+    assert compute_moments_of_inertia([], []).shape == (0,)
+
+
+def test_batch_invalid_input() -> None:
+    """Test that the batch computation rejects invalid geometries and mismatched weights."""
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    with pytest.raises(TypeError):
+        compute_moments_of_inertia([square, "not_a_polygon"], [1.0, 1.0])
+    with pytest.raises(ValueError):
+        compute_moments_of_inertia([square, square], [1.0])
@@ -0,0 +1,465 @@
+"""Tests of the handle-based API of the CrowdMechanics shared library and of its Python wrapper."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import copy
+import shutil
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import configuration.utils.constants as cst
+from configuration.mechanics.crowd_mechanics import CrowdMechanicsSimulation, get_default_library_path
+
+#: Folder of the mechanical layer test whose static files are used by these tests.
+SCENARIO_PATH = Path(__file__).parent.parent / "mechanical_layer" / "test_push_agent_agent"
+#: Initial agent dynamics file of the scenario.
+INITIAL_DYNAMICS_PATH = (
+    Path(__file__).parent.parent / "mechanical_layer" / "initial_agent_dynamics_files" / "AgentDynamics_test_push_agent_agent.xml"
+)
+#: Materials file with friction between agents, used by the tests of the contacts.
+FRICTIONAL_MATERIALS_PATH = (
+    Path(__file__).parent.parent / "mechanical_layer" / "test_tangential_spring_agent_agent" / "static" / "Materials.xml"
+)
+#: Number of decisional time steps simulated in each test.
+NB_STEPS = 3
+#: Kinematics of two overlapping agents, the first one sliding along the second one.
+OVERLAPPING_KINEMATICS = np.array([[0.736, 1.0, 0.0, 0.0, 0.5, 0.0], [1.01, 1.0, 0.0, 0.0, 0.0, 0.0]])
+
+pytestmark = pytest.mark.skipif(not get_default_library_path().is_file(), reason="the CrowdMechanics library is not built")
+
+
+def prepare_scenario(directory: Path) -> Path:
+    """
+    Copy the scenario into its own directory, with absolute static and dynamic directories and a short time step.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory in which the scenario is copied.
+
+    Returns
+    -------
+    Path
+        The path to the Parameters file of the copied scenario.
+    """
+    shutil.copytree(SCENARIO_PATH / "static", directory / "static")
+    (directory / "dynamic").mkdir()
+    shutil.copyfile(INITIAL_DYNAMICS_PATH, directory / "dynamic" / "AgentDynamics.xml")
+    parameters_file = directory / "Parameters.xml"
+    parameters_file.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        "<Parameters>\n"
+        f'    <Directories Static="{directory / "static"}/" Dynamic="{directory / "dynamic"}/"/>\n'
+        '    <Times TimeStep="0.01" TimeStepMechanical="1e-5"/>\n'
+        "</Parameters>\n"
+    )
+    return parameters_file
+
+
+def reset_driving_forces(dynamics_file: Path) -> None:
+    """
+    Add null driving forces and torques to the output dynamics file, so that it can be used as the input of the next step.
+
+    Parameters
+    ----------
+    dynamics_file : Path
+        The path to the AgentDynamics file.
+    """
+    tree = ET.parse(dynamics_file)
+    for agent in tree.getroot().findall("Agent"):
+        ET.SubElement(agent, "Dynamics", Fp="0.0,0.0", Mp="0.0")
+    tree.write(dynamics_file)
+
+
+def run_scenario(directory: Path) -> np.ndarray:
+    """
+    Run the scenario for a few decisional time steps, reading the dynamics file at each step.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory in which the scenario is copied and run.
+
+    Returns
+    -------
+    np.ndarray
+        The kinematics of the agents at the end of the run.
+    """
+    with CrowdMechanicsSimulation(prepare_scenario(directory)) as simulation:
+        for _ in range(NB_STEPS):
+            simulation.step("AgentDynamics.xml")
+            reset_driving_forces(directory / "dynamic" / "AgentDynamics.xml")
+        kinematics: np.ndarray = simulation.get_kinematics()
+    return kinematics
+
+
+def test_create_and_query(tmp_path: Path) -> None:
+    """
+    Test that a simulation exposes its agents and their initial kinematics.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    with CrowdMechanicsSimulation(prepare_scenario(tmp_path)) as simulation:
+        assert simulation.number_agents == 2
+        assert simulation.agent_ids == ["0", "1"]
+        kinematics = simulation.get_kinematics()
+    assert kinematics.shape == (2, len(cst.MECHANICS_KINEMATICS_COLUMNS))
+    np.testing.assert_allclose(kinematics[0], [0.736, 1.0, 0.0, 1.5, 0.0, 0.0])
+    np.testing.assert_allclose(kinematics[1], [1.259, 1.0, 0.0, 0.0, 0.0, 0.0])
+
+
+def test_step_with_and_without_dynamics_file(tmp_path: Path) -> None:
+    """
+    Test that stepping from the in-memory state gives the same result as going through the dynamics file.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    with CrowdMechanicsSimulation(prepare_scenario(tmp_path / "file")) as simulation_file:
+        with CrowdMechanicsSimulation(prepare_scenario(tmp_path / "memory")) as simulation_memory:
+            for _ in range(NB_STEPS):
+                simulation_file.step("AgentDynamics.xml")
+                reset_driving_forces(tmp_path / "file" / "dynamic" / "AgentDynamics.xml")
+                simulation_memory.step()
+                np.testing.assert_allclose(simulation_file.get_kinematics(), simulation_memory.get_kinematics(), rtol=1e-5, atol=1e-8)
+    assert "Position" in (tmp_path / "file" / "dynamic" / "AgentDynamics.xml").read_text()
+
+
+def test_concurrent_simulations(tmp_path: Path) -> None:
+    """
+    Test that independent simulations run concurrently in threads give the same result as a sequential run.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    reference = run_scenario(tmp_path / "reference")
+    assert reference[0, 0] != pytest.approx(0.736)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(run_scenario, [tmp_path / f"scenario_{i}" for i in range(4)]))
+    for result in results:
+        np.testing.assert_array_equal(result, reference)
+
+
+def test_invalid_files(tmp_path: Path) -> None:
+    """
+    Test that a simulation cannot be created from missing files.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    parameters_file = prepare_scenario(tmp_path)
+    with pytest.raises(RuntimeError):
+        CrowdMechanicsSimulation(parameters_file, agents_file="Missing.xml")
+    with pytest.raises(RuntimeError):
+        CrowdMechanicsSimulation(tmp_path / "Missing.xml")
+
+
+def test_closed_simulation(tmp_path: Path) -> None:
+    """
+    Test that a released simulation cannot be used anymore, and that it can be released several times.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    simulation = CrowdMechanicsSimulation(prepare_scenario(tmp_path))
+    simulation.close()
+    assert simulation.closed
+    simulation.close()
+    with pytest.raises(ValueError, match="closed"):
+        simulation.step()
+    with pytest.raises(ValueError, match="closed"):
+        simulation.get_kinematics()
+
+
+def test_set_driving_forces(tmp_path: Path) -> None:
+    """
+    Test that driving forces set in memory give the same result as driving forces read from the dynamics file.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    driving_forces = np.array([[20.0, 5.0, 0.5], [-10.0, 0.0, 0.0]])
+    dynamics_file = tmp_path / "file" / "dynamic" / "AgentDynamics.xml"
+    with CrowdMechanicsSimulation(prepare_scenario(tmp_path / "file")) as simulation_file:
+        with CrowdMechanicsSimulation(prepare_scenario(tmp_path / "memory")) as simulation_memory:
+            for _ in range(NB_STEPS):
+                tree = ET.parse(dynamics_file)
+                for agent, (fp_x, fp_y, mp) in zip(tree.getroot().findall("Agent"), driving_forces, strict=True):
+                    dynamics = agent.find("Dynamics")
+                    if dynamics is None:
+                        dynamics = ET.SubElement(agent, "Dynamics")
+                    dynamics.set("Fp", f"{fp_x},{fp_y}")
+                    dynamics.set("Mp", f"{mp}")
+                tree.write(dynamics_file)
+                simulation_file.step("AgentDynamics.xml")
+                simulation_memory.set_driving_forces(driving_forces)
+                simulation_memory.step()
+                np.testing.assert_allclose(simulation_file.get_kinematics(), simulation_memory.get_kinematics(), rtol=1e-5, atol=1e-8)
+
+
+def test_set_kinematics(tmp_path: Path) -> None:
+    """
+    Test that the kinematics of the agents can be overwritten, and that arrays of the wrong shape are rejected.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    kinematics = np.array([[0.5, 1.2, 0.1, 0.3, -0.2, 0.4], [1.5, 0.8, -0.1, 0.0, 0.1, 0.0]])
+    with CrowdMechanicsSimulation(prepare_scenario(tmp_path)) as simulation:
+        simulation.set_kinematics(kinematics)
+        np.testing.assert_allclose(simulation.get_kinematics(), kinematics)
+        with pytest.raises(ValueError, match="shape"):
+            simulation.set_kinematics(kinematics[:, :3])
+        with pytest.raises(ValueError, match="shape"):
+            simulation.set_driving_forces(np.zeros((3, len(cst.MECHANICS_DRIVING_FORCES_COLUMNS))))
+
+
+def test_write_dynamics_file(tmp_path: Path) -> None:
+    """
+    Test that a dumped dynamics file restores the state of the simulation when it is used to create a new one.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    driving_forces = np.array([[20.0, 5.0, 0.5], [-10.0, 0.0, 0.0]])
+    with CrowdMechanicsSimulation(prepare_scenario(tmp_path)) as simulation:
+        simulation.set_driving_forces(driving_forces)
+        simulation.step()
+        simulation.write_dynamics_file(tmp_path / "dynamic" / "Dump.xml")
+        with CrowdMechanicsSimulation(tmp_path / "Parameters.xml", dynamics_file="Dump.xml") as restored:
+            # the values are written with the same precision as the output dynamics files
+            np.testing.assert_allclose(restored.get_kinematics(), simulation.get_kinematics(), rtol=1e-5, atol=1e-5)
+            simulation.step()
+            restored.step()
+            np.testing.assert_allclose(restored.get_kinematics(), simulation.get_kinematics(), rtol=1e-4, atol=1e-5)
+
+
+def test_contacts_kept_in_memory(tmp_path: Path) -> None:
+    """
+    Test that the contacts are kept in memory between steps, so that the Interactions file is an output only.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    interactions_file = tmp_path / "without_file" / "dynamic" / "AgentInteractions.xml"
+    nb_steps_with_contacts = 0
+    parameters_files = [prepare_scenario(tmp_path / "with_file"), prepare_scenario(tmp_path / "without_file")]
+    for parameters_file in parameters_files:
+        shutil.copyfile(FRICTIONAL_MATERIALS_PATH, parameters_file.parent / "static" / "Materials.xml")
+    with CrowdMechanicsSimulation(parameters_files[0]) as simulation_with_file:
+        with CrowdMechanicsSimulation(parameters_files[1]) as simulation_without_file:
+            simulation_with_file.set_kinematics(OVERLAPPING_KINEMATICS)
+            simulation_without_file.set_kinematics(OVERLAPPING_KINEMATICS)
+            for _ in range(NB_STEPS):
+                simulation_with_file.step()
+                simulation_without_file.step()
+                if interactions_file.is_file():
+                    nb_steps_with_contacts += 1
+                    interactions_file.unlink()
+                np.testing.assert_array_equal(simulation_with_file.get_kinematics(), simulation_without_file.get_kinematics())
+    assert nb_steps_with_contacts > 1
+
+
+def test_initial_contacts(tmp_path: Path) -> None:
+    """
+    Test that the contacts of an Interactions file present in the dynamic directory are read when the simulation is created.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    parameters_file = prepare_scenario(tmp_path)
+    shutil.copyfile(FRICTIONAL_MATERIALS_PATH, tmp_path / "static" / "Materials.xml")
+    interactions_file = tmp_path / "dynamic" / "AgentInteractions.xml"
+    interactions_file.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Interactions>\n    <Agent Id="0">\n        <Agent Id="1">\n'
+        '            <Interaction ParentShape="2" ChildShape="2" TangentialRelativeDisplacement="0.0,1e-4"/>\n'
+        "        </Agent>\n    </Agent>\n</Interactions>"
+    )
+    with CrowdMechanicsSimulation(parameters_file) as simulation:
+        simulation.set_kinematics(OVERLAPPING_KINEMATICS)
+        simulation.step()
+        with_initial_contact = simulation.get_kinematics()
+    interactions_file.unlink()
+    with CrowdMechanicsSimulation(parameters_file) as simulation:
+        simulation.set_kinematics(OVERLAPPING_KINEMATICS)
+        simulation.step()
+        assert np.abs(simulation.get_kinematics() - with_initial_contact).max() > 0.0
+
+    interactions_file.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Interactions>\n    <Agent Id="unknown">\n    </Agent>\n</Interactions>'
+    )
+    with pytest.raises(RuntimeError):
+        CrowdMechanicsSimulation(parameters_file)
+
+
+def test_number_threads(tmp_path: Path) -> None:
+    """
+    Test that the number of threads can be set from the Parameters file or from Python, without changing the results.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    parameters_files = [prepare_scenario(tmp_path / name) for name in ("serial", "from_python", "from_parameters")]
+    for parameters_file in parameters_files:
+        shutil.copyfile(FRICTIONAL_MATERIALS_PATH, parameters_file.parent / "static" / "Materials.xml")
+    parameters = parameters_files[2].read_text()
+    parameters_files[2].write_text(parameters.replace("</Parameters>", '    <Mechanics Threads="3"/>\n</Parameters>'))
+    kinematics = []
+    for parameters_file in parameters_files:
+        with CrowdMechanicsSimulation(parameters_file) as simulation:
+            if parameters_file.parent.name == "from_python":
+                simulation.set_number_threads(3)
+            simulation.set_kinematics(OVERLAPPING_KINEMATICS)
+            for _ in range(NB_STEPS):
+                simulation.step()
+            kinematics.append(simulation.get_kinematics())
+            with pytest.raises(ValueError):
+                simulation.set_number_threads(0)
+    np.testing.assert_array_equal(kinematics[1], kinematics[0])
+    np.testing.assert_array_equal(kinematics[2], kinematics[0])
+
+    parameters_files[2].write_text(parameters_files[2].read_text().replace('Threads="3"', 'Threads="0"'))
+    with pytest.raises(RuntimeError):
+        CrowdMechanicsSimulation(parameters_files[2])
+
+
+def test_adaptive_time_step(tmp_path: Path) -> None:
+    """
+    Test that the adaptive time step takes fewer sub-steps than the fixed one, with close results.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenarios are copied and run.
+    """
+    parameters_files = [prepare_scenario(tmp_path / name) for name in ("fixed", "adaptive")]
+    parameters = parameters_files[1].read_text()
+    parameters_files[1].write_text(parameters.replace("</Parameters>", '    <Mechanics AdaptiveTimeStep="true"/>\n</Parameters>'))
+    kinematics = []
+    number_sub_steps = []
+    for parameters_file in parameters_files:
+        with CrowdMechanicsSimulation(parameters_file) as simulation:
+            simulation.set_kinematics(OVERLAPPING_KINEMATICS)
+            simulation.step()
+            kinematics.append(simulation.get_kinematics())
+            number_sub_steps.append(simulation.number_sub_steps)
+    assert 0 < number_sub_steps[1] < number_sub_steps[0]
+    np.testing.assert_allclose(kinematics[1], kinematics[0], atol=1e-2)
+
+
+def test_get_contacts(tmp_path: Path) -> None:
+    """
+    Test that the contacts given by the library match the ones of the AgentInteractions file.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenario is copied and run.
+    """
+    parameters_file = prepare_scenario(tmp_path)
+    shutil.copyfile(FRICTIONAL_MATERIALS_PATH, tmp_path / "static" / "Materials.xml")
+    with CrowdMechanicsSimulation(parameters_file) as simulation:
+        assert simulation.get_contacts().shape == (0, len(cst.MECHANICS_CONTACTS_COLUMNS))
+        simulation.set_kinematics(OVERLAPPING_KINEMATICS)
+        simulation.step()
+        contacts = simulation.get_contacts()
+
+    interactions = ET.parse(tmp_path / "dynamic" / "AgentInteractions.xml").getroot().findall("./Agent/Agent/Interaction")
+    assert contacts.shape == (len(interactions), len(cst.MECHANICS_CONTACTS_COLUMNS))
+    assert len(interactions) > 0
+    columns = {name: index for index, name in enumerate(cst.MECHANICS_CONTACTS_COLUMNS)}
+    for contact, interaction in zip(contacts, interactions, strict=True):
+        assert (contact[columns["agent"]], contact[columns["neighbour"]]) == (0, 1)
+        assert contact[columns["shape"]] == int(interaction.get("ParentShape", -1))
+        assert contact[columns["neighbour_shape"]] == int(interaction.get("ChildShape", -1))
+        assert contact[columns["wall"]] == contact[columns["corner"]] == -1
+        for attribute, column in (("Fn", "fn_x"), ("Ft", "ft_x"), ("TangentialRelativeDisplacement", "slip_x")):
+            values = [float(value) for value in interaction.get(attribute, "0,0").split(",")]
+            np.testing.assert_allclose(contact[columns[column] : columns[column] + 2], values, rtol=1e-5)
+
+
+def test_contacts_with_inactive_first_agent(tmp_path: Path) -> None:
+    """
+    Test that the shape indices of the contacts are local to their agents when the first agent is not mechanically active.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenario is copied and run.
+    """
+    parameters_file = prepare_scenario(tmp_path)
+    shutil.copyfile(FRICTIONAL_MATERIALS_PATH, tmp_path / "static" / "Materials.xml")
+    for file_path in (tmp_path / "static" / "Agents.xml", tmp_path / "dynamic" / "AgentDynamics.xml"):
+        tree = ET.parse(file_path)
+        far_agent = copy.deepcopy(tree.getroot().find("Agent"))
+        assert far_agent is not None
+        far_agent.set("Id", "far")
+        tree.getroot().insert(0, far_agent)
+        tree.write(file_path)
+
+    with CrowdMechanicsSimulation(parameters_file) as simulation:
+        assert simulation.agent_ids == ["far", "0", "1"]
+        simulation.set_kinematics(np.vstack(([[50.0, 50.0, 0.0, 0.0, 0.0, 0.0]], OVERLAPPING_KINEMATICS)))
+        simulation.step()
+        contacts = simulation.get_contacts()
+
+    assert len(contacts) > 0
+    columns = {name: index for index, name in enumerate(cst.MECHANICS_CONTACTS_COLUMNS)}
+    number_shapes = 5
+    for contact in contacts:
+        assert (contact[columns["agent"]], contact[columns["neighbour"]]) == (1, 2)
+        assert 0 <= contact[columns["shape"]] < number_shapes
+        assert 0 <= contact[columns["neighbour_shape"]] < number_shapes
+    interactions = ET.parse(tmp_path / "dynamic" / "AgentInteractions.xml").getroot().findall("./Agent/Agent/Interaction")
+    assert [int(interaction.get("ParentShape", -1)) for interaction in interactions] == contacts[:, columns["shape"]].tolist()
@@ -0,0 +1,174 @@
+"""Tests of the batched 2D and 3D transforms of the agents of a crowd."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import copy
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Polygon
+
+import configuration.utils.constants as cst
+from configuration.models.crowd import Crowd
+
+#: Number of agents of the crowds used in the tests.
+NUMBER_AGENTS: int = 12
+
+#: Statistics of a crowd mixing pedestrians and bikes.
+MIXED_STATISTICS: dict[str, float] = {
+    **cst.CrowdStat,
+    "pedestrian_proportion": 0.5,
+    "bike_proportion": 0.5,
+}
+
+
+def make_crowd(agent_statistics: dict[str, float]) -> Crowd:
+    """
+    Create a seeded crowd with randomly rotated agents.
+
+    Parameters
+    ----------
+    agent_statistics : dict[str, float]
+        The statistics of the crowd, the default ones if empty.
+
+    Returns
+    -------
+    Crowd
+        The crowd.
+    """
+    crowd = Crowd(measures=agent_statistics or None, boundaries=Polygon([(0.0, 0.0), (300.0, 0.0), (300.0, 300.0), (0.0, 300.0)]))
+    crowd.create_agents(NUMBER_AGENTS, seed=3)
+    rng = np.random.default_rng(3)
+    for agent in crowd.agents:
+        agent.rotate(rng.uniform(-180.0, 180.0))
+    return crowd
+
+
+def shapes2D_coordinates(crowd: Crowd) -> list[np.ndarray]:
+    """
+    Get the coordinates of the 2D shapes of each agent of a crowd.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd.
+
+    Returns
+    -------
+    list[np.ndarray]
+        The centers of the disks and the vertices of the other shapes of each agent.
+    """
+    return [
+        np.vstack(
+            [
+                [[shape["x"], shape["y"]]] if shape["type"] == cst.ShapeTypes.disk.name else shapely.get_coordinates(shape["object"])
+                for shape in agent.shapes2D.shapes.values()
+            ]
+        )
+        for agent in crowd.agents
+    ]
+
+
+@pytest.mark.parametrize("agent_statistics", [{}, MIXED_STATISTICS])
+def test_transform_agents_matches_agent_transforms(agent_statistics: dict[str, float]) -> None:
+    """
+    Test that the batched 2D transform gives the same shapes as rotating then translating each agent.
+
+    Parameters
+    ----------
+    agent_statistics : dict[str, float]
+        The statistics of the crowd.
+    """
+    crowd = make_crowd(agent_statistics)
+    reference = copy.deepcopy(crowd)
+    rng = np.random.default_rng(4)
+    translations = rng.uniform(-50.0, 50.0, size=(NUMBER_AGENTS, 2))
+    angles = rng.uniform(-180.0, 180.0, size=NUMBER_AGENTS)
+    angles[:3] = [90.0, -90.0, 180.0]
+
+    crowd.transform_agents(translations, angles)
+    for agent, (dx, dy), angle in zip(reference.agents, translations, angles, strict=True):
+        agent.rotate(angle)
+        agent.translate(dx, dy)
+
+    for coordinates, expected in zip(shapes2D_coordinates(crowd), shapes2D_coordinates(reference), strict=True):
+        np.testing.assert_allclose(coordinates, expected, atol=1e-9)
+    np.testing.assert_allclose(crowd.get_agent_positions(), [agent.get_position().coords[0] for agent in reference.agents], atol=1e-9)
+
+
+def test_transform_bodies3D_matches_agent_transforms() -> None:
+    """Test that the batched 3D transform gives the same bodies as rotating then translating each body."""
+    crowd = make_crowd({})
+    reference = copy.deepcopy(crowd)
+    rng = np.random.default_rng(5)
+    translations = rng.uniform(-50.0, 50.0, size=(NUMBER_AGENTS, 3))
+    angles = rng.uniform(-180.0, 180.0, size=NUMBER_AGENTS)
+
+    np.testing.assert_allclose(
+        crowd.get_bodies3D_centroids(), [agent.get_centroid_body3D().coords[0] for agent in reference.agents], atol=1e-9
+    )
+    crowd.transform_bodies3D(translations, angles)
+    for agent, (dx, dy, dz), angle in zip(reference.agents, translations, angles, strict=True):
+        agent.rotate_body3D(angle)
+        agent.translate_body3D(dx, dy, dz)
+
+    for agent, expected_agent in zip(crowd.agents, reference.agents, strict=True):
+        assert agent.shapes3D is not None and expected_agent.shapes3D is not None
+        heights = list(agent.shapes3D.shapes)
+        expected_heights = list(expected_agent.shapes3D.shapes)
+        np.testing.assert_allclose(heights, expected_heights)
+        for slice_, expected_slice in zip(agent.shapes3D.shapes.values(), expected_agent.shapes3D.shapes.values(), strict=True):
+            np.testing.assert_allclose(shapely.get_coordinates(slice_), shapely.get_coordinates(expected_slice), atol=1e-9)
+
+
+def test_crowd_moves_keep_relative_shapes() -> None:
+    """Test that packing on a grid, translating and unpacking the crowd move each agent rigidly."""
+    crowd = make_crowd({})
+    initial_coordinates = shapes2D_coordinates(crowd)
+
+    crowd.pack_agents_on_grid()
+    grid_positions = crowd.get_agent_positions()
+    assert len(np.unique(np.round(grid_positions, 6), axis=0)) == NUMBER_AGENTS
+    crowd.translate_crowd(12.5, -3.0)
+    np.testing.assert_allclose(crowd.get_agent_positions(), grid_positions + [12.5, -3.0], atol=1e-9)
+    np.testing.assert_allclose(crowd.get_bodies3D_centroids(), crowd.get_agent_positions(), atol=1e-9)
+
+    crowd.unpack_crowd()
+    np.testing.assert_allclose(crowd.get_agent_positions(), 0.0, atol=1e-9)
+    for coordinates, initial in zip(shapes2D_coordinates(crowd), initial_coordinates, strict=True):
+        np.testing.assert_allclose(coordinates - coordinates.mean(axis=0), initial - initial.mean(axis=0), atol=1e-9)
+
+
+def test_transforms_reject_wrong_shapes() -> None:
+    """Test that the batched transforms reject translations and angles that do not match the number of agents."""
+    crowd = make_crowd({})
+    with pytest.raises(ValueError, match="Expected translations"):
+        crowd.transform_agents(np.zeros((NUMBER_AGENTS - 1, 2)))
+    with pytest.raises(ValueError, match="Expected translations"):
+        crowd.transform_agents(np.zeros((NUMBER_AGENTS, 2)), np.zeros(NUMBER_AGENTS + 1))
+    with pytest.raises(ValueError, match="Expected translations"):
+        crowd.transform_bodies3D(np.zeros((NUMBER_AGENTS, 2)))
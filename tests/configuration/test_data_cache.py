@@ -0,0 +1,89 @@
+"""Tests of the process-wide cache of the ANSURII database and of the 3D body templates."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import copy
+import pickle
+
+import pytest
+
+import configuration.utils.functions as fun
+from configuration.models.initial_agents import InitialPedestrian
+from configuration.models.measures import CrowdMeasures
+
+
+def test_default_database_shared_and_read_only() -> None:
+    """Test that all the crowd measures share the same read-only ANSURII database."""
+    first_measures = CrowdMeasures()
+    second_measures = CrowdMeasures()
+    assert first_measures.default_database is second_measures.default_database
+    assert len(first_measures.default_database) > 0
+
+    record = first_measures.default_database[0]
+    assert record["sex"] in ("male", "female")
+    with pytest.raises(TypeError):
+        first_measures.default_database[0] = {}
+    with pytest.raises(TypeError):
+        record["sex"] = "female"
+    with pytest.raises(AttributeError):
+        record.update(sex="female")
+
+
+def test_default_database_copies() -> None:
+    """Test that copies of the crowd measures share the cached database and that pickling preserves it."""
+    crowd_measures = CrowdMeasures()
+    assert copy.deepcopy(crowd_measures).default_database is crowd_measures.default_database
+
+    unpickled_database = pickle.loads(pickle.dumps(crowd_measures.default_database))
+    assert isinstance(unpickled_database, fun.ReadOnlyDict)
+    assert unpickled_database.keys() == crowd_measures.default_database.keys()
+    with pytest.raises(TypeError):
+        unpickled_database[0] = {}
+
+
+def test_body_template_shared_and_read_only() -> None:
+    """Test that the initial pedestrians of the same sex share the same read-only 3D body."""
+    assert InitialPedestrian("male").shapes3D is InitialPedestrian("male").shapes3D
+    assert InitialPedestrian("male").shapes3D is not InitialPedestrian("female").shapes3D
+
+    shapes3D = InitialPedestrian("female").shapes3D
+    with pytest.raises(TypeError):
+        shapes3D[0.0] = next(iter(shapes3D.values()))
+
+
+def test_clear_data_cache() -> None:
+    """Test that clearing the cache reloads the data on the next access."""
+    database = fun.load_default_database()
+    body_template = fun.load_body_template("male")
+
+    fun.clear_data_cache()
+
+    reloaded_database = fun.load_default_database()
+    reloaded_body_template = fun.load_body_template("male")
+    assert reloaded_database is not database
+    assert reloaded_body_template is not body_template
+    assert reloaded_database.keys() == database.keys()
+    assert reloaded_body_template.keys() == body_template.keys()
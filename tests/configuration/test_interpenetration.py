@@ -0,0 +1,153 @@
+"""Tests of the interpenetration metrics of a crowd."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Point, Polygon
+
+from configuration.models.crowd import Crowd
+from configuration.utils.functions import compute_disk_intersection_areas
+
+#: Boundaries of the crowd used in the tests (cm).
+BOUNDARIES = Polygon([(0.0, 0.0), (200.0, 0.0), (200.0, 200.0), (0.0, 200.0)])
+
+
+@pytest.fixture
+def crowd() -> Crowd:
+    """
+    Fixture to create a crowd of overlapping pedestrians, some of them outside the boundaries.
+
+    Returns
+    -------
+    Crowd
+        A crowd of 40 pedestrians at random positions and orientations.
+    """
+    np.random.seed(0)
+    crowd = Crowd(boundaries=BOUNDARIES)
+    crowd.create_agents(40)
+    rng = np.random.default_rng(0)
+    for agent in crowd.agents:
+        position = agent.get_position()
+        agent.translate(rng.uniform(-10.0, 210.0) - position.x, rng.uniform(-10.0, 210.0) - position.y)
+        agent.rotate(rng.uniform(-180.0, 180.0))
+    return crowd
+
+
+def brute_force_interpenetration(crowd: Crowd) -> tuple[float, float]:
+    """
+    Compute the interpenetration of a crowd by intersecting the polygons of all pairs of agents.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd.
+
+    Returns
+    -------
+    tuple[float, float]
+        The total interpenetration area between agents and with the boundaries (cm²).
+    """
+    geometries = [agent.shapes2D.get_geometric_shape() for agent in crowd.agents]
+    between_agents = sum(
+        geometries[i].intersection(geometries[j]).area for i in range(len(geometries)) for j in range(i + 1, len(geometries))
+    )
+    with_boundaries = sum(geometry.difference(crowd.boundaries).area for geometry in geometries)
+    return between_agents, with_boundaries
+
+
+def test_disk_intersection_areas() -> None:
+    """Test the lens areas against disjoint, nested and crossing disks."""
+    distances = np.array([5.0, 3.0, 0.5, 1.0, 1.5])
+    radii_a = np.array([2.0, 1.5, 2.0, 1.0, 1.0])
+    radii_b = np.array([2.0, 1.5, 1.0, 1.0, 2.0])
+    areas = compute_disk_intersection_areas(distances, radii_a, radii_b)
+    # Two unit disks whose centers are one radius apart overlap on 2π/3 - √3/2
+    expected_crossing = 2.0 * np.pi / 3.0 - np.sqrt(3.0) / 2.0
+    assert np.allclose(areas[:4], [0.0, 0.0, np.pi, expected_crossing])
+    lens = Point(0.0, 0.0).buffer(1.0, quad_segs=512).intersection(Point(1.5, 0.0).buffer(2.0, quad_segs=512))
+    assert np.isclose(areas[4], lens.area, rtol=1e-4)
+
+
+def test_interpenetration_matches_polygons(crowd: Crowd) -> None:
+    """
+    Test that the interpenetration matches the intersections of the polygons of all pairs of agents.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    between_agents, with_boundaries = crowd.calculate_interpenetration()
+    expected_between_agents, expected_with_boundaries = brute_force_interpenetration(crowd)
+    assert between_agents > 0.0
+    assert with_boundaries > 0.0
+    # Lenses are exact whereas polygons are inscribed in the disks
+    assert np.isclose(between_agents, expected_between_agents, rtol=2e-3)
+    assert np.isclose(with_boundaries, expected_with_boundaries, rtol=1e-12)
+
+
+def test_incremental_interpenetration(crowd: Crowd) -> None:
+    """
+    Test that the incremental interpenetration follows the moved agents and the boundaries.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    crowd.calculate_interpenetration(incremental=True)
+    crowd.agents[0].translate(15.0, -4.0)
+    crowd.agents[7].rotate(30.0)
+    crowd.agents[7].translate(-20.0, 0.0)
+    incremental = crowd.calculate_interpenetration(incremental=True)
+    assert np.allclose(incremental, crowd.calculate_interpenetration(), rtol=1e-12)
+
+    # Contributions of the agents that have not moved are reused
+    state = crowd.update_interpenetration_state()
+    geometry = state.geometries[3]
+    crowd.agents[5].translate(1.0, 1.0)
+    assert crowd.update_interpenetration_state().geometries[3] is geometry
+
+    crowd.boundaries = shapely.box(0.0, 0.0, 150.0, 150.0)
+    incremental = crowd.calculate_interpenetration(incremental=True)
+    assert np.allclose(incremental, crowd.calculate_interpenetration(), rtol=1e-12)
+    assert np.isclose(incremental[1], brute_force_interpenetration(crowd)[1], rtol=1e-12)
+
+
+def test_covered_area(crowd: Crowd) -> None:
+    """
+    Test that the covered area is the sum of the areas of the agents.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    assert np.isclose(crowd.calculate_covered_area(), sum(agent.shapes2D.get_area() for agent in crowd.agents))
+    assert Crowd().calculate_covered_area() == 0.0
+    assert Crowd().calculate_interpenetration() == (0.0, 0.0)
@@ -0,0 +1,127 @@
+"""Tests of the lazy creation of the 3D shapes of the agents and of the switch disabling them in a crowd."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import copy
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Polygon
+
+from configuration.models.crowd import Crowd
+
+#: Number of agents of the crowds used in the tests.
+NUMBER_AGENTS: int = 6
+
+#: Seed of the crowds used in the tests.
+SEED: int = 7
+
+
+def make_crowd(shapes3D_enabled: bool = True) -> Crowd:
+    """
+    Create a seeded crowd of pedestrians with randomly rotated agents.
+
+    Parameters
+    ----------
+    shapes3D_enabled : bool
+        Whether the agents of the crowd have 3D shapes.
+
+    Returns
+    -------
+    Crowd
+        The crowd.
+    """
+    crowd = Crowd(boundaries=Polygon([(0.0, 0.0), (300.0, 0.0), (300.0, 300.0), (0.0, 300.0)]), shapes3D_enabled=shapes3D_enabled)
+    crowd.create_agents(NUMBER_AGENTS, seed=SEED)
+    rng = np.random.default_rng(SEED)
+    for agent in crowd.agents:
+        agent.rotate(rng.uniform(-180.0, 180.0))
+    return crowd
+
+
+def test_shapes3D_created_on_first_access() -> None:
+    """Test that the 3D shapes are only created when first accessed, centered on the origin."""
+    crowd = make_crowd()
+    agent = crowd.agents[0]
+    assert agent.shapes3D_pending
+
+    assert agent.shapes3D is not None and agent.shapes3D.shapes
+    assert not agent.shapes3D_pending
+    centroid = agent.get_centroid_body3D()
+    assert centroid.x == pytest.approx(0.0, abs=1e-9)
+    assert centroid.y == pytest.approx(0.0, abs=1e-9)
+
+
+def test_deferred_placement_matches_eager_placement() -> None:
+    """Test that the placement of bodies not created yet gives the same bodies as moving the created ones."""
+    lazy_crowd = make_crowd()
+    eager_crowd = copy.deepcopy(lazy_crowd)
+    for agent in eager_crowd.agents:
+        assert agent.shapes3D is not None
+
+    for crowd in (lazy_crowd, eager_crowd):
+        crowd.pack_agents_on_grid()
+        crowd.translate_crowd(12.5, -3.0)
+    assert all(agent.shapes3D_pending for agent in lazy_crowd.agents)
+
+    for lazy_agent, eager_agent in zip(lazy_crowd.agents, eager_crowd.agents, strict=True):
+        assert lazy_agent.shapes3D is not None and eager_agent.shapes3D is not None
+        np.testing.assert_allclose(list(lazy_agent.shapes3D.shapes), list(eager_agent.shapes3D.shapes))
+        for lazy_slice, eager_slice in zip(lazy_agent.shapes3D.shapes.values(), eager_agent.shapes3D.shapes.values(), strict=True):
+            np.testing.assert_allclose(shapely.get_coordinates(lazy_slice), shapely.get_coordinates(eager_slice), atol=1e-9)
+
+
+def test_crowd_without_shapes3D() -> None:
+    """Test that the agents of a crowd with disabled 3D shapes have none, and that the crowd can still be moved."""
+    crowd = make_crowd(shapes3D_enabled=False)
+    reference = make_crowd()
+
+    for agent, reference_agent in zip(crowd.agents, reference.agents, strict=True):
+        assert agent.shapes3D is None
+        assert not agent.shapes3D_pending
+        np.testing.assert_allclose(
+            shapely.get_coordinates(agent.shapes2D.get_geometric_shape()),
+            shapely.get_coordinates(reference_agent.shapes2D.get_geometric_shape()),
+        )
+
+    crowd.pack_agents_on_grid()
+    crowd.translate_crowd(12.5, -3.0)
+    assert all(agent.shapes3D is None for agent in crowd.agents)
+    with pytest.raises(ValueError, match="No 3D shapes available"):
+        crowd.agents[0].get_centroid_body3D()
+
+
+def test_measures_update_keeps_shapes3D_pending() -> None:
+    """Test that updating the measures of an agent does not create its 3D shapes, which then use the new measures."""
+    agent = make_crowd().agents[0]
+    measures = copy.deepcopy(agent.measures)
+    measures.measures["height"] = float(measures.measures["height"]) + 10.0
+
+    agent.measures = measures
+    assert agent.shapes3D_pending
+    assert agent.shapes3D is not None
+    assert agent.shapes3D.get_height() == pytest.approx(float(measures.measures["height"]), rel=1e-2)
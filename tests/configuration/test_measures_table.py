@@ -0,0 +1,109 @@
+"""Tests of the batch drawing of the measures of the agents of a crowd as a table."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import numpy as np
+import pytest
+
+import configuration.utils.constants as cst
+import configuration.utils.functions as fun
+from configuration.models.measures import CrowdMeasures, create_agent_measures_from_table, draw_crowd_measures_table
+
+NUMBER_AGENTS: int = 2000
+
+AGENT_STATISTICS: dict[str, float] = {
+    **cst.CrowdStat,
+    "male_proportion": 0.3,
+    "pedestrian_proportion": 0.8,
+    "bike_proportion": 0.2,
+}
+
+
+def test_measures_table_from_statistics() -> None:
+    """Test that the table drawn from the agent statistics follows the proportions and the truncated normal laws."""
+    np.random.seed(0)
+    table = draw_crowd_measures_table(NUMBER_AGENTS, CrowdMeasures(agent_statistics=AGENT_STATISTICS))
+    assert len(table) == NUMBER_AGENTS
+
+    is_pedestrian = table["agent_type"] == cst.AgentTypes.pedestrian.name
+    assert np.isclose(is_pedestrian.mean(), AGENT_STATISTICS["pedestrian_proportion"], atol=0.05)
+    assert table.loc[~is_pedestrian, "sex"].isna().all()
+    assert np.isclose((table.loc[is_pedestrian, "sex"] == "male").mean(), AGENT_STATISTICS["male_proportion"], atol=0.05)
+
+    groups = [
+        (is_pedestrian & (table["sex"] == "male"), "male_", [part.name for part in list(cst.PedestrianParts)[1:]] + ["weight"]),
+        (is_pedestrian & (table["sex"] == "female"), "female_", [part.name for part in list(cst.PedestrianParts)[1:]] + ["weight"]),
+        (~is_pedestrian, "", [part.name for part in cst.BikeParts]),
+    ]
+    for mask, prefix, part_names in groups:
+        for part_name in part_names:
+            values = table.loc[mask, part_name]
+            assert values.notna().all()
+            assert values.min() >= AGENT_STATISTICS[f"{prefix}{part_name}_min"]
+            assert values.max() <= AGENT_STATISTICS[f"{prefix}{part_name}_max"]
+            assert np.isclose(values.mean(), AGENT_STATISTICS[f"{prefix}{part_name}_mean"], rtol=0.05)
+    assert table.loc[is_pedestrian, [part.name for part in cst.BikeParts]].isna().all().all()
+    assert table.loc[~is_pedestrian, cst.PedestrianParts.chest_depth.name].isna().all()
+
+
+def test_measures_table_from_default_database() -> None:
+    """Test that the table drawn without agent statistics only contains records of the ANSURII database."""
+    np.random.seed(0)
+    table = draw_crowd_measures_table(NUMBER_AGENTS, CrowdMeasures())
+    assert (table["agent_type"] == cst.AgentTypes.pedestrian.name).all()
+
+    database = fun.load_default_database_table()
+    database_records = set(
+        zip(database["sex"], database["bideltoid breadth [cm]"], database["chest depth [cm]"], database["height [cm]"], strict=True)
+    )
+    drawn_records = zip(table["sex"], table["bideltoid_breadth"], table["chest_depth"], table["height"], strict=True)
+    assert all(record in database_records for record in drawn_records)
+
+
+@pytest.mark.parametrize("agent_statistics", [{}, AGENT_STATISTICS])
+def test_create_agent_measures_from_table(agent_statistics: dict[str, float]) -> None:
+    """
+    Test that the measures of the agents built from the table match its rows.
+
+    Parameters
+    ----------
+    agent_statistics : dict[str, float]
+        The agent statistics of the crowd, the ANSURII database being used if empty.
+    """
+    table = draw_crowd_measures_table(20, CrowdMeasures(agent_statistics=agent_statistics))
+    agents_measures = create_agent_measures_from_table(table)
+    assert len(agents_measures) == len(table)
+    for agent_measures, (_, row) in zip(agents_measures, table.iterrows(), strict=True):
+        assert agent_measures.agent_type.name == row["agent_type"]
+        for part_name, value in agent_measures.measures.items():
+            assert value == row[part_name]
+
+
+def test_measures_table_invalid_number_of_agents() -> None:
+    """Test that a negative number of agents raises a ValueError."""
+    with pytest.raises(ValueError):
+        draw_crowd_measures_table(-1, CrowdMeasures())
+    assert len(draw_crowd_measures_table(0, CrowdMeasures(agent_statistics=AGENT_STATISTICS))) == 0
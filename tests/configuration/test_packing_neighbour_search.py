@@ -0,0 +1,160 @@
+"""Tests for the spatial-index neighbour search used by the packing algorithm of the Crowd class."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import copy
+
+import numpy as np
+import pytest
+import shapely
+
+import configuration.utils.constants as cst
+from configuration.models.crowd import Crowd
+
+NUMBER_AGENTS: int = 15
+#: Relative tolerance on the area of the convex hull of the packed crowd between both packing modes.
+HULL_AREA_RTOL: float = 0.25
+
+
+@pytest.fixture(scope="module")
+def crowd() -> Crowd:
+    """
+    Fixture to create an unpacked Crowd instance.
+
+    Returns
+    -------
+    Crowd
+        An instance of Crowd with agents created but not packed.
+    """
+    np.random.seed(0)
+    crowd = Crowd()
+    crowd.create_agents(number_agents=NUMBER_AGENTS)
+    return crowd
+
+
+def test_find_packing_neighbours_contains_all_close_agents(crowd: Crowd) -> None:
+    """
+    Test that the candidate neighbours contain every agent closer than the search radius.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    packed_crowd = copy.deepcopy(crowd)
+    packed_crowd.pack_agents_on_grid()
+    geometries = [agent.shapes2D.get_geometric_shape() for agent in packed_crowd.agents]
+    search_radius = cst.REPULSION_CUTOFF_FACTOR * cst.DEFAULT_REPULSION_LENGTH
+    neighbours = Crowd.find_packing_neighbours(geometries, search_radius)
+
+    assert len(neighbours) == NUMBER_AGENTS
+    for i_agent, geometry in enumerate(geometries):
+        assert i_agent not in neighbours[i_agent], "An agent should not be its own neighbour."
+        assert neighbours[i_agent] == sorted(neighbours[i_agent]), "Neighbours should be sorted."
+        for j_agent, other_geometry in enumerate(geometries):
+            if i_agent == j_agent:
+                continue
+            if geometry.centroid.distance(other_geometry.centroid) <= search_radius or geometry.intersects(other_geometry):
+                assert j_agent in neighbours[i_agent], f"Agent {j_agent} is missing from the neighbours of agent {i_agent}."
+
+
+def test_neighbour_search_matches_all_pairs_packing(crowd: Crowd) -> None:
+    """
+    Test that packing with the neighbour search yields a crowd comparable to the all-pairs algorithm.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    results = {}
+    for neighbour_search in (False, True):
+        packed_crowd = copy.deepcopy(crowd)
+        np.random.seed(1)
+        packed_crowd.pack_agents_with_forces(neighbour_search=neighbour_search)
+        interpenetration, _ = packed_crowd.calculate_interpenetration()
+        hull = shapely.union_all([agent.shapes2D.get_geometric_shape() for agent in packed_crowd.agents]).convex_hull
+        results[neighbour_search] = (interpenetration, hull.area)
+
+    assert np.isclose(results[True][0], results[False][0], atol=1.0), "Interpenetration should match the all-pairs packing."
+    assert np.isclose(results[True][1], results[False][1], rtol=HULL_AREA_RTOL), "Packing density should match the all-pairs packing."
+
+
+def test_neighbour_search_requeried_when_agents_move_beyond_margin(crowd: Crowd, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the neighbours are queried again within an iteration once an agent moves by more than half the margin.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    monkeypatch : pytest.MonkeyPatch
+        Fixture used to shrink the search margin and count the neighbour queries.
+    """
+    find_packing_neighbours = Crowd.find_packing_neighbours
+    nb_queries = 0
+
+    def counting_find_packing_neighbours(
+        geometries: list[shapely.Polygon | shapely.MultiPolygon], search_radius: float
+    ) -> list[list[int]]:
+        """
+        Count the neighbour queries before delegating to the original implementation.
+
+        Parameters
+        ----------
+        geometries : list[shapely.Polygon | shapely.MultiPolygon]
+            The 2D geometric shapes of the agents.
+        search_radius : float
+            Distance (cm) by which the bounding box of each agent is enlarged.
+
+        Returns
+        -------
+        list[list[int]]
+            For each agent, the sorted indices of its candidate neighbours.
+        """
+        nonlocal nb_queries
+        nb_queries += 1
+        neighbours: list[list[int]] = find_packing_neighbours(geometries, search_radius)
+        return neighbours
+
+    monkeypatch.setattr(cst, "NEIGHBOUR_SEARCH_MARGIN", 1.0e-6)
+    monkeypatch.setattr(Crowd, "find_packing_neighbours", staticmethod(counting_find_packing_neighbours))
+    packed_crowd = copy.deepcopy(crowd)
+    np.random.seed(1)
+    packed_crowd.pack_agents_with_forces(neighbour_search=True)
+
+    assert nb_queries > cst.MAX_NB_ITERATIONS, "Moving agents should trigger additional neighbour queries within an iteration."
+
+
+def test_neighbour_search_invalid_type() -> None:
+    """Test that a non-boolean neighbour search flag raises a TypeError."""
+    with pytest.raises(TypeError):
+        Crowd.check_validity_parameters_agents_packing(
+            repulsion_length=cst.DEFAULT_REPULSION_LENGTH,
+            desired_direction=cst.DEFAULT_DESIRED_DIRECTION,
+            variable_orientation=cst.DEFAULT_VARIABLE_ORIENTATION,
+            neighbour_search="yes",
+        )
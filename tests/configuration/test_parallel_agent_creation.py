@@ -0,0 +1,160 @@
+"""Tests of the creation of the agents of a crowd in several worker processes."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import numpy as np
+import pytest
+import shapely
+
+import configuration.utils.constants as cst
+from configuration.models.crowd import Crowd
+from configuration.models.shapes3D import Shapes3D
+
+NUMBER_AGENTS: int = 8
+SEED: int = 12
+
+AGENT_STATISTICS: dict[str, float] = {
+    **cst.CrowdStat,
+    "pedestrian_proportion": 0.5,
+    "bike_proportion": 0.5,
+}
+
+
+def crowd_signature(crowd: Crowd) -> list[tuple[str, dict[str, object], list[tuple[float, float]]]]:
+    """
+    Summarize the agents of a crowd by their type, measures and 2D shape.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd to summarize.
+
+    Returns
+    -------
+    list[tuple[str, dict[str, object], list[tuple[float, float]]]]
+        The type, measures and exterior coordinates of the 2D shape of each agent.
+    """
+    return [
+        (agent.agent_type.name, dict(agent.measures.measures), list(agent.shapes2D.get_geometric_shape().convex_hull.exterior.coords))
+        for agent in crowd.agents
+    ]
+
+
+@pytest.mark.parametrize("agent_statistics", [{}, AGENT_STATISTICS])
+def test_create_agents_independent_of_workers(agent_statistics: dict[str, float]) -> None:
+    """
+    Test that a seeded crowd is identical whatever the number of workers used to create it.
+
+    Parameters
+    ----------
+    agent_statistics : dict[str, float]
+        The agent statistics of the crowd, the ANSURII database being used if empty.
+    """
+    signatures = []
+    for workers in (1, 2, 3):
+        crowd = Crowd(measures=agent_statistics)
+        crowd.create_agents(NUMBER_AGENTS, workers=workers, seed=SEED)
+        assert crowd.get_number_agents() == NUMBER_AGENTS
+        signatures.append(crowd_signature(crowd))
+    assert signatures[0] == signatures[1] == signatures[2]
+
+
+def test_create_agents_seed_preserves_global_random_state() -> None:
+    """Test that a seeded creation is reproducible and does not consume the global random state."""
+    np.random.seed(0)
+    first_crowd = Crowd()
+    first_crowd.create_agents(NUMBER_AGENTS, seed=SEED)
+    first_random_value = np.random.rand()
+
+    np.random.seed(0)
+    second_crowd = Crowd()
+    second_crowd.create_agents(NUMBER_AGENTS, seed=SEED)
+    assert crowd_signature(first_crowd) == crowd_signature(second_crowd)
+    assert np.random.rand() == first_random_value
+
+    third_crowd = Crowd()
+    third_crowd.create_agents(NUMBER_AGENTS, seed=SEED + 1)
+    assert crowd_signature(first_crowd) != crowd_signature(third_crowd)
+
+
+def bodies3D_signature(crowd: Crowd) -> list[list[tuple[float, list[tuple[float, float]]]]]:
+    """
+    Summarize the 3D bodies of the agents of a crowd, creating them if needed.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd to summarize.
+
+    Returns
+    -------
+    list[list[tuple[float, list[tuple[float, float]]]]]
+        The height and the coordinates of each slice of the 3D body of each agent.
+    """
+    signature = []
+    for agent in crowd.agents:
+        assert agent.shapes3D is not None
+        signature.append(
+            [(float(height), shapely.get_coordinates(slice_).tolist()) for height, slice_ in agent.shapes3D.shapes.items()]
+        )
+    return signature
+
+
+def test_create_agents_seed_reproducible_shapes3D(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the 3D bodies of a seeded crowd are reproducible when they are fitted with the optimizer.
+
+    They must not depend on the number of workers, nor on the global random state when they are first accessed.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Fixture used to disable the scaling lookup table, so that the 3D bodies are fitted with dual annealing.
+    """
+    monkeypatch.setattr(Shapes3D, "lookup_pedestrian_scaling", lambda *args: None)
+    number_agents = 3
+    signatures = []
+    for workers in (2, 2, 1):
+        crowd = Crowd()
+        crowd.create_agents(number_agents, workers=workers, seed=SEED)
+        np.random.seed(workers)
+        np.random.rand(10)
+        signatures.append(bodies3D_signature(crowd))
+    assert signatures[0] == signatures[1] == signatures[2]
+
+
+@pytest.mark.parametrize("workers", [0, -2, 1.5])
+def test_create_agents_invalid_workers(workers: int) -> None:
+    """
+    Test that an invalid number of workers raises a ValueError.
+
+    Parameters
+    ----------
+    workers : int
+        The invalid number of workers.
+    """
+    with pytest.raises(ValueError):
+        Crowd().create_agents(NUMBER_AGENTS, workers=workers)
@@ -0,0 +1,95 @@
+"""Tests of the lookup table of the scaling factors used to fit the 3D pedestrian to anthropometric measures."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import numpy as np
+import pytest
+from shapely.affinity import scale
+
+import configuration.utils.constants as cst
+import configuration.utils.functions as fun
+from configuration.models.initial_agents import InitialPedestrian
+from configuration.models.measures import AgentMeasures
+from configuration.models.shapes3D import Shapes3D
+
+MEASURES: list[dict[str, str | float]] = [
+    {"sex": "male", "bideltoid_breadth": 51.0, "chest_depth": 26.0, "height": 178.0, "weight": 85.0},
+    {"sex": "male", "bideltoid_breadth": 45.0, "chest_depth": 25.0, "height": 180.0, "weight": 75.0},
+    {"sex": "female", "bideltoid_breadth": 41.0, "chest_depth": 22.0, "height": 160.0, "weight": 60.0},
+    {"sex": "female", "bideltoid_breadth": 48.0, "chest_depth": 27.0, "height": 170.0, "weight": 70.0},
+]
+
+
+@pytest.mark.parametrize("measures", MEASURES)
+def test_lookup_scaling_fits_reference_multipolygon(measures: dict[str, str | float]) -> None:
+    """
+    Test that the scaling factors interpolated from the lookup table fit the torso slice to the wanted measures.
+
+    Parameters
+    ----------
+    measures : dict[str, str | float]
+        The measures of the pedestrian.
+    """
+    scaling = Shapes3D.lookup_pedestrian_scaling(
+        str(measures["sex"]), float(measures["chest_depth"]), float(measures["bideltoid_breadth"])
+    )
+    assert scaling is not None
+    reference_multipolygon = InitialPedestrian(str(measures["sex"])).get_reference_multipolygon()
+    scaled_multipolygon = scale(reference_multipolygon, xfact=scaling[0], yfact=scaling[1], origin=reference_multipolygon.centroid)
+    assert np.isclose(
+        fun.compute_chest_depth_from_multipolygon(scaled_multipolygon), measures["chest_depth"], atol=cst.SCALING_TABLE_TOLERANCE
+    )
+    assert np.isclose(
+        fun.compute_bideltoid_breadth_from_multipolygon(scaled_multipolygon),
+        measures["bideltoid_breadth"],
+        atol=cst.SCALING_TABLE_TOLERANCE,
+    )
+
+
+@pytest.mark.parametrize("measures", MEASURES)
+def test_lookup_matches_optimizer(measures: dict[str, str | float]) -> None:
+    """
+    Test that the 3D pedestrian fitted with the lookup table is as close to the wanted measures as the optimized one.
+
+    Parameters
+    ----------
+    measures : dict[str, str | float]
+        The measures of the pedestrian.
+    """
+    np.random.seed(0)
+    for use_optimizer in (False, True):
+        shapes3D = Shapes3D(agent_type=cst.AgentTypes.pedestrian)
+        shapes3D.create_pedestrian3D(
+            AgentMeasures(agent_type=cst.AgentTypes.pedestrian, measures=measures), use_optimizer=use_optimizer
+        )
+        assert np.isclose(shapes3D.get_chest_depth(), measures["chest_depth"], atol=cst.SCALING_TABLE_TOLERANCE)
+        assert np.isclose(shapes3D.get_bideltoid_breadth(), measures["bideltoid_breadth"], atol=cst.SCALING_TABLE_TOLERANCE)
+
+
+def test_lookup_scaling_out_of_table() -> None:
+    """Test that measures outside the lookup table are not interpolated."""
+    assert Shapes3D.lookup_pedestrian_scaling("male", wanted_chest_depth=5.0, wanted_bideltoid_breadth=50.0) is None
+    assert Shapes3D.lookup_pedestrian_scaling("female", wanted_chest_depth=25.0, wanted_bideltoid_breadth=100.0) is None
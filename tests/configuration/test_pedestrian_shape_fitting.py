@@ -0,0 +1,109 @@
+"""Regression tests comparing the closed-form fitting of the 2D pedestrian shape with the optimizer-based fitting."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import numpy as np
+import pytest
+
+import configuration.utils.constants as cst
+from configuration.models.initial_agents import InitialPedestrian
+from configuration.models.measures import AgentMeasures
+from configuration.models.shapes2D import Shapes2D
+
+#: Tolerance (cm) between the disks fitted in closed form and those fitted by the optimizer.
+DISK_TOL: float = 0.5
+
+MEASURES: list[dict[str, str | float]] = [
+    {"sex": "male", "bideltoid_breadth": 51.0, "chest_depth": 26.0, "height": 178.0, "weight": 85.0},
+    {"sex": "male", "bideltoid_breadth": 45.0, "chest_depth": 25.0, "height": 180.0, "weight": 75.0},
+    {"sex": "female", "bideltoid_breadth": 41.0, "chest_depth": 22.0, "height": 160.0, "weight": 60.0},
+    {"sex": "female", "bideltoid_breadth": 48.0, "chest_depth": 27.0, "height": 170.0, "weight": 70.0},
+]
+
+
+def fitted_disks(measures: dict[str, str | float], use_optimizer: bool) -> list[tuple[float, float, float]]:
+    """
+    Fit the 2D shape of a pedestrian and return its disks.
+
+    Parameters
+    ----------
+    measures : dict[str, str | float]
+        The measures of the pedestrian.
+    use_optimizer : bool
+        Whether the shape is fitted by the optimizer instead of the closed-form solution.
+
+    Returns
+    -------
+    list[tuple[float, float, float]]
+        The x-coordinate, y-coordinate and radius (cm) of each disk.
+    """
+    shapes2D = Shapes2D(agent_type=cst.AgentTypes.pedestrian)
+    shapes2D.create_pedestrian_shapes(
+        AgentMeasures(agent_type=cst.AgentTypes.pedestrian, measures=measures), use_optimizer=use_optimizer
+    )
+    return [
+        (disk["x"] * cst.M_TO_CM, disk["y"] * cst.M_TO_CM, disk["radius"] * cst.M_TO_CM)
+        for disk in shapes2D.get_additional_parameters().values()
+    ]
+
+
+@pytest.mark.parametrize("measures", MEASURES)
+def test_closed_form_matches_optimizer(measures: dict[str, str | float]) -> None:
+    """
+    Test that the disks fitted in closed form match those fitted by the optimizer.
+
+    Parameters
+    ----------
+    measures : dict[str, str | float]
+        The measures of the pedestrian.
+    """
+    np.random.seed(0)
+    closed_form_disks = fitted_disks(measures, use_optimizer=False)
+    optimizer_disks = fitted_disks(measures, use_optimizer=True)
+    assert np.allclose(closed_form_disks, optimizer_disks, atol=DISK_TOL), f"{closed_form_disks} != {optimizer_disks}"
+
+
+@pytest.mark.parametrize("measures", MEASURES)
+def test_closed_form_fits_measures(measures: dict[str, str | float]) -> None:
+    """
+    Test that the closed-form fitting reproduces the wanted chest depth and bideltoid breadth.
+
+    Parameters
+    ----------
+    measures : dict[str, str | float]
+        The measures of the pedestrian.
+    """
+    shapes2D = Shapes2D(agent_type=cst.AgentTypes.pedestrian)
+    shapes2D.create_pedestrian_shapes(AgentMeasures(agent_type=cst.AgentTypes.pedestrian, measures=measures))
+    assert np.isclose(shapes2D.get_chest_depth(), measures["chest_depth"], atol=0.2)
+    assert np.isclose(shapes2D.get_bideltoid_breadth(), measures["bideltoid_breadth"], atol=0.2)
+
+
+def test_solve_pedestrian_scaling_out_of_bounds() -> None:
+    """Test that the closed-form solution is rejected when the scaling factors fall outside the bounds."""
+    initial_pedestrian = InitialPedestrian("male")
+    assert Shapes2D.solve_pedestrian_scaling(initial_pedestrian, wanted_chest_depth=30.0, wanted_bideltoid_breadth=1.0) is None
+    assert Shapes2D.solve_pedestrian_scaling(initial_pedestrian, wanted_chest_depth=300.0, wanted_bideltoid_breadth=50.0) is None
@@ -0,0 +1,92 @@
+"""Tests of the vectorized resampling of the agent trajectories for PedPy."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from configuration.backup import xml_to_Chaos, xml_to_PedPy
+from tests.configuration.test_xml_trajectories_ingestion import AGENT_IDS, NB_FILES, write_agent_dynamics_files
+
+#: Geometry file of the mechanical layer test used by these tests.
+GEOMETRY_PATH = Path(__file__).parent.parent / "mechanical_layer" / "test_push_agent_agent" / "static" / "Geometry.xml"
+
+
+def test_resample_trajectories_to_frames() -> None:
+    """Test that the positions are interpolated on the frames as with np.interp, pedestrian by pedestrian."""
+    rng = np.random.default_rng(0)
+    samples = {
+        3: np.array([0.0, 0.1, 0.2, 0.5, 0.6, 1.0]),  # missing samples are interpolated
+        1: np.array([0.3, 0.4, 0.7]),  # the pedestrian appears late and leaves early
+        2: np.array([0.8]),  # a single sample: dropped
+    }
+    trajectories = pd.concat(
+        [
+            pd.DataFrame({"t": times, "ID": ped_id, "x": rng.random(len(times)), "y": rng.random(len(times))})
+            for ped_id, times in samples.items()
+        ]
+    ).sample(frac=1.0, random_state=0)
+
+    data, dt = xml_to_PedPy.resample_trajectories_to_frames(trajectories)
+
+    assert dt == pytest.approx(0.1)
+    assert data["id"].unique().tolist() == [1, 3]
+    assert data["frame"].tolist() == list(range(11)) * 2
+    grid = np.arange(11) * dt
+    for ped_id in (1, 3):
+        ped = trajectories[trajectories["ID"] == ped_id].sort_values("t")
+        ped_data = data[data["id"] == ped_id]
+        np.testing.assert_allclose(ped_data["x"], np.interp(grid, ped["t"], ped["x"]), atol=1e-12)
+        np.testing.assert_allclose(ped_data["y"], np.interp(grid, ped["t"], ped["y"]), atol=1e-12)
+
+    duplicated = pd.concat([trajectories, trajectories[trajectories["ID"] == 3].head(1)])
+    with pytest.raises(ValueError):
+        xml_to_PedPy.resample_trajectories_to_frames(duplicated)
+    with pytest.raises(ValueError):
+        xml_to_PedPy.resample_trajectories_to_frames(trajectories[trajectories["ID"] == 2])
+
+
+def test_export_XML_to_PedPy(tmp_path: Path) -> None:
+    """
+    Test that the XML files give the same PedPy trajectories with and without the intermediate CSV file.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the XML and CSV files are written.
+    """
+    write_agent_dynamics_files(tmp_path / "xml")
+    trajectory_data, walkable_area = xml_to_PedPy.export_XML_to_PedPy(tmp_path / "xml", GEOMETRY_PATH)
+    assert trajectory_data.frame_rate == pytest.approx(10.0)
+    assert len(trajectory_data.data) == NB_FILES * len(AGENT_IDS)
+    assert walkable_area.polygon.area > 0
+
+    xml_to_Chaos.export_XML_to_CSV(tmp_path, tmp_path / "xml")
+    trajectory_data_csv, _ = xml_to_PedPy.export_XML_to_PedPy(tmp_path / "xml", GEOMETRY_PATH, tmp_path / "all_trajectories.csv")
+    np.testing.assert_allclose(trajectory_data_csv.data[["x", "y"]], trajectory_data.data[["x", "y"]], atol=1e-6)
@@ -0,0 +1,167 @@
+"""Tests of the exact representation of the disks of the 2D shapes."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import numpy as np
+import pytest
+from shapely.geometry import Point
+
+import configuration.utils.constants as cst
+from configuration.models.agents import Agent
+from configuration.models.crowd import Crowd
+from configuration.models.shapes2D import Shapes2D
+from configuration.utils.typing_custom import Sex
+
+
+@pytest.fixture
+def agent() -> Agent:
+    """
+    Fixture to create a pedestrian for testing.
+
+    Returns
+    -------
+    Agent
+        A male pedestrian with predefined measures.
+    """
+    measures: dict[str, Sex | float] = {
+        "sex": "male",
+        "bideltoid_breadth": 45.0,
+        "chest_depth": 25.0,
+        "height": 180.0,
+        "weight": 75.0,
+    }
+    return Agent(agent_type=cst.AgentTypes.pedestrian, measures=measures)
+
+
+def get_disks(agent: Agent) -> dict[str, tuple[float, float, float]]:
+    """
+    Gather the center and radius of the disks of a pedestrian.
+
+    Parameters
+    ----------
+    agent : Agent
+        The pedestrian.
+
+    Returns
+    -------
+    dict[str, tuple[float, float, float]]
+        The x-coordinate, y-coordinate and radius of each disk (cm).
+    """
+    return {name: (shape["x"], shape["y"], shape["radius"]) for name, shape in agent.shapes2D.shapes.items()}
+
+
+def test_disks_are_stored_exactly(agent: Agent) -> None:
+    """
+    Test that the disks are stored by their center and radius, which match the fitted chest depth.
+
+    Parameters
+    ----------
+    agent : Agent
+        The pedestrian fixture.
+    """
+    for shape in agent.shapes2D.shapes.values():
+        assert shape["type"] == cst.ShapeTypes.disk.name
+        assert "object" not in shape
+    assert agent.shapes2D.shapes["disk2"]["radius"] == pytest.approx(12.5)
+    assert agent.shapes2D.get_additional_parameters()["disk2"]["radius"] == pytest.approx(0.125)
+
+
+def test_transforms_move_the_centers_only(agent: Agent) -> None:
+    """
+    Test that translations and rotations move the disk centers exactly and keep the radii.
+
+    Parameters
+    ----------
+    agent : Agent
+        The pedestrian fixture.
+    """
+    initial_disks = get_disks(agent)
+    agent.translate(10.0, -5.0)
+    agent.rotate(90.0)
+    position = agent.get_position()
+    assert (position.x, position.y) == pytest.approx((10.0, -5.0))
+    for name, (x, y, radius) in get_disks(agent).items():
+        initial_x, initial_y, initial_radius = initial_disks[name]
+        assert radius == initial_radius
+        assert (x, y) == pytest.approx((10.0 - initial_y, -5.0 + initial_x))
+    assert agent.get_agent_orientation() == pytest.approx(90.0)
+
+
+def test_disk_polygons_are_cached(agent: Agent) -> None:
+    """
+    Test that the disk polygons are built lazily, reused, and rebuilt when the disks move.
+
+    Parameters
+    ----------
+    agent : Agent
+        The pedestrian fixture.
+    """
+    polygon = agent.shapes2D.get_shape_object("disk0")
+    assert agent.shapes2D.get_shape_object("disk0") is polygon
+    assert polygon.centroid.distance(Point(agent.shapes2D.shapes["disk0"]["x"], agent.shapes2D.shapes["disk0"]["y"])) < 1e-9
+
+    agent.translate(3.0, 4.0)
+    moved_polygon = agent.shapes2D.get_shape_object("disk0")
+    assert moved_polygon is not polygon
+    assert np.allclose(np.array(moved_polygon.exterior.coords), np.array(polygon.exterior.coords) + [3.0, 4.0])
+
+
+def test_disk_given_as_polygon() -> None:
+    """Test that a disk given as a buffered polygon is converted to its center and radius."""
+    disk = Point(2.0, 3.0).buffer(7.0, quad_segs=cst.DISK_QUAD_SEGS)
+    shapes = {"disk0": {"type": cst.ShapeTypes.disk.name, "material": cst.MaterialNames.human_naked.name, "object": disk}}
+    shapes2D = Shapes2D(agent_type=cst.AgentTypes.pedestrian, shapes=shapes)
+    x, y, radius = (shapes2D.shapes["disk0"][key] for key in ("x", "y", "radius"))
+    assert (x, y, radius) == pytest.approx((2.0, 3.0, 7.0))
+    assert shapes["disk0"]["object"] is disk, "The shapes given by the caller should be left unchanged."
+    assert "radius" not in shapes["disk0"]
+    assert shapes2D.get_area() == pytest.approx(disk.area)
+
+
+def test_invalid_disk() -> None:
+    """Test that a disk without a numerical radius is rejected."""
+    with pytest.raises(ValueError):
+        Shapes2D(
+            agent_type=cst.AgentTypes.pedestrian,
+            shapes={"disk0": {"type": cst.ShapeTypes.disk.name, "material": cst.MaterialNames.human_naked.name, "x": 0.0, "y": 0.0}},
+        )
+
+
+def test_disk_arrays(agent: Agent) -> None:
+    """
+    Test that the disk arrays of a crowd are read from the exact disks.
+
+    Parameters
+    ----------
+    agent : Agent
+        The pedestrian fixture.
+    """
+    crowd = Crowd(agents=[agent])
+    disk_centers, disk_radii, disk_owners = crowd.get_disk_arrays()
+    disks = np.array(list(get_disks(agent).values()))
+    assert np.array_equal(disk_centers, disks[:, :2])
+    assert np.array_equal(disk_radii, disks[:, 2])
+    assert np.array_equal(disk_owners, np.zeros(cst.DISK_NUMBER, dtype=np.int64))
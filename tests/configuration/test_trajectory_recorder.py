@@ -0,0 +1,174 @@
+"""Tests of the recorder of the trajectories of the agents in a single chunked binary file."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import configuration.utils.constants as cst
+from configuration.mechanics.crowd_mechanics import CrowdMechanicsSimulation, get_default_library_path
+from configuration.mechanics.trajectory_recorder import TrajectoryReader, TrajectoryRecorder
+from tests.configuration.test_crowd_mechanics_simulation import FRICTIONAL_MATERIALS_PATH, OVERLAPPING_KINEMATICS, prepare_scenario
+
+#: Ids of the agents of the synthetic trajectories.
+AGENT_IDS = ["agent_a", "agent_b", "agent_c"]
+#: Number of frames of the synthetic trajectories.
+NB_FRAMES = 25
+#: Time between two frames of the synthetic trajectories (s).
+FRAME_TIME = 0.1
+
+
+def make_frame(frame: int) -> tuple[float, np.ndarray, np.ndarray]:
+    """
+    Build a synthetic frame, whose values depend on its index, with a number of contacts that varies from frame to frame.
+
+    Parameters
+    ----------
+    frame : int
+        The index of the frame.
+
+    Returns
+    -------
+    tuple[float, np.ndarray, np.ndarray]
+        The time of the frame, the kinematics of the agents and their contacts.
+    """
+    kinematics: np.ndarray = frame + np.arange(len(AGENT_IDS) * len(cst.MECHANICS_KINEMATICS_COLUMNS), dtype=np.float64)
+    contacts: np.ndarray = -frame - np.arange((frame % 4) * len(cst.MECHANICS_CONTACTS_COLUMNS), dtype=np.float64)
+    return (
+        frame * FRAME_TIME,
+        kinematics.reshape(len(AGENT_IDS), len(cst.MECHANICS_KINEMATICS_COLUMNS)),
+        contacts.reshape(-1, len(cst.MECHANICS_CONTACTS_COLUMNS)),
+    )
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_random_access(tmp_path: Path, compress: bool) -> None:
+    """
+    Test that the frames written in several chunks are read back in any order, with their contacts.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the trajectory file is written.
+    compress : bool
+        Whether the chunks are compressed.
+    """
+    trajectory_file = tmp_path / "trajectory.npz"
+    with TrajectoryRecorder(trajectory_file, AGENT_IDS, record_contacts=True, frames_per_chunk=10, compress=compress) as recorder:
+        for frame in range(NB_FRAMES):
+            recorder.record(*make_frame(frame))
+        assert recorder.number_frames == NB_FRAMES
+
+    with TrajectoryReader(trajectory_file) as reader:
+        assert len(reader) == NB_FRAMES
+        assert reader.number_chunks == 3
+        assert reader.agent_ids == AGENT_IDS
+        assert reader.has_contacts
+        np.testing.assert_allclose(reader.times, np.arange(NB_FRAMES) * FRAME_TIME)
+        for frame in [24, 3, 17, 0, 11, -1]:
+            _, kinematics, contacts = make_frame(frame % NB_FRAMES)
+            np.testing.assert_array_equal(reader.get_kinematics(frame), kinematics)
+            np.testing.assert_array_equal(reader.get_contacts(frame), contacts)
+        assert reader.get_frame(1.25) == 12
+        assert reader.get_frame(2.45) == 24
+        with pytest.raises(ValueError):
+            reader.get_frame(-0.5)
+        with pytest.raises(IndexError):
+            reader.get_kinematics(NB_FRAMES)
+
+    # The file is also a regular NPZ archive
+    with np.load(trajectory_file) as archive:
+        assert archive["chunk_000002_kinematics"].shape == (5, len(AGENT_IDS), len(cst.MECHANICS_KINEMATICS_COLUMNS))
+
+
+def test_append(tmp_path: Path) -> None:
+    """
+    Test that a recorder can append frames to an existing trajectory file, and that inconsistent frames are rejected.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the trajectory file is written.
+    """
+    trajectory_file = tmp_path / "trajectory.npz"
+    with TrajectoryRecorder(trajectory_file, AGENT_IDS) as recorder:
+        for frame in range(10):
+            recorder.record(*make_frame(frame)[:2])
+        with pytest.raises(ValueError):
+            recorder.record(*make_frame(5)[:2])
+        with pytest.raises(ValueError):
+            recorder.record(NB_FRAMES * FRAME_TIME, np.zeros((2, len(cst.MECHANICS_KINEMATICS_COLUMNS))))
+
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(trajectory_file, AGENT_IDS[:2], append=True)
+    with TrajectoryRecorder(trajectory_file, AGENT_IDS, append=True) as recorder:
+        for frame in range(10, NB_FRAMES):
+            recorder.record(*make_frame(frame)[:2])
+
+    with TrajectoryReader(trajectory_file) as reader:
+        assert len(reader) == NB_FRAMES
+        assert not reader.has_contacts
+        for frame, (time, kinematics) in enumerate(reader.iter_kinematics()):
+            expected_time, expected_kinematics, _ = make_frame(frame)
+            assert time == expected_time
+            np.testing.assert_array_equal(kinematics, expected_kinematics)
+        with pytest.raises(ValueError):
+            reader.get_contacts(0)
+
+
+@pytest.mark.skipif(not get_default_library_path().is_file(), reason="the CrowdMechanics library is not built")
+def test_record_simulation(tmp_path: Path) -> None:
+    """
+    Test that the states of the agents of a simulation and their contacts are recorded at each step.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the scenario is copied and run, and the trajectory file is written.
+    """
+    parameters_file = prepare_scenario(tmp_path)
+    shutil.copyfile(FRICTIONAL_MATERIALS_PATH, tmp_path / "static" / "Materials.xml")
+    kinematics = []
+    contacts = []
+    with CrowdMechanicsSimulation(parameters_file) as simulation:
+        agent_ids = simulation.agent_ids
+        with TrajectoryRecorder(tmp_path / "trajectory.npz", simulation.agent_ids, record_contacts=True) as recorder:
+            simulation.set_kinematics(OVERLAPPING_KINEMATICS)
+            for step in range(3):
+                simulation.step()
+                recorder.record_simulation(simulation, (step + 1) * 0.01)
+                kinematics.append(simulation.get_kinematics())
+                contacts.append(simulation.get_contacts())
+
+    with TrajectoryReader(tmp_path / "trajectory.npz") as reader:
+        assert reader.agent_ids == agent_ids
+        for frame in range(3):
+            np.testing.assert_array_equal(reader.get_kinematics(frame), kinematics[frame])
+            np.testing.assert_array_equal(reader.get_contacts(frame), contacts[frame])
+    assert sum(len(frame_contacts) for frame_contacts in contacts) > 0
@@ -0,0 +1,127 @@
+"""Tests for the vectorized packing engine of the Crowd class operating on disk arrays."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+import copy
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+import configuration.utils.constants as cst
+from configuration.models.agents import Agent
+from configuration.models.crowd import Crowd
+
+NUMBER_AGENTS: int = 20
+#: Tolerance on the interpenetration area between agents after packing (cm²).
+INTERPENETRATION_TOL: float = 1.0
+#: Square boundaries (cm) used to check that agents are packed inside the room.
+BOUNDARIES: Polygon = Polygon([(0.0, 0.0), (300.0, 0.0), (300.0, 300.0), (0.0, 300.0)])
+
+
+@pytest.fixture(scope="module")
+def crowd() -> Crowd:
+    """
+    Fixture to create an unpacked Crowd instance.
+
+    Returns
+    -------
+    Crowd
+        An instance of Crowd with agents created but not packed.
+    """
+    np.random.seed(0)
+    crowd = Crowd()
+    crowd.create_agents(number_agents=NUMBER_AGENTS)
+    return crowd
+
+
+def test_get_disk_arrays(crowd: Crowd) -> None:
+    """
+    Test that the flattened disk arrays match the disks stored in the agents.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    disk_centers, disk_radii, disk_owners = crowd.get_disk_arrays()
+    assert disk_centers.shape == (NUMBER_AGENTS * cst.DISK_NUMBER, 2)
+    assert np.array_equal(disk_owners, np.repeat(np.arange(NUMBER_AGENTS), cst.DISK_NUMBER))
+    for i_agent, agent in enumerate(crowd.agents):
+        params = agent.shapes2D.get_additional_parameters()
+        for i_disk, disk in enumerate(params.values()):
+            index = i_agent * cst.DISK_NUMBER + i_disk
+            assert np.isclose(disk_radii[index] * cst.CM_TO_M, disk["radius"], atol=1e-3)
+            assert np.allclose(disk_centers[index] * cst.CM_TO_M, (disk["x"], disk["y"]), atol=1e-3)
+
+
+def test_vectorized_packing_without_boundaries(crowd: Crowd) -> None:
+    """
+    Test that the vectorized packing removes the overlaps between agents and keeps their shapes.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    packed_crowd = copy.deepcopy(crowd)
+    packed_crowd.pack_agents_with_vectorized_forces()
+    interpenetration, _ = packed_crowd.calculate_interpenetration()
+    assert interpenetration < INTERPENETRATION_TOL, f"Agents still overlap after packing: {interpenetration} cm²."
+    for agent, packed_agent in zip(crowd.agents, packed_crowd.agents, strict=True):
+        assert np.isclose(agent.shapes2D.get_area(), packed_agent.shapes2D.get_area(), rtol=1e-3)
+        assert np.isclose(agent.shapes2D.get_bideltoid_breadth(), packed_agent.shapes2D.get_bideltoid_breadth(), atol=0.2)
+
+
+def test_vectorized_packing_with_boundaries(crowd: Crowd) -> None:
+    """
+    Test that the vectorized packing keeps the agents inside the boundaries.
+
+    Parameters
+    ----------
+    crowd : Crowd
+        The crowd fixture.
+    """
+    packed_crowd = copy.deepcopy(crowd)
+    packed_crowd.boundaries = BOUNDARIES
+    packed_crowd.pack_agents_with_vectorized_forces(variable_orientation=True)
+    interpenetration, outside_boundaries = packed_crowd.calculate_interpenetration()
+    assert interpenetration < INTERPENETRATION_TOL, f"Agents still overlap after packing: {interpenetration} cm²."
+    assert outside_boundaries < INTERPENETRATION_TOL, f"Agents lie outside the boundaries: {outside_boundaries} cm²."
+
+
+def test_vectorized_packing_rejects_bikes() -> None:
+    """Test that the vectorized packing raises a ValueError for agents that are not made of disks."""
+    bike_measures = {
+        "wheel_width": 6.0,
+        "total_length": 142.0,
+        "handlebar_length": 45.0,
+        "top_tube_length": 61.0,
+        "weight": 30.0,
+    }
+    crowd = Crowd(agents=[Agent(agent_type=cst.AgentTypes.bike, measures=bike_measures)])
+    with pytest.raises(ValueError):
+        crowd.pack_agents_with_vectorized_forces()
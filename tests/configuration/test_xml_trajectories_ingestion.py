@@ -0,0 +1,116 @@
+"""Tests of the ingestion of the AgentDynamics XML files into a table of agent trajectories."""
+
+# Copyright  2025  Institute of Light and Matter, CNRS UMR 5306, University Claude Bernard Lyon 1
+# Contributors: Oscar DUFOUR, Maxime STAPELLE, Alexandre NICOLAS
+
+# This software is a computer program designed to generate a realistic crowd from anthropometric data and
+# simulate the mechanical interactions that occur within it and with obstacles.
+
+# This software is governed by the CeCILL-B license under French law and abiding by the rules of distribution
+# of free software.  You can  use, modify and/ or redistribute the software under the terms of the CeCILL-B
+# license as circulated by CEA, CNRS and INRIA at the following URL "http://www.cecill.info".
+
+# As a counterpart to the access to the source code and  rights to copy, modify and redistribute granted by
+# the license, users are provided only with a limited warranty  and the software's author,  the holder of the
+# economic rights,  and the successive licensors  have only  limited liability.
+
+# In this respect, the user's attention is drawn to the risks associated with loading,  using,  modifying
+# and/or developing or reproducing the software by the user in light of its specific status of free software,
+# that may mean  that it is complicated to manipulate,  and  that  also therefore means  that it is reserved
+# for developers  and  experienced professionals having in-depth computer knowledge. Users are therefore
+# encouraged to load and test the software's suitability as regards their requirements in conditions enabling
+# the security of their systems and/or data to be ensured and,  more generally, to use and operate it in the
+# same conditions as regards security.
+
+# The fact that you are presently reading this means that you have had knowledge of the CeCILL-B license and that
+# you accept its terms.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from configuration.backup import xml_to_Chaos
+
+#: Number of AgentDynamics files written in the test folder.
+NB_FILES = 6
+#: Ids of the agents, whose alphabetical order differs from the order of the files.
+AGENT_IDS = ["b", "a", "10", "2"]
+
+
+def write_agent_dynamics_files(folder: Path) -> None:
+    """
+    Write AgentDynamics files whose values depend on the time and on the agent, with a few malformed agents and other files.
+
+    Parameters
+    ----------
+    folder : Path
+        The folder in which the files are written.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    for step in range(NB_FILES):
+        lines = ['<?xml version="1.0" encoding="utf-8"?>', "<Agents>"]
+        for index, agent_id in enumerate(AGENT_IDS):
+            x, y, vx, vy, theta, omega = step + index + np.arange(6) / 8.0
+            lines.append(
+                f'    <Agent Id="{agent_id}">\n'
+                f'        <Kinematics Position="{x},{y}" Velocity="{vx},{vy}" Theta="{theta}" Omega="{omega}"/>\n'
+                '        <Dynamics Fp="0.0,0.0" Mp="0.0"/>\n'
+                "    </Agent>"
+            )
+        if step == 2:
+            lines.append('    <Agent Id="malformed"><Kinematics Position="1.0" Velocity="0.0,0.0" Theta="0.0" Omega="0.0"/></Agent>')
+        lines.append('    <Agent Id="incomplete"><Kinematics Position="1.0,1.0"/></Agent>')
+        lines.append("</Agents>")
+        (folder / f"AgentDynamics output t={0.1 * step:.1f}.xml").write_text("\n".join(lines))
+    (folder / "AgentInteractions output t=0.1.xml").write_text("<Interactions/>")
+    (folder / "AgentDynamics.xml").write_text("<Agents/>")
+
+
+def test_read_agent_trajectories(tmp_path: Path) -> None:
+    """
+    Test that the table of the trajectories holds one row per well-formed agent and per file, sorted by time and agent ID.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the XML files are written.
+    """
+    write_agent_dynamics_files(tmp_path)
+    trajectories = xml_to_Chaos.read_agent_trajectories_from_XML(tmp_path)
+
+    assert list(trajectories.columns) == list(xml_to_Chaos.trajectories_columns)
+    assert len(trajectories) == NB_FILES * len(AGENT_IDS)
+    np.testing.assert_allclose(trajectories["t"].unique(), 0.1 * np.arange(NB_FILES))
+    assert trajectories["ID"].tolist()[: len(AGENT_IDS)] == sorted(AGENT_IDS)
+    row = trajectories[(trajectories["ID"] == "10") & (trajectories["t"] == 0.3)].iloc[0]
+    np.testing.assert_allclose(row[["x", "y", "vx", "vy", "theta", "omega"]].to_numpy(dtype=float), 5 + np.arange(6) / 8.0)
+
+    pd.testing.assert_frame_equal(xml_to_Chaos.read_agent_trajectories_from_XML(tmp_path, workers=2), trajectories)
+    with pytest.raises(ValueError):
+        xml_to_Chaos.read_agent_trajectories_from_XML(tmp_path, workers=0)
+
+
+def test_export_XML_to_CSV(tmp_path: Path) -> None:
+    """
+    Test that the CSV file and the dictionary of the trajectories match the table of the trajectories.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory in which the XML and CSV files are written.
+    """
+    write_agent_dynamics_files(tmp_path / "xml")
+    trajectories = xml_to_Chaos.read_agent_trajectories_from_XML(tmp_path / "xml")
+    xml_to_Chaos.export_XML_to_CSV(tmp_path, tmp_path / "xml")
+
+    lines = (tmp_path / xml_to_Chaos.trajectories_csv_filename).read_text(encoding="utf-8").split("\n")
+    assert lines[0] == "t,ID,x,y,vx,vy,theta,omega"
+    assert lines[1] == "0.0000,10,2.000000,2.125000,2.250000,2.375000,2.500000,2.625000"
+    assert len(lines) == len(trajectories) + 1
+
+    times, agents = xml_to_Chaos.create_dict_of_agent_trajectories(tmp_path / "xml")
+    assert times == sorted(trajectories["t"].unique().tolist())
+    assert sorted(agents) == sorted(AGENT_IDS)
+    assert agents["a"][times[1]] == pytest.approx({"x": 2.0, "y": 2.125, "vx": 2.25, "vy": 2.375, "theta": 2.5, "omega": 2.625})